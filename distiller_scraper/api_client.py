@@ -24,20 +24,47 @@ Selenium 爬取每頁需要 5-10 秒（瀏覽器啟動 + 頁面渲染 + JavaScri
 - fetch_spirit_detail()：None 表示 API 不可用或解析失敗
   → 呼叫端 fallback 至 Selenium 爬取詳情頁
 
+端點快取（cache_path）
+----------------------
+完整探測需要 Chrome 載入搜尋頁、滾動、讀取 performance log，再逐一測試候選路徑。
+探測成功後端點寫入 JSON 狀態檔（含 saved_at），下次執行時 load_cached_endpoints()
+在 TTL 內只以「一次」搜索端點請求驗證快取即可直接使用，不需為了探測而載入頁面。
+需要完整探測時，所有候選路徑改為並行測試，但仍依原本的優先順序選出結果。
+
 _map_search_response / _map_detail_response 的設計
 ---------------------------------------------------
 API 回應格式不固定（list、{spirits:[...]}, {data:{...}} 等）
 用防禦性解析策略，逐一嘗試已知格式，確保回應格式變更時不會直接崩潰
+
+搜尋結果欄位擷取
+----------------
+搜尋回應的每筆項目常已帶有品名、評分、類型、ABV、風味等欄位，
+原本只取 URL，之後每筆還要再發一次詳情請求。
+fetch_search_results() 另以 _map_search_items()（與詳情共用 _map_spirit_fields 映射）保留這些欄位，
+completeness() 達 API_SEARCH_MIN_COMPLETENESS 的紀錄暫存起來，
+由 scraper 以 take_search_record() 直接儲存並略過該筆詳情請求；不足時照常請求詳情。
+
+原始回應封存
+------------
+注入 archive（PageArchive）時，fetch_spirit_detail() 的 JSON 回應以烈酒頁 URL 為鍵封存，
+_map_detail_response 修正後可離線重新映射（見 page_archive.py / reparse.py）。
 """
 
+import json
 import logging
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 from urllib.parse import parse_qs, urljoin, urlparse
 
 import requests
 
 from .config import ScraperConfig
+from .page_archive import KIND_DISTILLER_API, PageArchive
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +93,24 @@ class DistillerAPIClient:
     # 探測時使用的測試 slug（高知名度烈酒，大機率存在）
     _TEST_SLUG = "highland-park-12-year"
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        cache_ttl: float = None,
+        archive: Optional[PageArchive] = None,
+    ):
+        """
+        cache_path：端點快取 JSON 檔路徑，None 表示不使用快取（每次完整探測）
+        cache_ttl：快取有效秒數，預設 ScraperConfig.API_CACHE_TTL_HOURS
+        archive：詳情 API 回應的原始頁面封存，None 表示不封存
+        """
+        self.archive = archive
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.cache_ttl = (
+            cache_ttl
+            if cache_ttl is not None
+            else ScraperConfig.API_CACHE_TTL_HOURS * 3600
+        )
         self.session = requests.Session()
         self.session.headers.update(
             {
@@ -81,6 +125,11 @@ class DistillerAPIClient:
         self.detail_endpoint_template: Optional[str] = None
         self._available = False
         self._discovered = False
+        # 搜尋結果中欄位已完整的紀錄（URL → 紀錄），可直接儲存而不需詳情請求
+        # 搜尋頁可能由預取執行緒抓取，因此以鎖保護
+        self._harvested: Dict[str, Dict] = {}
+        self._harvest_lock = threading.Lock()
+        self.harvest_stats: Dict[str, int] = {"搜尋結果": 0, "欄位完整": 0}
 
     # ------------------------------------------------------------------
     # 公開屬性
@@ -117,37 +166,39 @@ class DistillerAPIClient:
             "available": False,
         }
 
-        # 1. 分析 XHR 捕獲
+        # 1. 分析 XHR 捕獲（XHR 候選優先於已知候選路徑）
+        xhr_candidates: List[str] = []
         if xhr_urls:
-            candidates = self._extract_json_candidates(xhr_urls)
-            result["xhr_candidates"] = candidates
-            logger.info(f"從 XHR 捕獲中篩選出 {len(candidates)} 個 API 候選")
-            for url in candidates:
-                if self._test_search_endpoint(url):
-                    self.search_endpoint = url
-                    result["search_endpoint"] = url
-                    logger.info(f"✓ 找到搜索端點（XHR）: {url}")
-                    break
-
-        # 2. 嘗試已知候選路徑
-        if not self.search_endpoint:
-            for path in self.SEARCH_CANDIDATES:
-                url = urljoin(self.BASE_URL, path)
-                if self._test_search_endpoint(url):
-                    self.search_endpoint = url
-                    result["search_endpoint"] = url
-                    logger.info(f"✓ 找到搜索端點（候選）: {url}")
-                    break
-
-        if not self.search_endpoint:
+            xhr_candidates = self._extract_json_candidates(xhr_urls)
+            result["xhr_candidates"] = xhr_candidates
+            logger.info(f"從 XHR 捕獲中篩選出 {len(xhr_candidates)} 個 API 候選")
+
+        # 2. 搜索與詳情候選全部並行探測，再依優先順序挑選
+        static_candidates = [urljoin(self.BASE_URL, p) for p in self.SEARCH_CANDIDATES]
+        search_urls = list(dict.fromkeys(xhr_candidates + static_candidates))
+        detail_urls = [
+            urljoin(self.BASE_URL, t.replace("{slug}", self._TEST_SLUG))
+            for t in self.DETAIL_CANDIDATES
+        ]
+        checks = [(self._test_search_endpoint, u) for u in search_urls] + [
+            (self._test_detail_endpoint, u) for u in detail_urls
+        ]
+        passed = self._run_probes(checks)
+        search_ok, detail_ok = passed[: len(search_urls)], passed[len(search_urls):]
+
+        for url, ok in zip(search_urls, search_ok):
+            if ok:
+                self.search_endpoint = url
+                result["search_endpoint"] = url
+                source = "XHR" if url in xhr_candidates else "候選"
+                logger.info(f"✓ 找到搜索端點（{source}）: {url}")
+                break
+        else:
             logger.info("未找到可用的搜索端點")
 
-        # 3. 探測詳情端點
-        for template in self.DETAIL_CANDIDATES:
-            test_url = urljoin(
-                self.BASE_URL, template.replace("{slug}", self._TEST_SLUG)
-            )
-            if self._test_detail_endpoint(test_url):
+        # 3. 詳情端點
+        for template, ok in zip(self.DETAIL_CANDIDATES, detail_ok):
+            if ok:
                 self.detail_endpoint_template = urljoin(self.BASE_URL, template)
                 result["detail_endpoint_template"] = template
                 logger.info(f"✓ 找到詳情端點: {template}")
@@ -157,8 +208,59 @@ class DistillerAPIClient:
         self._available = self.search_endpoint is not None
         result["available"] = self._available
         self._discovered = True
+        if self._available:
+            self._save_cache()
         return result
 
+    def load_cached_endpoints(self) -> bool:
+        """
+        從快取檔載入端點，並以一次搜索請求驗證仍可用。
+
+        回傳 True 表示已可直接使用（不需完整探測）；
+        無快取、已過期、格式錯誤或驗證失敗時回傳 False。
+        """
+        if not self.cache_path or not self.cache_path.exists():
+            return False
+        try:
+            cached = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            saved_at = float(cached["saved_at"])
+            search_endpoint = cached["search_endpoint"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"API 端點快取無法讀取，將重新探測: {e}")
+            return False
+
+        age = time.time() - saved_at
+        if age > self.cache_ttl:
+            logger.info(f"API 端點快取已過期（{age / 3600:.1f} 小時），將重新探測")
+            return False
+        if not search_endpoint or not self._test_search_endpoint(search_endpoint):
+            logger.info("快取的搜索端點驗證失敗，將重新探測")
+            return False
+
+        self.search_endpoint = search_endpoint
+        self.detail_endpoint_template = cached.get("detail_endpoint_template")
+        self._available = True
+        self._discovered = True
+        logger.info(f"✓ 使用快取的 API 端點（{age / 3600:.1f} 小時前探測）: {search_endpoint}")
+        return True
+
+    def _save_cache(self) -> None:
+        """將目前端點寫入快取檔（先寫暫存檔再置換，避免中斷時留下半份檔案）。"""
+        if not self.cache_path:
+            return
+        payload = {
+            "search_endpoint": self.search_endpoint,
+            "detail_endpoint_template": self.detail_endpoint_template,
+            "saved_at": time.time(),
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            logger.warning(f"寫入 API 端點快取失敗: {e}")
+
     # ------------------------------------------------------------------
     # 公開查詢方法
     # ------------------------------------------------------------------
@@ -174,9 +276,48 @@ class DistillerAPIClient:
         透過 API 取得搜索結果的 spirit URL 列表。
         回傳 []（而非 None）代表「本頁無結果」，None 代表「API 請求失敗」。
         """
-        if not self.search_endpoint:
+        data = self._search(category, page, spirit_style_id, sort)
+        if data is None:
             return []
 
+        try:
+            urls = self._map_search_response(data)
+        except Exception as e:
+            logger.warning(f"解析搜索 API 回應失敗: {e}")
+            return []
+        try:
+            self._harvest(self._map_search_items(data))
+        except Exception as e:
+            logger.debug(f"搜尋結果欄位擷取失敗（僅取 URL）: {e}")
+        return urls
+
+    def fetch_search_items(
+        self,
+        category: str,
+        page: int = 1,
+        spirit_style_id: str = None,
+        sort: str = "distiller_score",
+    ) -> Optional[List[Dict]]:
+        """
+        透過 API 取得搜索結果的完整紀錄（含 expert_score / community_score，供分數刷新使用）。
+        與 fetch_search_results 不同，端點不存在或請求失敗時回傳 None，讓呼叫端改走 Selenium。
+        """
+        data = self._search(category, page, spirit_style_id, sort)
+        if data is None:
+            return None
+        try:
+            return self._map_search_items(data)
+        except Exception as e:
+            logger.warning(f"解析搜索 API 回應失敗: {e}")
+            return None
+
+    def _search(
+        self, category: str, page: int, spirit_style_id: Optional[str], sort: str
+    ) -> Optional[Any]:
+        """送出搜尋請求並回傳 JSON；端點未探測到或請求 / 解析失敗時回傳 None。"""
+        if not self.search_endpoint:
+            return None
+
         params: Dict[str, Any] = {"category": category, "sort": sort}
         if spirit_style_id:
             params["spirit_style_id"] = spirit_style_id
@@ -185,13 +326,24 @@ class DistillerAPIClient:
 
         resp = self._probe(self.search_endpoint, params=params)
         if resp is None:
-            return []
-
+            return None
         try:
-            return self._map_search_response(resp.json())
+            return resp.json()
         except Exception as e:
             logger.warning(f"解析搜索 API 回應失敗: {e}")
-            return []
+            return None
+
+    def take_search_record(self, url: str) -> Optional[Dict]:
+        """取出搜尋 API 已帶齊欄位的紀錄（取出後移除）；沒有時回傳 None，呼叫端照常請求詳情。"""
+        with self._harvest_lock:
+            return self._harvested.pop(url, None)
+
+    def clear_search_records(self) -> int:
+        """丟棄尚未取出的搜尋結果紀錄（每個查詢結束時呼叫，避免整次執行累積），回傳丟棄筆數。"""
+        with self._harvest_lock:
+            dropped = len(self._harvested)
+            self._harvested.clear()
+        return dropped
 
     def fetch_spirit_detail(self, url: str) -> Optional[Dict]:
         """
@@ -211,6 +363,11 @@ class DistillerAPIClient:
         if resp is None:
             return None
 
+        if self.archive is not None:
+            try:
+                self.archive.put(url, resp.text, KIND_DISTILLER_API)
+            except Exception as e:  # 封存失敗（磁碟已滿、檔案鎖定）不影響爬取
+                logger.warning(f"頁面封存失敗 {url}: {e}")
         try:
             return self._map_detail_response(resp.json(), url)
         except Exception as e:
@@ -247,6 +404,14 @@ class DistillerAPIClient:
         except (ValueError, requests.exceptions.JSONDecodeError):
             return False
 
+    def _run_probes(self, checks: List[tuple]) -> List[bool]:
+        """並行執行 (test_fn, url) 探測，回傳與 checks 同順序的結果。"""
+        if not checks:
+            return []
+        workers = min(len(checks), ScraperConfig.API_PROBE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda check: bool(check[0](check[1])), checks))
+
     def _test_search_endpoint(self, url: str) -> bool:
         resp = self._probe(
             url, params={"category": "whiskey", "sort": "distiller_score"}
@@ -307,20 +472,69 @@ class DistillerAPIClient:
         for item in spirits:
             if not isinstance(item, dict):
                 continue
-            # 嘗試直接取得 URL
-            url = item.get("url") or item.get("href") or item.get("link")
+            url = self._item_url(item)
             if url:
-                if url.startswith("/"):
-                    url = f"{self.BASE_URL}{url}"
                 urls.append(url)
-                continue
-            # 嘗試從 slug 建構 URL
-            slug = item.get("slug") or item.get("id")
-            if slug:
-                urls.append(f"{self.BASE_URL}/spirits/{slug}")
 
         return urls
 
+    def _item_url(self, item: Dict) -> Optional[str]:
+        """搜尋結果項目 → spirit URL（url / href / link，或由 slug / id 建構）。"""
+        # 嘗試直接取得 URL
+        url = item.get("url") or item.get("href") or item.get("link")
+        if url:
+            if url.startswith("/"):
+                url = f"{self.BASE_URL}{url}"
+            return url
+        # 嘗試從 slug 建構 URL
+        slug = item.get("slug") or item.get("id")
+        if slug:
+            return f"{self.BASE_URL}/spirits/{slug}"
+        return None
+
+    def _map_search_items(self, data: Any) -> List[Dict]:
+        """
+        將 API 搜索回應映射為與 _map_detail_response 相同格式的紀錄列表（含 url）。
+        搜尋結果通常只帶部分欄位，缺少的欄位為 "N/A"；是否足以取代詳情請求由 completeness() 判斷。
+        """
+        spirits: Optional[list] = None
+        if isinstance(data, list):
+            spirits = data
+        elif isinstance(data, dict):
+            for key in ("spirits", "results", "data", "items", "records"):
+                if key in data and isinstance(data[key], list):
+                    spirits = data[key]
+                    break
+
+        items = []
+        for item in spirits or []:
+            if not isinstance(item, dict):
+                continue
+            url = self._item_url(item)
+            if url:
+                items.append(self._map_spirit_fields(item, url))
+        return items
+
+    @staticmethod
+    def completeness(record: Dict, fields=None) -> float:
+        """紀錄中 fields（預設 API_SEARCH_DETAIL_FIELDS）已有值的比例（0.0 ~ 1.0）。"""
+        fields = fields or ScraperConfig.API_SEARCH_DETAIL_FIELDS
+        filled = sum(1 for f in fields if record.get(f) not in (None, "", "N/A", "None", {}))
+        return filled / len(fields)
+
+    def _harvest(self, items: List[Dict]) -> None:
+        """保留欄位足夠完整的搜尋結果，供 take_search_record() 取代詳情請求。"""
+        complete = [
+            item for item in items
+            if item["name"] not in ("N/A", "", "None")
+            and self.completeness(item) >= ScraperConfig.API_SEARCH_MIN_COMPLETENESS
+        ]
+        with self._harvest_lock:
+            self.harvest_stats["搜尋結果"] += len(items)
+            self.harvest_stats["欄位完整"] += len(complete)
+            for item in complete:
+                self._harvested[item["url"]] = item
+
     def _map_detail_response(self, data: Any, original_url: str) -> Optional[Dict]:
         """
         將 API 詳情回應映射為與 DataExtractor.extract_spirit_details() 相容的格式。
@@ -335,6 +549,16 @@ class DistillerAPIClient:
         elif "data" in data and isinstance(data["data"], dict):
             data = data["data"]
 
+        mapped = self._map_spirit_fields(data, original_url)
+
+        # 驗證必要欄位
+        if mapped["name"] in ("N/A", "", "None"):
+            return None
+
+        return mapped
+
+    def _map_spirit_fields(self, data: Dict, url: str) -> Dict:
+        """將單筆烈酒 JSON 映射為 DataExtractor.extract_spirit_details() 相容欄位（詳情與搜尋結果共用）。"""
         # brand / country 可能在巢狀欄位
         brand = (
             data.get("brand")
@@ -371,11 +595,6 @@ class DistillerAPIClient:
             "expert_name":     str(data.get("expert_name") or "N/A"),
             "flavor_summary":  str(data.get("flavor_summary") or "N/A"),
             "flavor_data":     flavor_raw if isinstance(flavor_raw, dict) else {},
-            "url":             original_url,
+            "url":             url,
         }
-
-        # 驗證必要欄位
-        if mapped["name"] in ("N/A", "", "None"):
-            return None
-
         return mapped
@@ -0,0 +1,120 @@
+"""
+爬取預算：以請求數與牆鐘時間限制單次 run 的工作量。
+
+設計理由
+--------
+每日排程的 run 原本只受 max_spirits 與各種分頁停止條件限制，
+實際發出的請求數與耗時取決於網站當天有多少新烈酒，無法預估。
+加入過期資料刷新後，新 URL 探索與舊資料重爬會搶同一份請求額度，
+需要一個兩者共用、可查詢剩餘額度的計數器。
+
+CrawlBudget 只負責記帳與判斷，不主動中斷任何工作：
+- spend()：呼叫端在發出請求（列表頁、詳情頁）時記帳
+- remaining()：還能做幾項工作；未設任何上限（或尚無成本估計）時為 None（不限）
+- exhausted()：任一上限用完即成立，並記錄是哪一項（stopped_by）
+呼叫端在頁面 / 批次之間檢查，額度用完時以原本的停止路徑結束
+（分頁檢查點保留，下一次 run 從中斷處續爬）。
+
+時間預算（Cloud Run 任務逾時）
+------------------------------
+逾時被強制終止的 run 來不及執行 finish_scrape_run 與通知，整次 run 的紀錄都遺失。
+時間預算改為「在截止前主動收尾」：
+- record()：每批詳情完成後回報項數與耗時，以 EWMA 更新每項平均成本（item_cost）
+  EWMA 讓估計跟上 API 限速、Chrome 回收等造成的速度變化，又不會被單一慢頁拉偏
+- 剩餘時間 = max_seconds − 已用時間 − reserve_seconds（保留給寫檔、上傳 DB、通知）
+- remaining() 以 剩餘時間 ÷ item_cost 換算還能開始的項數；不足一項即視為用完
+  → 不會開始一項預估在截止前做不完的工作
+- plan() / completed：計畫與實際完成的項數，寫入 scrape_runs 的 planned / completed
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+
+class CrawlBudget:
+    """單次 run 的請求數 / 時間預算（None 或 0 代表不限）。"""
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        reserve_seconds: float = 0.0,
+        alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_requests = max_requests or None
+        self.max_seconds = max_seconds or None
+        self.reserve_seconds = reserve_seconds
+        self.alpha = alpha  # EWMA 平滑係數：越大越偏重最近一批
+        self._clock = clock
+        self._started = clock()
+        self.requests = 0
+        self.item_cost: Optional[float] = None  # 每項工作的 EWMA 秒數（尚無樣本時為 None）
+        self.planned = 0  # 排入待辦的項數
+        self.completed = 0  # 實際處理完（成功或失敗）的項數
+        self.stopped_by: Optional[str] = None  # "請求數" / "時間"：第一次用完的預算
+
+    def spend(self, requests: int = 1) -> None:
+        self.requests += max(requests, 0)
+
+    def plan(self, items: int) -> None:
+        self.planned += max(items, 0)
+
+    def record(self, items: int, seconds: float) -> None:
+        """回報一批 items 項工作耗時 seconds 秒，更新每項成本的 EWMA。"""
+        if items <= 0:
+            return
+        self.completed += items
+        cost = max(seconds, 0.0) / items
+        self.item_cost = (
+            cost
+            if self.item_cost is None
+            else self.alpha * cost + (1 - self.alpha) * self.item_cost
+        )
+
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    def time_left(self) -> Optional[float]:
+        """扣除收尾保留時間後的剩餘秒數；未設時間上限時回傳 None。"""
+        if self.max_seconds is None:
+            return None
+        return self.max_seconds - self.reserve_seconds - self.elapsed()
+
+    def remaining(self) -> Optional[int]:
+        """還能開始的項數（請求數與時間換算取小者）；用完時回傳 0，無上限時回傳 None。"""
+        if self.exhausted():
+            return 0
+        limits = []
+        if self.max_requests is not None:
+            limits.append(self.max_requests - self.requests)
+        if self.max_seconds is not None and self.item_cost:
+            limits.append(int(self.time_left() // self.item_cost))
+        return min(limits) if limits else None
+
+    def allow(self, wanted: Optional[int]) -> Optional[int]:
+        """wanted 筆請求中預算允許的數量（wanted 為 None 代表「全部」）。"""
+        remaining = self.remaining()
+        if remaining is None:
+            return wanted
+        return remaining if wanted is None else min(wanted, remaining)
+
+    def exhausted(self) -> bool:
+        if self.stopped_by is None:
+            if self.max_requests is not None and self.requests >= self.max_requests:
+                self.stopped_by = "請求數"
+            elif self.max_seconds is not None and self.time_left() < (self.item_cost or 0.0):
+                self.stopped_by = "時間"  # 剩餘時間不足以再做一項
+        return self.stopped_by is not None
+
+    def summary(self) -> Dict:
+        return {
+            "請求數": self.requests,
+            "請求上限": self.max_requests,
+            "耗時秒數": round(self.elapsed(), 1),
+            "時間上限": self.max_seconds,
+            "每項秒數": round(self.item_cost, 2) if self.item_cost is not None else None,
+            "計畫": self.planned,
+            "完成": self.completed,
+            "提前結束": self.stopped_by,
+        }
@@ -0,0 +1,44 @@
+"""
+並行爬取輔助工具：執行緒安全的全域請求速率限制。
+
+設計理由
+--------
+API 模式下詳情頁改由 worker pool 並行抓取（見 DistillerScraperV2._scrape_urls_concurrent），
+並行度（同時進行的請求數）與速率（每秒請求數）是兩個獨立的限制：
+- 並行度由 ThreadPoolExecutor 的 max_workers 控制
+- 速率由本模組的 RateLimiter 控制，所有 worker 共用同一個實例
+  → 無論開多少 worker，整體對 Distiller.com 的請求頻率都不會超過上限
+
+RateLimiter 採「最小間隔」排程而非 token bucket：
+每次 acquire() 預約下一個可用時間槽，確保請求均勻分布，不會出現瞬間爆量。
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """執行緒安全的全域速率限制器（每秒最多 max_per_sec 次）。
+
+    max_per_sec 為 None 或 <= 0 時不限速（acquire() 立即回傳）。
+    """
+
+    def __init__(self, max_per_sec: Optional[float]):
+        self.max_per_sec = max_per_sec
+        self._interval = 1.0 / max_per_sec if max_per_sec and max_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> float:
+        """阻塞直到取得下一個請求時間槽，回傳實際等待秒數。"""
+        if not self._interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -12,7 +12,7 @@
 ------------------
 - DELAY_MIN / DELAY_MAX：每筆詳情爬取之間的隨機延遲，模擬人類行為，降低被封鎖風險
 - SCROLL_DELAY：頁面滾動後的等待時間，給予 JavaScript lazy-loading 完成的時間
-- INITIAL_PAGE_DELAY：頁面初次載入後的等待，確保 React/Next.js 完成水合（hydration）
+- INITIAL_PAGE_DELAY：頁面初次載入後的固定等待（已由 READY_* 條件式等待取代，見 page_wait.py）
 - CATEGORY_DELAY：類別間的延遲，讓伺服器有恢復時間，也避免連續請求觸發速率限制
 
 分頁停止條件（三道防線）
@@ -43,12 +43,27 @@ class ScraperConfig:
     DELAY_MIN = 2  # 爬取間隨機延遲下限（秒）
     DELAY_MAX = 4  # 爬取間隨機延遲上限（秒）
     CATEGORY_DELAY = 8  # 類別切換時的等待時間（讓伺服器有恢復時間）
-    SCROLL_DELAY = 2  # 頁面滾動後的等待時間（等 JavaScript lazy-load 完成）
-    INITIAL_PAGE_DELAY = 5  # 頁面初次載入後的等待（等 React hydration 完成）
+    SCROLL_DELAY = 2  # 頁面滾動後等待列表項目增加的上限（秒；無法計數時固定等待此秒數）
+    SCROLL_MIN_WAIT = 0.5  # 自適應滾動等待的下限（秒，見 scroll.py）
+    SCROLL_IDLE_SECONDS = 0.6  # 滾動後無進行中請求且資源數維持不變多久視為網路閒置（秒）
+    SCROLL_POLL_INTERVAL = 0.2  # 滾動後輪詢列表項目數的間隔（秒）
+    INITIAL_PAGE_DELAY = 5  # 舊版固定等待（秒）；頁面載入已改用下方條件式等待，保留供相容
+
+    # ── 條件式頁面等待（取代固定 INITIAL_PAGE_DELAY，見 page_wait.py）──
+    # 任一條件成立即開始解析；各條件逾時後退出輪詢，全部逾時仍照常解析
+    READY_POLL_INTERVAL = 0.25  # 就緒條件輪詢間隔（秒）
+    NAVIGATION_COMMIT_TIMEOUT = 15  # driver.get() 後等待新 document 取代上一頁的上限（秒）
+    DETAIL_READY_TIMEOUT = 10  # 詳情頁：品名節點 / 風味圖譜 data-flavors 的等待上限（秒）
+    LISTING_READY_TIMEOUT = 10  # 搜尋頁：結果項目節點的等待上限（秒）
+    DOM_STABLE_SECONDS = 1.5  # DOM 元素數量維持不變多久視為渲染完成（秒）
+    DOM_STABLE_TIMEOUT = 15  # DOM 穩定條件的等待上限（秒）
 
     # ── 爬取上限 ──
     MAX_SPIRITS_PER_CATEGORY = 150  # 每類別最多爬取的烈酒數量
     MAX_SCROLL_ATTEMPTS = 15  # 滾動模式下最多滾動次數（避免無限滾動）
+    # 搜尋頁卡片改在瀏覽器內以 execute_script 擷取（見 selectors.LIST_ITEMS_SCRIPT），
+    # 不傳回整份 page_source；False 或腳本失敗時以 BeautifulSoup 解析 page_source
+    LISTING_EXTRACT_IN_BROWSER = True
     MAX_RETRIES = 3  # 單一 URL 的最大重試次數（應對 session 斷開）
 
     # ── 分頁設定 ──
@@ -57,8 +72,38 @@ class ScraperConfig:
     PAGE_PARAM = "page"  # URL 分頁參數名稱（?page=N）
     # 停止分頁的判斷條件（三道防線）
     MIN_NEW_URLS_PER_PAGE = 2  # 每頁至少需取得此數量的新 URL（否則意義不大）
-    DUPLICATE_RATIO_THRESHOLD = 0.8  # 重複 URL 比例超過此值時停止（接近資料邊界）
-    MAX_CONSECUTIVE_DUP_PAGES = 3  # 連續 N 頁全為已知 URL 時停止分頁（確定到達邊界）
+    DUPLICATE_RATIO_THRESHOLD = 0.8  # 重複 URL（已知或其他查詢已列出）比例超過此值時停止（接近資料邊界）
+    MAX_CONSECUTIVE_DUP_PAGES = 3  # 連續 N 頁沒有新 URL（已知或其他查詢已列出）時停止分頁
+    REFRESH_PAGES_PER_QUERY = 3  # 分數刷新模式每個查詢走的列表頁數（依 distiller_score 排序）
+
+    # ── 過期資料刷新排程（見 staleness.py）──
+    STALE_REFRESH_LIMIT = 0  # 每次 run 重新爬取的過期烈酒上限（0 = 停用）
+    STALE_MIN_AGE_DAYS = 30  # 距上次更新超過此天數才列入候選
+    STALE_CANDIDATE_FACTOR = 4  # 候選集 = 上限 × 此倍數筆最舊的烈酒（依 updated_at 索引取出後再排序）
+    STALE_REFRESH_PER_PAGE = 5  # 每處理完一頁列表後交錯重爬的過期烈酒筆數
+    STALE_MOMENTUM_WEIGHT = 0.5  # 評論增量（review_delta）對優先序的加權
+    STALE_CATEGORY_WEIGHTS = {"whiskey": 1.5}  # 類別權重（未列出的類別為 1.0）
+
+    # ── 爬取預算（見 budget.py）：新 URL 探索與過期刷新共用 ──
+    REQUEST_BUDGET = 0  # 單次 run 的請求數上限（列表頁 + 詳情頁，0 = 不限）
+    TIME_BUDGET_SECONDS = 0  # 單次 run 的時間上限（秒，0 = 不限）
+    TIME_BUDGET_RESERVE_SECONDS = 120  # 時間預算中保留給收尾的秒數（寫入 scrape_runs、上傳 DB、通知）
+    BUDGET_COST_EWMA_ALPHA = 0.3  # 每項詳情成本 EWMA 的平滑係數（越大越偏重最近一批）
+
+    # ── Sitemap 探索（見 sitemap.py）：取代搜尋分頁列出烈酒 URL ──
+    SITEMAP_INDEX_URL = "https://distiller.com/sitemap.xml"  # sitemap 索引（或單一 urlset）
+    SITEMAP_TIMEOUT = 30  # 單一 sitemap 檔案的 HTTP 請求逾時（秒）
+    SITEMAP_BATCH_SIZE = 50  # 每批詳情 URL 數：批次之間檢查爬取預算
+
+    # ── 串流記錄（見 record_stream.py）：結果只寫入 storage，記憶體只保留計數 ──
+    STREAM_RECORDS = False  # True 時 spirits_data 不保留記錄（CSV 輸出需關閉）
+
+    # ── 原始頁面封存（見 page_archive.py）：--archive 未指定路徑時使用 ──
+    PAGE_ARCHIVE_PATH = "page_archive.db"  # 與 distiller.db 分開；Difford's 共用同一檔（以 kind 區分）
+    REPARSE_BATCH_SIZE = 200  # 離線重新擷取（reparse.py）每個寫入 transaction 的筆數
+    # 資料庫列的更新時間晚於封存的最後抓取時間超過此秒數，才視為封存後另有更新而不覆寫
+    # （同一次抓取寫入 DB 的時間本就稍晚於封存時間）
+    REPARSE_NEWER_ROW_SLACK = 300
 
     # 類別列表
     CATEGORIES = [
@@ -146,6 +191,66 @@ class ScraperConfig:
         "null is not an object",  # Safari 風格 JS null 錯誤（防禦性）
     ]
     SKIP_CATEGORY_THRESHOLD = 0.95  # 首頁重複率超過此值時直接跳過整個類別查詢（節省後續分頁載入）
+    # Chrome 主動回收水位（見 driver_watchdog.py）：於頁面之間重啟，不佔用 MAX_RESTART_ATTEMPTS
+    CHROME_MAX_PAGES = 300  # 單一 driver 最多載入頁數（0 = 不限）
+    CHROME_MAX_RSS_MB = 2048  # chromedriver + Chrome 程序樹 RSS 上限（MB，0 = 不檢查）
+    CHROME_RSS_CHECK_EVERY = 5  # 每載入 N 頁取樣一次 RSS（需掃描 /proc）
+
+    # ── API 模式並行抓取 ──
+    # 詳情 API 為純 JSON HTTP 請求，不需逐筆 random_delay；改由 worker pool + 全域速率上限控制負載
+    API_CONCURRENCY = 4  # 詳情頁並行 worker 數（1 = 循序，等同舊行為）
+    API_MAX_REQUESTS_PER_SEC = 4.0  # 所有 worker 合計的每秒請求上限（None 或 0 = 不限速）
+
+    # ── API 端點探測 ──
+    API_CACHE_TTL_HOURS = 24  # 端點快取有效時數（過期後重新完整探測）
+    API_PROBE_WORKERS = 8  # 完整探測時並行測試候選路徑的執行緒數
+    # 搜尋結果欄位擷取：搜尋 API 項目已帶齊這些欄位時直接儲存，略過該筆詳情請求
+    API_SEARCH_DETAIL_FIELDS = (
+        "name",
+        "spirit_type",
+        "expert_score",
+        "community_score",
+        "abv",
+        "flavor_data",
+    )
+    API_SEARCH_MIN_COMPLETENESS = 1.0  # 已有值欄位的比例門檻（1.0 = 全部齊備；> 1 停用）
+    # 搜尋頁預取：詳情頁爬取期間背景抓取後續 API 搜尋頁（Selenium 搜尋頁不預取）
+    LISTING_PREFETCH_DEPTH = 2  # 最多領先的頁數（0 = 停用）
+
+    # ── Selenium WebDriver 池 ──
+    # 每個 Chrome 約佔 1-2 GB 記憶體；主 driver 負責搜尋頁，池中 driver 負責詳情頁
+    DRIVER_POOL_SIZE = 0  # 詳情頁 Chrome 池大小（0 = 停用，所有頁面共用主 driver）
+    # 單一 Chrome 多分頁：只多佔 renderer 記憶體，適合無法多開 Chrome 的容器
+    TAB_COUNT = 1  # 主 driver 詳情頁並行分頁數（1 = 停用；WebDriver 池啟用時不使用）
+
+    # ── Selenium 資源封鎖（見 resource_blocking.py）──
+    # 以 CDP Network.setBlockedURLs 封鎖非必要資源；預設關閉：非允許來源一出現即被封鎖，
+    # 若前端 bundle / API 改由未列入 ALLOWED_ORIGINS 的網域提供，詳情頁會無聲地渲染失敗。
+    # 確認允許清單涵蓋所有渲染所需來源後，以 --block-resources 啟用
+    BLOCK_RESOURCES = False
+    # 未封鎖時的詳情頁平均就緒秒數（取自不加 --block-resources 執行的「頁面等待」detail 平均秒數）；
+    # 設定後「資源封鎖」統計會輸出本次就緒秒數與此基準的差異，None = 不比較
+    UNBLOCKED_READY_SECONDS = None
+    BLOCKED_URL_PATTERNS = [
+        # 圖片 / 字型 / 樣式表：解析 DOM 不需要
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.css",
+        # 已知廣告與分析服務
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*facebook.net*", "*hotjar.com*", "*segment.io*",
+    ]
+    # 渲染 React 內容所需的來源；其餘來源於第一次出現後即加入封鎖規則
+    # 若前端 bundle 改由外部 CDN 提供，需將該網域加入此清單
+    ALLOWED_ORIGINS = ["distiller.com", "*.distiller.com"]
+
+    # ── 純 HTTP 詳情頁（見 http_fetcher.py）──
+    # 靜態 HTML 缺少任一必要欄位時視為需要 JavaScript 渲染，改走 Selenium
+    HTTP_DETAIL_REQUIRED_FIELDS = ("name", "expert_score", "flavor_data")
+    HTTP_DETAIL_TIMEOUT = 15  # 單一詳情頁 HTTP 請求逾時（秒）
+
+    # ── 詳情頁解析器（見 lxml_extractor.py）──
+    # "bs4"：html.parser + DataExtractor；"lxml"：解析一次、預編譯 XPath（輸出相同、較快）
+    DETAIL_PARSER = "bs4"
 
     # User-Agent
     USER_AGENT = (
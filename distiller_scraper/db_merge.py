@@ -0,0 +1,234 @@
+"""
+SQLite 資料庫合併：把其他 distiller.db / diffords.db（平行分片、supplement_liqueurs.py 補爬結果、
+不同環境的 GCS 副本）併入目標資料庫，不需重新爬取。
+
+設計理由
+--------
+逐筆讀出再呼叫 save_spirit() / save_cocktail() 會把每一筆的時間戳改成合併當下，
+無從判斷哪一邊的資料較新，且每筆一次 transaction。
+改以 ATTACH 把來源掛進同一個連線，全部以集合式 SQL 完成：
+- 主表以 url 比對；目標沒有的列新增，兩邊都有時版本欄位較新者為準
+  （spirits.updated_at / cocktails.scraped_at；相同時保留目標，分片中未重爬的列因此不會被改寫）
+- 勝出的列整列覆寫（INSERT ... ON CONFLICT(url) DO UPDATE），目標的 id 與 created_at 不變
+- 子表（flavor_profiles / cocktail_ingredients）依 url 對應兩邊的主表 id：
+  刪除目標舊子列後整批插入來源子列（與 _save_flavors / _save_ingredients 的先刪後插一致）
+- 執行紀錄（scrape_runs / diffords_scrape_runs）沒有自然鍵：以 started_at + mode
+  判斷是否已存在，只追加目標沒有的紀錄（分片複製自主資料庫的舊紀錄不會重複）
+- 只搬兩邊都有的欄位：來源是舊版 schema（缺少新欄位）時仍可合併
+
+資料庫種類（distiller / diffords）依來源的資料表自動判斷，
+目標不存在時以對應的 Storage 建立 schema（含 _MIGRATIONS 遷移）。
+"""
+
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_ALIAS = "src"
+
+
+@dataclass(frozen=True)
+class _Entity:
+    """主表（以 url 比對、版本欄位決勝）與其依 parent id 掛載的子表。"""
+
+    table: str
+    version: str
+    child: str
+    child_fk: str
+    keep_id: bool = False  # cocktails.id 是 Difford's 原始 ID（自然鍵），需一併複製
+
+
+_SPIRITS = _Entity("spirits", "updated_at", "flavor_profiles", "spirit_id")
+_COCKTAILS = _Entity("cocktails", "scraped_at", "cocktail_ingredients", "cocktail_id", keep_id=True)
+
+# 種類 → (主表, 執行紀錄表)
+_KINDS: Dict[str, Tuple[_Entity, str]] = {
+    "distiller": (_SPIRITS, "scrape_runs"),
+    "diffords": (_COCKTAILS, "diffords_scrape_runs"),
+}
+
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    return [r[1] for r in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _common_columns(
+    conn: sqlite3.Connection, alias: str, table: str, exclude: Sequence[str] = ()
+) -> List[str]:
+    source = set(_columns(conn, alias, table))
+    return [c for c in _columns(conn, "main", table) if c in source and c not in exclude]
+
+
+def _tables(conn: sqlite3.Connection, schema: str) -> set:
+    return {
+        r[0] for r in conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table'")
+    }
+
+
+@contextmanager
+def attach(conn: sqlite3.Connection, path: str, alias: str = _ALIAS) -> Iterator[str]:
+    """ATTACH 來源資料庫，離開時 DETACH。"""
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (path,))
+    try:
+        yield alias
+    finally:
+        conn.execute(f"DETACH DATABASE {alias}")
+
+
+def _merge_entity(conn: sqlite3.Connection, alias: str, entity: _Entity) -> Dict[str, int]:
+    """把 alias 的主表與子表併入 main，回傳來源列數、新增與更新筆數。"""
+    table, child = entity.table, entity.child
+    columns = _common_columns(conn, alias, table, () if entity.keep_id else ("id",))
+    col_list = ", ".join(columns)
+    updates = ", ".join(
+        f"{c} = excluded.{c}" for c in columns if c not in ("id", "url", "created_at")
+    )
+    child_columns = _common_columns(conn, alias, child, ("id", entity.child_fk))
+    child_list = ", ".join(child_columns)
+
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS temp.merge_urls")
+        conn.execute(
+            f"""
+            CREATE TEMP TABLE merge_urls AS
+            SELECT s.url, m.id IS NULL AS is_new
+            FROM {alias}.{table} s LEFT JOIN main.{table} m ON m.url = s.url
+            WHERE m.id IS NULL OR s.{entity.version} > m.{entity.version}
+            """
+        )
+        rows, = conn.execute(f"SELECT COUNT(*) FROM {alias}.{table}").fetchone()
+        added, updated = conn.execute(
+            "SELECT COALESCE(SUM(is_new), 0), COALESCE(SUM(NOT is_new), 0) FROM temp.merge_urls"
+        ).fetchone()
+        # WHERE ... AND true：避免 INSERT ... SELECT ... ON CONFLICT 的語法歧義
+        conn.execute(
+            f"""
+            INSERT INTO main.{table} ({col_list})
+            SELECT {col_list} FROM {alias}.{table}
+            WHERE url IN (SELECT url FROM temp.merge_urls) AND true
+            ON CONFLICT(url) DO UPDATE SET {updates}
+            """
+        )
+        conn.execute(
+            f"""
+            DELETE FROM main.{child} WHERE {entity.child_fk} IN (
+                SELECT id FROM main.{table} WHERE url IN (SELECT url FROM temp.merge_urls)
+            )
+            """
+        )
+        conn.execute(
+            f"""
+            INSERT INTO main.{child} ({entity.child_fk}, {child_list})
+            SELECT m.id, {", ".join(f"c.{col}" for col in child_columns)}
+            FROM {alias}.{child} c
+            JOIN {alias}.{table} s ON s.id = c.{entity.child_fk}
+            JOIN main.{table} m ON m.url = s.url
+            WHERE s.url IN (SELECT url FROM temp.merge_urls)
+            ORDER BY c.id
+            """
+        )
+        conn.execute("DROP TABLE temp.merge_urls")
+    return {"來源列數": rows, "新增": added, "更新": updated}
+
+
+def merge_spirits(conn: sqlite3.Connection, alias: str = _ALIAS) -> Dict[str, int]:
+    """把 alias 的 spirits / flavor_profiles 併入 main（updated_at 較新者為準）。"""
+    return _merge_entity(conn, alias, _SPIRITS)
+
+
+def merge_cocktails(conn: sqlite3.Connection, alias: str = _ALIAS) -> Dict[str, int]:
+    """把 alias 的 cocktails / cocktail_ingredients 併入 main（scraped_at 較新者為準）。"""
+    return _merge_entity(conn, alias, _COCKTAILS)
+
+
+def merge_runs(conn: sqlite3.Connection, table: str, alias: str = _ALIAS) -> int:
+    """追加目標沒有的執行紀錄（以 started_at + mode 判斷），回傳追加筆數。"""
+    columns = _common_columns(conn, alias, table, ("id",))
+    col_list = ", ".join(columns)
+    with conn:
+        cur = conn.execute(
+            f"""
+            INSERT INTO main.{table} ({col_list})
+            SELECT {col_list} FROM {alias}.{table} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM main.{table} m
+                WHERE m.started_at = s.started_at AND m.mode IS s.mode
+            )
+            ORDER BY s.started_at
+            """
+        )
+    return cur.rowcount
+
+
+def detect_kind(path: str) -> Optional[str]:
+    """依資料表判斷資料庫種類（distiller / diffords），無法判斷時回傳 None。"""
+    conn = sqlite3.connect(path)
+    try:
+        tables = _tables(conn, "main")
+    finally:
+        conn.close()
+    for kind, (entity, _) in _KINDS.items():
+        if entity.table in tables:
+            return kind
+    return None
+
+
+def _init_target(path: str, kind: str) -> None:
+    """建立 / 遷移目標資料庫的 schema。"""
+    if kind == "distiller":
+        from .storage import SQLiteStorage
+
+        SQLiteStorage(path).close()
+    else:
+        from .diffords_storage import DiffordsStorage
+
+        DiffordsStorage(path).close()
+
+
+def merge_databases(
+    target: str, sources: Sequence[str], kind: Optional[str] = None
+) -> Dict:
+    """把 sources 依序併入 target，回傳合併統計（含每秒處理的來源列數）。
+
+    kind 未指定時依第一個可判斷的來源自動判斷；與 kind 不符的來源略過並記入「略過」。
+    """
+    kind = kind or next(filter(None, (detect_kind(s) for s in sources)), None)
+    if kind not in _KINDS:
+        raise ValueError(f"無法判斷資料庫種類: {list(sources)}")
+    entity, runs_table = _KINDS[kind]
+    _init_target(target, kind)
+
+    stats: Dict = {
+        "種類": kind, "來源": 0, "略過": [], "來源列數": 0, "新增": 0, "更新": 0, "執行紀錄": 0,
+    }
+    started = time.perf_counter()
+    conn = sqlite3.connect(target)
+    try:
+        for path in sources:
+            with attach(conn, path) as alias:
+                tables = _tables(conn, alias)
+                if entity.table not in tables or entity.child not in tables:
+                    logger.warning(f"略過 {path}：不是 {kind} 資料庫")
+                    stats["略過"].append(path)
+                    continue
+                merged = _merge_entity(conn, alias, entity)
+                runs = merge_runs(conn, runs_table, alias) if runs_table in tables else 0
+            for key in ("來源列數", "新增", "更新"):
+                stats[key] += merged[key]
+            stats["執行紀錄"] += runs
+            stats["來源"] += 1
+            logger.info(
+                f"已合併 {path}: {merged['來源列數']} 列，新增 {merged['新增']}、更新 {merged['更新']}、執行紀錄 {runs}"
+            )
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    stats["耗時秒數"] = round(elapsed, 3)
+    stats["每秒列數"] = round(stats["來源列數"] / elapsed) if elapsed > 0 else None
+    return stats
@@ -16,6 +16,10 @@ import os
 DEFAULT_DELAY_MIN = 2.0
 DEFAULT_DELAY_MAX = 4.0
 
+# ── 時間預算 ──
+# --time-budget 時保留給收尾的秒數（寫入 diffords_scrape_runs、上傳 DB、通知）
+TIME_BUDGET_RESERVE_SECONDS = 120
+
 # ── Sitemap 設定 ──
 SITEMAP_URL = "https://www.diffordsguide.com/sitemap/cocktail.xml"
 
@@ -28,6 +28,18 @@ Difford's Guide 在初始 HTML 中嵌入完整的 schema.org JSON-LD 結構化
 -------------------
 1. seen_urls：啟動時從 DB 載入所有已爬 URL → Set（O(1) 查詢）
 2. lastmod 比對：sitemap lastmod ≤ DB lastmod → 跳過
+
+時間預算（scrape(time_budget=...)）
+----------------------------------
+Cloud Run 任務逾時會直接終止程序，finish_scrape_run 與通知都來不及執行。
+設定時間預算時，待爬條目先依價值排序（從未收錄的新酒譜優先，其次 lastmod 較新的更新），
+每筆詳情的耗時以 CrawlBudget 的 EWMA 估計，剩餘時間不足一筆時停止。
+每筆成功即寫入 DB，下一次增量 run 以 lastmod 比對自然接續未完成的部分。
+
+原始頁面封存（archive）
+----------------------
+注入 PageArchive 時，_fetch_recipe() 取得的 HTML 在解析前封存；
+diffords_selectors.py 修正後以 reparse.py 離線重新擷取，不必再以禮貌延遲重爬（見 page_archive.py）。
 """
 
 import logging
@@ -42,9 +54,17 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from .diffords_config import DEFAULT_DELAY_MAX, DEFAULT_DELAY_MIN, SITEMAP_URL, _HEADERS
+from .budget import CrawlBudget
+from .diffords_config import (
+    DEFAULT_DELAY_MAX,
+    DEFAULT_DELAY_MIN,
+    SITEMAP_URL,
+    TIME_BUDGET_RESERVE_SECONDS,
+    _HEADERS,
+)
 from .diffords_selectors import DiffordsExtractor
 from .diffords_storage import DiffordsStorage
+from .page_archive import KIND_DIFFORDS_HTML, PageArchive
 
 logger = logging.getLogger(__name__)
 
@@ -112,13 +132,16 @@ class DiffordsGuideScraper:
         storage: Optional[DiffordsStorage] = None,
         delay_min: float = DEFAULT_DELAY_MIN,
         delay_max: float = DEFAULT_DELAY_MAX,
+        archive: Optional[PageArchive] = None,
     ):
         self.storage = storage
+        self.archive = archive
         self.delay_min = delay_min
         self.delay_max = delay_max
         self.stats = ScrapeStats()
         self.failed_urls: list[str] = []
         self.session = _build_session()
+        self.budget = CrawlBudget()  # scrape(time_budget=...) 時重設
 
         # 啟動時從 DB 預載，避免重複請求
         self.seen_urls: set[str] = storage.get_existing_urls() if storage else set()
@@ -197,16 +220,27 @@ class DiffordsGuideScraper:
             logger.warning("請求失敗 %s: %s", url, e)
             return None
 
+        if self.archive is not None:
+            try:
+                self.archive.put(url, resp.text, KIND_DIFFORDS_HTML)
+            except Exception as e:  # 封存失敗（磁碟已滿、檔案鎖定）不影響爬取
+                logger.warning("頁面封存失敗 %s: %s", url, e)
         data = DiffordsExtractor.extract_all(resp.text)
         if data is None:
             logger.warning("JSON-LD 解析失敗，可能不是雞尾酒詳情頁: %s", url)
         return data
 
+    def _order_by_value(self, entries: list[SitemapEntry]) -> list[SitemapEntry]:
+        """時間預算下的爬取順序：新酒譜優先，其次 lastmod 較新者（排序穩定，無 lastmod 排最後）。"""
+        by_lastmod = sorted(entries, key=lambda e: e.lastmod or "", reverse=True)
+        return sorted(by_lastmod, key=lambda e: e.url in self.seen_urls)
+
     def scrape(
         self,
         max_recipes: Optional[int] = None,
         incremental: bool = True,
         entries: Optional[list[SitemapEntry]] = None,
+        time_budget: Optional[float] = None,
     ) -> bool:
         """主爬取流程。
 
@@ -214,6 +248,7 @@ class DiffordsGuideScraper:
             max_recipes: 最多爬取筆數（None = 無限制）
             incremental: True = 跳過未更新的 URL（預設）；False = 全量重爬
             entries:     預先解析的 sitemap 條目，None 則自動解析 sitemap
+            time_budget: 時間預算（秒，None = 不限）；剩餘時間不足一筆時提前收尾
 
         Returns:
             True  = 執行成功（含部分失敗）
@@ -225,6 +260,14 @@ class DiffordsGuideScraper:
             logger.error("無 sitemap 條目，中止爬取")
             return False
 
+        self.budget = CrawlBudget(
+            max_seconds=time_budget, reserve_seconds=TIME_BUDGET_RESERVE_SECONDS
+        )
+        if self.budget.max_seconds is not None:
+            entries = self._order_by_value(entries)
+        planned = sum(1 for e in entries if not self._should_skip(e, incremental))
+        self.budget.plan(planned if max_recipes is None else min(planned, max_recipes))
+
         mode_label = "增量" if incremental else "全量"
         logger.info("開始 %s 爬取，共 %d 筆", mode_label, len(entries))
 
@@ -239,12 +282,20 @@ class DiffordsGuideScraper:
                     logger.info("已跳過 %d 筆（未更新）", self.stats.skipped)
                 continue
 
+            if self.budget.exhausted():
+                logger.info(
+                    "時間預算將用完（已用 %ds），提前收尾；剩餘條目留待下一次增量 run",
+                    int(self.budget.elapsed()),
+                )
+                break
+
             logger.info(
                 "[%d/%d] %s",
                 i,
                 len(entries),
                 entry.url,
             )
+            started = self.budget.elapsed()
             data = self._fetch_recipe(entry.url)
 
             if data is None:
@@ -269,6 +320,7 @@ class DiffordsGuideScraper:
 
             # 隨機延遲（尊重網站頻率限制）
             time.sleep(random.uniform(self.delay_min, self.delay_max))
+            self.budget.record(1, self.budget.elapsed() - started)  # 含延遲：即每筆實際成本
 
         logger.info(
             "爬取完成：新增 %d，跳過 %d，失敗 %d，耗時 %ds",
@@ -280,7 +332,12 @@ class DiffordsGuideScraper:
         return self.stats.scraped > 0 or self.stats.skipped > 0
 
     def get_statistics(self) -> dict:
-        return self.stats.to_dict()
+        stats = self.stats.to_dict()
+        if self.budget.max_seconds is not None:
+            stats["爬取預算"] = self.budget.summary()
+        if self.archive is not None:
+            stats["頁面封存"] = self.archive.summary()
+        return stats
 
     def close(self):
         self.session.close()
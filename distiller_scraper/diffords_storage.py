@@ -102,7 +102,9 @@ CREATE TABLE IF NOT EXISTS diffords_scrape_runs (
     total_skipped  INTEGER DEFAULT 0,
     total_failed   INTEGER DEFAULT 0,
     mode           TEXT,
-    status         TEXT DEFAULT 'running'
+    status         TEXT DEFAULT 'running',
+    planned        INTEGER,
+    completed      INTEGER
 );
 
 CREATE INDEX IF NOT EXISTS idx_cocktails_name    ON cocktails(name);
@@ -111,6 +113,11 @@ CREATE INDEX IF NOT EXISTS idx_ci_cocktail       ON cocktail_ingredients(cocktai
 CREATE INDEX IF NOT EXISTS idx_ci_item_generic   ON cocktail_ingredients(item_generic);
 """
 
+# 舊版資料庫缺少的欄位：CREATE TABLE IF NOT EXISTS 不會補上新欄位，開啟時以 ALTER TABLE 補齊
+_MIGRATIONS = {
+    "diffords_scrape_runs": [("planned", "INTEGER"), ("completed", "INTEGER")],
+}
+
 
 # 欄位轉型輔助
 def _to_real(value) -> Optional[float]:
@@ -151,6 +158,11 @@ class DiffordsStorage:
 
     def _init_schema(self):
         self.conn.executescript(_DDL)
+        for table, columns in _MIGRATIONS.items():
+            existing = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in columns:
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
         self.conn.commit()
 
     # ------------------------------------------------------------------
@@ -185,6 +197,44 @@ class DiffordsStorage:
             logger.error("DiffordsStorage.save_cocktail 失敗: %s", e)
             return False
 
+    def save_reparsed(
+        self, data_list: list[dict[str, Any]], newer_than: Optional[dict[str, str]] = None
+    ) -> int:
+        """離線重新擷取的批次寫入（見 reparse.py）：整批一個 transaction，回傳成功筆數。
+
+        已收錄的酒譜保留原本的 scraped_at 與 lastmod：重新擷取不是新的爬取，
+        增量更新的 lastmod 比對與 db_merge 的「較新者為準」維持原本的判斷。
+        newer_than：url → UTC 時間（與 CURRENT_TIMESTAMP 同格式）；已收錄的列 scraped_at 晚於此值，
+        表示封存之後另有未封存的爬取，該筆略過不覆寫。
+        """
+        newer_than = newer_than or {}
+        saved = 0
+        with self.conn:
+            cur = self.conn.cursor()
+            for data in data_list:
+                try:
+                    before = cur.execute(
+                        "SELECT scraped_at, lastmod FROM cocktails WHERE url = ?",
+                        (data.get("url", ""),),
+                    ).fetchone()
+                    cutoff = newer_than.get(data.get("url", ""))
+                    if before and cutoff and before[0] and before[0] > cutoff:
+                        logger.debug("略過重新擷取 %s：資料庫的列較封存版本新", data.get("url"))
+                        continue
+                    if before:
+                        data = {**data, "lastmod": data.get("lastmod") or before[1]}
+                    cocktail_id = self._upsert_cocktail(cur, data)
+                    self._save_ingredients(cur, cocktail_id, data)
+                    if before:
+                        cur.execute(
+                            "UPDATE cocktails SET scraped_at = ? WHERE id = ?",
+                            (before[0], cocktail_id),
+                        )
+                    saved += 1
+                except (sqlite3.Error, ValueError) as e:
+                    logger.error("DiffordsStorage.save_reparsed 失敗 (%s): %s", data.get("url"), e)
+        return saved
+
     def _upsert_cocktail(self, cur: sqlite3.Cursor, data: dict[str, Any]) -> int:
         row = self._prepare_row(data)
         existing = cur.execute(
@@ -302,20 +352,31 @@ class DiffordsStorage:
         return cur.lastrowid
 
     def finish_scrape_run(
-        self, run_id: int, scraped: int, skipped: int, failed: int, status: str
+        self,
+        run_id: int,
+        scraped: int,
+        skipped: int,
+        failed: int,
+        status: str,
+        planned: Optional[int] = None,
+        completed: Optional[int] = None,
     ):
         self.conn.execute(
             """
             UPDATE diffords_scrape_runs
-            SET finished_at=?, total_scraped=?, total_skipped=?, total_failed=?, status=?
+            SET finished_at=?, total_scraped=?, total_skipped=?, total_failed=?, status=?,
+                planned=?, completed=?
             WHERE id=?
             """,
-            (datetime.now().isoformat(), scraped, skipped, failed, status, run_id),
+            (
+                datetime.now().isoformat(), scraped, skipped, failed, status,
+                planned, completed, run_id,
+            ),
         )
         self.conn.commit()
 
     def get_last_successful_run(self) -> Optional[str]:
-        """取得最近一次成功執行的 started_at 時間戳。"""
+        """取得最近一次成功執行的 started_at 時間戳（預算用完提前結束的 partial 不算）。"""
         row = self.conn.execute("""
             SELECT started_at FROM diffords_scrape_runs
             WHERE status IN ('completed', 'completed_with_errors')
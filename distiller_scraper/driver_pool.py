@@ -0,0 +1,113 @@
+"""
+WebDriver 池：Selenium fallback 時以多個獨立 Chrome 並行爬取詳情頁。
+
+設計理由
+--------
+API 探測失敗時，所有頁面原本都經由 DistillerScraperV2 唯一的 self.driver 循序載入。
+DriverPool 維護 N 個「worker」，每個 worker 都是一個不帶 storage / api_client 的
+DistillerScraperV2 實例，直接沿用其既有的 Chrome 管理邏輯：
+
+- start_driver() / _health_check()：池啟動時逐一啟動並驗證
+- restart_driver()：scrape_spirit_detail() 偵測到 session 斷開時由 worker 自行重啟
+- restart_count / driver_failed：每個 worker 各自計數 → 崩潰恢復以單一 driver 為單位
+
+某個 worker 的 driver_failed 變為 True（重啟次數用盡）時，池只淘汰該 worker，
+其餘 driver 繼續服務；全部淘汰後 worker() 會拋出 DriverPoolExhausted，
+由呼叫端改回主 driver 循序爬取。
+
+使用方式：
+    pool = DriverPool(size=3, worker_factory=lambda: DistillerScraperV2(storage=None))
+    pool.start()
+    with pool.worker() as w:
+        data = w.scrape_spirit_detail(url)
+    pool.close()
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolExhausted(RuntimeError):
+    """池中已無存活的 WebDriver。"""
+
+
+class DriverPool:
+    """固定大小的 WebDriver worker 池（執行緒安全）。"""
+
+    # worker() 等待閒置 worker 時的輪詢間隔（秒），用於偵測池是否已全數淘汰
+    _POLL_INTERVAL = 1.0
+
+    def __init__(self, size: int, worker_factory: Callable[[], Any]):
+        self.size = size
+        self._factory = worker_factory
+        self._workers: List[Any] = []
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.retired = 0
+
+    @property
+    def alive(self) -> int:
+        """目前存活（未被淘汰）的 worker 數。"""
+        with self._lock:
+            return len(self._workers)
+
+    def start(self) -> int:
+        """啟動所有 worker 的 Chrome 並做健康檢查，回傳成功啟動的數量。"""
+        for idx in range(self.size):
+            worker = self._factory()
+            if worker.start_driver() and worker._health_check():
+                with self._lock:
+                    self._workers.append(worker)
+                self._idle.put(worker)
+                logger.info(f"✓ WebDriver 池 #{idx + 1} 已就緒")
+            else:
+                logger.warning(f"WebDriver 池 #{idx + 1} 啟動或健康檢查失敗，略過")
+                self._safe_close(worker)
+        logger.info(f"WebDriver 池啟動完成：{self.alive}/{self.size} 個可用")
+        return self.alive
+
+    @contextmanager
+    def worker(self) -> Iterator[Any]:
+        """借出一個閒置 worker；區塊結束時歸還，driver 已失效者直接淘汰。"""
+        while True:
+            if not self.alive:
+                raise DriverPoolExhausted("WebDriver 池中已無可用的 driver")
+            try:
+                worker = self._idle.get(timeout=self._POLL_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+        try:
+            yield worker
+        finally:
+            self._release(worker)
+
+    def _release(self, worker: Any) -> None:
+        if worker.driver_failed:
+            logger.warning("WebDriver 池：worker 重啟次數已用盡，淘汰此 driver")
+            with self._lock:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+                self.retired += 1
+            self._safe_close(worker)
+        else:
+            self._idle.put(worker)
+
+    @staticmethod
+    def _safe_close(worker: Any) -> None:
+        try:
+            worker.close_driver()
+        except Exception as e:
+            logger.debug(f"關閉 worker driver 失敗: {e}")
+
+    def close(self) -> None:
+        """關閉所有 worker 的 Chrome。"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            self._safe_close(worker)
@@ -0,0 +1,134 @@
+"""
+Chrome 看門狗：在記憶體或頁數超過水位時，於頁面之間主動回收 WebDriver。
+
+設計理由
+--------
+restart_driver() 原本只在 Selenium 拋出 "invalid session id" 等錯誤後才執行，
+此時當頁已遺失並記入 failed_urls。Cloud Run 上 Chrome 隨頁數增加而膨脹，
+最後被 OOM kill，是 completed_with_errors 的主要來源。
+
+DriverWatchdog 追蹤兩個水位：
+- 自 driver 啟動以來載入的頁數（CHROME_MAX_PAGES）
+- chromedriver 及其所有子程序（Chrome browser / renderer / GPU）的 RSS 總和（CHROME_MAX_RSS_MB）
+
+RSS 直接讀取 Linux 的 /proc（Cloud Run 與 Docker 皆為 Linux），不需額外套件；
+非 Linux 環境讀不到 /proc 時只以頁數判斷。
+讀取整個程序樹需要掃描 /proc，因此自上次取樣起累計 CHROME_RSS_CHECK_EVERY 頁才取樣一次
+（以差值判斷而非取餘數：多分頁路徑一次記錄整批頁數，頁數可能跳過 check_every 的倍數）。
+
+超過水位時由 DistillerScraperV2 在「下一頁載入前」重啟 driver，
+不佔用 MAX_RESTART_ATTEMPTS（那是崩潰恢復的額度）。
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_PROC = "/proc"
+
+
+def _read_ppid_map() -> Dict[int, List[int]]:
+    """掃描 /proc 建立 ppid → [pid] 對照表。"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir(_PROC):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"{_PROC}/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue  # 程序在掃描期間結束
+        # comm 欄位可能含空白與括號，從最後一個 ')' 之後解析
+        fields = stat[stat.rfind(")") + 2 :].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"{_PROC}/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024  # 單位為 kB
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def process_tree_rss(root_pid: int) -> Optional[int]:
+    """回傳 root_pid 與所有子孫程序的 RSS 總和（bytes）；無法讀取 /proc 時回傳 None。"""
+    if not os.path.isdir(f"{_PROC}/{root_pid}"):
+        return None
+    children = _read_ppid_map()
+    total, stack, seen = 0, [root_pid], set()
+    while stack:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total += _rss_bytes(pid)
+        stack.extend(children.get(pid, ()))
+    return total
+
+
+class DriverWatchdog:
+    """追蹤單一 WebDriver 的頁數與程序樹記憶體，判斷是否該回收。
+
+    max_pages / max_rss_mb 為 0 或 None 時停用對應水位。
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int],
+        max_rss_mb: Optional[int],
+        check_every: int = 5,
+    ):
+        self.max_pages = max_pages or 0
+        self.max_rss_bytes = (max_rss_mb or 0) * 1024 * 1024
+        self.check_every = max(1, check_every)
+        self.pages = 0
+        self.pages_at_last_sample = 0
+        self.recycles = 0
+        self.reasons: Dict[str, int] = {}
+        self.peak_rss_bytes = 0
+
+    def reset(self) -> None:
+        """driver（重新）啟動後歸零頁數。"""
+        self.pages = 0
+        self.pages_at_last_sample = 0
+
+    def record_page(self) -> None:
+        self.pages += 1
+
+    def check(self, pid: Optional[int]) -> Optional[str]:
+        """回傳回收原因（"pages" / "memory"），未超過水位則回傳 None。"""
+        if self.max_pages and self.pages >= self.max_pages:
+            return "pages"
+        if (
+            self.max_rss_bytes
+            and pid
+            and self.pages - self.pages_at_last_sample >= self.check_every
+        ):
+            self.pages_at_last_sample = self.pages
+            rss = process_tree_rss(pid)
+            if rss is not None:
+                self.peak_rss_bytes = max(self.peak_rss_bytes, rss)
+                if rss >= self.max_rss_bytes:
+                    logger.info(f"Chrome 程序樹 RSS {rss / 1024 / 1024:.0f} MB 超過水位")
+                    return "memory"
+        return None
+
+    def record_recycle(self, reason: str) -> None:
+        self.recycles += 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def summary(self) -> Dict:
+        """回收統計（供 get_statistics 輸出）。"""
+        return {
+            "回收次數": self.recycles,
+            "回收原因": dict(self.reasons),
+            "最高 RSS MB": round(self.peak_rss_bytes / 1024 / 1024, 1),
+        }
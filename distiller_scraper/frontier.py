@@ -0,0 +1,125 @@
+"""
+爬取前沿（crawl frontier）：跨風格查詢與類別統一去重、分類詳情頁 URL。
+
+設計理由
+--------
+_get_search_queries() 把一個類別展開成多個風格查詢（威士忌有 9 種風格），
+每個查詢各自翻頁，熱門烈酒會在多個查詢的列表中重複出現。
+原本每頁只以 seen_urls 計算重複率：風格 A 剛爬過的烈酒出現在風格 B 的列表時，
+會被當成「資料庫已有」而推高 B 的重複率，讓 B 提早觸發首頁早停或重複率停止，
+B 後段真正沒爬過的烈酒反而看不到。
+
+CrawlFrontier 是整個 run 共用的單一前沿：
+- offer()：收進某查詢某頁的 URL，當下依 seen_urls 與前沿內容分成三類
+    新增（fresh）：第一次出現，放入待爬佇列
+    重疊（overlap）：本次 run 已由「其他查詢」發現（已爬或仍在佇列）
+    已知（known）：執行前已存在於資料庫，或同一查詢自己重複列出
+  首頁早停（SKIP_CATEGORY_THRESHOLD，「資料庫已是最新」）只把「已知」當重複：
+  風格 B 的首頁全是風格 A 剛爬過的烈酒時，B 仍會往後翻頁找 A 沒列出的烈酒；
+  翻頁中的停止條件則以「新增」為準：沒有新增 URL 的頁（不論已知或重疊）累計連續重複頁，
+  重疊也計入重複率（repeat_ratio），只重複列出其他查詢結果的風格查詢不會一路翻到 MAX_PAGES_PER_QUERY
+- pop()：依（頁碼, 到達順序）取出待爬 URL 交給詳情階段（_scrape_urls）
+  scrape_category_paginated 每處理完一頁就清空前沿（_scrape_frontier），
+  檢查點、max_spirits 與爬取預算都以「頁」為單位判斷；因此實際上不跨查詢排序，
+  取出順序即列表順序（搜尋結果依 distiller_score 排序），前沿的作用是跨查詢去重與重疊分類
+- discard_pending()：類別結束（例如已達 max_spirits）時丟棄未爬的 URL，
+  不會被下一個類別以錯誤的 category 爬取；之後再被列出時會重新視為新增
+
+seen_urls 由 DistillerScraperV2 持有並在爬取成功時更新，前沿只在 offer / pop 時讀取，
+不保留參照（測試與呼叫端可以整個替換 seen_urls）。
+"""
+
+import heapq
+from typing import Dict, List, NamedTuple, Set
+
+
+class FrontierOffer(NamedTuple):
+    """單一列表頁經前沿分類後的結果。"""
+
+    fresh: List[str]
+    overlap: List[str]
+    known: List[str]
+
+    @property
+    def total(self) -> int:
+        return len(self.fresh) + len(self.overlap) + len(self.known)
+
+    @property
+    def duplicate_ratio(self) -> float:
+        """只計入「已知」URL 的重複率（查詢之間的重疊不算重複），供首頁早停判斷資料庫是否已是最新。"""
+        return len(self.known) / self.total if self.total else 0.0
+
+    @property
+    def repeat_ratio(self) -> float:
+        """沒有帶來新 URL 的比例（已知 + 重疊），供翻頁中的重複率停止判斷。"""
+        return (len(self.known) + len(self.overlap)) / self.total if self.total else 0.0
+
+
+class CrawlFrontier:
+    """跨查詢共用的詳情頁 URL 前沿：去重、新增 / 重疊 / 已知分類與查詢重疊統計。"""
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._pending: Set[str] = set()
+        self._discovered_by: Dict[str, str] = {}  # URL → 本次 run 第一個列出它的查詢
+        self._seq = 0
+        self.sources: Dict[str, Dict[str, int]] = {}
+
+    def offer(self, urls: List[str], source: str, page: int, seen: Set[str]) -> FrontierOffer:
+        """收進 source 查詢第 page 頁的 URL，回傳分類結果；新增的 URL 放入待爬佇列。"""
+        fresh: List[str] = []
+        overlap: List[str] = []
+        known: List[str] = []
+        for url in dict.fromkeys(urls):
+            first_source = self._discovered_by.get(url)
+            if url in seen or url in self._pending:
+                if first_source is not None and first_source != source:
+                    overlap.append(url)
+                else:
+                    known.append(url)
+                continue
+            # 未爬且不在佇列（含先前被 discard_pending 丟棄、或詳情爬取失敗的 URL）
+            heapq.heappush(self._heap, (page, self._seq, url))
+            self._seq += 1
+            self._pending.add(url)
+            self._discovered_by.setdefault(url, source)
+            fresh.append(url)
+
+        stats = self.sources.setdefault(source, {"列出": 0, "新增": 0, "重疊": 0, "已知": 0})
+        stats["列出"] += len(fresh) + len(overlap) + len(known)
+        stats["新增"] += len(fresh)
+        stats["重疊"] += len(overlap)
+        stats["已知"] += len(known)
+        return FrontierOffer(fresh, overlap, known)
+
+    def pop(self, seen: Set[str], limit: int = None) -> List[str]:
+        """依優先序取出待爬 URL（略過期間已被爬取者）；limit 為 None 時全部取出。"""
+        batch: List[str] = []
+        while self._heap and (limit is None or len(batch) < limit):
+            _, _, url = heapq.heappop(self._heap)
+            self._pending.discard(url)
+            if url not in seen:
+                batch.append(url)
+        return batch
+
+    def discard_pending(self) -> int:
+        """丟棄所有未爬的 URL，回傳丟棄數量。"""
+        dropped = len(self._heap)
+        self._heap.clear()
+        self._pending.clear()
+        return dropped
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def summary(self) -> Dict:
+        """查詢重疊統計（供 get_statistics 輸出）。"""
+        listed = sum(s["列出"] for s in self.sources.values())
+        overlap = sum(s["重疊"] for s in self.sources.values())
+        return {
+            "列出 URL": listed,
+            "不重複 URL": len(self._discovered_by),
+            "查詢重疊": overlap,
+            "重疊率": round(overlap / listed, 3) if listed else 0.0,
+            "各查詢": {k: dict(v) for k, v in self.sources.items()},
+        }
@@ -0,0 +1,112 @@
+"""
+純 HTTP 詳情頁抓取：以 requests 直接 GET 詳情頁 HTML，不啟動 Chrome。
+
+設計理由
+--------
+DataExtractor.extract_spirit_details() 只依賴 BeautifulSoup，本身不需要瀏覽器；
+HTML 過去只從 self.driver.page_source 取得，是因為當初假設詳情頁需要 JavaScript 渲染。
+實際上 Distiller.com 詳情頁的品名、評分與風味圖譜（data-flavors 屬性）多數由伺服器直接輸出，
+一次 HTTP 請求（約 0.3-1 秒、數 MB 記憶體）即可取得，
+相較 Chrome 載入（數秒、1-2 GB 記憶體）快一個數量級。
+
+驗證與 fallback
+---------------
+靜態 HTML 不一定完整（例如某些區塊由前端補上）。fetch() 解析後會檢查
+REQUIRED_FIELDS（預設：品名、專家評分、風味圖譜）是否齊全：
+- 齊全 → 回傳與 Selenium 路徑相同格式的 dict
+- 缺欄位、非 200、網路錯誤 → 回傳 None，由呼叫端 fallback 至 Selenium
+
+解析依 ScraperConfig.DETAIL_PARSER 使用 DataExtractor 或 LxmlExtractor（見 lxml_extractor.py）。
+hits / fallbacks 計數供 get_statistics() 輸出，用於評估多少頁面真的需要 JavaScript。
+注入 archive（PageArchive）時，200 回應的 HTML 在解析前封存（見 page_archive.py）。
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Sequence
+
+import requests
+from .config import ScraperConfig
+from .lxml_extractor import extract_detail_html
+from .page_archive import KIND_DISTILLER_HTML, PageArchive
+
+logger = logging.getLogger(__name__)
+
+
+class HTMLDetailFetcher:
+    """以 requests.Session 抓取並解析 Distiller.com 詳情頁 HTML。"""
+
+    def __init__(
+        self,
+        required_fields: Sequence[str] = None,
+        timeout: float = None,
+        archive: Optional[PageArchive] = None,
+    ):
+        self.required_fields = tuple(
+            required_fields or ScraperConfig.HTTP_DETAIL_REQUIRED_FIELDS
+        )
+        self.timeout = timeout or ScraperConfig.HTTP_DETAIL_TIMEOUT
+        self.archive = archive
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "User-Agent": ScraperConfig.USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+                "Referer": "https://distiller.com/",
+            }
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+
+    def _missing_fields(self, data: Dict) -> list:
+        return [
+            f for f in self.required_fields if not data.get(f) or data.get(f) == "N/A"
+        ]
+
+    def _count(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.hits += 1
+            else:
+                self.fallbacks += 1
+
+    def fetch(self, url: str) -> Optional[Dict]:
+        """
+        抓取並解析詳情頁。
+
+        回傳與 DataExtractor.extract_spirit_details() 相同格式的 dict（含 url），
+        或 None（請求失敗 / 必要欄位不齊，需 Selenium 渲染）。
+        """
+        try:
+            resp = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.debug(f"  [HTTP] 請求異常 {url}: {e}")
+            self._count(False)
+            return None
+
+        if resp.status_code != 200:
+            logger.debug(f"  [HTTP] HTTP {resp.status_code}: {url}")
+            self._count(False)
+            return None
+
+        if self.archive is not None:
+            try:
+                self.archive.put(url, resp.text, KIND_DISTILLER_HTML)
+            except Exception as e:  # 封存失敗（磁碟已滿、檔案鎖定）不影響爬取
+                logger.warning(f"  [HTTP] 頁面封存失敗 {url}: {e}")
+        data = extract_detail_html(resp.text)
+        missing = self._missing_fields(data)
+        if missing:
+            logger.debug(f"  [HTTP] 靜態 HTML 缺少 {missing}，需 Selenium: {url}")
+            self._count(False)
+            return None
+
+        data["url"] = url
+        self._count(True)
+        return data
+
+    def summary(self) -> Dict[str, int]:
+        """命中 / fallback 計數（供 get_statistics 輸出）。"""
+        return {"命中": self.hits, "需 Selenium": self.fallbacks}
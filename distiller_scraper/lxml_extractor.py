@@ -0,0 +1,181 @@
+"""
+lxml 詳情頁提取器：解析一次、以預先編譯的 XPath 取出所有欄位，輸出與 DataExtractor 相同的 dict。
+
+設計理由
+--------
+DataExtractor.extract_spirit_details() 對 html.parser 建出的 BeautifulSoup 呼叫約 17 次 select_one，
+每次都重新解析 CSS 選擇器並以 Python 走訪整棵樹；詳情頁是完整渲染後的 React 頁面，
+解析（html.parser 為純 Python）與走訪都佔掉明顯的 CPU 時間。
+
+LxmlExtractor：
+- 以 libxml2（lxml.etree.HTMLParser）解析一次
+- Selectors 的 CSS 選擇器在模組載入時轉成 XPath 並編譯（etree.XPath），每頁只做 C 層的查詢
+- 選擇器仍只定義在 selectors.Selectors：css_to_xpath() 只支援其中用到的子集
+  （標籤、.class、[attr='value']、後代空白），遇到其他語法直接報錯，不會悄悄選錯
+- 文字取法對齊 get_text(strip=True)：後代文字節點各自 strip 後串接（不含註解）
+
+輸出必須與 DataExtractor 一致（tests/unit/test_lxml_extractor.py 以 fixtures 的詳情頁驗證）；
+效能比較見 scripts/bench_detail_parser.py。
+解析器以 ScraperConfig.DETAIL_PARSER 切換（"bs4" / "lxml"），由 extract_detail_html() 分派。
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from .config import ScraperConfig
+from .selectors import DataExtractor, Selectors
+
+_TOKEN = re.compile(r"""([a-zA-Z][\w-]*)|\.([\w-]+)|\[([\w-]+)='([^']*)'\]""")
+
+
+def _step_xpath(step: str) -> str:
+    """單一複合選擇器（如 p.description[itemprop='description']）→ XPath 步驟。"""
+    tag, predicates, pos = "*", [], 0
+    for match in _TOKEN.finditer(step):
+        if match.start() != pos:
+            break
+        name, cls, attr, value = match.groups()
+        if name:
+            if pos:
+                break
+            tag = name
+        elif cls:
+            predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')")
+        else:
+            predicates.append(f"@{attr}='{value}'")
+        pos = match.end()
+    if pos != len(step) or not step:
+        raise ValueError(f"不支援的 CSS 選擇器: {step!r}")
+    return tag + "".join(f"[{p}]" for p in predicates)
+
+
+def css_to_xpath(selector: str) -> str:
+    """Selectors 用到的 CSS 子集（後代組合）→ 文件順序的 XPath。"""
+    return "".join(f"//{_step_xpath(step)}" for step in selector.split())
+
+
+def _compile(selector: str) -> etree.XPath:
+    return etree.XPath(css_to_xpath(selector))
+
+
+_TEXT_NODES = etree.XPath(".//text()")
+
+# 欄位 → 依序嘗試的選擇器（與 DataExtractor.extract_spirit_details 相同）
+_TEXT_FIELDS: Dict[str, List[etree.XPath]] = {
+    "name": [_compile(Selectors.NAME), _compile(Selectors.NAME_FALLBACK)],
+    "spirit_type": [_compile(Selectors.SPIRIT_TYPE)],
+    "badge": [_compile(Selectors.BADGE)],
+    "age": [_compile(Selectors.AGE)],
+    "abv": [_compile(Selectors.ABV)],
+    "cask_type": [_compile(Selectors.CASK_TYPE_VALUE)],
+    "expert_score": [_compile(Selectors.EXPERT_SCORE)],
+    "community_score": [_compile(Selectors.COMMUNITY_SCORE)],
+    "review_count": [_compile(Selectors.REVIEW_COUNT)],
+    "description": [_compile(Selectors.DESCRIPTION), _compile(Selectors.DESCRIPTION_FIRST)],
+    "tasting_notes": [_compile(Selectors.TASTING_NOTES)],
+    "expert_name": [_compile(Selectors.EXPERT_NAME)],
+    "flavor_summary": [_compile(Selectors.FLAVOR_HEADLINE)],
+}
+_LOCATION = _compile(Selectors.LOCATION)
+_COST = _compile(Selectors.COST)
+_FLAVOR_CHART = _compile(Selectors.FLAVOR_CHART)
+
+
+class LxmlExtractor:
+    """以 lxml 解析詳情頁 HTML 並提取欄位（靜態方法，與 DataExtractor 相同用法）。"""
+
+    @staticmethod
+    def parse(html: str) -> Optional[etree._Element]:
+        """解析 HTML；空白文件回傳 None。"""
+        parser = etree.HTMLParser()
+        try:
+            return etree.fromstring(html, parser)
+        except ValueError:
+            # 含 XML 編碼宣告的 str 需以 bytes 解析
+            return etree.fromstring(html.encode("utf-8"), parser)
+
+    @staticmethod
+    def _text(root, xpaths: List[etree.XPath], default: str = "N/A") -> str:
+        """第一個有非空白文字的選擇器結果（對應 extract_text / extract_text_multi）。"""
+        for xpath in xpaths:
+            found = xpath(root)
+            if found:
+                text = "".join(s.strip() for s in _TEXT_NODES(found[0]))
+                if text:
+                    return text
+        return default
+
+    @staticmethod
+    def _first(root, xpath: etree.XPath):
+        found = xpath(root)
+        return found[0] if found else None
+
+    @staticmethod
+    def _flavor_profile(root) -> Dict[str, Any]:
+        elem = LxmlExtractor._first(root, _FLAVOR_CHART)
+        raw = elem.get("data-flavors") if elem is not None else None
+        if raw is not None:
+            try:
+                return json.loads(raw)
+            except json.JSONDecodeError:
+                pass
+        return {}
+
+    @staticmethod
+    def _cost_level(root) -> str:
+        elem = LxmlExtractor._first(root, _COST)
+        if elem is not None:
+            for cls in (elem.get("class") or "").split():
+                if cls.startswith("cost-"):
+                    return cls.replace("cost-", "")
+        return "N/A"
+
+    @staticmethod
+    def _location_parts(root) -> tuple:
+        location_text = LxmlExtractor._text(root, [_LOCATION])
+        if "//" in location_text:
+            parts = location_text.split("//")
+            return parts[0].strip(), parts[1].strip()
+        return "N/A", location_text
+
+    @staticmethod
+    def extract_spirit_details(html: str) -> dict:
+        """從 HTML 字串提取烈酒完整詳細資料（欄位與順序同 DataExtractor.extract_spirit_details）。"""
+        root = LxmlExtractor.parse(html) if html.strip() else None
+        if root is None:
+            root = etree.fromstring("<html/>", etree.HTMLParser())
+        text = {field: LxmlExtractor._text(root, xpaths) for field, xpaths in _TEXT_FIELDS.items()}
+        brand, country = LxmlExtractor._location_parts(root)
+        return {
+            "name": text["name"],
+            "spirit_type": text["spirit_type"],
+            "brand": brand,
+            "country": country,
+            "badge": text["badge"],
+            "age": text["age"],
+            "abv": text["abv"],
+            "cost_level": LxmlExtractor._cost_level(root),
+            "cask_type": text["cask_type"],
+            "expert_score": text["expert_score"],
+            "community_score": text["community_score"],
+            "review_count": text["review_count"],
+            "description": text["description"],
+            "tasting_notes": text["tasting_notes"],
+            "expert_name": text["expert_name"],
+            "flavor_summary": text["flavor_summary"],
+            "flavor_data": LxmlExtractor._flavor_profile(root),
+        }
+
+
+def extract_detail_html(html: str, parser: str = None) -> dict:
+    """依 parser（預設 ScraperConfig.DETAIL_PARSER）解析詳情頁 HTML："bs4" 或 "lxml"。"""
+    parser = parser or ScraperConfig.DETAIL_PARSER
+    if parser == "lxml":
+        return LxmlExtractor.extract_spirit_details(html)
+    if parser != "bs4":
+        raise ValueError(f"未知的詳情頁解析器: {parser}")
+    return DataExtractor.extract_spirit_details(BeautifulSoup(html, "html.parser"))
@@ -158,6 +158,12 @@ class LineNotifier:
         ])
         if page_errors > 0:
             lines.append(f"  • 頁面錯誤：{page_errors} 筆")
+        budget = stats.get("爬取預算")
+        if isinstance(budget, dict) and budget.get("提前結束"):
+            lines.append(
+                f"  • ⏳ {budget['提前結束']}預算用完，提前收尾："
+                f"完成 {budget.get('完成', '?')}/{budget.get('計畫', '?')} 項（下次執行續爬）"
+            )
 
         if categories:
             cat_total = (
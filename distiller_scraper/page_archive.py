@@ -0,0 +1,198 @@
+"""
+原始頁面封存：把爬蟲下載的頁面（Selenium page_source、詳情 API JSON、Difford's 酒譜 HTML）
+壓縮後存入 SQLite，供選擇器修正後離線重新擷取，不必重爬整個網站。
+
+設計理由
+--------
+兩個爬蟲都只保留擷取後的欄位；selectors.py / diffords_selectors.py 每次修正
+（網站改版、漏抓欄位）都得以禮貌延遲重爬數千頁（Difford's 約 6 小時）。
+PageArchive 以 --archive 啟用，預設關閉，不影響既有流程。
+
+儲存格式（單一 SQLite 檔，與 distiller.db / diffords.db 分開）：
+- bodies：內容定址（content-addressed）—— 以 sha256(原始內容) 為主鍵，zlib 壓縮的 BLOB
+  → 完全相同的內容（同一頁重爬未變動、不同 URL 回傳相同錯誤頁）只存一份
+- pages：每個 URL + kind 的版本時間軸，一列 = 一段內容相同的期間（hash、首次與最後抓取時間）
+  → 內容未變的重爬只更新最新一列的 last_fetched_at；內容變動（包括變回舊內容）時新增一列
+
+查詢：get(url, at=None) 取得某時間點的版本、history(url) 列出所有版本、
+latest(kind) 依 URL 取最新版本（離線重新擷取用，見 reparse.py）。
+put() 可由多個 worker 執行緒呼叫（持鎖，每筆 commit；WAL 模式）。
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union
+
+# 頁面種類
+KIND_DISTILLER_HTML = "distiller-html"  # 詳情頁 HTML（Selenium page_source / 靜態 HTML）
+KIND_DISTILLER_API = "distiller-api"  # 詳情 API 的 JSON 回應
+KIND_DIFFORDS_HTML = "diffords-html"  # Difford's 酒譜頁 HTML
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS bodies (
+    hash        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    body        BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS pages (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    url             TEXT NOT NULL,
+    kind            TEXT NOT NULL,
+    hash            TEXT NOT NULL REFERENCES bodies(hash),
+    fetched_at      TEXT NOT NULL,
+    last_fetched_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_pages_url_fetched ON pages(url, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_pages_kind ON pages(kind, url);
+"""
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    """封存的單一版本；data 為 zlib 壓縮內容（text 解壓）。"""
+
+    url: str
+    kind: str
+    hash: str
+    fetched_at: str
+    last_fetched_at: str
+    size: int
+    data: bytes
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.data).decode("utf-8")
+
+
+_SELECT = """
+    SELECT p.url, p.kind, p.hash, p.fetched_at, p.last_fetched_at, b.size, b.body
+    FROM pages p JOIN bodies b ON b.hash = p.hash
+"""
+
+
+class PageArchive:
+    """以 SQLite 儲存壓縮的原始頁面（內容定址、依 URL + 抓取時間查詢）。"""
+
+    def __init__(self, db_path: str = "page_archive.db", level: int = 6):
+        self.db_path = db_path
+        self.level = level
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_DDL)
+        self.conn.commit()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "頁面": 0, "新內容": 0, "重複內容": 0, "原始位元組": 0, "壓縮位元組": 0,
+        }
+
+    def put(
+        self, url: str, body: Union[str, bytes], kind: str, fetched_at: datetime = None
+    ) -> str:
+        """封存一次抓取結果，回傳內容 hash；相同內容只壓縮儲存一次。"""
+        raw = body.encode("utf-8") if isinstance(body, str) else body
+        digest = content_hash(raw)
+        now = (fetched_at or datetime.now()).isoformat()
+        with self._lock:
+            exists = self.conn.execute(
+                "SELECT 1 FROM bodies WHERE hash = ?", (digest,)
+            ).fetchone()
+            if not exists:
+                compressed = zlib.compress(raw, self.level)
+                self.conn.execute(
+                    "INSERT INTO bodies (hash, size, body) VALUES (?, ?, ?)",
+                    (digest, len(raw), compressed),
+                )
+                self.stats["新內容"] += 1
+                self.stats["壓縮位元組"] += len(compressed)
+            else:
+                self.stats["重複內容"] += 1
+            current = self.conn.execute(
+                """
+                SELECT id, hash FROM pages WHERE url = ? AND kind = ?
+                ORDER BY fetched_at DESC, id DESC LIMIT 1
+                """,
+                (url, kind),
+            ).fetchone()
+            if current and current[1] == digest:
+                self.conn.execute(
+                    "UPDATE pages SET last_fetched_at = ? WHERE id = ?", (now, current[0])
+                )
+            else:
+                self.conn.execute(
+                    """
+                    INSERT INTO pages (url, kind, hash, fetched_at, last_fetched_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (url, kind, digest, now, now),
+                )
+            self.conn.commit()
+            self.stats["頁面"] += 1
+            self.stats["原始位元組"] += len(raw)
+        return digest
+
+    def get(self, url: str, at: str = None, kind: str = None) -> Optional[ArchivedPage]:
+        """URL 在 at（ISO 時間，預設現在）時的版本：首次抓取時間 ≤ at 的最後一個版本。"""
+        query = _SELECT + " WHERE p.url = ?"
+        params: list = [url]
+        if kind is not None:
+            query += " AND p.kind = ?"
+            params.append(kind)
+        if at is not None:
+            query += " AND p.fetched_at <= ?"
+            params.append(at)
+        row = self.conn.execute(
+            query + " ORDER BY p.fetched_at DESC, p.id DESC LIMIT 1", params
+        ).fetchone()
+        return ArchivedPage(*row) if row else None
+
+    def history(self, url: str) -> List[ArchivedPage]:
+        """URL 的所有版本（依首次抓取時間排序）。"""
+        rows = self.conn.execute(
+            _SELECT + " WHERE p.url = ? ORDER BY p.fetched_at, p.id", (url,)
+        ).fetchall()
+        return [ArchivedPage(*row) for row in rows]
+
+    def latest(self, kind: str, since: str = None) -> Iterator[ArchivedPage]:
+        """kind 的每個 URL 最新一版（依 URL 排序）；since 指定時只含最後抓取於該時間之後者。"""
+        query = f"""
+            {_SELECT}
+            WHERE p.id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY url ORDER BY fetched_at DESC, id DESC
+                    ) AS rn
+                    FROM pages WHERE kind = ?
+                ) WHERE rn = 1
+            )
+        """
+        params: list = [kind]
+        if since is not None:
+            query += " AND p.last_fetched_at >= ?"
+            params.append(since)
+        for row in self.conn.execute(query + " ORDER BY p.url", params):
+            yield ArchivedPage(*row)
+
+    def count(self, kind: str = None) -> int:
+        """封存的 URL 數（kind 指定時只算該種類）。"""
+        if kind is None:
+            return self.conn.execute("SELECT COUNT(DISTINCT url) FROM pages").fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(DISTINCT url) FROM pages WHERE kind = ?", (kind,)
+        ).fetchone()[0]
+
+    def summary(self) -> Dict[str, int]:
+        """本次執行的封存統計（供 get_statistics 輸出）。"""
+        return dict(self.stats)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,215 @@
+"""
+條件式頁面等待：以「頁面已就緒」的明確條件取代固定的 INITIAL_PAGE_DELAY 延遲。
+
+設計理由
+--------
+start_driver() 設定 page_load_strategy='none'，driver.get() 發出導覽後立即返回，
+原本各處都以 time.sleep(INITIAL_PAGE_DELAY)（5 秒）等待 React 渲染完成。
+3,000 筆烈酒的完整爬取光是這段固定延遲就超過 4 小時，
+而多數頁面實際上 1-2 秒內就已渲染出需要的節點。
+
+PageWaiter 改為輪詢一組 WaitCondition，任一條件成立即返回：
+- 元素存在：CSS selector 命中（例如 Selectors.NAME、帶 data-flavors 屬性的風味圖譜）
+  → 以 find_elements() 判斷，不需注入 JavaScript
+- DOM 穩定：document 已脫離 'loading' 且元素數量在 stable_for 秒內不再變化
+  → 作為 404 或版型變動時的後備條件，避免每頁都等到逾時
+
+導覽 commit 檢查：driver.get() 立即返回時，瀏覽器顯示的仍是上一頁的 document，
+上一頁同樣有品名 / 搜尋結果節點、DOM 也早已穩定，條件會立刻在舊頁面上成立。
+因此 _load_page() 先以 wait_for_navigation() 確認新 document 已 commit
+（location.href 等於要求的 URL，或導覽前取得的 <html> 節點已 stale），之後才輪詢就緒條件；
+逾時仍未 commit 時回傳 False，呼叫端不解析（否則上一頁的內容會存到新 URL 下）。
+
+每個條件各自有逾時（per-selector timeout），逾時的條件即退出輪詢；
+全部條件都逾時仍照常返回，由呼叫端解析 page_source（與固定延遲後直接解析的舊行為一致）。
+
+每次等待的實際耗時、由哪個條件滿足、是否逾時，都記錄在 WaitStats 中，
+供 get_statistics() 輸出，用於觀察各類頁面真正需要的等待時間。
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urldefrag
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+logger = logging.getLogger(__name__)
+
+# DOM 穩定判斷：document 解析完成後回傳元素總數，尚在解析中回傳 null
+_DOM_SIZE_SCRIPT = (
+    "return document.readyState === 'loading' || !document.body"
+    " ? null : document.getElementsByTagName('*').length;"
+)
+
+
+def _normalize_url(url: str) -> str:
+    return urldefrag(url)[0].rstrip("/")
+
+
+def document_root(driver: Any) -> Any:
+    """導覽前取得目前 document 的 <html> 節點（供 navigation_committed 判斷 stale）；失敗時 None。"""
+    try:
+        return driver.find_element(By.TAG_NAME, "html")
+    except Exception:
+        return None
+
+
+def navigation_committed(driver: Any, url: str, previous_root: Any = None) -> Optional[str]:
+    """
+    導覽到 url 的新 document 是否已取代上一頁，回傳成立的依據（"stale" / "url"），尚未 commit 時 None。
+
+    - previous_root（導覽前的 <html> 節點）已 stale → 新 document 已 commit（含轉址到其他 URL）
+    - location.href 與 url 相同（忽略 fragment 與結尾斜線）
+    location.href 不是字串（無法判斷）時視為已 commit，維持沒有此檢查時的行為。
+    """
+    if previous_root is not None:
+        try:
+            previous_root.tag_name
+        except StaleElementReferenceException:
+            return "stale"
+        except Exception:
+            pass  # document 切換中無法判斷，改以 location.href 判斷
+    try:
+        href = driver.execute_script("return location.href;")
+    except Exception:
+        return None
+    if not isinstance(href, str):
+        return "url"
+    return "url" if _normalize_url(href) == _normalize_url(url) else None
+
+
+@dataclass
+class WaitCondition:
+    """單一就緒條件。
+
+    selector 不為 None 時為「元素存在」條件；否則為「DOM 穩定」條件，
+    需在 stable_for 秒內元素數量不變才算成立。
+    """
+
+    name: str
+    timeout: float
+    selector: Optional[str] = None
+    stable_for: float = 0.0
+
+    @classmethod
+    def element(cls, selector: str, timeout: float) -> "WaitCondition":
+        return cls(name=selector, timeout=timeout, selector=selector)
+
+    @classmethod
+    def dom_stable(cls, stable_for: float, timeout: float) -> "WaitCondition":
+        return cls(name="dom-stable", timeout=timeout, stable_for=stable_for)
+
+
+@dataclass
+class WaitStats:
+    """單一類頁面（label）的等待統計。"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    timeouts: int = 0
+    satisfied_by: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, elapsed: float, condition: Optional[str]) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        if condition is None:
+            self.timeouts += 1
+        else:
+            self.satisfied_by[condition] = self.satisfied_by.get(condition, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        avg = self.total_seconds / self.count if self.count else 0.0
+        return {
+            "次數": self.count,
+            "平均秒數": round(avg, 2),
+            "最長秒數": round(self.max_seconds, 2),
+            "逾時次數": self.timeouts,
+            "滿足條件": dict(self.satisfied_by),
+        }
+
+
+class PageWaiter:
+    """輪詢 WaitCondition 直到任一成立或全部逾時。"""
+
+    def __init__(self, poll_interval: float = 0.25):
+        self.poll_interval = poll_interval
+        self.stats: Dict[str, WaitStats] = {}
+
+    def _element_present(self, driver: Any, selector: str) -> bool:
+        try:
+            return bool(driver.find_elements(By.CSS_SELECTOR, selector))
+        except Exception:
+            return False  # 導覽中 document 可能尚未建立
+
+    @staticmethod
+    def _dom_size(driver: Any) -> Optional[int]:
+        try:
+            size = driver.execute_script(_DOM_SIZE_SCRIPT)
+        except Exception:
+            return None
+        return size if isinstance(size, int) else None
+
+    def wait(
+        self, driver: Any, conditions: List[WaitCondition], label: str = "page"
+    ) -> Optional[str]:
+        """
+        等待頁面就緒，回傳滿足的條件名稱；全部條件逾時則回傳 None。
+
+        不論結果為何，實際耗時都記錄在 self.stats[label]。
+        """
+        start = time.monotonic()
+        active = list(conditions)
+        last_size: Optional[int] = None
+        size_since = start
+        satisfied: Optional[str] = None
+
+        while active and satisfied is None:
+            now = time.monotonic()
+            elapsed = now - start
+            for cond in list(active):
+                if elapsed >= cond.timeout:
+                    active.remove(cond)
+                    continue
+                if cond.selector is not None:
+                    if self._element_present(driver, cond.selector):
+                        satisfied = cond.name
+                        break
+                    continue
+                size = self._dom_size(driver)
+                if size is None or size != last_size:
+                    last_size, size_since = size, now
+                elif now - size_since >= cond.stable_for:
+                    satisfied = cond.name
+                    break
+            if satisfied is None and active:
+                time.sleep(self.poll_interval)
+
+        elapsed = time.monotonic() - start
+        self.stats.setdefault(label, WaitStats()).record(elapsed, satisfied)
+        if satisfied is None:
+            logger.debug(f"頁面等待逾時（{label}，{elapsed:.1f}s），照常解析")
+        return satisfied
+
+    def wait_for_navigation(
+        self, driver: Any, url: str, previous_root: Any, timeout: float
+    ) -> bool:
+        """等待導覽到 url 的 document commit（見 navigation_committed）；統計記錄於 label "navigation"。"""
+        start = time.monotonic()
+        satisfied = navigation_committed(driver, url, previous_root)
+        while satisfied is None and time.monotonic() - start < timeout:
+            time.sleep(self.poll_interval)
+            satisfied = navigation_committed(driver, url, previous_root)
+        elapsed = time.monotonic() - start
+        self.stats.setdefault("navigation", WaitStats()).record(elapsed, satisfied)
+        if satisfied is None:
+            logger.warning(f"導覽未完成（{elapsed:.1f}s 後仍為上一頁）: {url}")
+        return satisfied is not None
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """各 label 的等待統計摘要（供 get_statistics 輸出）。"""
+        return {label: stats.summary() for label, stats in self.stats.items()}
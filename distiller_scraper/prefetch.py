@@ -0,0 +1,129 @@
+"""
+搜尋頁預取：詳情頁爬取期間，背景執行緒先行抓取後續搜尋頁。
+
+設計理由
+--------
+scrape_category_paginated 原本是嚴格序列的：抓第 N 頁 URL → 爬完所有詳情 →
+sleep SCROLL_DELAY → 才抓第 N+1 頁。搜尋頁的往返時間與頁間延遲全部落在關鍵路徑上。
+
+ListingPrefetcher 把流程拆成兩段 producer / consumer：
+- listing 段（本模組的背景執行緒）依序抓取搜尋頁，放入有界佇列（depth 頁）
+  佇列滿時阻塞 → 最多領先 depth 頁，不會因停止條件觸發而白抓整個查詢
+- detail 段（scrape_category_paginated 主迴圈）依頁碼取出結果、判斷停止條件、爬取詳情
+
+限制：只用於 API 搜尋端點。Selenium 搜尋頁需要主 driver，
+而主 driver 同時負責詳情頁，兩個執行緒不能共用同一個 WebDriver。
+fetch 回傳 None（API 請求失敗）時不預取後續頁，由主迴圈以原本的重試 / Selenium fallback 同步抓取。
+
+取消：任何停止條件（重複率、連續重複頁、首頁早停、max_spirits）成立時，
+主迴圈呼叫 cancel()，背景執行緒在下一次請求前結束，已預取的頁面直接丟棄。
+頁間延遲改由背景執行緒負責（以 Event.wait 實作，取消時立即喚醒）。
+"""
+
+import logging
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_END = object()  # 背景執行緒結束標記
+
+
+class ListingPrefetcher:
+    """以背景執行緒依序預取搜尋頁（start_page ~ end_page），最多領先 depth 頁。
+
+    fetch(page) 回傳 URL 列表；[] 代表查詢已無結果，None 代表請求失敗。
+    兩者都會讓背景執行緒停止預取後續頁面。
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Optional[List[str]]],
+        start_page: int,
+        end_page: int,
+        depth: int = 2,
+        delay: float = 0.0,
+    ):
+        self._fetch = fetch
+        self.start_page = start_page
+        self.end_page = end_page
+        self.delay = delay
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, depth))
+        self._cancel = threading.Event()
+        self._exhausted = False
+        self._thread = threading.Thread(
+            target=self._run, name="listing-prefetch", daemon=True
+        )
+        self.fetched = 0  # 背景執行緒實際發出的請求數
+        self.hits = 0  # 主迴圈直接取得預取結果的頁數
+        self.misses = 0  # 未預取到、需同步抓取的頁數
+
+    def start(self) -> "ListingPrefetcher":
+        self._thread.start()
+        return self
+
+    # ------------------------------------------------------------------
+    # producer（背景執行緒）
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        for page in range(self.start_page, self.end_page + 1):
+            if page > self.start_page and self.delay and self._cancel.wait(self.delay):
+                return
+            if self._cancel.is_set():
+                return
+            try:
+                urls = self._fetch(page)
+            except Exception as e:
+                logger.debug(f"  預取第 {page} 頁失敗: {e}")
+                urls = None
+            self.fetched += 1
+            if not self._put((page, urls)):
+                return
+            if not urls:
+                break  # 無結果或請求失敗：後續頁交由主迴圈處理
+        self._put(_END)
+
+    def _put(self, item) -> bool:
+        """佇列滿時阻塞等待；取消時放棄並回傳 False。"""
+        while not self._cancel.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # ------------------------------------------------------------------
+    # consumer（主迴圈）
+    # ------------------------------------------------------------------
+
+    def take(self, page: int) -> Optional[List[str]]:
+        """取出 page 的預取結果；未預取到或請求失敗時回傳 None（呼叫端改為同步抓取）。"""
+        while not self._exhausted and not self._cancel.is_set():
+            item = self._queue.get()
+            if item is _END:
+                self._exhausted = True
+                break
+            fetched_page, urls = item
+            if fetched_page < page:
+                continue  # 主迴圈已略過的頁（不應發生，保險起見丟棄）
+            if fetched_page == page and urls is not None:
+                self.hits += 1
+                return urls
+            break
+        self.misses += 1
+        return None
+
+    def cancel(self) -> None:
+        """停止預取並丟棄佇列中尚未取用的頁面。"""
+        self._cancel.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def summary(self) -> Dict[str, int]:
+        return {"預取頁數": self.fetched, "命中": self.hits, "未命中": self.misses}
@@ -0,0 +1,89 @@
+"""
+串流記錄容器：爬取結果直接寫入 storage，記憶體中只保留計數與欄位有效率統計。
+
+設計理由
+--------
+DistillerScraperV2 原本把每筆結果 append 到 spirits_data，
+scrape_category_paginated 另有一份類別層級的 results；get_statistics() 再把全部複製進 pandas。
+SQLite 輸出時每筆在 _persist() 已經寫入資料庫，記憶體中的副本只用於最後的統計，
+長時間 run 的 RSS 因此隨筆數線性成長。
+
+StreamingRecords 取代這些 list（只用到 append / extend / len 的地方不需改動）：
+- append()：更新 RecordTally 後丟棄記錄，不保留參照
+- len()：已接收的筆數（爬蟲的 max_spirits 判斷照常運作）
+- 迭代結果為空：記錄已轉交，spirits_data.extend(category_results) 不會重複計數
+- child()：類別層級的容器，只計數並把記錄轉交給上層（spirits_data）
+
+RecordTally 以 O(欄位數) 的計數重現 get_statistics() 原本以 DataFrame 計算的
+「類別分布」與「欄位有效率」（None / "" / "N/A" 視為無效，url / flavor_data 不列入）。
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_SKIPPED_FIELDS = ("url", "flavor_data")
+
+
+def _is_valid(value: Any) -> bool:
+    return value is not None and not (isinstance(value, str) and value in ("", "N/A"))
+
+
+class RecordTally:
+    """筆數、各類別筆數與各欄位有效筆數（欄位依首次出現順序）。"""
+
+    def __init__(self):
+        self.count = 0
+        self._valid: Dict[str, int] = {}
+        self._categories: Counter = Counter()
+
+    def add(self, record: Dict) -> None:
+        self.count += 1
+        for key, value in record.items():
+            if key in _SKIPPED_FIELDS:
+                continue
+            self._valid[key] = self._valid.get(key, 0) + (1 if _is_valid(value) else 0)
+        category = record.get("category")
+        if category is not None:
+            self._categories[category] += 1
+
+    def categories(self) -> Dict[str, int]:
+        return dict(self._categories.most_common())
+
+    def field_coverage(self) -> Dict[str, str]:
+        """與 get_statistics() 的「欄位有效率」相同格式：'有效/總數 (百分比%)'。"""
+        if not self.count:
+            return {}
+        return {
+            key: f"{valid}/{self.count} ({valid / self.count * 100:.1f}%)"
+            for key, valid in self._valid.items()
+        }
+
+
+class StreamingRecords:
+    """list 介面的記錄容器：只計數、不保留記錄。"""
+
+    def __init__(self, parent: Optional["StreamingRecords"] = None):
+        self._parent = parent
+        self._count = 0
+        self.tally = RecordTally() if parent is None else parent.tally
+
+    def child(self) -> "StreamingRecords":
+        """類別層級的容器：記錄轉交給本容器，自身只計數。"""
+        return StreamingRecords(parent=self)
+
+    def append(self, record: Dict) -> None:
+        self._count += 1
+        if self._parent is not None:
+            self._parent.append(record)
+        else:
+            self.tally.add(record)
+
+    def extend(self, records: Iterable[Dict]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(())
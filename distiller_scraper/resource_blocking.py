@@ -0,0 +1,194 @@
+"""
+Selenium 資源封鎖：不下載圖片、字型、樣式表與第三方追蹤腳本。
+
+設計理由
+--------
+爬蟲只需要 React 渲染後的 DOM（品名、評分、data-flavors），
+但每個詳情頁都會連帶下載商品圖、網頁字型、CSS、廣告與分析腳本。
+這些請求佔去大部分頻寬與 renderer 記憶體，也拖慢頁面就緒時間。
+
+封鎖分兩層，都透過 CDP Network.setBlockedURLs 套用於 start_driver()：
+1. 靜態規則（BLOCKED_URL_PATTERNS）：依副檔名封鎖圖片 / 字型 / CSS，以及已知追蹤服務網域
+   另以 Chrome prefs 關閉圖片載入（CDP 規則失效時的第二道保險）
+2. 來源允許清單（ALLOWED_ORIGINS）：Network.setBlockedURLs 不支援「除了…以外全部封鎖」，
+   因此 observe() 從 performance log 讀出實際發出的請求，
+   凡是來源不在允許清單的網域，就加入封鎖規則並重新套用 → 從下一頁起生效
+
+統計
+----
+observe() 同時累計：頁數、實際傳輸位元組（Network.loadingFinished.encodedDataLength）、
+被封鎖的請求數（Network.loadingFailed.blockedReason，依資源類型分組）與新封鎖的網域。
+被封鎖的請求沒有回應，無從得知實際大小，因此「估計節省位元組」以封鎖數乘上該類型的平均大小：
+本次執行中同類型已載入請求的平均值優先，沒有樣本時（例如圖片全部被封鎖）才用 TYPICAL_BYTES。
+載入時間比較取 PageWaiter 的詳情頁平均就緒秒數；同一次執行只會是封鎖或不封鎖其中一種，
+所以基準值（未封鎖時的平均就緒秒數）由 ScraperConfig.UNBLOCKED_READY_SECONDS 提供，未設定時差異為 None。
+
+預設關閉（ScraperConfig.BLOCK_RESOURCES = False）：第 2 層會封鎖任何不在允許清單的來源，
+前端改用外部 CDN 時頁面會渲染失敗而不報錯，因此由使用者確認 ALLOWED_ORIGINS 後再啟用。
+讀取 performance log 也會清空 chromedriver 端的緩衝，避免長時間執行時 log 持續累積。
+"""
+
+import fnmatch
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class ResourcePolicy:
+    """CDP 資源封鎖規則與流量統計。"""
+
+    # 以 Chrome prefs 關閉的內容類型（2 = 封鎖）
+    CHROME_PREFS = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    }
+
+    # 各 CDP 資源類型的典型傳輸大小（位元組）：估計節省量時，本次執行沒有同類型樣本才使用
+    TYPICAL_BYTES = {
+        "Image": 60_000,
+        "Font": 40_000,
+        "Stylesheet": 30_000,
+        "Script": 50_000,
+        "Media": 200_000,
+    }
+    DEFAULT_TYPICAL_BYTES = 10_000  # 未列出的類型（XHR / Ping / Other 等）
+
+    def __init__(
+        self,
+        blocked_patterns: Iterable[str],
+        allowed_origins: Iterable[str],
+        enabled: bool = True,
+        baseline_ready_seconds: Optional[float] = None,
+    ):
+        self.enabled = enabled
+        self.baseline_ready_seconds = baseline_ready_seconds
+        self.blocked_patterns: List[str] = list(blocked_patterns)
+        self.allowed_origins: List[str] = list(allowed_origins)
+        self.blocked_hosts: Set[str] = set()
+        self.pages = 0
+        self.transferred_bytes = 0
+        self.blocked_requests = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self.bytes_by_type: Dict[str, int] = {}
+        self.loaded_by_type: Dict[str, int] = {}
+        self._request_types: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # 規則
+    # ------------------------------------------------------------------
+
+    def is_allowed_host(self, host: str) -> bool:
+        """host 是否符合允許清單（支援 *.example.com 萬用字元）。"""
+        return any(fnmatch.fnmatch(host, pattern) for pattern in self.allowed_origins)
+
+    def url_patterns(self) -> List[str]:
+        """目前要交給 Network.setBlockedURLs 的完整規則（靜態 + 已學習網域）。"""
+        return self.blocked_patterns + [f"*://{h}/*" for h in sorted(self.blocked_hosts)]
+
+    def apply(self, driver: Any) -> bool:
+        """將封鎖規則套用到 driver（start_driver / restart_driver 後呼叫）。"""
+        if not self.enabled:
+            return False
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.url_patterns()})
+            return True
+        except Exception as e:
+            logger.warning(f"套用資源封鎖規則失敗（照常載入所有資源）: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # 觀察與統計
+    # ------------------------------------------------------------------
+
+    def observe(self, driver: Any) -> None:
+        """讀取並清空 performance log，更新統計；發現新的非允許來源時重新套用規則。"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"讀取 performance log 失敗: {e}")
+            return
+
+        new_hosts = self._consume(entries)
+        self.pages += 1
+        if new_hosts and self.enabled:
+            self.blocked_hosts |= new_hosts
+            logger.info(f"封鎖非允許來源: {', '.join(sorted(new_hosts))}")
+            self.apply(driver)
+
+    def _consume(self, entries: Iterable[Dict]) -> Set[str]:
+        new_hosts: Set[str] = set()
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = msg.get("method")
+            params = msg.get("params", {})
+            if method == "Network.loadingFinished":
+                size = int(params.get("encodedDataLength", 0) or 0)
+                self.transferred_bytes += size
+                rtype = self._request_types.pop(params.get("requestId"), None)
+                if rtype is not None:
+                    self.bytes_by_type[rtype] = self.bytes_by_type.get(rtype, 0) + size
+                    self.loaded_by_type[rtype] = self.loaded_by_type.get(rtype, 0) + 1
+            elif method == "Network.loadingFailed":
+                self._request_types.pop(params.get("requestId"), None)
+                if not params.get("blockedReason"):
+                    continue
+                self.blocked_requests += 1
+                rtype = params.get("type", "Other")
+                self.blocked_by_type[rtype] = self.blocked_by_type.get(rtype, 0) + 1
+            elif method == "Network.requestWillBeSent":
+                if params.get("requestId") and params.get("type"):
+                    self._request_types[params["requestId"]] = params["type"]
+                host = self._host(params.get("request", {}).get("url", ""))
+                if host and not self.is_allowed_host(host) and host not in self.blocked_hosts:
+                    new_hosts.add(host)
+        return new_hosts
+
+    @staticmethod
+    def _host(url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            return None  # data: / blob: / chrome-extension: 等不需處理
+        return parsed.hostname
+
+    def estimated_saved_bytes(self) -> int:
+        """被封鎖請求的估計大小：同類型已載入請求的平均值，沒有樣本時用 TYPICAL_BYTES。"""
+        total = 0.0
+        for rtype, count in self.blocked_by_type.items():
+            if self.loaded_by_type.get(rtype):
+                size = self.bytes_by_type[rtype] / self.loaded_by_type[rtype]
+            else:
+                size = self.TYPICAL_BYTES.get(rtype, self.DEFAULT_TYPICAL_BYTES)
+            total += count * size
+        return int(total)
+
+    def summary(self, ready_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        封鎖與流量統計（供 get_statistics 輸出）。
+
+        ready_seconds 為 PageWaiter 的詳情頁平均就緒秒數；有基準值時一併輸出兩者差異。
+        """
+        per_page = self.transferred_bytes / self.pages if self.pages else 0
+        saved = self.estimated_saved_bytes()
+        delta = None
+        if ready_seconds is not None and self.baseline_ready_seconds is not None:
+            delta = round(ready_seconds - self.baseline_ready_seconds, 2)
+        return {
+            "啟用": self.enabled,
+            "觀察頁數": self.pages,
+            "傳輸位元組": self.transferred_bytes,
+            "每頁平均位元組": int(per_page),
+            "封鎖請求數": self.blocked_requests,
+            "封鎖類型": dict(self.blocked_by_type),
+            "估計節省位元組": saved,
+            "每頁估計節省位元組": int(saved / self.pages) if self.pages else 0,
+            "詳情頁平均就緒秒數": ready_seconds,
+            "就緒秒數差異": delta,
+            "封鎖網域": sorted(self.blocked_hosts),
+        }
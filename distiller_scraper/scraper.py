@@ -25,27 +25,63 @@ Distiller.com 爬蟲 V2：烈酒評分資料爬取器。
 1. 分頁模式（預設）：對每個類別的 search URL 翻頁爬取
    優點：可取得遠超頁面顯示上限的資料，且效率高
    停止條件：連續 N 頁重複 / 重複率過高 / 達到頁數上限
+   API 搜尋端點可用時，ListingPrefetcher 在詳情頁爬取期間先行抓取後續搜尋頁
+   （最多領先 LISTING_PREFETCH_DEPTH 頁），停止條件成立即取消尚未取用的預取
 
 2. 滾動模式（fallback）：讓 Selenium 滾動頁面觸發 lazy-loading
    適用於：分頁機制無效時（第 2 頁與第 1 頁內容相同）
+   每次滾動後等待列表項目數增加（或網路閒置），不再固定等待 SCROLL_DELAY；
+   新項目足夠時提前停止（見 scroll.py）
 
 去重機制
 --------
 seen_urls：在記憶體中維護已爬取的 URL 集合，初始化時從 SQLite 載入
 優點：爬取過程中的即時去重，避免重複請求相同頁面
 設計選擇：Set[str] 而非 DB 查詢，因記憶體查詢 O(1) 遠快於磁碟 IO
+frontier（CrawlFrontier）：分頁模式的列表 URL 先進入跨查詢共用的前沿，
+跨查詢去重後逐頁交給詳情階段，並區分「資料庫已有」與「其他風格查詢剛爬過」（見 frontier.py）
+
+過期資料刷新
+------------
+scrape(refresh_stale=N) 以 updated_at 索引挑出最多 N 筆久未更新的烈酒（見 staleness.py），
+在分頁探索的頁與頁之間交錯重爬；探索與刷新共用 CrawlBudget 的請求數 / 時間上限（見 budget.py）
+
+Sitemap 探索
+------------
+scrape_sitemap() 以 sitemap 取代搜尋分頁列出烈酒 URL（見 sitemap.py），
+與 DiffordsGuideScraper 相同以 lastmod 略過未變動的已收錄烈酒，其餘交給同一條詳情管線
+
+工作分片
+--------
+shard（ShardSpec）設定時，搜尋查詢、sitemap URL 與過期刷新候選只保留本分片負責的部分，
+多個平行任務各自寫入分片資料庫，最後再合併（見 sharding.py）
+
+串流記錄
+--------
+streaming=True 時 spirits_data 與類別層級的結果容器改為 StreamingRecords：
+每筆在 _persist() 寫入 storage 後只更新計數與欄位有效率，不保留記錄，
+長時間 run 的記憶體不隨筆數成長（見 record_stream.py）
 
 Session 恢復機制
 ----------------
 Selenium WebDriver 偶爾因 Chrome 崩潰或記憶體不足出現 session 斷開，
 scrape_spirit_detail() 偵測到 "invalid session id" / "session deleted" 錯誤時
 自動呼叫 restart_driver() 重新啟動瀏覽器並重試（最多 MAX_RETRIES 次）
+
+Chrome 延遲啟動
+---------------
+有 api_client 時，scrape() 以 HTTP 請求做健康檢查，不先啟動 Chrome；
+Chrome 由 _ensure_driver() 在第一次真正需要 Selenium（XHR 探測、列表或詳情 fallback）時
+才啟動並做頁面健康檢查。整次執行都由 API 完成時，完全不需 Chrome 的冷啟動與記憶體。
 """
 
 import json
 import logging
 import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
 
@@ -57,9 +93,26 @@ from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 
 from .api_client import DistillerAPIClient
+from .budget import CrawlBudget
+from .concurrency import RateLimiter
 from .config import ScraperConfig
-from .selectors import DataExtractor, Selectors
+from .driver_pool import DriverPool, DriverPoolExhausted
+from .driver_watchdog import DriverWatchdog
+from .frontier import CrawlFrontier
+from .http_fetcher import HTMLDetailFetcher
+from .page_archive import KIND_DISTILLER_HTML, PageArchive
+from .page_wait import PageWaiter, WaitCondition, document_root
+from .prefetch import ListingPrefetcher
+from .lxml_extractor import extract_detail_html
+from .record_stream import StreamingRecords
+from .resource_blocking import ResourcePolicy
+from .selectors import LIST_ITEMS_SCRIPT, DataExtractor, Selectors
+from .scroll import ScrollWaiter
+from .sharding import ShardSpec
+from .sitemap import SitemapDiscovery, SitemapEntry
+from .staleness import StaleRefreshScheduler
 from .storage import StorageBackend
+from .tab_loader import MultiTabLoader
 
 # 設定日誌
 logging.basicConfig(
@@ -72,6 +125,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# _scrape_detail_on_pool 的回傳值：WebDriver 池已全數淘汰，URL 尚未嘗試
+_POOL_EXHAUSTED = object()
+
 
 class DistillerScraperV2:
     """改進版 Distiller.com 爬蟲。
@@ -81,12 +137,27 @@ class DistillerScraperV2:
     - delay_min/delay_max：隨機延遲範圍，過短容易被封鎖，過長則效率低落
     - storage：注入儲存後端（SQLite 或 CSV），None 表示僅在記憶體暫存
     - api_client：注入 HTTP API 客戶端，None 則完全使用 Selenium 模式
+    - api_concurrency / api_max_rps：API 模式詳情頁的並行 worker 數與全域每秒請求上限
+    - driver_pool_size：Selenium 詳情頁的 Chrome 池大小（0 = 停用，僅用主 driver）
+    - tab_count：主 driver 內並行載入詳情頁的分頁數（1 = 停用）；記憶體受限時取代 driver_pool
+    - html_fetcher：注入純 HTTP 詳情頁抓取器，None 則詳情頁一律經由 Chrome 渲染
+    - block_resources：Chrome 是否封鎖圖片 / 字型 / CSS / 非允許來源（None 沿用 ScraperConfig）
+    - prefetch_depth：API 搜尋頁預取領先的頁數（0 = 停用，逐頁同步抓取）
+    - shard：平行任務的分片設定，只處理本分片負責的查詢 / URL（None = 不分片，見 sharding.py）
+    - streaming：串流模式，結果只寫入 storage、記憶體只保留計數與欄位統計（見 record_stream.py）
+    - archive：原始頁面封存，詳情頁 HTML 解析前先壓縮存入（None = 不封存，見 page_archive.py）
 
     依賴注入（Dependency Injection）的設計理由：
     - storage 和 api_client 以外部注入而非在內部建立，方便測試時 mock
     - 允許不同場景使用不同儲存後端（測試用 CSV，生產用 SQLite）
     """
 
+    # 詳情頁就緒判斷（多分頁模式）：品名節點已由 React 渲染出來
+    _DETAIL_READY_SCRIPT = (
+        f'return !!(document.querySelector("{Selectors.NAME}")'
+        f' || document.querySelector("{Selectors.NAME_FALLBACK}"));'
+    )
+
     def __init__(
         self,
         headless: bool = True,
@@ -94,21 +165,99 @@ class DistillerScraperV2:
         delay_max: float = 4,
         storage: Optional[StorageBackend] = None,
         api_client: Optional[DistillerAPIClient] = None,
+        api_concurrency: int = None,
+        api_max_rps: float = None,
+        driver_pool_size: int = None,
+        tab_count: int = None,
+        html_fetcher: Optional[HTMLDetailFetcher] = None,
+        block_resources: bool = None,
+        prefetch_depth: int = None,
+        shard: Optional[ShardSpec] = None,
+        streaming: bool = None,
+        archive: Optional[PageArchive] = None,
     ):
         self.headless = headless
         self.delay_min = delay_min
         self.delay_max = delay_max
         self.storage = storage
         self.api_client = api_client
+        self.html_fetcher = html_fetcher
+        self.archive = archive
+        self.shard = shard or ShardSpec()
+        self.api_concurrency = api_concurrency or ScraperConfig.API_CONCURRENCY
+        self._rate_limiter = RateLimiter(
+            api_max_rps if api_max_rps is not None else ScraperConfig.API_MAX_REQUESTS_PER_SEC
+        )
+        # storage 寫入鎖：並行 worker 取得的結果一律經由 _persist() 序列化寫入
+        self._storage_lock = threading.Lock()
+        # 並行 HTTP 階段已失敗的 URL：交給 Selenium 詳情階段時不再重試 API / 靜態 HTML
+        self._http_failed: Set[str] = set()
+        # Selenium 詳情頁 Chrome 池：首次需要 Selenium 詳情時才啟動（見 _ensure_driver_pool）
+        self.driver_pool_size = (
+            driver_pool_size
+            if driver_pool_size is not None
+            else ScraperConfig.DRIVER_POOL_SIZE
+        )
+        self.driver_pool: Optional[DriverPool] = None
+        self.tab_count = tab_count or ScraperConfig.TAB_COUNT
+        # API 搜尋頁預取：詳情頁爬取期間背景抓取後續搜尋頁（見 prefetch.py）
+        self.prefetch_depth = (
+            prefetch_depth
+            if prefetch_depth is not None
+            else ScraperConfig.LISTING_PREFETCH_DEPTH
+        )
+        self.prefetch_stats: Dict[str, int] = {}
+        self.refresh_stats: Dict[str, int] = {}  # refresh_scores() 的列表頁 / 分數變動統計
+        # 搜尋頁卡片的擷取方式：瀏覽器內 execute_script / 退回 page_source + BeautifulSoup
+        self.listing_extract_stats: Dict[str, int] = {"瀏覽器": 0, "page_source": 0}
+        self.search_record_saves = 0  # 直接以搜尋 API 欄位儲存、略過詳情請求的筆數
+        # 無限滾動：等待列表項目增加而非固定 SCROLL_DELAY，並記錄滾動效率（見 scroll.py）
+        self.scroll_waiter = ScrollWaiter(
+            Selectors.SPIRIT_LIST_ITEM,
+            max_wait=ScraperConfig.SCROLL_DELAY,
+            min_wait=ScraperConfig.SCROLL_MIN_WAIT,
+            idle_seconds=ScraperConfig.SCROLL_IDLE_SECONDS,
+            poll_interval=ScraperConfig.SCROLL_POLL_INTERVAL,
+        )
+        # 條件式頁面等待：取代固定 INITIAL_PAGE_DELAY，並記錄各類頁面實際等待時間
+        self.page_waiter = PageWaiter(ScraperConfig.READY_POLL_INTERVAL)
+        # 資源封鎖規則與流量統計：停用時仍記錄每頁位元組，供啟用前後比較
+        self.resource_policy = ResourcePolicy(
+            ScraperConfig.BLOCKED_URL_PATTERNS,
+            ScraperConfig.ALLOWED_ORIGINS,
+            enabled=(
+                block_resources
+                if block_resources is not None
+                else ScraperConfig.BLOCK_RESOURCES
+            ),
+            baseline_ready_seconds=ScraperConfig.UNBLOCKED_READY_SECONDS,
+        )
         self.driver: Optional[Any] = None  # webdriver.Chrome，延遲導入以加速初始化
-        self.spirits_data: List[Dict] = []  # 本次執行爬取的所有結果（記憶體暫存）
+        # 本次執行爬取的所有結果（記憶體暫存）；串流模式下只計數，記錄已由 _persist() 寫入 storage
+        if streaming is None:
+            streaming = ScraperConfig.STREAM_RECORDS
+        self.spirits_data: List[Dict] = StreamingRecords() if streaming else []
         self.failed_urls: List[str] = []  # 爬取失敗的 URL 列表（用於事後重試或除錯）
         self.page_errors: int = 0  # 頁面載入失敗計數（timeout 等非 URL 問題）
         self.restart_count: int = 0
         self.driver_failed: bool = False
+        # Chrome 看門狗：頁數 / 記憶體超過水位時於頁面之間主動回收
+        self.watchdog = DriverWatchdog(
+            max_pages=ScraperConfig.CHROME_MAX_PAGES,
+            max_rss_mb=ScraperConfig.CHROME_MAX_RSS_MB,
+            check_every=ScraperConfig.CHROME_RSS_CHECK_EVERY,
+        )
         # 去重集合：有 storage 時從 DB 載入已知 URLs，避免重複爬取
         # 設計理由：記憶體 Set 查詢 O(1)，遠比每次爬取前都 DB 查詢更有效率
         self.seen_urls: Set[str] = storage.get_existing_urls() if storage else set()
+        # 跨風格查詢 / 類別共用的 URL 前沿：分頁模式的列表 URL 經此去重後才進入詳情階段
+        self.frontier = CrawlFrontier()
+        # 單次 run 的請求數 / 時間預算：探索與過期刷新共用（scrape() 依參數重設，預設不限）
+        self.budget = CrawlBudget()
+        # 過期資料刷新排程：scrape(refresh_stale=N) 時才建立
+        self.stale_scheduler: Optional[StaleRefreshScheduler] = None
+        self.stale_refreshed = 0  # 過期刷新實際重爬成功的筆數
+        self.sitemap_stats: Dict[str, int] = {}  # scrape_sitemap() 的 URL / 略過 / 爬取統計
 
     def start_driver(self) -> bool:
         """啟動 Chrome WebDriver。
@@ -119,6 +268,7 @@ class DistillerScraperV2:
         - --disable-dev-shm-usage：避免在 /dev/shm 空間不足時崩潰（Docker 預設 64MB）
         - --disable-gpu：無頭環境通常無 GPU，關閉可避免相關錯誤
         - Performance Logging：捕獲所有網路請求，供 discover_api() 分析 XHR 端點
+        - 資源封鎖：圖片 prefs + CDP Network.setBlockedURLs（見 resource_blocking.py）
 
         Selenium Manager（Selenium 4.6+）：
         自動下載與 Chrome 版本相容的 chromedriver，無需手動管理 chromedriver 版本
@@ -145,17 +295,21 @@ class DistillerScraperV2:
             options.add_argument("--disable-blink-features=AutomationControlled")
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option("useAutomationExtension", False)
+            if self.resource_policy.enabled:
+                options.add_experimental_option("prefs", ResourcePolicy.CHROME_PREFS)
 
             # 啟用 Performance Logging：捕獲所有 Network 事件，用於 XHR API 探測
             options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
             # page_load_strategy='none'：不等待 document.readyState='complete'
             # 原因：Distiller.com 的 JS 會持續發送背景請求，導致頁面永遠不觸發 load 事件
-            # 改以固定延遲 (INITIAL_PAGE_DELAY) 等待 React 渲染完成
+            # 改以 PageWaiter 輪詢就緒條件（品名節點、DOM 穩定等）等待 React 渲染完成
             options.page_load_strategy = "none"
 
             # Selenium Manager 自動解析相容的 Chrome + chromedriver（Selenium 4.6+）
             self.driver = webdriver.Chrome(options=options)
             self.driver.set_page_load_timeout(ScraperConfig.PAGE_LOAD_TIMEOUT)
+            self.resource_policy.apply(self.driver)
+            self.watchdog.reset()
 
             logger.info("✓ Chrome WebDriver 已啟動")
             return True
@@ -170,6 +324,117 @@ class DistillerScraperV2:
             self.driver.quit()
             logger.info("瀏覽器已關閉")
 
+    def _ensure_driver(self) -> bool:
+        """
+        延遲啟動 Chrome：第一次需要 Selenium 時才啟動並做頁面健康檢查。
+
+        啟動或健康檢查失敗時標記 driver_failed，之後的呼叫直接回傳 False，
+        避免每筆 fallback 都重試冷啟動。
+        """
+        if self.driver is not None:
+            return True
+        if self.driver_failed:
+            return False
+        if self.start_driver() and self._health_check():
+            return True
+        logger.error("Chrome WebDriver 啟動或健康檢查失敗，停用 Selenium")
+        self.close_driver()
+        self.driver = None
+        self.driver_failed = True
+        return False
+
+    def _driver_pid(self) -> Optional[int]:
+        """chromedriver 程序 PID（Chrome 各程序皆為其子孫）；取不到時回傳 None。"""
+        try:
+            pid = self.driver.service.process.pid
+        except Exception:
+            return None
+        return pid if isinstance(pid, int) else None
+
+    def _recycle_driver_if_needed(self) -> None:
+        """
+        頁面之間檢查看門狗水位，超過時主動重啟 driver。
+
+        與崩潰後的 restart_driver() 不同：此時沒有頁面遺失，
+        因此不計入 restart_count（MAX_RESTART_ATTEMPTS 保留給真正的崩潰恢復）。
+        """
+        if self.driver is None:
+            return
+        reason = self.watchdog.check(self._driver_pid())
+        if reason is None:
+            return
+        logger.info(
+            f"Chrome 已載入 {self.watchdog.pages} 頁，達到回收水位（{reason}），重啟 driver..."
+        )
+        self.watchdog.record_recycle(reason)
+        if not self.restart_driver():
+            # 交由 _ensure_driver() 於下一頁再嘗試一次冷啟動
+            logger.error("主動回收後重啟 driver 失敗")
+            self.driver = None
+
+    def _load_page(self, url: str) -> bool:
+        """
+        Selenium 載入頁面的共用入口：先檢查回收水位，再導覽並計入頁數。
+
+        回傳新 document 是否已 commit（見 page_wait.navigation_committed）；
+        False 時瀏覽器仍顯示上一頁，呼叫端不可解析。
+        """
+        self._recycle_driver_if_needed()
+        if not self._ensure_driver():
+            raise RuntimeError("Chrome WebDriver 無法使用")
+        previous_root = document_root(self.driver)
+        self.driver.get(url)
+        self.watchdog.record_page()
+        return self.page_waiter.wait_for_navigation(
+            self.driver, url, previous_root, ScraperConfig.NAVIGATION_COMMIT_TIMEOUT
+        )
+
+    def _http_health_check(self) -> bool:
+        """API 模式的健康檢查：以一次 HTTP 請求確認網站可連線，不啟動 Chrome。"""
+        url = (
+            ScraperConfig.BASE_URL
+            if hasattr(ScraperConfig, "BASE_URL")
+            else "https://distiller.com"
+        )
+        try:
+            resp = self.api_client.session.get(
+                url, timeout=ScraperConfig.HEALTH_CHECK_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(f"HTTP 健康檢查失敗: {e}")
+            return False
+        if resp.status_code >= 500:
+            logger.error(f"HTTP 健康檢查失敗（HTTP {resp.status_code}）")
+            return False
+        return True
+
+    def _new_pool_worker(self) -> "DistillerScraperV2":
+        """建立 WebDriver 池的 worker：同樣的瀏覽器設定，但不寫 storage、不走 API。"""
+        return DistillerScraperV2(
+            headless=self.headless,
+            delay_min=self.delay_min,
+            delay_max=self.delay_max,
+            driver_pool_size=0,
+            block_resources=self.resource_policy.enabled,
+            archive=self.archive,
+        )
+
+    def _ensure_driver_pool(self) -> Optional[DriverPool]:
+        """延遲啟動 WebDriver 池；停用或已全數淘汰時回傳 None。"""
+        if self.driver_pool_size <= 0:
+            return None
+        if self.driver_pool is None:
+            logger.info(f"正在啟動 WebDriver 池（{self.driver_pool_size} 個 Chrome）...")
+            self.driver_pool = DriverPool(self.driver_pool_size, self._new_pool_worker)
+            self.driver_pool.start()
+        return self.driver_pool if self.driver_pool.alive else None
+
+    def close_driver_pool(self):
+        """關閉 WebDriver 池中所有 Chrome"""
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
+
     def random_delay(self, min_sec: float = None, max_sec: float = None):
         """隨機延遲"""
         min_sec = min_sec or self.delay_min
@@ -189,56 +454,106 @@ class DistillerScraperV2:
             logger.warning(f"等待 document.body 逾時（{timeout}s）")
             return False
 
-    def scroll_page(self, max_scrolls: int = None):
-        """滾動頁面載入更多內容"""
-        max_scrolls = max_scrolls or ScraperConfig.MAX_SCROLL_ATTEMPTS
+    def _wait_until_ready(self, label: str) -> Optional[str]:
+        """
+        等待目前頁面就緒（label: detail / listing / health），回傳滿足的條件名稱。
 
-        if not self._wait_for_body():
-            self.page_errors += 1
-            return
+        逾時不視為錯誤：呼叫端照常解析 page_source，由既有的欄位驗證決定成敗。
+        """
+        dom_stable = WaitCondition.dom_stable(
+            ScraperConfig.DOM_STABLE_SECONDS, ScraperConfig.DOM_STABLE_TIMEOUT
+        )
+        if label == "detail":
+            timeout = ScraperConfig.DETAIL_READY_TIMEOUT
+            conditions = [
+                WaitCondition.element(Selectors.NAME, timeout),
+                WaitCondition.element(Selectors.NAME_FALLBACK, timeout),
+                WaitCondition.element(f"{Selectors.FLAVOR_CHART}[data-flavors]", timeout),
+                dom_stable,
+            ]
+        elif label == "listing":
+            timeout = ScraperConfig.LISTING_READY_TIMEOUT
+            conditions = [WaitCondition.element(Selectors.SPIRIT_LIST_ITEM, timeout), dom_stable]
+        else:
+            conditions = [WaitCondition.element("body", ScraperConfig.HEALTH_CHECK_TIMEOUT)]
+        return self.page_waiter.wait(self.driver, conditions, label=label)
 
+    def _read_scroll_height(self) -> Optional[int]:
+        """讀取 scrollHeight（null body 時重試）；重試用盡記為頁面錯誤並回傳 None。"""
         for attempt in range(ScraperConfig.MAX_SCROLL_RETRIES):
             try:
-                last_height = self.driver.execute_script(
-                    "return document.body.scrollHeight"
-                )
-                break
+                return self.driver.execute_script("return document.body.scrollHeight")
             except JavascriptException as exc:
                 if attempt == ScraperConfig.MAX_SCROLL_RETRIES - 1:
                     logger.error(f"scrollPage 取得 scrollHeight 失敗，已放棄: {exc}")
                     self.page_errors += 1
-                    return
+                    return None
                 logger.warning(f"scrollPage 取得 scrollHeight 失敗，準備重試: {exc}")
                 time.sleep(1)
+        return None
+
+    def scroll_page(
+        self,
+        max_scrolls: int = None,
+        target_items: int = None,
+        known_urls: Optional[Set[str]] = None,
+    ):
+        """
+        滾動頁面載入更多內容。
+
+        每次滾動後由 ScrollWaiter 等待列表項目增加（或網路閒置 / 自適應逾時），
+        項目數與 scrollHeight 都不再變化即停止；target_items 指定時，
+        不在 known_urls 的新項目達到目標數即提前停止。
+        """
+        max_scrolls = max_scrolls or ScraperConfig.MAX_SCROLL_ATTEMPTS
+
+        if not self._wait_for_body():
+            self.page_errors += 1
+            return
+
+        last_height = self._read_scroll_height()
+        if last_height is None:
+            return
+
+        started = time.monotonic()
+        waiter = self.scroll_waiter
+        first = waiter.probe(self.driver)
+        probe, scrolls, early_stop = first, 0, False
 
         for i in range(max_scrolls):
+            if target_items and probe is not None:
+                # 新項目數在 Python 端以連結比對 known_urls，不把整個集合傳入瀏覽器
+                probe = waiter.probe(self.driver, links=True) or probe
+                if probe.fresh(known_urls) >= target_items:
+                    early_stop = True
+                    break
             self.driver.execute_script(
                 "window.scrollTo(0, document.body.scrollHeight);"
             )
-            time.sleep(ScraperConfig.SCROLL_DELAY)
+            scrolls += 1
+            grown = False
+            if probe is not None:
+                current = waiter.wait_for_growth(self.driver, probe)
+                if current is not None:
+                    grown = current.items > probe.items
+                probe = current
+            else:
+                # 無法計數（probe 失敗）：退回固定等待
+                time.sleep(ScraperConfig.SCROLL_DELAY)
 
-            for attempt in range(ScraperConfig.MAX_SCROLL_RETRIES):
-                try:
-                    new_height = self.driver.execute_script(
-                        "return document.body.scrollHeight"
-                    )
-                    break
-                except JavascriptException as exc:
-                    if attempt == ScraperConfig.MAX_SCROLL_RETRIES - 1:
-                        logger.error(
-                            f"scrollPage 取得 scrollHeight 失敗，已放棄: {exc}"
-                        )
-                        self.page_errors += 1
-                        return
-                    logger.warning(
-                        f"scrollPage 取得 scrollHeight 失敗，準備重試: {exc}"
-                    )
-                    time.sleep(1)
-            if new_height == last_height:
+            new_height = self._read_scroll_height()
+            if new_height is None:
+                return
+            if new_height == last_height and not grown:
                 logger.debug(f"滾動完成，共 {i + 1} 次")
                 break
             last_height = new_height
 
+        if first is not None and probe is not None:
+            waiter.record_page(
+                scrolls, probe.items - first.items, time.monotonic() - started, early_stop
+            )
+
     def extract_spirit_urls_from_list(self, soup: BeautifulSoup) -> List[str]:
         """從搜索結果頁面提取烈酒 URL"""
         urls = []
@@ -286,7 +601,7 @@ class DistillerScraperV2:
         try:
             self.driver.set_page_load_timeout(ScraperConfig.HEALTH_CHECK_TIMEOUT)
             self.driver.get(url)
-            time.sleep(ScraperConfig.INITIAL_PAGE_DELAY)
+            self._wait_until_ready("health")
             # 等待 <body> 元素存在，防止 "document.body is null" 錯誤
             # 原因：頁面可能因 React 非同步水合尚未完成，導致 DOM 未就緒
             WebDriverWait(self.driver, ScraperConfig.HEALTH_CHECK_TIMEOUT).until(
@@ -313,7 +628,7 @@ class DistillerScraperV2:
 
         try:
             self.driver.get(url)
-            time.sleep(ScraperConfig.INITIAL_PAGE_DELAY)
+            self._wait_until_ready("listing")
 
             # 等待 <body> 就緒，防止 scrollHeight null 錯誤
             if not self._wait_for_body():
@@ -374,40 +689,122 @@ class DistillerScraperV2:
                 f"https://distiller.com/search?category={category}&sort=distiller_score"
             )
             queries.append((url, category))
+        if self.shard.enabled:
+            # 平行任務：以查詢為單位分片，同一查詢的翻頁與檢查點都留在同一個任務
+            queries = self.shard.select(queries, key=lambda q: q[0])
         return queries
 
-    def _fetch_spirit_urls_from_page(self, page_url: str) -> List[str]:
+    def _extract_listing_in_browser(self) -> Optional[List[Dict]]:
+        """在瀏覽器內擷取列表卡片（LIST_ITEMS_SCRIPT）；停用、腳本錯誤或格式不符時回傳 None。"""
+        if not ScraperConfig.LISTING_EXTRACT_IN_BROWSER:
+            return None
+        try:
+            raw = self.driver.execute_script(
+                LIST_ITEMS_SCRIPT, *DataExtractor.list_items_script_args()
+            )
+        except Exception as e:
+            logger.debug(f"瀏覽器端列表擷取失敗，改用 page_source: {e}")
+            return None
+        return DataExtractor.parse_list_items_json(raw)
+
+    def _load_listing_items(
+        self, page_url: str, target_items: int = None
+    ) -> Optional[List[Dict]]:
         """
-        載入搜索結果頁面，完整滾動後回傳所有 spirit URL。
-        供分頁與滾動模式共用。
+        載入搜索結果頁面並滾動，回傳列表卡片資料；Chrome 不可用或頁面未載入時回傳 None。
+
+        優先在瀏覽器內擷取（只傳回精簡 JSON），失敗時才取回 page_source 以 BeautifulSoup 解析。
+        target_items 指定時，尚未爬過的項目達到此數即停止滾動。
         """
-        self.driver.get(page_url)
-        time.sleep(ScraperConfig.INITIAL_PAGE_DELAY)
+        if not self._ensure_driver():
+            self.page_errors += 1
+            return None
+
+        if not self._load_page(page_url):
+            self.page_errors += 1
+            return None
+        self._wait_until_ready("listing")
 
         if not self._wait_for_body():
             self.page_errors += 1
-            return []
+            return None
 
-        self.scroll_page()
-        soup = BeautifulSoup(self.driver.page_source, "html.parser")
-        return self.extract_spirit_urls_from_list(soup)
+        self.scroll_page(target_items=target_items, known_urls=self.seen_urls)
+        items = self._extract_listing_in_browser()
+        if items is not None:
+            self.listing_extract_stats["瀏覽器"] += 1
+        else:
+            self.listing_extract_stats["page_source"] += 1
+            soup = BeautifulSoup(self.driver.page_source, "html.parser")
+            items = [
+                DataExtractor.extract_list_item(item)
+                for item in soup.select(Selectors.SPIRIT_LIST_ITEM)
+            ]
+            unique: Dict[str, Dict] = {}
+            for item in items:
+                if "/spirits/" in item["url"]:
+                    unique.setdefault(item["url"], item)  # 與瀏覽器端相同：保留首次出現者
+            items = list(unique.values())
+        self.resource_policy.observe(self.driver)
+        return items
+
+    def _fetch_spirit_urls_from_page(self, page_url: str, target_items: int = None) -> List[str]:
+        """
+        載入搜索結果頁面，滾動後回傳所有 spirit URL（去重、保留頁面順序）。
+        供分頁與滾動模式共用；target_items 見 _load_listing_items()。
+        """
+        items = self._load_listing_items(page_url, target_items)
+        return [item["url"] for item in items] if items else []
+
+    def _fetch_listing_items(self, base_url: str, page: int) -> List[Dict]:
+        """
+        取得搜索結果的列表卡片資料（url / distiller_score / community_rating 等）。
+        API 可用時以搜尋 API 取得（不需 Chrome），失敗或不帶分數時才載入搜尋頁。
+        """
+        if self.api_client and self.api_client.is_available():
+            items = self._fetch_listing_items_api(base_url, page)
+            if items is not None:
+                return items
+            logger.debug("  API 搜尋結果不可用於分數刷新，fallback 至 Selenium")
+        page_url = base_url if page == 1 else f"{base_url}&page={page}"
+        return self._load_listing_items(page_url) or []
+
+    def _fetch_listing_items_api(self, base_url: str, page: int) -> Optional[List[Dict]]:
+        """搜尋 API 紀錄 → 列表卡片格式；請求失敗或整頁都沒有分數欄位時回傳 None。"""
+        from urllib.parse import parse_qs, urlparse
+
+        params = parse_qs(urlparse(base_url).query, keep_blank_values=True)
+        records = self.api_client.fetch_search_items(
+            category=params.get("category", [""])[0],
+            page=page,
+            spirit_style_id=params.get("spirit_style_id", [None])[0],
+        )
+        if records is None:
+            return None
+        items = [
+            {
+                "name": r["name"],
+                "url": r["url"],
+                "distiller_score": r["expert_score"],
+                "community_rating": r["community_score"],
+            }
+            for r in records
+        ]
+        if items and all(
+            self._parse_listing_score(i["distiller_score"]) is None
+            and self._parse_listing_score(i["community_rating"]) is None
+            for i in items
+        ):
+            return None  # API 回應不帶分數，無法偵測變動
+        return items
 
     def _fetch_spirit_urls(self, base_url: str, page: int) -> List[str]:
         """
         取得指定查詢 + 頁碼的 spirit URL 列表。
         優先使用 API（快速），失敗時 fallback 至 Selenium。
         """
-        from urllib.parse import parse_qs, urlparse
-
         if self.api_client and self.api_client.is_available():
-            parsed = urlparse(base_url)
-            params = parse_qs(parsed.query, keep_blank_values=True)
-            category = params.get("category", [""])[0]
-            style_id = params.get("spirit_style_id", [None])[0]
-
-            urls = self.api_client.fetch_search_results(
-                category=category, page=page, spirit_style_id=style_id
-            )
+            urls = self._fetch_spirit_urls_api(base_url, page)
             if urls is not None:  # [] 代表本頁無結果（合法），None 代表請求異常
                 mode = "API"
                 logger.info(f"  [{mode}] 第 {page} 頁: {len(urls)} 個連結")
@@ -418,26 +815,82 @@ class DistillerScraperV2:
         page_url = base_url if page == 1 else f"{base_url}&page={page}"
         return self._fetch_spirit_urls_from_page(page_url)
 
+    def _fetch_spirit_urls_api(self, base_url: str, page: int) -> Optional[List[str]]:
+        """以搜尋 API 取得指定查詢 + 頁碼的 URL 列表；請求異常時回傳 None。"""
+        from urllib.parse import parse_qs, urlparse
+
+        params = parse_qs(urlparse(base_url).query, keep_blank_values=True)
+        return self.api_client.fetch_search_results(
+            category=params.get("category", [""])[0],
+            page=page,
+            spirit_style_id=params.get("spirit_style_id", [None])[0],
+        )
+
+    def _start_listing_prefetch(
+        self, base_url: str, start_page: int
+    ) -> Optional[ListingPrefetcher]:
+        """API 搜尋端點可用時啟動背景預取；Selenium 搜尋頁需要主 driver，不預取。"""
+        if self.prefetch_depth <= 0 or not (
+            self.api_client and self.api_client.is_available()
+        ):
+            return None
+
+        def fetch(page: int) -> Optional[List[str]]:
+            self._rate_limiter.acquire()
+            return self._fetch_spirit_urls_api(base_url, page)
+
+        return ListingPrefetcher(
+            fetch,
+            start_page,
+            ScraperConfig.MAX_PAGES_PER_QUERY,
+            depth=self.prefetch_depth,
+            delay=ScraperConfig.SCROLL_DELAY,
+        ).start()
+
+    def _take_listing(
+        self, base_url: str, page: int, prefetcher: Optional[ListingPrefetcher]
+    ) -> List[str]:
+        """優先取用預取結果；未預取到時同步抓取（含 Selenium fallback）。"""
+        if prefetcher is not None:
+            urls = prefetcher.take(page)
+            if urls is not None:
+                logger.info(f"  [API 預取] 第 {page} 頁: {len(urls)} 個連結")
+                return urls
+        return self._fetch_spirit_urls(base_url, page)
+
+    def _finish_listing_prefetch(self, prefetcher: Optional[ListingPrefetcher]) -> None:
+        if prefetcher is None:
+            return
+        prefetcher.cancel()
+        for key, value in prefetcher.summary().items():
+            self.prefetch_stats[key] = self.prefetch_stats.get(key, 0) + value
+
     def discover_api(self, warm_up_category: str = "whiskey") -> bool:
         """
         探測 Distiller.com API 端點。
-        載入一個搜索頁面並捕獲 XHR 請求，交給 api_client 分析。
+        先嘗試 api_client 的端點快取（一次請求驗證，不需載入頁面）；
+        快取無效時才載入一個搜索頁面並捕獲 XHR 請求，交給 api_client 分析。
         回傳 API 是否可用。
         若 api_client 未設定，直接回傳 False。
         """
         if not self.api_client:
             return False
 
+        if self.api_client.load_cached_endpoints():
+            return True
+
         logger.info("=" * 60)
         logger.info("正在探測 API 端點...")
-        warm_url = (
-            f"https://distiller.com/search"
-            f"?category={warm_up_category}&sort=distiller_score"
-        )
-        xhr_urls = self.capture_xhr_requests(warm_url, scroll_count=2)
-        logger.info(f"捕獲 {len(xhr_urls)} 個 XHR 請求")
-
-        result = self.api_client.discover(xhr_urls)
+        # 先只測已知候選路徑（純 HTTP）；找不到才啟動 Chrome 擷取 XHR 再完整探測
+        result = self.api_client.discover()
+        if not result["available"] and self._ensure_driver():
+            warm_url = (
+                f"https://distiller.com/search"
+                f"?category={warm_up_category}&sort=distiller_score"
+            )
+            xhr_urls = self.capture_xhr_requests(warm_url, scroll_count=2)
+            logger.info(f"捕獲 {len(xhr_urls)} 個 XHR 請求")
+            result = self.api_client.discover(xhr_urls)
 
         if result["available"]:
             logger.info(f"✓ API 可用！搜索端點: {result['search_endpoint']}")
@@ -449,12 +902,276 @@ class DistillerScraperV2:
 
         return result["available"]
 
+    def _persist(self, data: Dict) -> None:
+        """將單筆結果寫入 storage（持鎖，允許多執行緒呼叫）。"""
+        if self.storage:
+            with self._storage_lock:
+                self.storage.save_spirit(data)
+
+    def _api_detail_available(self) -> bool:
+        return bool(
+            self.api_client
+            and self.api_client.is_available()
+            and self.api_client.detail_endpoint_template
+        )
+
+    def _use_concurrent_details(self) -> bool:
+        """有純 HTTP 詳情來源（API 或靜態 HTML）且並行度 > 1 時，詳情頁改走 worker pool。"""
+        return bool(
+            self.api_concurrency > 1
+            and (self._api_detail_available() or self.html_fetcher)
+        )
+
+    def _fetch_detail_api(self, url: str) -> Optional[Dict]:
+        """worker 執行緒：受全域速率限制的單筆 API 詳情請求（不寫 storage、不動共享狀態）。"""
+        self._rate_limiter.acquire()
+        try:
+            return self.api_client.fetch_spirit_detail(url)
+        except Exception as e:
+            logger.warning(f"  [API] 詳情請求異常 {url}: {e}")
+            return None
+
+    def _fetch_detail_html(self, url: str) -> Optional[Dict]:
+        """worker 執行緒：受全域速率限制的靜態 HTML 詳情請求（必要欄位不齊時回傳 None）。"""
+        self._rate_limiter.acquire()
+        try:
+            return self.html_fetcher.fetch(url)
+        except Exception as e:
+            logger.warning(f"  [HTTP] 詳情解析異常 {url}: {e}")
+            return None
+
+    def _fetch_detail_http(self, url: str) -> Optional[Dict]:
+        """worker 執行緒：依序嘗試 API → 靜態 HTML，皆不需 Chrome。"""
+        data = self._fetch_detail_api(url) if self._api_detail_available() else None
+        if data is None and self.html_fetcher:
+            data = self._fetch_detail_html(url)
+        return data
+
+    def _scrape_urls_concurrent(
+        self,
+        spirit_urls: List[str],
+        category: str,
+        results: List[Dict],
+        max_spirits: int,
+    ) -> None:
+        """
+        HTTP 模式（API 或靜態 HTML）：以 worker pool 並行抓取一整頁的詳情。
+
+        - worker 只負責 HTTP 請求；seen_urls / results / storage 皆在呼叫端執行緒更新
+        - 每批最多送出「剩餘名額」個請求，避免超過 max_spirits 後仍浪費請求
+        - HTTP 失敗的 URL 於 pool 結束後交給 Selenium 詳情階段（記入 _http_failed，不再重試 HTTP）
+        """
+        pending = [u for u in dict.fromkeys(spirit_urls) if u not in self.seen_urls]
+        fallback: List[str] = []
+
+        with ThreadPoolExecutor(max_workers=self.api_concurrency) as pool:
+            while pending and len(results) < max_spirits:
+                slots = max_spirits - len(results)
+                batch, pending = pending[:slots], pending[slots:]
+                futures = {pool.submit(self._fetch_detail_http, u): u for u in batch}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    api_data = future.result()
+                    if not api_data:
+                        fallback.append(url)
+                        self._http_failed.add(url)
+                        continue
+                    api_data["url"] = url
+                    api_data["category"] = category
+                    self.seen_urls.add(url)
+                    self._persist(api_data)
+                    results.append(api_data)
+                    logger.info(
+                        f"✓ [HTTP][{len(results)}/{max_spirits}] 已爬取: {api_data['name']}"
+                    )
+
+        if fallback and len(results) < max_spirits:
+            logger.debug(f"  {len(fallback)} 筆 API 詳情失敗，fallback Selenium")
+            self._scrape_urls_selenium(fallback, category, results, max_spirits)
+
+    def _scrape_detail_on_pool(self, url: str) -> Any:
+        """
+        worker 執行緒：向 WebDriver 池借一個 driver 爬取單筆詳情。
+
+        池已全數淘汰時回傳 _POOL_EXHAUSTED（URL 未嘗試，由呼叫端交回主 driver），
+        與 None（已嘗試但爬取失敗）區分。
+        """
+        try:
+            with self.driver_pool.worker() as worker:
+                data = worker.scrape_spirit_detail(url)
+                worker.random_delay()
+                return data
+        except DriverPoolExhausted:
+            return _POOL_EXHAUSTED
+
+    def _scrape_urls_pooled(
+        self,
+        spirit_urls: List[str],
+        category: str,
+        results: List[Dict],
+        max_spirits: int,
+    ) -> None:
+        """
+        Selenium 模式：將詳情 URL 分派給 WebDriver 池中任一閒置的 driver。
+
+        與 _scrape_urls_concurrent 相同，worker 只負責載入與解析，
+        seen_urls / results / storage 皆在呼叫端執行緒更新。
+        """
+        pool = self.driver_pool
+        pending = [u for u in dict.fromkeys(spirit_urls) if u not in self.seen_urls]
+        unserved: List[str] = []  # 池耗盡而未嘗試的 URL（批次內），與 pending 一併交回主 driver
+
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            while pending and len(results) < max_spirits and pool.alive:
+                slots = max_spirits - len(results)
+                batch, pending = pending[:slots], pending[slots:]
+                futures = {
+                    executor.submit(self._scrape_detail_on_pool, u): u for u in batch
+                }
+                for future in as_completed(futures):
+                    url = futures[future]
+                    data = future.result()
+                    if data is _POOL_EXHAUSTED:
+                        unserved.append(url)
+                        continue
+                    if not data:
+                        self.failed_urls.append(url)
+                        continue
+                    data["category"] = category
+                    self.seen_urls.add(url)
+                    self._persist(data)
+                    results.append(data)
+
+        fallback = unserved + pending
+        if fallback and len(results) < max_spirits:
+            logger.warning("WebDriver 池已無可用 driver，改用主 driver 循序爬取")
+            self._scrape_urls_sequential(fallback, category, results, max_spirits)
+
+    def _scrape_urls_multitab(
+        self,
+        spirit_urls: List[str],
+        category: str,
+        results: List[Dict],
+        max_spirits: int,
+    ) -> None:
+        """
+        Selenium 模式：在主 driver 內開 tab_count 個分頁並行載入詳情頁。
+
+        發生 session 斷開等需重啟的錯誤時，重啟 driver 後將尚未完成的 URL
+        交回循序路徑（沿用 scrape_spirit_detail 的重試邏輯）。
+        """
+        pending = [u for u in dict.fromkeys(spirit_urls) if u not in self.seen_urls]
+        pending = pending[: max_spirits - len(results)]
+        done: Set[str] = set()
+        self._recycle_driver_if_needed()
+        if not self._ensure_driver():
+            self._scrape_urls_sequential(pending, category, results, max_spirits)
+            return
+        loader = MultiTabLoader(
+            self.driver,
+            tabs=self.tab_count,
+            ready_script=self._DETAIL_READY_SCRIPT,
+            timeout=ScraperConfig.DETAIL_READY_TIMEOUT,
+        )
+        try:
+            for url, html in loader.load(pending):
+                done.add(url)
+                self.watchdog.record_page()
+                if html is None:
+                    logger.warning(f"分頁導覽未完成（仍為上一頁），略過: {url}")
+                    self.failed_urls.append(url)
+                    continue
+                self.resource_policy.observe(self.driver)
+                data = self._parse_detail_html(url, html)
+                if data is None:
+                    continue
+                data["category"] = category
+                self.seen_urls.add(url)
+                self._persist(data)
+                results.append(data)
+                logger.info(f"✓ [分頁][{len(results)}/{max_spirits}] 已爬取: {data['name']}")
+        except Exception as e:
+            if not self._should_restart(str(e)):
+                raise
+            logger.warning(f"多分頁載入時 session 斷開，改為循序爬取剩餘 URL: {e}")
+            if self.restart_count < ScraperConfig.MAX_RESTART_ATTEMPTS and self.restart_driver():
+                self.restart_count += 1
+            else:
+                self.driver_failed = True
+                return
+            remaining = [u for u in pending if u not in done]
+            self._scrape_urls_sequential(remaining, category, results, max_spirits)
+
+    def _scrape_urls_selenium(
+        self,
+        spirit_urls: List[str],
+        category: str,
+        results: List[Dict],
+        max_spirits: int,
+    ) -> None:
+        """Selenium 詳情階段：WebDriver 池 > 主 driver 多分頁 > 主 driver 循序。"""
+        if self._ensure_driver_pool():
+            self._scrape_urls_pooled(spirit_urls, category, results, max_spirits)
+        elif self.tab_count > 1 and self._ensure_driver():
+            self._scrape_urls_multitab(spirit_urls, category, results, max_spirits)
+        else:
+            self._scrape_urls_sequential(spirit_urls, category, results, max_spirits)
+
     def _scrape_urls(
         self,
         spirit_urls: List[str],
         category: str,
         results: List[Dict],
         max_spirits: int,
+    ) -> None:
+        """爬取 spirit URL 列表，結果 append 至 results（就地修改）"""
+        spirit_urls = self._save_search_records(spirit_urls, category, results, max_spirits)
+        if not spirit_urls or len(results) >= max_spirits:
+            return
+        if self._use_concurrent_details():
+            self._scrape_urls_concurrent(spirit_urls, category, results, max_spirits)
+        else:
+            self._scrape_urls_selenium(spirit_urls, category, results, max_spirits)
+
+    def _save_search_records(
+        self,
+        spirit_urls: List[str],
+        category: str,
+        results: List[Dict],
+        max_spirits: int,
+    ) -> List[str]:
+        """搜尋 API 已帶齊欄位的 URL 直接儲存（不發詳情請求），回傳仍需爬取詳情的 URL。"""
+        if not self.api_client:
+            return spirit_urls
+        remaining: List[str] = []
+        for url in spirit_urls:
+            if url in self.seen_urls:
+                self.api_client.take_search_record(url)  # 已收錄：丟棄，不留在 api_client 中
+                continue
+            record = (
+                self.api_client.take_search_record(url)
+                if len(results) < max_spirits
+                else None
+            )
+            if not isinstance(record, dict):
+                remaining.append(url)
+                continue
+            record["category"] = category
+            self.seen_urls.add(url)
+            self._persist(record)
+            results.append(record)
+            self.search_record_saves += 1
+            logger.info(
+                f"✓ [API 搜尋][{len(results)}/{max_spirits}] 已儲存: {record['name']}"
+            )
+        return remaining
+
+    def _scrape_urls_sequential(
+        self,
+        spirit_urls: List[str],
+        category: str,
+        results: List[Dict],
+        max_spirits: int,
     ) -> None:
         """逐一爬取 spirit URL 列表，結果 append 至 results（就地修改）"""
         for spirit_url in spirit_urls:
@@ -469,6 +1186,116 @@ class DistillerScraperV2:
                 results.append(spirit_data)
             self.random_delay()
 
+    def _new_results(self) -> List[Dict]:
+        """類別層級的結果容器；串流模式下只計數並轉交 spirits_data，不保留記錄。"""
+        if isinstance(self.spirits_data, StreamingRecords):
+            return self.spirits_data.child()
+        return []
+
+    def _scrape_frontier(self, category: str, results: List[Dict], max_spirits: int) -> None:
+        """詳情階段：依列表順序取出前沿中待爬 URL（不超過剩餘請求預算）並爬取。"""
+        urls = self.frontier.pop(self.seen_urls, self.budget.allow(None))
+        if urls:
+            self.budget.spend(min(len(urls), max(max_spirits - len(results), 0)))
+            self._scrape_urls_budgeted(urls, category, results, max_spirits)
+
+    def _scrape_urls_budgeted(
+        self,
+        spirit_urls: List[str],
+        category: str,
+        results: List[Dict],
+        max_spirits: int,
+    ) -> None:
+        """_scrape_urls 並將處理項數（成功 + 失敗）與耗時回報給 CrawlBudget 更新每項成本。"""
+        started = self.budget.elapsed()
+        before = len(results) + len(self.failed_urls)
+        self._scrape_urls(spirit_urls, category, results, max_spirits)
+        self.budget.record(
+            len(results) + len(self.failed_urls) - before, self.budget.elapsed() - started
+        )
+
+    def _plan_stale_refresh(self, categories: List[str], limit: int) -> None:
+        """從 storage 挑出本次 run 要重爬的過期烈酒（limit <= 0 或無 storage 時停用）。"""
+        self.stale_scheduler = None
+        if not self.storage or limit <= 0:
+            return
+        with self._storage_lock:
+            rows = self.storage.select_stale_spirits(
+                ScraperConfig.STALE_MIN_AGE_DAYS,
+                limit * ScraperConfig.STALE_CANDIDATE_FACTOR,
+                categories,
+            )
+        self.stale_scheduler = StaleRefreshScheduler(
+            self.shard.select(rows, key=lambda row: row["url"]),
+            limit,
+            category_weights=ScraperConfig.STALE_CATEGORY_WEIGHTS,
+            momentum_weight=ScraperConfig.STALE_MOMENTUM_WEIGHT,
+        )
+        self.budget.plan(self.stale_scheduler.scheduled)
+        logger.info(
+            f"[過期刷新] 候選 {self.stale_scheduler.candidates} 筆，排程 {self.stale_scheduler.scheduled} 筆"
+        )
+
+    def _refresh_stale(self, category: str, limit: Optional[int] = None) -> None:
+        """從排程取出 category 的過期烈酒（limit 為 None 時取完）並重爬詳情。"""
+        if self.stale_scheduler is None:
+            return
+        urls = self.stale_scheduler.take(category, self.budget.allow(limit))
+        if not urls:
+            return
+        logger.info(f"  [過期刷新] {category}: 重新爬取 {len(urls)} 筆")
+        self.budget.spend(len(urls))
+        # 移出 seen_urls 才會重新爬取；爬取失敗者放回，避免被探索階段當成新 URL
+        self.seen_urls.difference_update(urls)
+        refreshed = self._new_results()
+        try:
+            self._scrape_urls_budgeted(urls, category, refreshed, len(urls))
+        finally:
+            self.seen_urls.update(urls)
+        self.spirits_data.extend(refreshed)
+        self.stale_refreshed += len(refreshed)
+
+    def _load_crawl_checkpoint(self, category: str, query: str) -> Optional[Dict]:
+        if not self.storage:
+            return None
+        with self._storage_lock:
+            return self.storage.load_checkpoint(category, query)
+
+    def _query_value(self, category: str, query: str) -> tuple:
+        """
+        時間預算下的查詢排序鍵（越小越先爬），只依檢查點判斷：
+        尚未開始或上次仍有新烈酒的查詢 → 最近幾頁全是重複的查詢 → 已完成的查詢。
+        """
+        checkpoint = self._load_crawl_checkpoint(category, query)
+        state = checkpoint["state"] if checkpoint else {}
+        return (bool(state.get("done")), state.get("consecutive_dup_pages", 0) > 0)
+
+    def _order_queries_by_value(self, category: str, queries: List[tuple]) -> List[tuple]:
+        """時間預算下的查詢順序（排序穩定，同級保留設定檔中的風格順序）。"""
+        return sorted(queries, key=lambda q: self._query_value(category, q[0]))
+
+    def _order_categories_by_value(
+        self, categories: List[str], use_styles: bool
+    ) -> List[str]:
+        """時間預算下的類別順序：以類別中最有價值的查詢為準，全部查詢已完成或停滯的類別排最後。"""
+        def best(category: str) -> tuple:
+            queries = self._get_search_queries(category, use_styles)
+            return min((self._query_value(category, q[0]) for q in queries), default=(True, True))
+
+        return sorted(categories, key=best)
+
+    def _save_crawl_checkpoint(
+        self, category: str, query: str, label: str, page: int, **state
+    ) -> None:
+        """記錄查詢最後完整處理的頁碼；寫入失敗只影響續爬，不中斷爬取。"""
+        if not self.storage:
+            return
+        try:
+            with self._storage_lock:
+                self.storage.save_checkpoint(category, query, label, page, state)
+        except Exception as e:
+            logger.warning(f"寫入檢查點失敗（{label} 第 {page} 頁）: {e}")
+
     def scrape_category_paginated(
         self,
         category: str,
@@ -483,140 +1310,211 @@ class DistillerScraperV2:
           - 頁面完全無結果
           - 達到 MAX_PAGES_PER_QUERY 上限
         若第一頁即判斷分頁無效，自動 fallback 至滾動模式。
+
+        API 搜尋端點可用時以 ListingPrefetcher 背景預取後續頁，停止時取消預取。
+        每完整處理一頁就寫入檢查點（storage 支援時）；run 中途中止後，
+        下一次 run 從最後完整處理的頁碼之後續爬，已走完的查詢直接跳過。
+        每處理完一頁交錯重爬少量過期烈酒；爬取預算用完時停止翻頁（保留檢查點）。
         """
         max_spirits = max_spirits or ScraperConfig.MAX_SPIRITS_PER_CATEGORY
-        results: List[Dict] = []
+        results = self._new_results()
         queries = self._get_search_queries(category, use_styles)
+        if self.budget.max_seconds is not None:
+            queries = self._order_queries_by_value(category, queries)
 
         for base_url, label in queries:
             if len(results) >= max_spirits:
                 break
 
-            logger.info(f"[分頁] 開始爬取: {label}")
-            pagination_works = False  # 確認分頁是否真的有效
-            prev_page_urls: set = set()
-            consecutive_dup_pages = 0
-
-            for page in range(1, ScraperConfig.MAX_PAGES_PER_QUERY + 1):
-                if len(results) >= max_spirits:
-                    break
-
-                logger.info(
-                    f"  第 {page} 頁 ({'API' if self.api_client and self.api_client.is_available() else 'Selenium'})"
-                )
+            checkpoint = self._load_crawl_checkpoint(category, base_url)
+            state = checkpoint["state"] if checkpoint else {}
+            if state.get("done"):
+                logger.info(f"[分頁] {label} 已於先前的 run 完成，跳過")
+                continue
 
-                urls_on_page: List[str] = []
-                page_loaded = False
-                for attempt in range(ScraperConfig.PAGE_RETRY_COUNT):
-                    if self.driver_failed:
+            start_page = checkpoint["last_page"] + 1 if checkpoint else 1
+            if checkpoint:
+                logger.info(f"[分頁] 從檢查點續爬: {label}（第 {start_page} 頁起）")
+            else:
+                logger.info(f"[分頁] 開始爬取: {label}")
+            pagination_works = state.get("pagination_works", False)  # 確認分頁是否真的有效
+            prev_page_urls: set = set(state.get("prev_page_urls", []))
+            consecutive_dup_pages = state.get("consecutive_dup_pages", 0)
+            finished = False  # 查詢已走完（而非因上限 / 載入失敗中斷）
+            page = start_page - 1
+
+            # 停止條件成立（break）或拋錯時，finally 取消尚未取用的預取
+            prefetcher = self._start_listing_prefetch(base_url, start_page)
+            try:
+                for page in range(start_page, ScraperConfig.MAX_PAGES_PER_QUERY + 1):
+                    if len(results) >= max_spirits:
                         break
-                    try:
-                        urls_on_page = self._fetch_spirit_urls(base_url, page)
-                        page_loaded = True
+                    if self.budget.exhausted():
+                        logger.info(f"  爬取預算已用完（{self.budget.stopped_by}），停止分頁")
                         break
-                    except Exception as e:
-                        if attempt < ScraperConfig.PAGE_RETRY_COUNT - 1:
-                            logger.warning(
-                                f"  第 {page} 頁嘗試 {attempt + 1} 失敗，重試..."
-                            )
-                            continue
-                        if (
-                            self._should_restart(str(e))
-                            and self.restart_count < ScraperConfig.MAX_RESTART_ATTEMPTS
-                        ):
-                            self.restart_driver()
-                            if self.driver_failed:
-                                break
-                            try:
-                                urls_on_page = self._fetch_spirit_urls(base_url, page)
-                                page_loaded = True
-                                break
-                            except Exception as retry_error:
-                                logger.error(f"  載入第 {page} 頁失敗: {retry_error}")
-                                self.page_errors += 1
-                                break
-                        logger.error(f"  載入第 {page} 頁失敗: {e}")
-                        self.page_errors += 1
-                if not page_loaded:
-                    break
 
-                if not urls_on_page:
-                    logger.info(f"  第 {page} 頁無結果，停止分頁")
-                    break
-
-                # 計算新 URL 數量（未見過的）
-                new_urls = [u for u in urls_on_page if u not in self.seen_urls]
-                total_on_page = len(urls_on_page)
-                duplicate_ratio = 1.0 - (len(new_urls) / total_on_page)
-                current_page_set = set(urls_on_page)
-
-                logger.info(
-                    f"  第 {page} 頁找到 {total_on_page} 個連結，"
-                    f"新增 {len(new_urls)} 個（重複率 {duplicate_ratio:.0%}）"
-                )
-
-                # ── 第一頁早停：重複率過高代表本類別資料已是最新，無需繼續分頁 ──
-                if page == 1 and duplicate_ratio >= ScraperConfig.SKIP_CATEGORY_THRESHOLD:
                     logger.info(
-                        f"  首頁重複率 {duplicate_ratio:.0%} >= {ScraperConfig.SKIP_CATEGORY_THRESHOLD:.0%}，"
-                        f"跳過 {label}（資料已是最新）"
+                        f"  第 {page} 頁 ({'API' if self.api_client and self.api_client.is_available() else 'Selenium'})"
                     )
-                    break
 
-                # ── 分頁有效性判斷（僅在第 2 頁） ──
-                if page == 2:
-                    if current_page_set != prev_page_urls:
-                        pagination_works = True
-                        logger.info("  分頁機制有效，繼續翻頁")
-                    else:
-                        # 分頁無效：第 2 頁與第 1 頁完全相同
-                        if all(u in self.seen_urls for u in urls_on_page):
-                            logger.info("  此類別資料已存在於資料庫，跳過")
-                        else:
-                            logger.info("  分頁無效（第二頁無新內容），切換至滾動模式")
-                            try:
-                                first_page_urls = self._fetch_spirit_urls_from_page(
-                                    base_url
-                                )
-                                self._scrape_urls(
-                                    first_page_urls, category, results, max_spirits
+                    urls_on_page: List[str] = []
+                    page_loaded = False
+                    for attempt in range(ScraperConfig.PAGE_RETRY_COUNT):
+                        if self.driver_failed:
+                            break
+                        try:
+                            urls_on_page = self._take_listing(
+                                base_url, page, prefetcher if attempt == 0 else None
+                            )
+                            page_loaded = True
+                            break
+                        except Exception as e:
+                            if attempt < ScraperConfig.PAGE_RETRY_COUNT - 1:
+                                logger.warning(
+                                    f"  第 {page} 頁嘗試 {attempt + 1} 失敗，重試..."
                                 )
-                            except Exception as e:
-                                logger.warning(f"  滾動模式 fallback 失敗: {e}")
-                                self.page_errors += 1
+                                continue
+                            if (
+                                self._should_restart(str(e))
+                                and self.restart_count < ScraperConfig.MAX_RESTART_ATTEMPTS
+                            ):
+                                self.restart_driver()
+                                if self.driver_failed:
+                                    break
+                                try:
+                                    urls_on_page = self._fetch_spirit_urls(base_url, page)
+                                    page_loaded = True
+                                    break
+                                except Exception as retry_error:
+                                    logger.error(f"  載入第 {page} 頁失敗: {retry_error}")
+                                    self.page_errors += 1
+                                    break
+                            logger.error(f"  載入第 {page} 頁失敗: {e}")
+                            self.page_errors += 1
+                    if not page_loaded:
                         break
+                    self.budget.spend(1)
 
-                prev_page_urls = current_page_set
+                    if not urls_on_page:
+                        logger.info(f"  第 {page} 頁無結果，停止分頁")
+                        finished = True
+                        break
+
+                    # 交給前沿分類：新增 URL 進入待爬佇列。首頁早停只看「已知」（資料庫已有）；
+                    # 翻頁停止條件以「新增」為準，與其他查詢的重疊也算重複
+                    offer = self.frontier.offer(urls_on_page, label, page, self.seen_urls)
+                    self.budget.plan(len(offer.fresh))
+                    new_urls = offer.fresh
+                    total_on_page = offer.total
+                    duplicate_ratio = offer.duplicate_ratio
+                    repeat_ratio = offer.repeat_ratio
+                    current_page_set = set(urls_on_page)
 
-                # ── 有新 URL → 爬取並重置計數器 ──
-                if new_urls:
-                    consecutive_dup_pages = 0
-                    self._scrape_urls(urls_on_page, category, results, max_spirits)
-                elif pagination_works:
-                    # ── 無新 URL 但分頁有效 → 累計連續重複頁 ──
-                    consecutive_dup_pages += 1
                     logger.info(
-                        f"  連續 {consecutive_dup_pages}/{ScraperConfig.MAX_CONSECUTIVE_DUP_PAGES} 頁無新 URL"
+                        f"  第 {page} 頁找到 {total_on_page} 個連結，"
+                        f"新增 {len(offer.fresh)} 個、與其他查詢重疊 {len(offer.overlap)} 個"
+                        f"（重複率 {repeat_ratio:.0%}，資料庫已有 {duplicate_ratio:.0%}）"
                     )
-                    if consecutive_dup_pages >= ScraperConfig.MAX_CONSECUTIVE_DUP_PAGES:
-                        logger.info("  此風格已完整收錄，停止分頁")
+
+                    # ── 第一頁早停：重複率過高代表本類別資料已是最新，無需繼續分頁 ──
+                    if page == 1 and duplicate_ratio >= ScraperConfig.SKIP_CATEGORY_THRESHOLD:
+                        logger.info(
+                            f"  首頁重複率 {duplicate_ratio:.0%} >= {ScraperConfig.SKIP_CATEGORY_THRESHOLD:.0%}，"
+                            f"跳過 {label}（資料已是最新）"
+                        )
+                        finished = True
                         break
-                else:
-                    # page == 1 且無新 URL（首頁全部已知），繼續翻到第 2 頁判斷分頁有效性
-                    self._scrape_urls(urls_on_page, category, results, max_spirits)
 
-                # 重複率過高也停止（僅在有部分新 URL 時判斷）
-                if (
-                    page >= 2
-                    and new_urls
-                    and duplicate_ratio >= ScraperConfig.DUPLICATE_RATIO_THRESHOLD
-                ):
-                    logger.info(f"  重複率 {duplicate_ratio:.0%} 過高，停止分頁")
-                    break
+                    # ── 分頁有效性判斷（僅在第 2 頁） ──
+                    if page == 2:
+                        if current_page_set != prev_page_urls:
+                            pagination_works = True
+                            logger.info("  分頁機制有效，繼續翻頁")
+                        else:
+                            # 分頁無效：第 2 頁與第 1 頁完全相同
+                            if all(u in self.seen_urls for u in urls_on_page):
+                                logger.info("  此類別資料已存在於資料庫，跳過")
+                            else:
+                                logger.info("  分頁無效（第二頁無新內容），切換至滾動模式")
+                                try:
+                                    first_page_urls = self._fetch_spirit_urls_from_page(
+                                        base_url, target_items=max_spirits - len(results)
+                                    )
+                                    self._scrape_urls(
+                                        first_page_urls, category, results, max_spirits
+                                    )
+                                except Exception as e:
+                                    logger.warning(f"  滾動模式 fallback 失敗: {e}")
+                                    self.page_errors += 1
+                            finished = True
+                            break
+
+                    prev_page_urls = current_page_set
+
+                    # ── 有新 URL → 爬取並重置計數器 ──
+                    if new_urls:
+                        consecutive_dup_pages = 0
+                        self._scrape_frontier(category, results, max_spirits)
+                    elif pagination_works:
+                        # ── 無新 URL 但分頁有效 → 累計連續重複頁 ──
+                        consecutive_dup_pages += 1
+                        logger.info(
+                            f"  連續 {consecutive_dup_pages}/{ScraperConfig.MAX_CONSECUTIVE_DUP_PAGES} 頁無新 URL"
+                        )
+                        if consecutive_dup_pages >= ScraperConfig.MAX_CONSECUTIVE_DUP_PAGES:
+                            logger.info("  此風格已完整收錄，停止分頁")
+                            finished = True
+                            break
+                    else:
+                        # page == 1 且無新 URL（首頁全部已知），繼續翻到第 2 頁判斷分頁有效性
+                        self._scrape_frontier(category, results, max_spirits)
+
+                    # 每頁之間交錯重爬少量過期烈酒
+                    self._refresh_stale(category, ScraperConfig.STALE_REFRESH_PER_PAGE)
+
+                    # 重複率（已知 + 重疊）過高也停止（僅在有部分新 URL 時判斷）
+                    if (
+                        page >= 2
+                        and new_urls
+                        and repeat_ratio >= ScraperConfig.DUPLICATE_RATIO_THRESHOLD
+                    ):
+                        logger.info(f"  重複率 {repeat_ratio:.0%} 過高，停止分頁")
+                        finished = True
+                        break
+
+                    # 預算在本頁中途用完（或 allow() 只放行本頁一部分）：不寫檢查點，
+                    # 下一次 run 重新處理本頁未爬完的 URL
+                    if self.budget.exhausted():
+                        logger.info(f"  爬取預算已用完（{self.budget.stopped_by}），停止分頁")
+                        break
+                    if len(self.frontier) and len(results) < max_spirits:
+                        logger.info(
+                            f"  剩餘預算只夠爬本頁部分 URL（{len(self.frontier)} 個未爬），停止分頁"
+                        )
+                        break
 
-                # 每頁間延遲
-                if len(results) < max_spirits:
-                    time.sleep(ScraperConfig.SCROLL_DELAY)
+                    self._save_crawl_checkpoint(
+                        category, base_url, label, page,
+                        pagination_works=pagination_works,
+                        consecutive_dup_pages=consecutive_dup_pages,
+                        prev_page_urls=sorted(prev_page_urls),
+                    )
+
+                    # 每頁間延遲（預取時由背景執行緒在請求之間延遲）
+                    if len(results) < max_spirits and prefetcher is None:
+                        time.sleep(ScraperConfig.SCROLL_DELAY)
+                else:
+                    finished = True  # 已達 MAX_PAGES_PER_QUERY
+            finally:
+                self._finish_listing_prefetch(prefetcher)
+                # 未爬完的 URL（如已達 max_spirits）不留給下一個查詢 / 類別
+                self.frontier.discard_pending()
+                # 其搜尋結果紀錄（含已收錄 URL、預取但未處理的頁）也一併丟棄
+                if self.api_client:
+                    self.api_client.clear_search_records()
+
+            if finished:
+                self._save_crawl_checkpoint(category, base_url, label, page, done=True)
 
             # 查詢間延遲（多風格時）
             if len(queries) > 1 and len(results) < max_spirits:
@@ -624,51 +1522,81 @@ class DistillerScraperV2:
 
         return results
 
+    def _parse_detail_html(self, url: str, html: str) -> Optional[Dict]:
+        """解析詳情頁 HTML（ScraperConfig.DETAIL_PARSER）；缺少品名時記為失敗並回傳 None。"""
+        if self.archive is not None:
+            # 解析前封存：即使選擇器抓不到品名，原始頁面仍可供修正後離線重新擷取
+            try:
+                self.archive.put(url, html, KIND_DISTILLER_HTML)
+            except Exception as e:  # 封存失敗（磁碟已滿、檔案鎖定）不影響爬取
+                logger.warning(f"頁面封存失敗 {url}: {e}")
+        data = extract_detail_html(html)
+
+        # 驗證必要欄位
+        if data["name"] == "N/A" or not data["name"]:
+            logger.warning(f"無法提取品名: {url}")
+            self.failed_urls.append(url)
+            return None
+
+        # 添加 URL
+        data["url"] = url
+        return data
+
     def scrape_spirit_detail(self, url: str, retry_count: int = 0) -> Optional[Dict]:
-        """爬取單個烈酒詳情頁（優先使用 API，失敗則 fallback Selenium）"""
+        """
+        爬取單個烈酒詳情頁（依序嘗試 API → 靜態 HTML → Selenium）。
+
+        API / 靜態 HTML 請求與並行路徑共用全域速率限制；並行 HTTP 階段已失敗的 URL 直接走 Selenium。
+        """
         if url in self.seen_urls:
             logger.debug(f"跳過重複 URL: {url}")
             return None
+        http_tried = url in self._http_failed
 
         # ── API 模式 ────────────────────────────────────────────────
-        if self.api_client and self.api_client.is_available():
-            api_data = self.api_client.fetch_spirit_detail(url)
+        if not http_tried and self.api_client and self.api_client.is_available():
+            api_data = self._fetch_detail_api(url)
             if api_data:
                 api_data["url"] = url
                 self.seen_urls.add(url)
-                if self.storage:
-                    self.storage.save_spirit(api_data)
+                self._persist(api_data)
                 logger.info(f"✓ [API] 已爬取: {api_data['name']}")
                 return api_data
             logger.debug(f"  API 詳情失敗，fallback Selenium: {url}")
 
+        # ── 靜態 HTML（不需 Chrome）────────────────────────────────
+        if not http_tried and self.html_fetcher:
+            html_data = self._fetch_detail_html(url)
+            if html_data:
+                self.seen_urls.add(url)
+                self._persist(html_data)
+                logger.info(f"✓ [HTTP] 已爬取: {html_data['name']}")
+                return html_data
+
         # ── Selenium fallback ────────────────────────────────────────
         max_retries = 3
 
-        try:
-            self.driver.get(url)
-            time.sleep(ScraperConfig.INITIAL_PAGE_DELAY)  # 等待 React 渲染完成
-
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
-
-            # 使用 DataExtractor 提取完整資料
-            data = DataExtractor.extract_spirit_details(soup)
+        if not self._ensure_driver():
+            self.failed_urls.append(url)
+            return None
 
-            # 驗證必要欄位
-            if data["name"] == "N/A" or not data["name"]:
-                logger.warning(f"無法提取品名: {url}")
+        try:
+            if not self._load_page(url):
                 self.failed_urls.append(url)
                 return None
+            self._wait_until_ready("detail")  # 等待 React 渲染出品名 / 風味圖譜
 
-            # 添加 URL
-            data["url"] = url
+            html = self.driver.page_source
+            self.resource_policy.observe(self.driver)
+            data = self._parse_detail_html(url, html)
+            if data is None:
+                return None
 
             # 標記為已處理
             self.seen_urls.add(url)
 
             # 即時寫入 storage
-            if self.storage:
-                self.storage.save_spirit(data)
+            self._persist(data)
 
             logger.info(f"✓ 已爬取: {data['name']}")
             return data
@@ -722,7 +1650,7 @@ class DistillerScraperV2:
             )
 
         # ── 傳統滾動模式（fallback） ──────────────────────────────────────
-        results: List[Dict] = []
+        results = self._new_results()
         queries = self._get_search_queries(category, use_styles)
 
         for search_url, label in queries:
@@ -731,7 +1659,9 @@ class DistillerScraperV2:
 
             logger.info(f"[滾動] 正在爬取: {label} ({search_url})")
             try:
-                urls = self._fetch_spirit_urls_from_page(search_url)
+                urls = self._fetch_spirit_urls_from_page(
+                    search_url, target_items=max_spirits - len(results)
+                )
                 logger.info(f"在 {label} 中找到 {len(urls)} 個烈酒連結")
                 self._scrape_urls(urls, category, results, max_spirits)
             except Exception as e:
@@ -761,12 +1691,30 @@ class DistillerScraperV2:
         max_per_category: int = None,
         use_styles: bool = True,
         use_pagination: bool = None,
+        refresh_stale: int = None,
+        request_budget: int = None,
+        time_budget: float = None,
     ):
-        """執行爬蟲"""
+        """執行爬蟲
+
+        refresh_stale：本次 run 重新爬取的過期烈酒上限（0 = 停用，需 storage 支援）
+        request_budget / time_budget：探索與過期刷新共用的請求數 / 秒數上限（0 = 不限）；
+          時間預算以每項詳情的 EWMA 成本預估，剩餘時間不足一項時於頁面之間收尾
+        未指定時沿用 ScraperConfig 預設。
+        """
         categories = categories or ScraperConfig.CATEGORIES
         max_per_category = max_per_category or ScraperConfig.MAX_SPIRITS_PER_CATEGORY
         if use_pagination is None:
             use_pagination = ScraperConfig.PAGINATION_ENABLED
+        self.budget = CrawlBudget(
+            request_budget if request_budget is not None else ScraperConfig.REQUEST_BUDGET,
+            time_budget if time_budget is not None else ScraperConfig.TIME_BUDGET_SECONDS,
+            reserve_seconds=ScraperConfig.TIME_BUDGET_RESERVE_SECONDS,
+            alpha=ScraperConfig.BUDGET_COST_EWMA_ALPHA,
+        )
+        if self.budget.max_seconds is not None and use_pagination:
+            # 與 DiffordsGuideScraper._order_by_value 相同：時間有限時先爬最可能有新烈酒的類別 / 查詢
+            categories = self._order_categories_by_value(categories, use_styles)
 
         start_time = datetime.now()
         logger.info(f"\n{'=' * 80}")
@@ -777,19 +1725,34 @@ class DistillerScraperV2:
         logger.info(f"分頁模式: {use_pagination}")
         logger.info(f"{'=' * 80}\n")
 
-        if not self.start_driver():
-            return False
-
-        if not self._health_check():
-            logger.error("Health check failed — aborting scrape")
-            return False
-
-        # API 端點探測（若 api_client 已設定）
         if self.api_client:
+            # API 模式：HTTP 健康檢查，Chrome 延遲到第一次需要 Selenium 時才啟動
+            if not self._http_health_check():
+                logger.error("Health check failed — aborting scrape")
+                return False
             self.discover_api(warm_up_category=categories[0])
+        else:
+            # 純 Selenium 模式：一開始就啟動 Chrome 並做頁面健康檢查
+            if not self.start_driver():
+                return False
+            if not self._health_check():
+                logger.error("Health check failed — aborting scrape")
+                self.close_driver()
+                return False
+
+        self._plan_stale_refresh(
+            categories,
+            refresh_stale if refresh_stale is not None else ScraperConfig.STALE_REFRESH_LIMIT,
+        )
 
+        completed_categories: List[str] = []
         try:
             for cat_idx, category in enumerate(categories, 1):
+                if self.budget.exhausted():
+                    logger.info(
+                        f"爬取預算已用完（{self.budget.stopped_by}），略過其餘類別: {categories[cat_idx - 1:]}"
+                    )
+                    break
                 try:
                     logger.info(f"\n{'=' * 60}")
                     logger.info(f"類別 {cat_idx}/{len(categories)}: {category}")
@@ -802,6 +1765,11 @@ class DistillerScraperV2:
                         use_pagination=use_pagination,
                     )
                     self.spirits_data.extend(category_results)
+                    # 預算中途用完的類別不算完成：保留檢查點，下一次 run 續爬
+                    if not self.budget.exhausted():
+                        completed_categories.append(category)
+                    # 類別結束（含首頁早停）：做完該類別剩下的過期刷新排程
+                    self._refresh_stale(category)
 
                     logger.info(f"類別 {category} 完成: {len(category_results)} 筆")
 
@@ -814,6 +1782,11 @@ class DistillerScraperV2:
                     logger.error(f"類別 {category} 爬取失敗: {e}")
                     continue
 
+            # 正常走完的類別才清除檢查點；拋錯或 Chrome 失效的類別保留，下一次 run 從中斷處續爬
+            if self.storage and completed_categories and not self.driver_failed:
+                with self._storage_lock:
+                    self.storage.clear_checkpoints(completed_categories)
+
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
 
@@ -832,6 +1805,248 @@ class DistillerScraperV2:
             return False
 
         finally:
+            self.close_driver_pool()
+            self.close_driver()
+
+    @staticmethod
+    def _parse_listing_score(text: str) -> Optional[float]:
+        """列表卡片的分數文字（如 "99"、"Score 92"、"4.47"）轉為數字；無數字時回傳 None。"""
+        match = re.search(r"\d+(?:\.\d+)?", text or "")
+        return float(match.group()) if match else None
+
+    def refresh_scores(
+        self,
+        categories: List[str] = None,
+        use_styles: bool = True,
+        pages_per_query: int = None,
+        rescrape: bool = True,
+    ) -> bool:
+        """
+        分數刷新模式：只走搜尋列表頁，以列表卡片的專家評分 / 社群評分批次更新已收錄的烈酒。
+
+        seen_urls 讓一般模式永遠不會重訪已收錄的烈酒，分數會逐漸過時；
+        逐一重爬詳情頁需要數千次頁面載入，而列表卡片已帶有兩個分數。
+        每個查詢最多走 pages_per_query 頁（列表依 distiller_score 排序，淺頁涵蓋主要烈酒），
+        分數有變動的烈酒才重新爬取完整詳情（rescrape=False 時只更新分數）。
+        每日刷新因此只需數十次列表頁載入。
+        有 api_client 時列表取自搜尋 API，整次刷新都由 API 完成時不會啟動 Chrome。
+        """
+        categories = categories or ScraperConfig.CATEGORIES
+        pages_per_query = pages_per_query or ScraperConfig.REFRESH_PAGES_PER_QUERY
+        stats = {"列表頁數": 0, "列表項目": 0, "已收錄": 0, "分數變動": 0, "重新爬取": 0}
+        self.refresh_stats = stats
+
+        logger.info(f"\n{'=' * 80}")
+        logger.info(f"分數刷新 - 類別: {categories}，每查詢 {pages_per_query} 頁")
+        logger.info(f"{'=' * 80}\n")
+
+        if self.api_client:
+            # API 模式：列表與詳情都可能由 API 完成，Chrome 延遲到第一次需要 Selenium 時才啟動
+            if not self._http_health_check():
+                logger.error("Health check failed — aborting refresh")
+                return False
+            self.discover_api(warm_up_category=categories[0])
+        elif not self._ensure_driver():
+            # 純 Selenium 模式：列表頁需要 Chrome，一開始就啟動並做頁面健康檢查
+            logger.error("Health check failed — aborting refresh")
+            return False
+
+        try:
+            changed_by_category: Dict[str, List[str]] = {}
+            for category in categories:
+                changed = changed_by_category.setdefault(category, [])
+                for base_url, label in self._get_search_queries(category, use_styles):
+                    logger.info(f"[刷新] {label}")
+                    prev_urls: Set[str] = set()
+                    for page in range(1, pages_per_query + 1):
+                        try:
+                            items = self._fetch_listing_items(base_url, page)
+                        except Exception as e:
+                            logger.error(f"  載入第 {page} 頁失敗: {e}")
+                            self.page_errors += 1
+                            break
+                        page_urls = {item["url"] for item in items}
+                        if not items or page_urls == prev_urls:
+                            break  # 無結果或分頁無效
+                        prev_urls = page_urls
+                        stats["列表頁數"] += 1
+                        stats["列表項目"] += len(items)
+
+                        known = [item for item in items if item["url"] in self.seen_urls]
+                        stats["已收錄"] += len(known)
+                        rows = [
+                            {
+                                "url": item["url"],
+                                "expert_score": self._parse_listing_score(item["distiller_score"]),
+                                "community_score": self._parse_listing_score(
+                                    item["community_rating"]
+                                ),
+                            }
+                            for item in known
+                        ]
+                        with self._storage_lock:
+                            updated = self.storage.update_listing_scores(rows) if self.storage else []
+                        changed.extend(u for u in updated if u not in changed)
+                        logger.info(
+                            f"  第 {page} 頁: {len(items)} 筆，已收錄 {len(known)} 筆，分數變動 {len(updated)} 筆"
+                        )
+                        if not known:
+                            break  # 已超出資料庫收錄範圍，後續頁不會有需要刷新的烈酒
+                        time.sleep(ScraperConfig.SCROLL_DELAY)
+
+            stats["分數變動"] = sum(len(urls) for urls in changed_by_category.values())
+
+            if rescrape:
+                for category, urls in changed_by_category.items():
+                    if not urls:
+                        continue
+                    logger.info(f"[刷新] {category}: 重新爬取 {len(urls)} 筆詳情")
+                    # 分數變動代表評論 / 描述也可能更新：移出 seen_urls 才會重新爬取；
+                    # 爬取失敗者放回，與 _refresh_stale 相同
+                    self.seen_urls.difference_update(urls)
+                    results = self._new_results()
+                    try:
+                        self._scrape_urls(urls, category, results, len(urls))
+                    finally:
+                        self.seen_urls.update(urls)
+                    self.spirits_data.extend(results)
+                    stats["重新爬取"] += len(results)
+
+            logger.info(f"分數刷新完成: {stats}")
+            return True
+
+        except Exception as e:
+            logger.error(f"分數刷新時發生錯誤: {e}")
+            return False
+
+        finally:
+            self.close_driver_pool()
+            self.close_driver()
+
+    def _sitemap_should_skip(
+        self, entry: SitemapEntry, lastmods: Dict[str, str], incremental: bool
+    ) -> bool:
+        """與 DiffordsGuideScraper._should_skip 相同的判斷：已收錄且 lastmod 未更新才略過。"""
+        if entry.url not in self.seen_urls:
+            return False  # 新 URL，必爬
+        if not incremental:
+            return False
+        if not entry.lastmod:
+            return True  # 無 lastmod，保守跳過
+        stored = lastmods.get(entry.url)
+        if not stored:
+            return False  # DB 無 lastmod，需重爬
+        # DB 只有日期（updated_at 代替）時只比較日期部分
+        return entry.lastmod[: len(stored)] <= stored
+
+    def scrape_sitemap(
+        self,
+        max_spirits: int = None,
+        incremental: bool = True,
+        discovery: Optional[SitemapDiscovery] = None,
+        time_budget: float = None,
+        request_budget: int = None,
+    ) -> bool:
+        """
+        Sitemap 探索模式：從 sitemap 取得烈酒 URL，以 lastmod 略過未變動者後爬取詳情。
+
+        不需翻搜尋頁，列表階段只有數次 sitemap 請求，也不受搜尋排序能觸及的範圍限制。
+        sitemap 不帶類別：新烈酒的 category 留空，已收錄者保留原本的類別。
+        incremental=False 時已收錄的烈酒一律重爬。詳情依 SITEMAP_BATCH_SIZE 分批，
+        批次之間檢查爬取預算（與 scrape() 共用 CrawlBudget 語意）。
+        """
+        discovery = discovery or SitemapDiscovery()
+        self.budget = CrawlBudget(
+            request_budget if request_budget is not None else ScraperConfig.REQUEST_BUDGET,
+            time_budget if time_budget is not None else ScraperConfig.TIME_BUDGET_SECONDS,
+            reserve_seconds=ScraperConfig.TIME_BUDGET_RESERVE_SECONDS,
+            alpha=ScraperConfig.BUDGET_COST_EWMA_ALPHA,
+        )
+        stats = {"烈酒 URL": 0, "略過": 0, "待爬": 0, "已爬取": 0}
+        self.sitemap_stats = stats
+
+        logger.info(f"\n{'=' * 80}")
+        logger.info(f"Sitemap 探索 - {discovery.index_url}（{'增量' if incremental else '全量'}）")
+        logger.info(f"{'=' * 80}\n")
+
+        entries = discovery.entries()
+        self.budget.spend(1 + discovery.stats["子 sitemap"])
+        if not entries:
+            logger.error("Sitemap 沒有任何烈酒 URL — aborting scrape")
+            return False
+        if self.shard.enabled:
+            # 平行任務：以烈酒 URL 雜湊分片
+            entries = self.shard.select(entries, key=lambda e: e.url)
+            logger.info(f"分片 {self.shard}: 負責 {len(entries)} 筆烈酒 URL")
+        stats["烈酒 URL"] = len(entries)
+
+        with self._storage_lock:
+            lastmods = self.storage.get_url_lastmod_map() if self.storage else {}
+        pending: List[SitemapEntry] = []
+        baseline: Dict[str, str] = {}
+        for entry in entries:
+            if self._sitemap_should_skip(entry, lastmods, incremental):
+                stats["略過"] += 1
+                # 已收錄但尚未記錄 lastmod：以本次 sitemap 值為基準，下次直接比對
+                if entry.lastmod and entry.url not in lastmods:
+                    baseline[entry.url] = entry.lastmod
+            else:
+                pending.append(entry)
+        if max_spirits is not None:
+            pending = pending[:max_spirits]
+        stats["待爬"] = len(pending)
+        self.budget.plan(len(pending))
+        logger.info(
+            f"Sitemap: {len(entries)} 筆烈酒，略過 {stats['略過']} 筆未變動，待爬 {len(pending)} 筆"
+        )
+
+        # 全量模式重爬已收錄者：移出 seen_urls 才會進入詳情階段，爬取失敗者於結束時放回
+        known = {e.url for e in pending if e.url in self.seen_urls}
+        self.seen_urls.difference_update(known)
+        lastmod_by_url = {e.url: e.lastmod for e in pending if e.lastmod}
+        results = self._new_results()
+        try:
+            if self.api_client:
+                # API 模式：HTTP 健康檢查；Chrome 由 _ensure_driver() 延遲啟動
+                if not self._http_health_check():
+                    logger.error("Health check failed — aborting scrape")
+                    return False
+                self.discover_api()
+            batch_size = max(ScraperConfig.SITEMAP_BATCH_SIZE, 1)
+            start = 0
+            while start < len(pending):
+                if self.budget.exhausted():
+                    logger.info(
+                        f"爬取預算已用完（{self.budget.stopped_by}），剩餘 {len(pending) - start} 筆留待下次"
+                    )
+                    break
+                urls = [e.url for e in pending[start : start + self.budget.allow(batch_size)]]
+                if not urls:
+                    break
+                start += len(urls)
+                self.budget.spend(len(urls))
+                batch: List[Dict] = []
+                self._scrape_urls_budgeted(urls, None, batch, len(urls))
+                # 成功者才記錄 lastmod：失敗的 URL 下次 run 仍視為有變動
+                for data in batch:
+                    if data.get("url") in lastmod_by_url:
+                        baseline[data["url"]] = lastmod_by_url[data["url"]]
+                results.extend(batch)
+            stats["已爬取"] = len(results)
+            logger.info(f"Sitemap 探索完成: {stats}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Sitemap 探索時發生錯誤: {e}")
+            return False
+
+        finally:
+            self.seen_urls.update(known)
+            if self.storage and baseline:
+                with self._storage_lock:
+                    self.storage.set_lastmods(baseline)
+            self.spirits_data.extend(results)
+            self.close_driver_pool()
             self.close_driver()
 
     def to_dataframe(self) -> pd.DataFrame:
@@ -866,6 +2081,21 @@ class DistillerScraperV2:
             logger.error(f"儲存 CSV 時發生錯誤: {e}")
             return False
 
+    def _search_record_summary(self) -> Dict:
+        if not self.api_client:
+            return {}
+        return {**dict(self.api_client.harvest_stats), "直接儲存": self.search_record_saves}
+
+    def _stale_refresh_summary(self) -> Dict:
+        if self.stale_scheduler is None:
+            return {}
+        return {**self.stale_scheduler.summary(), "重新爬取": self.stale_refreshed}
+
+    def _resource_summary(self) -> Dict:
+        detail = self.page_waiter.stats.get("detail")
+        ready = round(detail.total_seconds / detail.count, 2) if detail and detail.count else None
+        return self.resource_policy.summary(ready)
+
     def get_statistics(self) -> Dict:
         """獲取統計資訊"""
         if not self.spirits_data:
@@ -873,30 +2103,65 @@ class DistillerScraperV2:
                 "總記錄數": 0,
                 "失敗 URL 數": len(self.failed_urls),
                 "頁面載入失敗數": self.page_errors,
+                "頁面等待": self.page_waiter.summary(),
+                "靜態 HTML 詳情": self.html_fetcher.summary() if self.html_fetcher else {},
+                "資源封鎖": self._resource_summary(),
+                "Chrome 回收": self.watchdog.summary(),
+                "搜尋頁預取": dict(self.prefetch_stats),
+                "查詢重疊": self.frontier.summary(),
+                "分數刷新": dict(self.refresh_stats),
+                "列表擷取": dict(self.listing_extract_stats),
+                "滾動效率": self.scroll_waiter.summary(),
+                "搜尋結果欄位": self._search_record_summary(),
+                "過期刷新": self._stale_refresh_summary(),
+                "Sitemap 探索": dict(self.sitemap_stats),
+                "爬取預算": self.budget.summary(),
+                "頁面封存": self.archive.summary() if self.archive else {},
             }
 
-        df = self.to_dataframe()
+        if isinstance(self.spirits_data, StreamingRecords):
+            # 串流模式：記錄未保留，改用逐筆累計的計數
+            tally = self.spirits_data.tally
+            total, categories, field_stats = tally.count, tally.categories(), tally.field_coverage()
+        else:
+            df = self.to_dataframe()
 
-        # 計算各欄位的有效率
-        field_stats = {}
-        for col in df.columns:
-            if col in ["url", "flavor_data"]:
-                continue
-            valid_count = (
-                (df[col] != "N/A") & (df[col] != "") & (df[col].notna())
-            ).sum()
-            field_stats[col] = (
-                f"{valid_count}/{len(df)} ({valid_count / len(df) * 100:.1f}%)"
+            # 計算各欄位的有效率
+            field_stats = {}
+            for col in df.columns:
+                if col in ["url", "flavor_data"]:
+                    continue
+                valid_count = (
+                    (df[col] != "N/A") & (df[col] != "") & (df[col].notna())
+                ).sum()
+                field_stats[col] = (
+                    f"{valid_count}/{len(df)} ({valid_count / len(df) * 100:.1f}%)"
+                )
+            total = len(df)
+            categories = (
+                df["category"].value_counts().to_dict() if "category" in df.columns else {}
             )
 
         return {
-            "總記錄數": len(df),
+            "總記錄數": total,
             "失敗 URL 數": len(self.failed_urls),
             "頁面載入失敗數": self.page_errors,
-            "類別分布": df["category"].value_counts().to_dict()
-            if "category" in df.columns
-            else {},
+            "類別分布": categories,
             "欄位有效率": field_stats,
+            "頁面等待": self.page_waiter.summary(),
+            "靜態 HTML 詳情": self.html_fetcher.summary() if self.html_fetcher else {},
+            "資源封鎖": self._resource_summary(),
+            "Chrome 回收": self.watchdog.summary(),
+            "搜尋頁預取": dict(self.prefetch_stats),
+            "查詢重疊": self.frontier.summary(),
+            "分數刷新": dict(self.refresh_stats),
+            "列表擷取": dict(self.listing_extract_stats),
+            "滾動效率": self.scroll_waiter.summary(),
+            "搜尋結果欄位": self._search_record_summary(),
+            "過期刷新": self._stale_refresh_summary(),
+            "Sitemap 探索": dict(self.sitemap_stats),
+            "爬取預算": self.budget.summary(),
+            "頁面封存": self.archive.summary() if self.archive else {},
         }
 
 
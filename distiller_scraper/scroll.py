@@ -0,0 +1,187 @@
+"""
+項目數感知的無限滾動：以列表項目數增加（或網路閒置）取代固定的 SCROLL_DELAY 等待。
+
+設計理由
+--------
+scroll_page() 原本每次滾動後固定 sleep SCROLL_DELAY（2 秒）再比較 scrollHeight，
+最多 15 次；每個列表頁至少多等 2 秒（最後一次滾動確認「沒有變高」），
+lazy-load 實際多在數百毫秒內完成，到底後也一樣要等滿 2 秒才知道。
+
+ScrollWaiter 每次滾動後以 probe（單次 execute_script）輪詢：
+- Selectors.SPIRIT_LIST_ITEM 的節點數增加 → 立即滾下一次
+- 網路閒置：進行中的 fetch / XHR 為 0，且 PerformanceObserver 觀察到的資源數在 idle_seconds 內
+  不再變化 → 視為沒有更多內容；至少等滿 min_wait 才採用閒置訊號
+  （lazy-load 請求可能在滾動後稍晚才發出）。
+  不用 performance.getEntriesByType("resource").length：資源緩衝區預設上限 250 筆，
+  長時間滾動的頁面填滿後數量不再變化，會被誤判為閒置
+- 等待上限隨實際載入耗時調整（EWMA × 2，介於 min_wait 與 max_wait = SCROLL_DELAY），
+  慢的頁面仍有完整的 SCROLL_DELAY，快的頁面不必每次等滿
+
+target 指定時，新項目（href 不在 known_urls）達到目標即停止滾動；新項目數在 Python 端以 probe
+回傳的 href 計算，已收錄 URL 集合（整次執行可達數萬筆）不傳入瀏覽器。
+probe 不可用（舊版頁面、測試 mock 的回傳值）時退回固定 SCROLL_DELAY，行為與原本相同。
+每頁的滾動次數、載入項目數與耗時記錄於 summary()（含每秒載入項目數）。
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import AbstractSet, Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 參數：列表項目選擇器、是否回傳各項目的連結
+# 同一文件第一次執行時安裝網路計數：PerformanceObserver 累計資源數（不受資源緩衝區上限影響）、
+# 包裝 fetch / XMLHttpRequest 計算進行中的請求數；換頁後新文件重新安裝
+# 回傳 [項目數, 累計資源數, 進行中請求數, 連結 href 陣列或 null]
+_PROBE_SCRIPT = """
+const [sel, withLinks] = arguments;
+let net = window.__distillerNet;
+if (!net) {
+  net = window.__distillerNet = {resources: 0, inflight: 0};
+  try {
+    new PerformanceObserver(list => { net.resources += list.getEntries().length; })
+      .observe({type: "resource"});
+  } catch (e) {}
+  const done = () => { net.inflight = Math.max(0, net.inflight - 1); };
+  if (window.fetch) {
+    const fetch0 = window.fetch;
+    window.fetch = function () {
+      net.inflight++;
+      try { return fetch0.apply(this, arguments).finally(done); } catch (e) { done(); throw e; }
+    };
+  }
+  const send0 = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    net.inflight++;
+    this.addEventListener("loadend", done, {once: true});
+    try { return send0.apply(this, arguments); } catch (e) { done(); throw e; }
+  };
+}
+const items = document.querySelectorAll(sel);
+const links = withLinks
+  ? Array.from(items, li => { const a = li.querySelector("a"); return a ? a.href : null; })
+  : null;
+return [items.length, net.resources, net.inflight, links];
+"""
+
+
+@dataclass(frozen=True)
+class ScrollProbe:
+    """單次 probe 結果：列表項目數、累計資源數、進行中請求數，以及（要求時）各項目的連結。"""
+
+    items: int
+    resources: int
+    inflight: int
+    links: Optional[Tuple[Optional[str], ...]] = None
+
+    def fresh(self, known_urls: Optional[AbstractSet[str]]) -> int:
+        """不在 known_urls 的項目數；known_urls 為 None 時所有項目皆算新項目。"""
+        if known_urls is None:
+            return self.items
+        if self.links is None:
+            return 0
+        return sum(1 for href in self.links if href and href not in known_urls)
+
+
+class ScrollWaiter:
+    """滾動後等待列表項目增加；記錄每頁的滾動效率。"""
+
+    def __init__(
+        self,
+        selector: str,
+        max_wait: float,
+        min_wait: float,
+        idle_seconds: float,
+        poll_interval: float = 0.2,
+        alpha: float = 0.3,
+    ):
+        self.selector = selector
+        self.max_wait = max_wait
+        self.min_wait = min(min_wait, max_wait)
+        self.idle_seconds = idle_seconds
+        self.poll_interval = poll_interval
+        self.alpha = alpha
+        self._latency: Optional[float] = None  # 項目增加所需秒數的 EWMA
+        self.pages = 0
+        self.scrolls = 0
+        self.items = 0
+        self.seconds = 0.0
+        self.early_stops = 0  # 達到 target 提前停止的頁數
+
+    def probe(self, driver: Any, links: bool = False) -> Optional[ScrollProbe]:
+        """讀取目前項目數（links=True 時一併取回各項目連結）；腳本失敗或回傳格式不符時回傳 None。"""
+        try:
+            raw = driver.execute_script(_PROBE_SCRIPT, self.selector, links)
+        except Exception:
+            return None
+        if (
+            not isinstance(raw, list)
+            or len(raw) != 4
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in raw[:3])
+            or not (raw[3] is None or isinstance(raw[3], list))
+        ):
+            return None
+        hrefs = tuple(raw[3]) if raw[3] is not None else None
+        return ScrollProbe(raw[0], raw[1], raw[2], hrefs)
+
+    @property
+    def timeout(self) -> float:
+        """本次等待上限：尚無觀測時為 max_wait。"""
+        if self._latency is None:
+            return self.max_wait
+        return min(self.max_wait, max(self.min_wait, self._latency * 2))
+
+    def wait_for_growth(self, driver: Any, before: ScrollProbe) -> Optional[ScrollProbe]:
+        """
+        滾動後輪詢至項目數增加、網路閒置或逾時，回傳最後一次 probe（皆失敗時 None）。
+
+        閒置：沒有進行中的請求、資源數 idle_seconds 內不變，且已等滿 min_wait。
+        """
+        start = time.monotonic()
+        timeout = self.timeout
+        last, active_since = before, start
+        while True:
+            time.sleep(self.poll_interval)
+            now = time.monotonic()
+            current = self.probe(driver)
+            if current is None:
+                return None
+            if current.items > before.items:
+                elapsed = now - start
+                self._latency = (
+                    elapsed
+                    if self._latency is None
+                    else self.alpha * elapsed + (1 - self.alpha) * self._latency
+                )
+                return current
+            if current.inflight > 0 or current.resources != last.resources:
+                active_since = now
+            last = current
+            elapsed = now - start
+            idle = elapsed >= self.min_wait and now - active_since >= self.idle_seconds
+            if idle or elapsed >= timeout:
+                return current
+
+    def record_page(self, scrolls: int, items: int, seconds: float, early_stop: bool) -> None:
+        self.pages += 1
+        self.scrolls += scrolls
+        self.items += items
+        self.seconds += seconds
+        self.early_stops += int(early_stop)
+        rate = items / seconds if seconds > 0 else 0.0
+        logger.info(
+            f"滾動完成：{scrolls} 次，載入 {items} 筆，{seconds:.1f} 秒（{rate:.1f} 筆/秒）"
+            + ("，已達目標數" if early_stop else "")
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """滾動效率統計（供 get_statistics 輸出）。"""
+        return {
+            "頁數": self.pages,
+            "滾動次數": self.scrolls,
+            "載入項目": self.items,
+            "秒數": round(self.seconds, 1),
+            "每秒項目數": round(self.items / self.seconds, 1) if self.seconds > 0 else 0.0,
+            "達到目標提前停止": self.early_stops,
+        }
@@ -15,6 +15,13 @@ Distiller.com 的 HTML 使用 BEM 命名慣例（.spirit-badge, .distiller-score
 3. Selectors.FLAVOR_CHART（風味圖譜 data-flavors 屬性）
 4. Selectors.SPIRIT_LIST_ITEM（搜索結果列表項目）
 
+列表頁的瀏覽器端擷取
+--------------------
+搜尋頁滾動 15 次後 page_source 可達數 MB，只為了讀列表卡片的 href 與分數。
+LIST_ITEMS_SCRIPT 以 execute_script 在瀏覽器內直接讀取卡片欄位，
+回傳去重後的精簡 JSON 陣列，由 DataExtractor.parse_list_items_json() 轉成與
+extract_list_item() 相同的 dict；腳本失敗時呼叫端才退回 BeautifulSoup 解析 page_source。
+
 風味圖譜的提取策略
 ------------------
 Distiller.com 使用 Chart.js 渲染風味雷達圖，資料存在：
@@ -247,6 +254,72 @@ class DataExtractor:
             "origin": DataExtractor.extract_text(item_soup, Selectors.LIST_ORIGIN),
         }
 
+    @staticmethod
+    def list_items_script_args() -> tuple:
+        """LIST_ITEMS_SCRIPT 的參數（選擇器仍只定義在 Selectors）。"""
+        return (
+            Selectors.SPIRIT_LIST_ITEM,
+            Selectors.LIST_NAME,
+            Selectors.LIST_DISTILLER_SCORE,
+            Selectors.LIST_COMMUNITY_RATING,
+            Selectors.LIST_ORIGIN,
+        )
+
+    @staticmethod
+    def parse_list_items_json(raw) -> Optional[list]:
+        """LIST_ITEMS_SCRIPT 的回傳值 → extract_list_item() 格式的 list；格式不符時回傳 None。"""
+        if not isinstance(raw, str):
+            return None
+        try:
+            rows = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(rows, list):
+            return None
+        items: Dict[str, dict] = {}
+        for row in rows:
+            if not isinstance(row, list) or len(row) != 5 or not isinstance(row[0], str):
+                return None
+            href, name, score, rating, origin = row
+            url = f"https://distiller.com{href}" if href.startswith("/") else href
+            # 相對與絕對 href 指向同一烈酒時只保留首次出現者
+            items.setdefault(
+                url,
+                {
+                    "name": name or "N/A",
+                    "url": url,
+                    "distiller_score": score or "N/A",
+                    "community_rating": rating or "N/A",
+                    "origin": origin or "N/A",
+                },
+            )
+        return list(items.values())
+
+
+# 參數：列表項目、名稱、專家評分、社群評分、產地的 CSS 選擇器（Selectors.SPIRIT_LIST_ITEM / LIST_*）
+# 文字取法對齊 get_text(strip=True)：各文字節點 trim 後串接；找不到元素或文字為空時回傳 null
+LIST_ITEMS_SCRIPT = """
+const [itemSel, nameSel, scoreSel, ratingSel, originSel] = arguments;
+const text = (root, sel) => {
+  const el = root.querySelector(sel);
+  if (!el) return null;
+  const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+  let out = "";
+  while (walker.nextNode()) out += walker.currentNode.nodeValue.trim();
+  return out || null;
+};
+const seen = new Set();
+const items = [];
+for (const li of document.querySelectorAll(itemSel)) {
+  const link = li.querySelector("a");
+  const href = link ? link.getAttribute("href") || "" : "";
+  if (!href.includes("/spirits/") || seen.has(href)) continue;
+  seen.add(href);
+  items.push([href, text(li, nameSel), text(li, scoreSel), text(li, ratingSel), text(li, originSel)]);
+}
+return JSON.stringify(items);
+"""
+
 
 class SearchURLBuilder:
     """搜索 URL 構建器"""
@@ -0,0 +1,152 @@
+"""
+工作分片：把一次爬取拆給多個平行的 Cloud Run 任務，各自寫入獨立的 SQLite 分片，最後合併。
+
+設計理由
+--------
+`run.py --mode full` 是單一程序循序爬完 7 個類別、數十個風格查詢，
+耗時受限於單一 Chrome / 單一速率限制器。Cloud Run Jobs 可以同時啟動多個任務
+（--tasks N），並以 CLOUD_RUN_TASK_INDEX / CLOUD_RUN_TASK_COUNT 告知每個任務自己的編號。
+
+切分方式（ShardSpec.owns）：
+- 搜尋分頁模式：以查詢 URL（類別 + 風格）為單位分配
+  → 每個查詢的翻頁、早停與檢查點完全在同一個任務內，不需跨任務協調
+- Sitemap 模式 / 過期刷新：以烈酒 URL 為單位分配（雜湊範圍）
+- 分配以 crc32(key) % count 決定：各任務各自計算、結果一致且互斥，
+  不依賴 Python 內建 hash()（每個程序的 hash seed 不同）
+
+分片資料庫：
+- 每個任務寫入 distiller.shard-<i>-of-<n>.db（shard_db_path），
+  開始前以 SQLite backup API 從主資料庫複製一份（prepare_shard_db），
+  seen_urls 去重與檢查點續爬照常運作
+- 所有任務結束後，merge 步驟（run.py --mode merge-shards）以 merge_shards()
+  把分片合併回主資料庫：烈酒依 updated_at 較新者為準、各分片的 scrape_runs 追加（見 db_merge.py），
+  爬取檢查點則由擁有該查詢的分片整份取代（分片清除的檢查點也一併清除）
+"""
+
+import os
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TypeVar
+
+from .db_merge import attach, merge_runs, merge_spirits
+
+T = TypeVar("T")
+
+
+def shard_of(key: str, count: int) -> int:
+    """key 所屬的分片編號（跨程序穩定）。"""
+    return zlib.crc32(key.encode("utf-8")) % count if count > 1 else 0
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """本任務的分片編號（index）與分片總數（count）；count = 1 代表不分片。"""
+
+    index: int = 0
+    count: int = 1
+
+    def __post_init__(self):
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError(f"無效的分片設定: {self.index}/{self.count}")
+
+    @classmethod
+    def from_env(
+        cls,
+        index: Optional[int] = None,
+        count: Optional[int] = None,
+        environ: Optional[Dict[str, str]] = None,
+    ) -> "ShardSpec":
+        """CLI 參數優先，其次 CLOUD_RUN_TASK_INDEX / CLOUD_RUN_TASK_COUNT，皆未設定時不分片。"""
+        environ = os.environ if environ is None else environ
+        if index is None:
+            index = int(environ.get("CLOUD_RUN_TASK_INDEX", 0))
+        if count is None:
+            count = int(environ.get("CLOUD_RUN_TASK_COUNT", 1))
+        return cls(index, count)
+
+    @property
+    def enabled(self) -> bool:
+        return self.count > 1
+
+    def owns(self, key: str) -> bool:
+        return shard_of(key, self.count) == self.index
+
+    def select(self, items: Iterable[T], key=lambda item: item) -> List[T]:
+        """保留本分片負責的項目（key 取出分配用的字串）。"""
+        return [item for item in items if self.owns(key(item))]
+
+    def db_path(self, db_path: str) -> str:
+        """本分片的 SQLite 路徑；不分片時即主資料庫。"""
+        return shard_db_path(db_path, self.index, self.count) if self.enabled else db_path
+
+    def __str__(self) -> str:
+        return f"{self.index + 1}/{self.count}"
+
+
+def shard_db_path(db_path: str, index: int, count: int) -> str:
+    """distiller.db → distiller.shard-<index>-of-<count>.db"""
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}.shard-{index}-of-{count}{path.suffix}"))
+
+
+def prepare_shard_db(db_path: str, shard_path: str) -> bool:
+    """以主資料庫為起點建立分片（backup API，WAL 中未 checkpoint 的內容也會帶上）。
+
+    分片已存在（例如已從 GCS 下載）或主資料庫不存在時不動作，回傳是否有複製。
+    """
+    if Path(shard_path).exists() or not Path(db_path).exists():
+        return False
+    src = sqlite3.connect(db_path)
+    dst = sqlite3.connect(shard_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return True
+
+
+def merge_shards(db_path: str, count: int) -> Dict:
+    """把 count 個分片合併回主資料庫；不存在的分片略過（該分片的檢查點維持原狀）。
+
+    回傳 分片（已合併數）/ 缺少（分片編號）/ 新增 / 更新 / 執行紀錄 筆數。
+    """
+    from .storage import SQLiteStorage
+
+    SQLiteStorage(db_path).close()  # 建立 / 遷移主資料庫 schema
+    conn = sqlite3.connect(db_path)
+    conn.create_function("shard_of", 2, shard_of, deterministic=True)
+    stats: Dict = {"分片": 0, "缺少": [], "新增": 0, "更新": 0, "執行紀錄": 0}
+    try:
+        for index in range(count):
+            path = shard_db_path(db_path, index, count)
+            # GCS 下載失敗時 download_db 會留下 0 位元組的空白檔，同樣視為缺少
+            if not Path(path).exists() or Path(path).stat().st_size == 0:
+                stats["缺少"].append(index)
+                continue
+            with attach(conn, path) as alias:
+                merged = merge_spirits(conn, alias)
+                stats["執行紀錄"] += merge_runs(conn, "scrape_runs", alias)
+                with conn:
+                    # 本分片負責的查詢：檢查點以分片為準（含分片已清除者）
+                    conn.execute(
+                        "DELETE FROM crawl_checkpoints WHERE shard_of(query, ?) = ?",
+                        (count, index),
+                    )
+                    conn.execute(
+                        f"""
+                        INSERT INTO crawl_checkpoints
+                            (category, query, label, last_page, state, updated_at)
+                        SELECT category, query, label, last_page, state, updated_at
+                        FROM {alias}.crawl_checkpoints WHERE shard_of(query, ?) = ?
+                        """,
+                        (count, index),
+                    )
+            stats["分片"] += 1
+            stats["新增"] += merged["新增"]
+            stats["更新"] += merged["更新"]
+    finally:
+        conn.close()
+    return stats
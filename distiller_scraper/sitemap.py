@@ -0,0 +1,116 @@
+"""
+Sitemap 探索：從 distiller.com 的 sitemap 索引取得所有烈酒詳情頁 URL 與 lastmod。
+
+設計理由
+--------
+分頁模式要用 Selenium（或 API）逐頁翻搜尋結果，7 個類別 × 多個風格 × 最多 50 頁，
+光是列表頁就要數百次頁面載入，而且只能看到搜尋排序能觸及的烈酒。
+DiffordsGuideScraper.parse_sitemap() 已示範另一種做法：sitemap 一次列出全站 URL，
+只需數次 HTTP 請求、不需要瀏覽器。
+
+SitemapDiscovery 的流程：
+- 下載 SITEMAP_INDEX_URL；根節點是 <sitemapindex> 時逐一下載子 sitemap，
+  是 <urlset> 時直接解析（網站沒有分割 sitemap 的情況）
+- 子 sitemap 常以 .xml.gz 提供：依 gzip magic bytes（1f 8b）判斷並解壓，
+  不依賴副檔名或 Content-Type（伺服器已用 Content-Encoding 解壓時 requests 會自動處理）
+- 只保留 /spirits/<slug> 形式的詳情頁 URL（排除列表、評論等其他路徑），依 URL 去重
+
+單一子 sitemap 下載或解析失敗只略過該檔並記入 stats，不影響其他子 sitemap。
+是否略過未變動的烈酒（lastmod 比對）由 DistillerScraperV2.scrape_sitemap() 決定。
+"""
+
+import gzip
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .config import ScraperConfig
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+_NS = {"sm": SITEMAP_NAMESPACE}
+
+
+@dataclass
+class SitemapEntry:
+    url: str
+    lastmod: Optional[str] = None
+
+
+class SitemapDiscovery:
+    """解析 sitemap 索引（含 gzip 子 sitemap），回傳烈酒詳情頁 URL 與 lastmod。"""
+
+    def __init__(
+        self,
+        index_url: str = None,
+        session: Optional[requests.Session] = None,
+        timeout: float = None,
+    ):
+        self.index_url = index_url or ScraperConfig.SITEMAP_INDEX_URL
+        self.timeout = timeout or ScraperConfig.SITEMAP_TIMEOUT
+        self.session = session or requests.Session()
+        self.session.headers.update({"User-Agent": ScraperConfig.USER_AGENT})
+        self.stats: Dict[str, int] = {"子 sitemap": 0, "失敗": 0, "烈酒 URL": 0}
+
+    def _fetch_xml(self, url: str) -> Optional[ET.Element]:
+        try:
+            resp = self.session.get(url, timeout=self.timeout)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Sitemap 取得失敗 {url}: {e}")
+            return None
+        content = resp.content
+        try:
+            if content[:2] == b"\x1f\x8b":
+                content = gzip.decompress(content)
+            return ET.fromstring(content)
+        except (OSError, EOFError, ET.ParseError) as e:
+            logger.warning(f"Sitemap 解析失敗 {url}: {e}")
+            return None
+
+    @staticmethod
+    def is_spirit_url(url: str) -> bool:
+        """/spirits/<slug>（不含更深的子路徑）才是詳情頁。"""
+        parts = urlparse(url).path.strip("/").split("/")
+        return len(parts) == 2 and parts[0] == "spirits" and bool(parts[1])
+
+    def _parse_urlset(self, root: ET.Element, found: Dict[str, SitemapEntry]) -> None:
+        for url_el in root.findall("sm:url", _NS):
+            loc = (url_el.findtext("sm:loc", namespaces=_NS) or "").strip()
+            if loc and loc not in found and self.is_spirit_url(loc):
+                lastmod = url_el.findtext("sm:lastmod", namespaces=_NS)
+                found[loc] = SitemapEntry(loc, lastmod.strip() if lastmod else None)
+
+    def entries(self) -> List[SitemapEntry]:
+        """下載並解析整個 sitemap；索引本身取得失敗時回傳空列表。"""
+        logger.info(f"解析 Sitemap: {self.index_url}")
+        root = self._fetch_xml(self.index_url)
+        if root is None:
+            self.stats["失敗"] += 1
+            return []
+
+        found: Dict[str, SitemapEntry] = {}
+        if root.tag.endswith("sitemapindex"):
+            for loc_el in root.findall("sm:sitemap/sm:loc", _NS):
+                child_url = (loc_el.text or "").strip()
+                if not child_url:
+                    continue
+                self.stats["子 sitemap"] += 1
+                child = self._fetch_xml(child_url)
+                if child is None:
+                    self.stats["失敗"] += 1
+                    continue
+                self._parse_urlset(child, found)
+        else:
+            self._parse_urlset(root, found)
+
+        self.stats["烈酒 URL"] = len(found)
+        logger.info(
+            f"Sitemap 解析完成：{self.stats['子 sitemap']} 個子 sitemap，{len(found)} 筆烈酒 URL"
+        )
+        return list(found.values())
@@ -0,0 +1,89 @@
+"""
+過期資料刷新排程：每次 run 挑出一批最需要重爬的已收錄烈酒，與新 URL 探索交錯進行。
+
+設計理由
+--------
+seen_urls 讓一般模式永遠不會重訪已收錄的烈酒，評分與評論數會逐漸過時。
+refresh_scores() 只能以列表卡片上的分數偵測變動，看不到評論數、描述等欄位；
+全面重爬詳情又需要數千次請求。折衷做法是每次 run 固定重爬一小批，
+長期下來整個資料庫會輪流被刷新。
+
+挑選方式（SQLiteStorage.select_stale_spirits + StaleRefreshScheduler）：
+- 候選集：依 updated_at 由舊到新，以 idx_spirits_updated_at 取出
+  limit × STALE_CANDIDATE_FACTOR 筆超過 STALE_MIN_AGE_DAYS 天未更新的烈酒
+  → 只讀取有界的索引前綴，不把整張 spirits 表載入記憶體
+- 優先序：在候選集內依 priority() 排序，保留前 limit 筆
+    priority = 距上次更新天數
+             × (1 + STALE_MOMENTUM_WEIGHT × ln(1 + 評論增量))
+             × 類別權重（STALE_CATEGORY_WEIGHTS，未列出的類別為 1.0）
+  評論增量（review_delta）是上一次更新時 review_count 的成長量：
+  評論持續增加的熱門烈酒分數最可能變動，比同樣久未更新的冷門烈酒先刷新
+
+交錯方式：scrape_category_paginated 每處理完一頁列表，就從排程取出該類別
+最多 STALE_REFRESH_PER_PAGE 筆重爬；類別結束時（含首頁早停）再把該類別剩下的排程做完。
+兩者共用同一份 CrawlBudget（見 budget.py），額度用完時一起停止。
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+
+class StaleRefreshScheduler:
+    """依優先序分類別排好的過期烈酒 URL；take() 依類別取出。"""
+
+    def __init__(
+        self,
+        candidates: Iterable[Dict],
+        limit: int,
+        category_weights: Optional[Dict[str, float]] = None,
+        momentum_weight: float = 0.5,
+    ):
+        rows = list(candidates)
+        self.candidates = len(rows)
+        ranked = sorted(
+            rows,
+            key=lambda row: self.priority(row, category_weights or {}, momentum_weight),
+            reverse=True,
+        )[: max(limit, 0)]
+        self._queues: Dict[Optional[str], Deque[str]] = {}
+        for row in ranked:
+            self._queues.setdefault(row.get("category"), deque()).append(row["url"])
+        self.scheduled = len(ranked)
+        self.taken: Dict[Optional[str], int] = {}
+
+    @staticmethod
+    def priority(
+        row: Dict, category_weights: Dict[str, float], momentum_weight: float
+    ) -> float:
+        age = max(row.get("age_days") or 0.0, 0.0)
+        momentum = math.log1p(max(row.get("review_delta") or 0, 0))
+        weight = category_weights.get(row.get("category"), 1.0)
+        return age * (1 + momentum_weight * momentum) * weight
+
+    def take(self, category: Optional[str], limit: Optional[int] = None) -> List[str]:
+        """取出 category 優先序最高的 limit 筆（None = 全部）。"""
+        queue = self._queues.get(category)
+        if not queue:
+            return []
+        count = len(queue) if limit is None else min(limit, len(queue))
+        urls = [queue.popleft() for _ in range(max(count, 0))]
+        if urls:
+            self.taken[category] = self.taken.get(category, 0) + len(urls)
+        return urls
+
+    def pending(self, category: Optional[str] = None) -> int:
+        if category is not None:
+            return len(self._queues.get(category, ()))
+        return sum(len(q) for q in self._queues.values())
+
+    def __len__(self) -> int:
+        return self.pending()
+
+    def summary(self) -> Dict:
+        return {
+            "候選": self.candidates,
+            "排程": self.scheduled,
+            "已取出": sum(self.taken.values()),
+            "各類別": {str(k): v for k, v in self.taken.items()},
+        }
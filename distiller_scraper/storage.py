@@ -23,7 +23,14 @@ SQLite Schema 設計要點
 - spirits.url 設 UNIQUE：防止重複爬取同一烈酒頁面（url 是天然主鍵）
 - flavor_profiles：獨立資料表 + FOREIGN KEY，支援依風味維度查詢
   （如：找出 smoky 分數最高的 10 款威士忌）
-- scrape_runs：紀錄每次爬取的元資料，用於稽核與效能分析
+- scrape_runs：紀錄每次爬取的元資料，用於稽核與效能分析；
+  planned / completed 為計畫與實際處理的項數，status = 'partial' 代表時間 / 請求預算用完提前收尾
+- spirits.review_delta：最近一次更新時 review_count 的增量（評論動能），
+  與 idx_spirits_updated_at 一起供過期刷新排程挑選優先重爬的烈酒（見 staleness.py）
+- spirits.lastmod：上次爬取時 sitemap 記載的 lastmod，sitemap 探索以此略過未變動的烈酒（見 sitemap.py）
+- crawl_checkpoints：分頁爬取的進度檢查點（category + 查詢 URL 為主鍵），
+  記錄最後完整處理的頁碼與分頁狀態；run 中途被 OOM / Cloud Run 逾時中止時，
+  下一次 run 從該頁之後繼續，而不是每個查詢都從第 1 頁重新走一遍
 - WAL (Write-Ahead Logging)：允許讀寫同時進行，提升並發效能
 - PRAGMA foreign_keys = ON：強制執行 FK 約束（SQLite 預設關閉）
 
@@ -64,6 +71,8 @@ CREATE TABLE IF NOT EXISTS spirits (
     expert_score   INTEGER,
     community_score REAL,
     review_count   INTEGER,
+    review_delta   INTEGER,
+    lastmod        TEXT,
     description    TEXT,
     tasting_notes  TEXT,
     expert_name    TEXT,
@@ -90,17 +99,36 @@ CREATE TABLE IF NOT EXISTS scrape_runs (
     total_scraped  INTEGER DEFAULT 0,
     total_failed   INTEGER DEFAULT 0,
     mode           TEXT,
-    status         TEXT DEFAULT 'running'
+    status         TEXT DEFAULT 'running',
+    planned        INTEGER,
+    completed      INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+    category       TEXT NOT NULL,
+    query          TEXT NOT NULL,
+    label          TEXT,
+    last_page      INTEGER NOT NULL,
+    state          TEXT,
+    updated_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (category, query)
 );
 
 CREATE INDEX IF NOT EXISTS idx_spirits_category      ON spirits(category);
 CREATE INDEX IF NOT EXISTS idx_spirits_brand         ON spirits(brand);
 CREATE INDEX IF NOT EXISTS idx_spirits_country       ON spirits(country);
 CREATE INDEX IF NOT EXISTS idx_spirits_expert_score  ON spirits(expert_score);
+CREATE INDEX IF NOT EXISTS idx_spirits_updated_at    ON spirits(updated_at);
 CREATE INDEX IF NOT EXISTS idx_flavor_spirit         ON flavor_profiles(spirit_id);
 CREATE INDEX IF NOT EXISTS idx_flavor_name           ON flavor_profiles(flavor_name);
 """
 
+# 舊版資料庫缺少的欄位：CREATE TABLE IF NOT EXISTS 不會補上新欄位，開啟時以 ALTER TABLE 補齊
+_MIGRATIONS = {
+    "spirits": [("review_delta", "INTEGER"), ("lastmod", "TEXT")],
+    "scrape_runs": [("planned", "INTEGER"), ("completed", "INTEGER")],
+}
+
 # 欄位轉型輔助
 def _to_real(value: Any) -> Optional[float]:
     if value in (None, "N/A", ""):
@@ -153,6 +181,36 @@ class StorageBackend(ABC):
     def close(self):
         """關閉連線 / 釋放資源"""
 
+    def update_listing_scores(self, rows: List[Dict]) -> List[str]:
+        """以列表頁分數更新已收錄資料，回傳分數有變動的 URL（預設不支援，回傳空列表）"""
+        return []
+
+    def select_stale_spirits(
+        self, min_age_days: float, limit: int, categories: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """取得最久未更新的烈酒（預設不支援，回傳空列表）"""
+        return []
+
+    def get_url_lastmod_map(self) -> Dict[str, str]:
+        """取得 url → 上次爬取時的 lastmod（預設不支援，回傳空 dict）"""
+        return {}
+
+    def set_lastmods(self, lastmods: Dict[str, str]) -> None:
+        """記錄烈酒的 sitemap lastmod（預設不持久化）"""
+
+    # 爬取檢查點：預設不持久化（CSVStorage 等不支援續爬的後端直接沿用）
+    def load_checkpoint(self, category: str, query: str) -> Optional[Dict]:
+        """取得查詢的檢查點（last_page / label / state），不存在時回傳 None"""
+        return None
+
+    def save_checkpoint(
+        self, category: str, query: str, label: str, last_page: int, state: Dict
+    ) -> None:
+        """記錄查詢最後完整處理的頁碼與分頁狀態"""
+
+    def clear_checkpoints(self, categories: Optional[List[str]] = None) -> None:
+        """清除檢查點（categories 為 None 時清除全部）"""
+
 
 class SQLiteStorage(StorageBackend):
     """SQLite 儲存後端：生產環境推薦，支援查詢、更新、風味關聯查詢。
@@ -174,6 +232,11 @@ class SQLiteStorage(StorageBackend):
 
     def _init_schema(self):
         self.conn.executescript(_DDL)
+        for table, columns in _MIGRATIONS.items():
+            existing = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in columns:
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
         self.conn.commit()
 
     # ------------------------------------------------------------------
@@ -218,6 +281,10 @@ class SQLiteStorage(StorageBackend):
           → flavor_profiles 的 FOREIGN KEY 會 CASCADE DELETE，風味資料遺失
         - 改用 SELECT 判斷 + 手動 UPDATE/INSERT，確保 id 不變且 FK 安全
 
+        review_delta：UPDATE 右側的 review_count 是更新前的舊值，
+        兩次都有評論數時記錄增量，否則保留上一次的增量。
+        category：sitemap 探索不知道類別（None），保留原本由搜尋查詢寫入的類別。
+
         spirit_id 的取得策略：
         - 更新已存在的紀錄時：從 SELECT 結果取得原始 id
         - 新插入的紀錄：從 cursor.lastrowid 取得自動遞增的 id
@@ -232,10 +299,11 @@ class SQLiteStorage(StorageBackend):
                 """
                 UPDATE spirits SET
                     name = :name, spirit_type = :spirit_type, brand = :brand,
-                    country = :country, category = :category, badge = :badge,
+                    country = :country, category = COALESCE(:category, category), badge = :badge,
                     age = :age, abv = :abv, cost_level = :cost_level,
                     cask_type = :cask_type, expert_score = :expert_score,
                     community_score = :community_score, review_count = :review_count,
+                    review_delta = COALESCE(:review_count - review_count, review_delta),
                     description = :description, tasting_notes = :tasting_notes,
                     expert_name = :expert_name, flavor_summary = :flavor_summary,
                     flavor_data = :flavor_data, updated_at = CURRENT_TIMESTAMP
@@ -305,6 +373,42 @@ class SQLiteStorage(StorageBackend):
                 success += 1
         return success
 
+    def save_reparsed(
+        self, data_list: List[Dict], newer_than: Optional[Dict[str, str]] = None
+    ) -> int:
+        """離線重新擷取的批次寫入（見 reparse.py）：整批一個 transaction，回傳成功筆數。
+
+        重新擷取的是已抓過的頁面，不是新的觀測：已收錄的烈酒保留原本的
+        updated_at / review_delta，過期刷新排程與 db_merge 的「較新者為準」才不會把舊頁面當成剛爬過。
+        newer_than：url → UTC 時間（與 CURRENT_TIMESTAMP 同格式）；已收錄的列 updated_at 晚於此值，
+        表示封存之後另有未封存的更新（例如未加 --archive 的重爬、分數刷新），該筆略過不覆寫。
+        """
+        newer_than = newer_than or {}
+        saved = 0
+        with self.conn:
+            cur = self.conn.cursor()
+            for data in data_list:
+                try:
+                    row = self._prepare_row(data)
+                    before = cur.execute(
+                        "SELECT updated_at, review_delta FROM spirits WHERE url = ?", (row["url"],)
+                    ).fetchone()
+                    cutoff = newer_than.get(row["url"])
+                    if before and cutoff and before[0] and before[0] > cutoff:
+                        logger.debug(f"略過重新擷取 {row['url']}：資料庫的列較封存版本新")
+                        continue
+                    spirit_id = self._upsert(cur, row)
+                    self._save_flavors(cur, spirit_id, data.get("flavor_data", {}))
+                    if before:
+                        cur.execute(
+                            "UPDATE spirits SET updated_at = ?, review_delta = ? WHERE id = ?",
+                            (before[0], before[1], spirit_id),
+                        )
+                    saved += 1
+                except sqlite3.Error as e:
+                    logger.error(f"SQLiteStorage.save_reparsed 失敗 ({data.get('url')}): {e}")
+        return saved
+
     def spirit_exists(self, url: str) -> bool:
         cur = self.conn.execute(
             "SELECT 1 FROM spirits WHERE url = ? LIMIT 1", (url,)
@@ -367,7 +471,13 @@ class SQLiteStorage(StorageBackend):
         return cur.lastrowid
 
     def finish_scrape_run(
-        self, run_id: int, total_scraped: int, total_failed: int, status: str = "completed"
+        self,
+        run_id: int,
+        total_scraped: int,
+        total_failed: int,
+        status: str = "completed",
+        planned: Optional[int] = None,
+        completed: Optional[int] = None,
     ):
         self.conn.execute(
             """
@@ -375,13 +485,162 @@ class SQLiteStorage(StorageBackend):
             SET finished_at = CURRENT_TIMESTAMP,
                 total_scraped = ?,
                 total_failed = ?,
-                status = ?
+                status = ?,
+                planned = ?,
+                completed = ?
             WHERE id = ?
             """,
-            (total_scraped, total_failed, status, run_id),
+            (total_scraped, total_failed, status, planned, completed, run_id),
+        )
+        self.conn.commit()
+
+    def update_listing_scores(self, rows: List[Dict]) -> List[str]:
+        """以列表頁分數批次更新已收錄的烈酒，回傳分數有變動的 URL（依 rows 順序）。
+
+        rows 每筆含 url / expert_score / community_score（None 代表列表未提供，不比較也不覆寫）。
+        未收錄的 URL 直接略過；只有分數實際改變的列才會 UPDATE（同時更新 updated_at）。
+        """
+        by_url = {r["url"]: r for r in rows if r.get("url")}
+        if not by_url:
+            return []
+
+        urls = list(by_url)
+        current: Dict[str, sqlite3.Row] = {}
+        for i in range(0, len(urls), 500):  # SQLite 參數數量上限
+            chunk = urls[i : i + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            for r in self.conn.execute(
+                f"SELECT url, expert_score, community_score FROM spirits WHERE url IN ({placeholders})",
+                chunk,
+            ):
+                current[r["url"]] = r
+
+        changed: List[Dict] = []
+        for url, row in by_url.items():
+            stored = current.get(url)
+            if stored is None:
+                continue
+            expert = _to_real(row.get("expert_score"))
+            expert = int(expert) if expert is not None else None  # 容許 "92" / 92.0
+            community = _to_real(row.get("community_score"))
+            if (expert is not None and expert != stored["expert_score"]) or (
+                community is not None
+                and (
+                    stored["community_score"] is None
+                    or round(community, 2) != round(stored["community_score"], 2)
+                )
+            ):
+                changed.append(
+                    {"url": url, "expert_score": expert, "community_score": community}
+                )
+
+        if changed:
+            self.conn.executemany(
+                """
+                UPDATE spirits SET
+                    expert_score = COALESCE(:expert_score, expert_score),
+                    community_score = COALESCE(:community_score, community_score),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE url = :url
+                """,
+                changed,
+            )
+            self.conn.commit()
+        return [c["url"] for c in changed]
+
+    def select_stale_spirits(
+        self, min_age_days: float, limit: int, categories: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """依 updated_at 由舊到新取出最多 limit 筆超過 min_age_days 天未更新的烈酒。
+
+        回傳 url / category / review_count / review_delta / age_days（距上次更新天數）。
+        以 INDEXED BY 固定走 idx_spirits_updated_at：依索引順序掃描、邊掃邊套用類別條件，
+        取滿 limit 筆即停止，不會把整張 spirits 表載入記憶體再排序。
+        """
+        if limit <= 0:
+            return []
+        sql = """
+            SELECT url, category, review_count, review_delta,
+                   julianday('now') - julianday(updated_at) AS age_days
+            FROM spirits INDEXED BY idx_spirits_updated_at
+            WHERE updated_at < datetime('now', ?)
+        """
+        params: List[Any] = [f"-{float(min_age_days)} days"]
+        if categories:
+            sql += f" AND category IN ({','.join('?' for _ in categories)})"
+            params.extend(categories)
+        sql += " ORDER BY updated_at LIMIT ?"
+        params.append(limit)
+        return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def get_url_lastmod_map(self) -> Dict[str, str]:
+        """url → lastmod；尚未記錄 lastmod 的烈酒以 updated_at 的日期代替。
+
+        以 updated_at 作為基準，升級後第一次 sitemap run 只會重爬
+        在上次更新之後才有變動的烈酒，而不是整個資料庫。
+        """
+        rows = self.conn.execute(
+            "SELECT url, COALESCE(lastmod, substr(updated_at, 1, 10)) FROM spirits"
+        ).fetchall()
+        return {r[0]: r[1] for r in rows if r[1]}
+
+    def set_lastmods(self, lastmods: Dict[str, str]) -> None:
+        if not lastmods:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE spirits SET lastmod = ? WHERE url = ?",
+                [(lastmod, url) for url, lastmod in lastmods.items()],
+            )
+
+    # ------------------------------------------------------------------
+    # 爬取檢查點
+    # ------------------------------------------------------------------
+
+    def load_checkpoint(self, category: str, query: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            """
+            SELECT label, last_page, state FROM crawl_checkpoints
+            WHERE category = ? AND query = ?
+            """,
+            (category, query),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            state = json.loads(row["state"]) if row["state"] else {}
+        except (TypeError, ValueError):
+            state = {}
+        return {"label": row["label"], "last_page": row["last_page"], "state": state}
+
+    def save_checkpoint(
+        self, category: str, query: str, label: str, last_page: int, state: Dict
+    ) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO crawl_checkpoints (category, query, label, last_page, state)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(category, query) DO UPDATE SET
+                label = excluded.label,
+                last_page = excluded.last_page,
+                state = excluded.state,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (category, query, label, last_page, json.dumps(state, ensure_ascii=False)),
         )
         self.conn.commit()
 
+    def clear_checkpoints(self, categories: Optional[List[str]] = None) -> None:
+        if categories is None:
+            self.conn.execute("DELETE FROM crawl_checkpoints")
+        else:
+            placeholders = ",".join("?" for _ in categories)
+            self.conn.execute(
+                f"DELETE FROM crawl_checkpoints WHERE category IN ({placeholders})",
+                list(categories),
+            )
+        self.conn.commit()
+
     def count(self) -> int:
         return self.conn.execute("SELECT COUNT(*) FROM spirits").fetchone()[0]
 
@@ -0,0 +1,117 @@
+"""
+單一 Chrome 內多分頁並行載入：不增加瀏覽器實例即可取得 Selenium 模式的並行度。
+
+設計理由
+--------
+WebDriver 池（driver_pool.py）每多一個 Chrome 就多佔 1-2 GB 記憶體，
+Cloud Run 容器已提高到 4Gi 仍相當吃緊。同一個 Chrome 開多個分頁只多出 renderer 的
+記憶體，且 start_driver() 已設定 page_load_strategy='none'：
+driver.get() 發出導覽後立即返回，不等頁面載入完成。
+
+因此 MultiTabLoader 的流程為：
+1. 開 N 個分頁，每個分頁各自 driver.get() 一個 URL（非阻塞）
+2. 輪詢各分頁：新 document 已 commit（見 page_wait.navigation_committed）且 ready_script 成立
+   （例如品名節點已出現）；重用的分頁在 commit 前仍是上一頁，品名節點也在，只看 ready_script 會取到舊頁面
+3. 哪個分頁先就緒就先取出 page_source 交給呼叫端，並立即在該分頁載入下一個 URL
+4. 結束時關閉額外分頁，切回原本的分頁
+
+WebDriver 同一時間只能操作一個分頁（switch_to.window），
+但「等待頁面載入」這段最耗時的時間是在 Chrome 內並行進行的。
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from .page_wait import document_root, navigation_committed
+
+logger = logging.getLogger(__name__)
+
+
+class MultiTabLoader:
+    """在同一個 WebDriver session 中以多分頁並行載入頁面。
+
+    load() 為 generator，依「完成順序」產出 (url, page_source)；
+    分頁逾時仍未就緒時 page_source 照樣回傳（與固定延遲後直接解析的舊行為一致），
+    由呼叫端的必要欄位驗證決定成敗；逾時仍未 commit（仍是上一頁）時回傳 None。
+    """
+
+    def __init__(
+        self,
+        driver: Any,
+        tabs: int,
+        ready_script: str,
+        timeout: float,
+        poll_interval: float = 0.25,
+    ):
+        self.driver = driver
+        self.tabs = max(1, tabs)
+        self.ready_script = ready_script
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.timeouts = 0
+
+    def _is_ready(self) -> bool:
+        try:
+            return bool(self.driver.execute_script(self.ready_script))
+        except Exception:
+            return False  # 頁面尚在導覽中（document 尚未建立）時 JS 可能失敗
+
+    def load(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        queue = deque(urls)
+        if not queue:
+            return
+
+        origin = self.driver.current_window_handle
+        handles = [origin]
+        busy: Dict[str, Tuple[str, float, Any]] = {}
+
+        def assign(handle: str) -> None:
+            url = queue.popleft()
+            self.driver.switch_to.window(handle)
+            previous_root = document_root(self.driver)
+            self.driver.get(url)  # page_load_strategy='none' → 立即返回
+            busy[handle] = (url, time.monotonic(), previous_root)
+
+        try:
+            for _ in range(min(self.tabs, len(queue)) - 1):
+                self.driver.switch_to.new_window("tab")
+                handles.append(self.driver.current_window_handle)
+            for handle in handles:
+                if queue:
+                    assign(handle)
+
+            while busy:
+                progressed = False
+                for handle in list(busy):
+                    url, started, previous_root = busy[handle]
+                    self.driver.switch_to.window(handle)
+                    timed_out = time.monotonic() - started >= self.timeout
+                    committed = navigation_committed(self.driver, url, previous_root) is not None
+                    if not ((committed and self._is_ready()) or timed_out):
+                        continue
+                    if timed_out:
+                        self.timeouts += 1
+                        logger.debug(f"分頁等待逾時（{self.timeout}s）: {url}")
+                    html = self.driver.page_source if committed else None
+                    del busy[handle]
+                    progressed = True
+                    # 先交出結果再載入下一個 URL：導覽失敗時已完成的頁面不會遺失
+                    yield url, html
+                    if queue:
+                        assign(handle)
+                if busy and not progressed:
+                    time.sleep(self.poll_interval)
+        finally:
+            self._close_extra_tabs(handles, origin)
+
+    def _close_extra_tabs(self, handles, origin) -> None:
+        try:
+            for handle in handles:
+                if handle != origin:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(origin)
+        except Exception as e:
+            logger.debug(f"關閉額外分頁失敗: {e}")
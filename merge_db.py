@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+SQLite 資料庫合併工具：把多個 distiller.db / diffords.db 併入目標資料庫，不需重新爬取
+
+用法:
+    python merge_db.py <目標 DB> <來源 DB> [來源 DB ...] [--kind distiller|diffords]
+
+範例:
+    # 併入 supplement_liqueurs.py 的補爬結果與另一個環境下載的 GCS 副本
+    python merge_db.py distiller.db supplement.db prod-copy.db
+    python merge_db.py diffords.db diffords-laptop.db
+
+衝突以時間戳決定（spirits.updated_at / cocktails.scraped_at 較新者為準），
+執行紀錄只追加目標沒有的部分（見 distiller_scraper/db_merge.py）。
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from distiller_scraper.db_merge import merge_databases
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合併多個 distiller.db / diffords.db")
+    parser.add_argument("target", help="目標資料庫（不存在時自動建立）")
+    parser.add_argument("sources", nargs="+", help="要併入的來源資料庫")
+    parser.add_argument(
+        "--kind",
+        choices=["distiller", "diffords"],
+        default=None,
+        help="資料庫種類（預設依來源的資料表自動判斷）",
+    )
+    args = parser.parse_args()
+
+    missing = [s for s in args.sources if not Path(s).is_file()]
+    if missing:
+        print(f"❌ 找不到來源資料庫: {missing}")
+        sys.exit(1)
+    if any(Path(s).resolve() == Path(args.target).resolve() for s in args.sources):
+        print("❌ 來源不可與目標相同")
+        sys.exit(1)
+
+    try:
+        stats = merge_databases(args.target, args.sources, kind=args.kind)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"\n統計:\n{json.dumps(stats, indent=2, ensure_ascii=False)}")
+    print(
+        f"\n✅ 已合併 {stats['來源']} 個來源：{stats['來源列數']} 列，"
+        f"{stats['耗時秒數']} 秒（{stats['每秒列數']} 列/秒）"
+    )
+
+
+if __name__ == "__main__":
+    main()
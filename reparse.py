@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+離線重新擷取工具：以 --archive 封存的原始頁面重跑提取器並寫回資料庫，不需重新爬取
+
+用法:
+    python reparse.py --kind distiller-html|distiller-api|diffords-html [--archive page_archive.db]
+                      [--db-path DB] [--workers N] [--batch-size 200] [--since ISO 時間]
+
+範例:
+    # 修正 diffords_selectors.py 後重建所有酒譜
+    python reparse.py --kind diffords-html
+    # 修正 selectors.py 後重新擷取 Distiller 詳情頁（4 個程序）
+    python reparse.py --kind distiller-html --workers 4
+
+每個 URL 取最新封存版本；已收錄的列保留原本的更新時間（見 distiller_scraper/reparse.py）。
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from distiller_scraper.config import ScraperConfig
+from distiller_scraper.diffords_storage import DiffordsStorage
+from distiller_scraper.page_archive import KIND_DIFFORDS_HTML, PageArchive
+from distiller_scraper.reparse import KINDS, reparse_archive
+from distiller_scraper.storage import SQLiteStorage
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="以封存的原始頁面離線重新擷取")
+    parser.add_argument("--kind", choices=KINDS, required=True, help="要重新擷取的頁面種類")
+    parser.add_argument(
+        "--archive",
+        default=ScraperConfig.PAGE_ARCHIVE_PATH,
+        help=f"頁面封存檔（預設: {ScraperConfig.PAGE_ARCHIVE_PATH}）",
+    )
+    parser.add_argument(
+        "--db-path",
+        default=None,
+        help="寫入的資料庫（預設: diffords-html 為 diffords.db，其餘為 distiller.db）",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="程序數（預設: CPU 數；1 = 不建立程序池）")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"每個寫入 transaction 的筆數（預設: {ScraperConfig.REPARSE_BATCH_SIZE}）",
+    )
+    parser.add_argument("--since", default=None, help="只處理最後抓取時間 ≥ 此 ISO 時間的頁面")
+    args = parser.parse_args()
+
+    if not Path(args.archive).is_file():
+        print(f"❌ 找不到頁面封存檔: {args.archive}")
+        sys.exit(1)
+
+    diffords = args.kind == KIND_DIFFORDS_HTML
+    db_path = args.db_path or ("diffords.db" if diffords else "distiller.db")
+    archive = PageArchive(args.archive)
+    storage = DiffordsStorage(db_path) if diffords else SQLiteStorage(db_path)
+    try:
+        stats = reparse_archive(
+            archive,
+            args.kind,
+            storage,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            since=args.since,
+        )
+    finally:
+        storage.close()
+        archive.close()
+
+    print(f"\n統計:\n{json.dumps(stats, indent=2, ensure_ascii=False)}")
+    print(
+        f"\n✅ 已重新擷取 {stats['頁面']} 頁並寫入 {db_path}：{stats['寫入']} 筆，"
+        f"{stats['耗時秒數']} 秒（{stats['每秒頁數']} 頁/秒）"
+    )
+
+
+if __name__ == "__main__":
+    main()
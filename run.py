@@ -2,7 +2,12 @@
 """
 Distiller 爬蟲 V2 執行腳本
 用法:
-    python run.py [--mode test|medium|full] [--output csv|sqlite|both] [--notify-line]
+    python run.py [--mode test|medium|full|refresh|merge-shards] [--output csv|sqlite|both] [--notify-line]
+
+平行分片（Cloud Run Jobs --tasks N）:
+    每個任務依 CLOUD_RUN_TASK_INDEX / CLOUD_RUN_TASK_COUNT（或 --shard-index / --shard-count）
+    只爬本分片負責的查詢，寫入 distiller.shard-<i>-of-<n>.db；
+    全部完成後執行 python run.py --mode merge-shards --shard-count N 合併回 distiller.db
 """
 
 import argparse
@@ -23,8 +28,12 @@ DATA_DIR.mkdir(exist_ok=True)
 
 from distiller_scraper.api_client import DistillerAPIClient
 from distiller_scraper.config import ScraperConfig
+from distiller_scraper.http_fetcher import HTMLDetailFetcher
 from distiller_scraper.notify import LineNotifier
+from distiller_scraper.page_archive import PageArchive
 from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.sitemap import SitemapDiscovery
+from distiller_scraper.sharding import ShardSpec, merge_shards, prepare_shard_db, shard_db_path
 from distiller_scraper.storage import CSVStorage, SQLiteStorage
 
 logger = logging.getLogger(__name__)
@@ -35,13 +44,89 @@ def _use_pagination(args) -> bool:
     return not getattr(args, "no_pagination", False)
 
 
-def _build_api_client(args) -> "DistillerAPIClient | None":
+def _build_archive(args) -> "PageArchive | None":
+    """--archive [PATH]：封存詳情頁 HTML / API 回應，供 reparse.py 離線重新擷取。"""
+    path = getattr(args, "archive", None)
+    if path:
+        print(f"頁面封存：已啟用（{path}）")
+        return PageArchive(path)
+    return None
+
+
+def _build_api_client(args, archive: "PageArchive | None" = None) -> "DistillerAPIClient | None":
     if getattr(args, "use_api", False):
-        print("API 模式：已啟用（將於爬取前自動探測端點）")
-        return DistillerAPIClient()
+        print("API 模式：已啟用（優先使用端點快取，過期或失效時自動探測）")
+        return DistillerAPIClient(cache_path=str(DATA_DIR / "api_endpoints.json"), archive=archive)
     return None
 
 
+def _build_html_fetcher(args, archive: "PageArchive | None" = None) -> "HTMLDetailFetcher | None":
+    if getattr(args, "http_detail", False):
+        print("靜態 HTML 詳情：已啟用（必要欄位不齊時才使用 Chrome）")
+        return HTMLDetailFetcher(archive=archive)
+    return None
+
+
+def _concurrency_kwargs(args) -> dict:
+    """瀏覽器與並行參數（--api-workers / --api-rps / --driver-pool / --tabs / --[no-]block-resources），未指定時沿用 ScraperConfig 預設。"""
+    return {
+        "api_concurrency": getattr(args, "api_workers", None),
+        "api_max_rps": getattr(args, "api_rps", None),
+        "driver_pool_size": getattr(args, "driver_pool", None),
+        "tab_count": getattr(args, "tabs", None),
+        "block_resources": getattr(args, "block_resources", None),
+    }
+
+
+def _build_shard(args) -> ShardSpec:
+    """--shard-index / --shard-count 優先，其次 Cloud Run 的 CLOUD_RUN_TASK_INDEX / CLOUD_RUN_TASK_COUNT。"""
+    return ShardSpec.from_env(getattr(args, "shard_index", None), getattr(args, "shard_count", None))
+
+
+def _streaming(args, csv_file) -> bool:
+    """--stream（或 ScraperConfig.STREAM_RECORDS）：只在純 SQLite 輸出時啟用（CSV 需要記憶體中的完整記錄）。"""
+    if not (getattr(args, "stream", False) or ScraperConfig.STREAM_RECORDS):
+        return False
+    if csv_file:
+        print("串流記錄：CSV 輸出需要完整記錄，已停用")
+        return False
+    print("串流記錄：已啟用（記錄只寫入 SQLite，記憶體只保留統計）")
+    return True
+
+
+def _scrape_kwargs(args) -> dict:
+    """過期刷新與爬取預算參數（--refresh-stale / --request-budget / --time-budget），未指定時沿用 ScraperConfig 預設。"""
+    return {
+        "refresh_stale": getattr(args, "refresh_stale", None),
+        "request_budget": getattr(args, "request_budget", None),
+        "time_budget": getattr(args, "time_budget", None),
+    }
+
+
+def _run_scrape(scraper, args, categories, max_per_category, use_styles) -> bool:
+    """依 --discovery 執行爬取：search（預設）翻搜尋分頁，sitemap 從 sitemap 取得烈酒 URL。"""
+    if getattr(args, "discovery", None) == "sitemap":
+        kwargs = _scrape_kwargs(args)
+        return scraper.scrape_sitemap(
+            max_spirits=max_per_category * len(categories),
+            discovery=SitemapDiscovery(getattr(args, "sitemap_url", None)),
+            request_budget=kwargs["request_budget"],
+            time_budget=kwargs["time_budget"],
+        )
+    return scraper.scrape(
+        categories=categories,
+        max_per_category=max_per_category,
+        use_styles=use_styles,
+        use_pagination=_use_pagination(args),
+        **_scrape_kwargs(args),
+    )
+
+
+def _budget_progress(scraper) -> dict:
+    """scrape_runs 的 planned / completed：本次 run 排入與實際處理的項數。"""
+    return {"planned": scraper.budget.planned, "completed": scraper.budget.completed}
+
+
 def _build_storage(output: str, db_path: str, filename: str):
     """根據 --output 參數建立儲存後端"""
     if output == "sqlite":
@@ -66,8 +151,16 @@ def run_test(output: str = "csv", db_path: str = "distiller.db", args=None):
     storage, csv_file = _build_storage(
         output, db_path, str(DATA_DIR / "distiller_test_v2.csv")
     )
+    archive = _build_archive(args)
     scraper = DistillerScraperV2(
-        headless=True, storage=storage, api_client=_build_api_client(args)
+        headless=True,
+        storage=storage,
+        api_client=_build_api_client(args, archive),
+        html_fetcher=_build_html_fetcher(args, archive),
+        archive=archive,
+        shard=_build_shard(args),
+        streaming=_streaming(args, csv_file),
+        **_concurrency_kwargs(args),
     )
 
     run_id = None
@@ -76,28 +169,28 @@ def run_test(output: str = "csv", db_path: str = "distiller.db", args=None):
 
     status = "completed"
     try:
-        scrape_ok = scraper.scrape(
-            categories=["whiskey"],
-            max_per_category=5,
-            use_styles=False,
-            use_pagination=_use_pagination(args),
-        )
+        scrape_ok = _run_scrape(scraper, args, ["whiskey"], 5, False)
         has_errors = len(scraper.failed_urls) > 0 or scraper.page_errors > 0
         if has_errors:
             status = "completed_with_errors"
+        if isinstance(scraper.budget.stopped_by, str):
+            status = "partial"  # 預算用完提前收尾，檢查點保留給下一次 run
     except Exception:
         status = "failed"
         raise
     finally:
         if run_id is not None and isinstance(storage, SQLiteStorage):
             storage.finish_scrape_run(
-                run_id, len(scraper.spirits_data), len(scraper.failed_urls), status
+                run_id, len(scraper.spirits_data), len(scraper.failed_urls), status,
+                **_budget_progress(scraper),
             )
 
     if csv_file:
         scraper.save_csv(csv_file)
     if storage:
         storage.close()
+    if archive:
+        archive.close()
 
     stats = scraper.get_statistics()
     print(f"\n統計:\n{json.dumps(stats, indent=2, ensure_ascii=False)}")
@@ -116,8 +209,16 @@ def run_medium(output: str = "csv", db_path: str = "distiller.db", args=None):
     storage, csv_file = _build_storage(
         output, db_path, str(DATA_DIR / f"distiller_spirits_{timestamp}.csv")
     )
+    archive = _build_archive(args)
     scraper = DistillerScraperV2(
-        headless=True, storage=storage, api_client=_build_api_client(args)
+        headless=True,
+        storage=storage,
+        api_client=_build_api_client(args, archive),
+        html_fetcher=_build_html_fetcher(args, archive),
+        archive=archive,
+        shard=_build_shard(args),
+        streaming=_streaming(args, csv_file),
+        **_concurrency_kwargs(args),
     )
 
     _medium_categories = ["whiskey", "gin", "rum", "vodka"]
@@ -127,28 +228,28 @@ def run_medium(output: str = "csv", db_path: str = "distiller.db", args=None):
 
     status = "completed"
     try:
-        scrape_ok = scraper.scrape(
-            categories=_medium_categories,
-            max_per_category=50,
-            use_styles=True,
-            use_pagination=_use_pagination(args),
-        )
+        scrape_ok = _run_scrape(scraper, args, _medium_categories, 50, True)
         has_errors = len(scraper.failed_urls) > 0 or scraper.page_errors > 0
         if has_errors:
             status = "completed_with_errors"
+        if isinstance(scraper.budget.stopped_by, str):
+            status = "partial"  # 預算用完提前收尾，檢查點保留給下一次 run
     except Exception:
         status = "failed"
         raise
     finally:
         if run_id is not None and isinstance(storage, SQLiteStorage):
             storage.finish_scrape_run(
-                run_id, len(scraper.spirits_data), len(scraper.failed_urls), status
+                run_id, len(scraper.spirits_data), len(scraper.failed_urls), status,
+                **_budget_progress(scraper),
             )
 
     if csv_file:
         scraper.save_csv(csv_file)
     if storage:
         storage.close()
+    if archive:
+        archive.close()
 
     stats = scraper.get_statistics()
     print(f"\n統計:\n{json.dumps(stats, indent=2, ensure_ascii=False)}")
@@ -166,8 +267,16 @@ def run_full(output: str = "csv", db_path: str = "distiller.db", args=None):
     storage, csv_file = _build_storage(
         output, db_path, str(DATA_DIR / f"distiller_spirits_full_{timestamp}.csv")
     )
+    archive = _build_archive(args)
     scraper = DistillerScraperV2(
-        headless=True, storage=storage, api_client=_build_api_client(args)
+        headless=True,
+        storage=storage,
+        api_client=_build_api_client(args, archive),
+        html_fetcher=_build_html_fetcher(args, archive),
+        archive=archive,
+        shard=_build_shard(args),
+        streaming=_streaming(args, csv_file),
+        **_concurrency_kwargs(args),
     )
 
     _full_categories = [
@@ -185,28 +294,28 @@ def run_full(output: str = "csv", db_path: str = "distiller.db", args=None):
 
     status = "completed"
     try:
-        scrape_ok = scraper.scrape(
-            categories=_full_categories,
-            max_per_category=150,
-            use_styles=True,
-            use_pagination=_use_pagination(args),
-        )
+        scrape_ok = _run_scrape(scraper, args, _full_categories, 150, True)
         has_errors = len(scraper.failed_urls) > 0 or scraper.page_errors > 0
         if has_errors:
             status = "completed_with_errors"
+        if isinstance(scraper.budget.stopped_by, str):
+            status = "partial"  # 預算用完提前收尾，檢查點保留給下一次 run
     except Exception:
         status = "failed"
         raise
     finally:
         if run_id is not None and isinstance(storage, SQLiteStorage):
             storage.finish_scrape_run(
-                run_id, len(scraper.spirits_data), len(scraper.failed_urls), status
+                run_id, len(scraper.spirits_data), len(scraper.failed_urls), status,
+                **_budget_progress(scraper),
             )
 
     if csv_file:
         scraper.save_csv(csv_file)
     if storage:
         storage.close()
+    if archive:
+        archive.close()
 
     stats = scraper.get_statistics()
     print(f"\n統計:\n{json.dumps(stats, indent=2, ensure_ascii=False)}")
@@ -214,13 +323,90 @@ def run_full(output: str = "csv", db_path: str = "distiller.db", args=None):
     return success, stats
 
 
+def run_refresh(output: str = "sqlite", db_path: str = "distiller.db", args=None):
+    """分數刷新：只走列表頁更新已收錄烈酒的評分，分數有變動者才重爬詳情"""
+    print("\n" + "=" * 80)
+    print("分數刷新模式 - 以列表頁更新評分")
+    print("=" * 80 + "\n")
+
+    if output == "csv":
+        print("分數刷新需要比對既有資料，改用 SQLite 輸出")
+    storage = SQLiteStorage(db_path)
+    print(f"輸出格式: SQLite ({db_path})")
+    archive = _build_archive(args)
+    scraper = DistillerScraperV2(
+        headless=True,
+        storage=storage,
+        api_client=_build_api_client(args, archive),
+        html_fetcher=_build_html_fetcher(args, archive),
+        archive=archive,
+        shard=_build_shard(args),
+        streaming=_streaming(args, None),
+        **_concurrency_kwargs(args),
+    )
+
+    _refresh_categories = ScraperConfig.CATEGORIES
+    run_id = storage.record_scrape_run(categories=_refresh_categories, mode="refresh")
+
+    status = "completed"
+    try:
+        refresh_ok = scraper.refresh_scores(
+            categories=_refresh_categories,
+            pages_per_query=getattr(args, "refresh_pages", None),
+        )
+        has_errors = len(scraper.failed_urls) > 0 or scraper.page_errors > 0
+        if has_errors:
+            status = "completed_with_errors"
+    except Exception:
+        status = "failed"
+        raise
+    finally:
+        storage.finish_scrape_run(
+            run_id, len(scraper.spirits_data), len(scraper.failed_urls), status
+        )
+        storage.close()
+        if archive:
+            archive.close()
+
+    stats = scraper.get_statistics()
+    print(f"\n統計:\n{json.dumps(stats, indent=2, ensure_ascii=False)}")
+    return refresh_ok, stats
+
+
+def run_merge_shards(db_path: str = "distiller.db", args=None):
+    """合併平行任務的分片資料庫（distiller.shard-<i>-of-<n>.db）回主資料庫"""
+    print("\n" + "=" * 80)
+    print("分片合併 - 將平行任務的分片併入主資料庫")
+    print("=" * 80 + "\n")
+
+    shard = _build_shard(args)
+    if not shard.enabled:
+        print("❌ 需以 --shard-count（或 CLOUD_RUN_TASK_COUNT）指定分片總數 > 1")
+        return False, {}
+
+    started = time.time()
+    merged = merge_shards(db_path, shard.count)
+    print(f"已合併 {merged['分片']}/{shard.count} 個分片（{time.time() - started:.1f} 秒）")
+    if merged["缺少"]:
+        print(f"⚠️  缺少分片: {merged['缺少']}（該分片的檢查點維持原狀）")
+    # 已併入的本機分片刪除：下一次 run 重新從主資料庫複製
+    for index in range(shard.count):
+        if index not in merged["缺少"]:
+            Path(shard_db_path(db_path, index, shard.count)).unlink(missing_ok=True)
+
+    stats = {"總記錄數": merged["新增"] + merged["更新"], "失敗 URL 數": 0, "分片合併": merged}
+    print(f"\n統計:\n{json.dumps(stats, indent=2, ensure_ascii=False)}")
+    return merged["分片"] > 0, stats
+
+
 def main():
     parser = argparse.ArgumentParser(description="Distiller.com 爬蟲 V2")
     parser.add_argument(
         "--mode",
-        choices=["test", "medium", "full"],
+        choices=["test", "medium", "full", "refresh", "merge-shards"],
         default="test",
-        help="爬取模式: test (5筆), medium (~200筆), full (~1000+筆)",
+        help="爬取模式: test (5筆), medium (~200筆), full (~1000+筆), refresh (以列表頁刷新評分), "
+        "merge-shards (合併平行任務的分片資料庫)",
     )
     parser.add_argument(
         "--output",
@@ -243,6 +429,113 @@ def main():
         action="store_true",
         help="啟用 API 模式（自動探測端點，大幅提升爬取速度）",
     )
+    parser.add_argument(
+        "--http-detail",
+        action="store_true",
+        help="詳情頁先以純 HTTP 抓取靜態 HTML，必要欄位不齊時才使用 Chrome",
+    )
+    parser.add_argument(
+        "--api-workers",
+        type=int,
+        default=None,
+        help=f"API 模式詳情頁並行數（預設: {ScraperConfig.API_CONCURRENCY}）",
+    )
+    parser.add_argument(
+        "--api-rps",
+        type=float,
+        default=None,
+        help=f"API 模式每秒請求上限，0 = 不限速（預設: {ScraperConfig.API_MAX_REQUESTS_PER_SEC}）",
+    )
+    parser.add_argument(
+        "--driver-pool",
+        type=int,
+        default=None,
+        help=f"Selenium 詳情頁 Chrome 池大小，0 = 停用（預設: {ScraperConfig.DRIVER_POOL_SIZE}）",
+    )
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=None,
+        help=f"Selenium 詳情頁於主 Chrome 內並行分頁數，1 = 停用（預設: {ScraperConfig.TAB_COUNT}）",
+    )
+    block = parser.add_mutually_exclusive_group()
+    block.add_argument(
+        "--block-resources",
+        dest="block_resources",
+        action="store_const",
+        const=True,
+        default=None,
+        help="Chrome 封鎖圖片 / 字型 / CSS / 第三方追蹤與非 ALLOWED_ORIGINS 來源"
+        f"（預設: {'啟用' if ScraperConfig.BLOCK_RESOURCES else '停用'}）",
+    )
+    block.add_argument(
+        "--no-block-resources",
+        dest="block_resources",
+        action="store_const",
+        const=False,
+        help="Chrome 不封鎖任何資源（ScraperConfig.BLOCK_RESOURCES 啟用時用於比較封鎖前後差異）",
+    )
+    parser.add_argument(
+        "--refresh-pages",
+        type=int,
+        default=None,
+        help=f"refresh 模式每個查詢走的列表頁數（預設: {ScraperConfig.REFRESH_PAGES_PER_QUERY}）",
+    )
+    parser.add_argument(
+        "--refresh-stale",
+        type=int,
+        default=None,
+        help=f"每次 run 與新 URL 探索交錯重爬的過期烈酒上限，需 SQLite 輸出（預設: {ScraperConfig.STALE_REFRESH_LIMIT}）",
+    )
+    parser.add_argument(
+        "--request-budget",
+        type=int,
+        default=None,
+        help=f"單次 run 的請求數上限（列表頁 + 詳情頁），0 = 不限（預設: {ScraperConfig.REQUEST_BUDGET}）",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="單次 run 的時間上限（秒，自程式啟動起算），截止前主動收尾並保留檢查點；"
+        "建議設為 Cloud Run 任務逾時（0 = 不限）",
+    )
+    parser.add_argument(
+        "--discovery",
+        choices=["search", "sitemap"],
+        default="search",
+        help="烈酒 URL 來源：search = 翻搜尋分頁（預設），sitemap = 解析 sitemap 並略過 lastmod 未變動者",
+    )
+    parser.add_argument(
+        "--sitemap-url",
+        default=None,
+        help=f"--discovery sitemap 使用的 sitemap 索引 URL（預設: {ScraperConfig.SITEMAP_INDEX_URL}）",
+    )
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=None,
+        help="本任務的分片編號（0 起算，預設取 CLOUD_RUN_TASK_INDEX）",
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=None,
+        help="分片總數；> 1 時各任務只爬本分片負責的查詢 / URL 並寫入分片資料庫（預設取 CLOUD_RUN_TASK_COUNT）",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="串流記錄：結果只寫入 SQLite，記憶體只保留計數與欄位統計（長時間 run 記憶體不隨筆數成長；CSV 輸出時停用）",
+    )
+    parser.add_argument(
+        "--archive",
+        nargs="?",
+        const=ScraperConfig.PAGE_ARCHIVE_PATH,
+        default=None,
+        metavar="PATH",
+        help=f"封存原始詳情頁 HTML / API 回應（壓縮、相同內容只存一份），供 reparse.py 離線重新擷取（預設路徑: {ScraperConfig.PAGE_ARCHIVE_PATH}）",
+    )
     parser.add_argument(
         "--notify-line",
         action="store_true",
@@ -254,14 +547,36 @@ def main():
     print(f"\n開始時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     _run_start = time.time()
 
+    # 平行分片：爬取模式改寫入本分片的資料庫；merge-shards 模式維持主資料庫
+    shard = _build_shard(args)
+    main_db_path = args.db_path
+    sharded_scrape = shard.enabled and args.mode != "merge-shards"
+    if sharded_scrape:
+        args.db_path = shard.db_path(main_db_path)
+        print(f"分片 {shard}：寫入 {args.db_path}")
+
     # GCS 下載：爬取前從 GCS 取得最新 DB（僅 sqlite/both 輸出模式且設定了 GCS_BUCKET）
     gcs_bucket = os.getenv("GCS_BUCKET", "")
+    gcs_db_blob = os.getenv("GCS_DB_BLOB", "distiller.db")
     if gcs_bucket and args.output in ("sqlite", "both"):
         from distiller_scraper import gcs_storage
 
-        gcs_db_blob = os.getenv("GCS_DB_BLOB", "distiller.db")
         print(f"☁️  從 GCS 下載 DB ({gcs_bucket}/{gcs_db_blob})…")
-        gcs_storage.download_db(gcs_bucket, gcs_db_blob, args.db_path)
+        gcs_storage.download_db(gcs_bucket, gcs_db_blob, main_db_path)
+        if args.mode == "merge-shards" and shard.enabled:
+            for index in range(shard.count):
+                gcs_storage.download_db(
+                    gcs_bucket,
+                    shard_db_path(gcs_db_blob, index, shard.count),
+                    shard_db_path(main_db_path, index, shard.count),
+                )
+    if sharded_scrape and args.output in ("sqlite", "both"):
+        # 分片以主資料庫為起點：seen_urls 去重與檢查點續爬照常運作
+        prepare_shard_db(main_db_path, args.db_path)
+
+    # 時間預算自程式啟動起算：扣除 GCS 下載等前置耗時
+    if args.time_budget:
+        args.time_budget = max(args.time_budget - (time.time() - _run_start), 1.0)
 
     _exc: Exception | None = None
     try:
@@ -269,6 +584,10 @@ def main():
             success, stats = run_test(args.output, args.db_path, args)
         elif args.mode == "medium":
             success, stats = run_medium(args.output, args.db_path, args)
+        elif args.mode == "refresh":
+            success, stats = run_refresh(args.output, args.db_path, args)
+        elif args.mode == "merge-shards":
+            success, stats = run_merge_shards(args.db_path, args)
         else:
             success, stats = run_full(args.output, args.db_path, args)
     except Exception as e:
@@ -311,7 +630,8 @@ def main():
     if gcs_bucket and args.output in ("sqlite", "both"):
         from distiller_scraper import gcs_storage
 
-        gcs_db_blob = os.getenv("GCS_DB_BLOB", "distiller.db")
+        if sharded_scrape:
+            gcs_db_blob = shard_db_path(gcs_db_blob, shard.index, shard.count)
         print(f"\n☁️  上傳 DB 至 GCS ({gcs_bucket}/{gcs_db_blob})…")
         gcs_storage.upload_db(gcs_bucket, gcs_db_blob, args.db_path)
 
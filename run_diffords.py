@@ -7,6 +7,8 @@ Difford's Guide 雞尾酒譜爬蟲執行腳本
     python run_diffords.py --mode full           # 全量爬取（首次或強制重爬）
     python run_diffords.py --mode test           # 測試（僅爬 10 筆，驗證 selector）
     python run_diffords.py --notify-line         # 完成後透過 LINE 推播通知
+    python run_diffords.py --time-budget 3300    # 截止前主動收尾（Cloud Run 任務逾時）
+    python run_diffords.py --archive             # 封存原始 HTML，供 reparse.py 離線重新擷取
 
 執行流程：
     1. GCS 下載 diffords.db（Cloud Run 環境）
@@ -31,6 +33,7 @@ from distiller_scraper.diffords_config import DIFFORDS_NOTIFY_SOURCE
 from distiller_scraper.diffords_scraper import DiffordsGuideScraper
 from distiller_scraper.diffords_storage import DiffordsStorage
 from distiller_scraper.notify import LineNotifier
+from distiller_scraper.page_archive import PageArchive
 
 logging.basicConfig(
     level=logging.INFO,
@@ -74,7 +77,9 @@ def run(mode: str, db_path: str, notify_line: bool, args) -> tuple[bool, dict]:
 
     storage = DiffordsStorage(db_path)
     run_id = storage.record_scrape_run(mode)
-    scraper = DiffordsGuideScraper(storage=storage)
+    archive_path = getattr(args, "archive", None)
+    archive = PageArchive(archive_path) if archive_path else None
+    scraper = DiffordsGuideScraper(storage=storage, archive=archive)
     status = "completed"
     exc = None
     success = False
@@ -83,9 +88,14 @@ def run(mode: str, db_path: str, notify_line: bool, args) -> tuple[bool, dict]:
         success = scraper.scrape(
             max_recipes=max_recipes,
             incremental=incremental,
+            time_budget=getattr(args, "time_budget", None) or None,
         )
         if scraper.stats.failed > 0:
             status = "completed_with_errors"
+        if scraper.budget.stopped_by:
+            # 預算用完提前收尾：記為 partial，get_last_successful_run() 不把它當成完整的 run；
+            # 未爬到的酒譜下一次 run 依 lastmod 比對續爬
+            status = "partial"
     except Exception as e:
         exc = e
         status = "failed"
@@ -97,9 +107,13 @@ def run(mode: str, db_path: str, notify_line: bool, args) -> tuple[bool, dict]:
             skipped=scraper.stats.skipped,
             failed=scraper.stats.failed,
             status=status,
+            planned=scraper.budget.planned,
+            completed=scraper.budget.completed,
         )
         scraper.close()
         storage.close()
+        if archive:
+            archive.close()
 
     if exc:
         raise exc
@@ -121,6 +135,20 @@ def main():
         default="diffords.db",
         help="SQLite 資料庫路徑（預設: diffords.db）",
     )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="時間上限（秒，自程式啟動起算），截止前主動收尾；建議設為 Cloud Run 任務逾時",
+    )
+    parser.add_argument(
+        "--archive",
+        nargs="?",
+        const="page_archive.db",
+        default=None,
+        metavar="PATH",
+        help="封存原始酒譜頁 HTML（壓縮、相同內容只存一份），供 reparse.py 離線重新擷取（預設路徑: page_archive.db）",
+    )
     parser.add_argument(
         "--notify-line",
         action="store_true",
@@ -142,6 +170,9 @@ def main():
         gcs_storage.download_db(gcs_bucket, gcs_db_blob, args.db_path)
 
     # ── 執行爬蟲 ─────────────────────────────────────────────────────
+    # 時間預算自程式啟動起算：扣除 GCS 下載等前置耗時
+    if args.time_budget:
+        args.time_budget = max(args.time_budget - (time.time() - _run_start), 1.0)
     _exc: Exception | None = None
     try:
         success, stats = run(args.mode, args.db_path, args.notify_line, args)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+詳情頁解析器微基準：比較 bs4（html.parser + DataExtractor）與 lxml（LxmlExtractor）
+每頁「解析 + 提取」的耗時，並確認兩者輸出一致。
+
+用法:
+    uv run python scripts/bench_detail_parser.py [HTML 檔 ...] [--repeat 200] [--filler-kb 0]
+
+範例:
+    # 以 fixtures 的詳情頁為基準
+    uv run python scripts/bench_detail_parser.py
+    # 存下的實際詳情頁（driver.page_source）；或以 --filler-kb 模擬完整 React 頁面的大小
+    uv run python scripts/bench_detail_parser.py pages/*.html
+    uv run python scripts/bench_detail_parser.py --filler-kb 400
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from distiller_scraper.lxml_extractor import extract_detail_html
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "fixtures" / "sample_spirit_detail.html"
+PARSERS = ("bs4", "lxml")
+
+# 與詳情欄位無關的列表區塊：模擬渲染後頁面的導覽列、推薦清單等
+_FILLER_BLOCK = (
+    '<div class="related"><ul class="spirits-list">'
+    + "".join(
+        f'<li class="spirit-card"><a href="/spirits/x-{i}"><span class="title">Spirit {i}</span>'
+        f'<span class="meta">Whiskey // Scotland</span></a></li>'
+        for i in range(10)
+    )
+    + "</ul></div>"
+)
+
+
+def pad(html: str, filler_kb: int) -> str:
+    """在 </body> 前插入約 filler_kb KB 的無關標記。"""
+    if filler_kb <= 0:
+        return html
+    filler = _FILLER_BLOCK * max(1, filler_kb * 1024 // len(_FILLER_BLOCK))
+    return html.replace("</body>", filler + "</body>", 1)
+
+
+def bench(html: str, parser: str, repeat: int) -> float:
+    """每頁解析 + 提取耗時的中位數（毫秒）。"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract_detail_html(html, parser)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較詳情頁解析器的每頁耗時")
+    parser.add_argument("files", nargs="*", default=[str(FIXTURE)], help="詳情頁 HTML 檔")
+    parser.add_argument("--repeat", type=int, default=200, help="每頁重複次數（預設: 200）")
+    parser.add_argument(
+        "--filler-kb", type=int, default=0, help="附加的無關標記大小（KB），模擬完整渲染頁面"
+    )
+    args = parser.parse_args()
+
+    print(f"{'頁面':<40} {'大小':>8} {'bs4 ms':>9} {'lxml ms':>9} {'倍數':>6}  輸出一致")
+    totals = {name: 0.0 for name in PARSERS}
+    for path in args.files:
+        html = pad(Path(path).read_text(encoding="utf-8"), args.filler_kb)
+        same = extract_detail_html(html, "bs4") == extract_detail_html(html, "lxml")
+        ms = {name: bench(html, name, args.repeat) for name in PARSERS}
+        for name in PARSERS:
+            totals[name] += ms[name]
+        print(
+            f"{Path(path).name:<40} {len(html) // 1024:>6}KB {ms['bs4']:>9.2f} {ms['lxml']:>9.2f} "
+            f"{ms['bs4'] / ms['lxml']:>5.1f}x  {'✓' if same else '✗'}"
+        )
+        if not same:
+            print("  ⚠️  兩個解析器輸出不同，請先修正 lxml_extractor.py 再切換 DETAIL_PARSER")
+
+    if len(args.files) > 1:
+        print(
+            f"{'合計':<40} {'':>8} {totals['bs4']:>9.2f} {totals['lxml']:>9.2f} "
+            f"{totals['bs4'] / totals['lxml']:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
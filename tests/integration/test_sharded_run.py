@@ -0,0 +1,116 @@
+"""
+整合測試 - 平行分片執行
+以本機 mock server 提供 sitemap 與詳情頁，同時啟動 N 個 run.py 程序（各一個分片），
+再以 --mode merge-shards 合併，驗證每筆烈酒恰好由一個分片爬取且全部併入主資料庫
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from distiller_scraper.sharding import ShardSpec, shard_db_path
+
+ROOT = Path(__file__).resolve().parents[2]
+DETAIL_HTML = (ROOT / "tests" / "fixtures" / "sample_spirit_detail.html").read_text()
+SLUGS = [f"mock-spirit-{i}" for i in range(6)]
+SHARDS = 3
+
+
+class MockDistiller(BaseHTTPRequestHandler):
+    def do_GET(self):
+        host = f"http://{self.headers['Host']}"
+        if self.path == "/sitemap.xml":
+            body = (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                + "".join(
+                    f"<url><loc>{host}/spirits/{slug}</loc><lastmod>2026-05-01</lastmod></url>"
+                    for slug in SLUGS
+                )
+                + "</urlset>"
+            )
+            content_type = "application/xml"
+        elif self.path.startswith("/spirits/") and self.path[9:] in SLUGS:
+            body = DETAIL_HTML.replace("Highland Park 18 Year", self.path[9:])
+            content_type = "text/html"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mock_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockDistiller)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def run_py(*args, cwd):
+    env = {
+        k: v for k, v in os.environ.items()
+        if not k.startswith(("CLOUD_RUN_TASK_", "GCS_", "LINE_"))
+    }
+    return subprocess.Popen(
+        [sys.executable, str(ROOT / "run.py"), *args],
+        cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+
+
+def test_parallel_shards_then_merge(mock_server, tmp_path):
+    db_path = str(tmp_path / "distiller.db")
+    urls = {f"{mock_server}/spirits/{slug}" for slug in SLUGS}
+
+    procs = [
+        run_py(
+            "--mode", "medium", "--discovery", "sitemap", "--http-detail",
+            "--output", "sqlite", "--db-path", db_path,
+            "--sitemap-url", f"{mock_server}/sitemap.xml",
+            "--shard-index", str(i), "--shard-count", str(SHARDS),
+            cwd=tmp_path,
+        )
+        for i in range(SHARDS)
+    ]
+    for proc in procs:
+        output, _ = proc.communicate(timeout=120)
+        assert proc.returncode == 0, output
+
+    scraped = {}
+    for i in range(SHARDS):
+        conn = sqlite3.connect(shard_db_path(db_path, i, SHARDS))
+        scraped[i] = {r[0] for r in conn.execute("SELECT url FROM spirits")}
+        conn.close()
+        assert all(ShardSpec(i, SHARDS).owns(url) for url in scraped[i])
+    assert set().union(*scraped.values()) == urls
+
+    merge = run_py(
+        "--mode", "merge-shards", "--output", "sqlite", "--db-path", db_path,
+        "--shard-count", str(SHARDS), cwd=tmp_path,
+    )
+    output, _ = merge.communicate(timeout=120)
+    assert merge.returncode == 0, output
+
+    conn = sqlite3.connect(db_path)
+    merged = {r[0] for r in conn.execute("SELECT url FROM spirits")}
+    flavors = conn.execute("SELECT COUNT(DISTINCT spirit_id) FROM flavor_profiles").fetchone()[0]
+    conn.close()
+    assert merged == urls
+    assert flavors == len(SLUGS)
+    assert not Path(shard_db_path(db_path, 0, SHARDS)).exists()  # 已併入的分片刪除
@@ -4,12 +4,14 @@ DistillerAPIClient 單元測試
 """
 
 import json
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
 from distiller_scraper.api_client import DistillerAPIClient
+from distiller_scraper.config import ScraperConfig
 
 
 # ---------------------------------------------------------------------------
@@ -306,6 +308,68 @@ class TestDiscover:
         assert client._discovered is True
 
 
+# ---------------------------------------------------------------------------
+# 搜尋結果欄位擷取
+# ---------------------------------------------------------------------------
+
+FULL_SEARCH_ITEM = {
+    "url": "/spirits/ardbeg-10",
+    "name": "Ardbeg 10",
+    "type": "Peated Single Malt",
+    "distiller_score": 92,
+    "average_rating": 4.3,
+    "abv": 46,
+    "flavor_profile": {"smoky": 90, "sweet": 20},
+}
+
+
+class TestSearchHarvest:
+    def fetch(self, client, items):
+        client.search_endpoint = "https://distiller.com/search.json"
+        with patch.object(client, "_probe", return_value=make_response({"spirits": items})):
+            return client.fetch_search_results("whiskey")
+
+    def test_map_search_items_keeps_fields(self, client):
+        items = client._map_search_items([FULL_SEARCH_ITEM, {"slug": "bare"}, "junk"])
+        assert items[0]["url"] == "https://distiller.com/spirits/ardbeg-10"
+        assert items[0]["spirit_type"] == "Peated Single Malt"
+        assert items[0]["flavor_data"] == {"smoky": 90, "sweet": 20}
+        assert items[1]["url"] == "https://distiller.com/spirits/bare"
+        assert items[1]["name"] == "N/A"
+
+    def test_completeness(self, client):
+        full, bare = client._map_search_items([FULL_SEARCH_ITEM, {"slug": "bare", "name": "Bare"}])
+        assert client.completeness(full) == 1.0
+        assert client.completeness(bare) == pytest.approx(1 / 6)
+
+    def test_complete_item_harvested(self, client):
+        urls = self.fetch(client, [FULL_SEARCH_ITEM])
+
+        assert urls == ["https://distiller.com/spirits/ardbeg-10"]
+        record = client.take_search_record(urls[0])
+        assert record["name"] == "Ardbeg 10"
+        assert client.take_search_record(urls[0]) is None  # 取出後移除
+
+    def test_clear_search_records(self, client):
+        urls = self.fetch(client, [FULL_SEARCH_ITEM])
+
+        assert client.clear_search_records() == 1
+        assert client.take_search_record(urls[0]) is None
+
+    def test_incomplete_item_not_harvested(self, client):
+        item = {k: v for k, v in FULL_SEARCH_ITEM.items() if k != "flavor_profile"}
+        urls = self.fetch(client, [item])
+
+        assert client.take_search_record(urls[0]) is None
+        assert client.harvest_stats == {"搜尋結果": 1, "欄位完整": 0}
+
+    def test_threshold_configurable(self, client):
+        item = {k: v for k, v in FULL_SEARCH_ITEM.items() if k != "flavor_profile"}
+        with patch.object(ScraperConfig, "API_SEARCH_MIN_COMPLETENESS", 0.8):
+            urls = self.fetch(client, [item])
+        assert client.take_search_record(urls[0]) is not None
+
+
 # ---------------------------------------------------------------------------
 # fetch_search_results (mock HTTP)
 # ---------------------------------------------------------------------------
@@ -355,6 +419,19 @@ class TestFetchSearchResults:
 
         assert "page" not in captured_params
 
+    def test_search_items_keep_scores(self, client):
+        client.search_endpoint = "https://distiller.com/search.json"
+        with patch.object(client, "_probe", return_value=make_response([FULL_SEARCH_ITEM])):
+            items = client.fetch_search_items("whiskey")
+        assert items[0]["expert_score"] == "92"
+        assert items[0]["community_score"] == "4.3"
+
+    def test_search_items_none_on_failure(self, client):
+        assert client.fetch_search_items("whiskey") is None  # 尚未探測到端點
+        client.search_endpoint = "https://distiller.com/search.json"
+        with patch.object(client, "_probe", return_value=None):
+            assert client.fetch_search_items("whiskey") is None
+
 
 # ---------------------------------------------------------------------------
 # fetch_spirit_detail (mock HTTP)
@@ -383,3 +460,118 @@ class TestFetchSpiritDetail:
         client.detail_endpoint_template = "https://distiller.com/spirits/{slug}.json"
         result = client.fetch_spirit_detail("https://distiller.com/search")
         assert result is None
+
+
+# ---------------------------------------------------------------------------
+# 並行探測優先順序
+# ---------------------------------------------------------------------------
+
+class TestParallelDiscover:
+    def test_priority_order_kept_when_several_candidates_pass(self, client):
+        xhr_urls = ["https://distiller.com/api/v2/spirits"]
+
+        def mock_get(url, **kwargs):
+            # 所有搜索候選皆可用 → 應選 XHR 候選（優先順序最高）
+            return make_response({"spirits": []})
+
+        with patch.object(client.session, "get", side_effect=mock_get):
+            result = client.discover(xhr_urls=xhr_urls)
+
+        assert result["search_endpoint"] == "https://distiller.com/api/v2/spirits"
+        assert result["detail_endpoint_template"] == DistillerAPIClient.DETAIL_CANDIDATES[0]
+
+    def test_later_candidate_selected_when_earlier_fail(self, client):
+        def mock_get(url, **kwargs):
+            if url.endswith("/api/spirits") or url.endswith("/api/spirits/highland-park-12-year"):
+                return make_response({"spirits": []})
+            return make_fail_response(404)
+
+        with patch.object(client.session, "get", side_effect=mock_get):
+            result = client.discover()
+
+        assert result["search_endpoint"] == "https://distiller.com/api/spirits"
+        assert result["detail_endpoint_template"] == "/api/spirits/{slug}"
+
+
+# ---------------------------------------------------------------------------
+# 端點快取
+# ---------------------------------------------------------------------------
+
+class TestEndpointCache:
+    def write_cache(self, path, saved_at=None, **overrides):
+        payload = {
+            "search_endpoint": "https://distiller.com/search.json",
+            "detail_endpoint_template": "https://distiller.com/spirits/{slug}.json",
+            "saved_at": saved_at if saved_at is not None else time.time(),
+        }
+        payload.update(overrides)
+        path.write_text(json.dumps(payload), encoding="utf-8")
+
+    def test_no_cache_path_disables_cache(self, client):
+        assert client.load_cached_endpoints() is False
+
+    def test_discover_writes_cache(self, tmp_path):
+        cache = tmp_path / "state" / "api.json"
+        client = DistillerAPIClient(cache_path=str(cache))
+        with patch.object(client.session, "get", return_value=make_response({"spirits": []})):
+            client.discover()
+
+        saved = json.loads(cache.read_text(encoding="utf-8"))
+        assert saved["search_endpoint"] == client.search_endpoint
+        assert saved["detail_endpoint_template"] == client.detail_endpoint_template
+
+    def test_failed_discover_does_not_write_cache(self, tmp_path):
+        cache = tmp_path / "api.json"
+        client = DistillerAPIClient(cache_path=str(cache))
+        with patch.object(client.session, "get", return_value=make_fail_response()):
+            client.discover()
+        assert not cache.exists()
+
+    def test_valid_cache_uses_single_probe(self, tmp_path):
+        cache = tmp_path / "api.json"
+        self.write_cache(cache)
+        client = DistillerAPIClient(cache_path=str(cache))
+
+        with patch.object(client.session, "get", return_value=make_response([])) as mock_get:
+            assert client.load_cached_endpoints() is True
+
+        assert mock_get.call_count == 1
+        assert client.is_available() is True
+        assert client.detail_endpoint_template == "https://distiller.com/spirits/{slug}.json"
+
+    def test_expired_cache_ignored(self, tmp_path):
+        cache = tmp_path / "api.json"
+        self.write_cache(cache, saved_at=0)
+        client = DistillerAPIClient(cache_path=str(cache), cache_ttl=60)
+
+        with patch.object(client.session, "get") as mock_get:
+            assert client.load_cached_endpoints() is False
+        mock_get.assert_not_called()
+
+    def test_stale_endpoint_rejected(self, tmp_path):
+        cache = tmp_path / "api.json"
+        self.write_cache(cache)
+        client = DistillerAPIClient(cache_path=str(cache))
+
+        with patch.object(client.session, "get", return_value=make_fail_response(404)):
+            assert client.load_cached_endpoints() is False
+        assert client.is_available() is False
+
+    def test_corrupt_cache_ignored(self, tmp_path):
+        cache = tmp_path / "api.json"
+        cache.write_text("{not json", encoding="utf-8")
+        client = DistillerAPIClient(cache_path=str(cache))
+        assert client.load_cached_endpoints() is False
+
+    def test_scraper_skips_xhr_capture_when_cache_valid(self):
+        from distiller_scraper.scraper import DistillerScraperV2
+
+        api = MagicMock()
+        api.load_cached_endpoints.return_value = True
+        scraper = DistillerScraperV2(api_client=api)
+
+        with patch.object(scraper, "capture_xhr_requests") as mock_capture:
+            assert scraper.discover_api() is True
+
+        mock_capture.assert_not_called()
+        api.discover.assert_not_called()
@@ -0,0 +1,195 @@
+"""
+分頁爬取檢查點單元測試
+驗證 crawl_checkpoints 讀寫、scrape_category_paginated 續爬與 scrape() 清除檢查點
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from distiller_scraper.config import ScraperConfig
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.storage import CSVStorage, SQLiteStorage
+
+QUERY = "https://distiller.com/search?category=whiskey"
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def db():
+    storage = SQLiteStorage(":memory:")
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def scraper(db):
+    return DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+
+
+def page_urls(page, per_page=3):
+    return [f"https://distiller.com/spirits/p{page}-{i}" for i in range(per_page)]
+
+
+def fake_scrape_urls(scraper):
+    """_scrape_urls 替身：標記為已見並加入結果。"""
+
+    def scrape(urls, category, results, max_spirits):
+        for url in urls:
+            if url in scraper.seen_urls or len(results) >= max_spirits:
+                continue
+            scraper.seen_urls.add(url)
+            results.append({"url": url})
+
+    return scrape
+
+
+def run_paginated(scraper, fetch, max_spirits=1000):
+    with (
+        patch.object(scraper, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+        patch.object(scraper, "_fetch_spirit_urls", side_effect=fetch) as mock_fetch,
+        patch.object(scraper, "_scrape_urls", side_effect=fake_scrape_urls(scraper)),
+        patch("time.sleep"),
+    ):
+        results = scraper.scrape_category_paginated("whiskey", max_spirits=max_spirits)
+    return results, [c.args[1] for c in mock_fetch.call_args_list]
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+class TestCheckpointStorage:
+    def test_table_created(self, db):
+        tables = {r[0] for r in db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        ).fetchall()}
+        assert "crawl_checkpoints" in tables
+
+    def test_missing_checkpoint(self, db):
+        assert db.load_checkpoint("whiskey", QUERY) is None
+
+    def test_save_and_load_roundtrip(self, db):
+        db.save_checkpoint("whiskey", QUERY, "whiskey", 3, {"pagination_works": True})
+        db.save_checkpoint("whiskey", QUERY, "whiskey", 4, {"pagination_works": True})
+
+        checkpoint = db.load_checkpoint("whiskey", QUERY)
+        assert checkpoint["last_page"] == 4
+        assert checkpoint["state"] == {"pagination_works": True}
+
+    def test_clear_by_category(self, db):
+        db.save_checkpoint("whiskey", QUERY, "whiskey", 1, {})
+        db.save_checkpoint("gin", "https://distiller.com/search?category=gin", "gin", 1, {})
+
+        db.clear_checkpoints(["whiskey"])
+
+        assert db.load_checkpoint("whiskey", QUERY) is None
+        assert db.load_checkpoint("gin", "https://distiller.com/search?category=gin")
+
+    def test_csv_storage_does_not_persist(self, tmp_path):
+        csv = CSVStorage(str(tmp_path / "out.csv"))
+        csv.save_checkpoint("whiskey", QUERY, "whiskey", 2, {})
+        assert csv.load_checkpoint("whiskey", QUERY) is None
+
+
+# ---------------------------------------------------------------------------
+# scrape_category_paginated 續爬
+# ---------------------------------------------------------------------------
+
+
+class TestPaginatedResume:
+    def test_checkpoint_written_per_page(self, scraper, db):
+        def fetch(url, page):
+            if page == 3:
+                raise RuntimeError("OOM")
+            return page_urls(page)
+
+        with patch.object(ScraperConfig, "PAGE_RETRY_COUNT", 1):
+            run_paginated(scraper, fetch)
+
+        checkpoint = db.load_checkpoint("whiskey", QUERY)
+        assert checkpoint["last_page"] == 2
+        assert checkpoint["state"]["pagination_works"] is True
+        assert not checkpoint["state"].get("done")
+
+    def test_resumes_after_last_processed_page(self, scraper, db):
+        db.save_checkpoint(
+            "whiskey", QUERY, "whiskey", 2,
+            {"pagination_works": True, "consecutive_dup_pages": 0,
+             "prev_page_urls": page_urls(2)},
+        )
+
+        results, pages = run_paginated(
+            scraper, lambda url, page: page_urls(page) if page <= 4 else []
+        )
+
+        assert pages == [3, 4, 5]
+        assert len(results) == 6
+        assert db.load_checkpoint("whiskey", QUERY)["state"]["done"] is True
+
+    def test_completed_query_skipped(self, scraper, db):
+        db.save_checkpoint("whiskey", QUERY, "whiskey", 7, {"done": True})
+
+        results, pages = run_paginated(scraper, lambda url, page: page_urls(page))
+
+        assert pages == []
+        assert results == []
+
+    def test_max_spirits_does_not_mark_done(self, scraper, db):
+        run_paginated(scraper, lambda url, page: page_urls(page), max_spirits=3)
+
+        checkpoint = db.load_checkpoint("whiskey", QUERY)
+        assert checkpoint["last_page"] == 1
+        assert not checkpoint["state"].get("done")
+
+    def test_without_storage(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        results, pages = run_paginated(
+            s, lambda url, page: page_urls(page) if page == 1 else []
+        )
+        assert pages == [1, 2]
+        assert len(results) == 3
+
+
+# ---------------------------------------------------------------------------
+# scrape() 清除檢查點
+# ---------------------------------------------------------------------------
+
+
+class TestScrapeClearsCheckpoints:
+    def run_scrape(self, scraper, scrape_category):
+        with (
+            patch.object(scraper, "start_driver", return_value=True),
+            patch.object(scraper, "_health_check", return_value=True),
+            patch.object(scraper, "scrape_category", side_effect=scrape_category),
+            patch("time.sleep"),
+        ):
+            return scraper.scrape(categories=["whiskey", "gin"], max_per_category=1)
+
+    def test_completed_categories_cleared(self, scraper, db):
+        db.save_checkpoint("whiskey", QUERY, "whiskey", 3, {})
+        db.save_checkpoint("gin", "gin-query", "gin", 3, {})
+
+        assert self.run_scrape(scraper, lambda category, **kw: []) is True
+
+        assert db.load_checkpoint("whiskey", QUERY) is None
+        assert db.load_checkpoint("gin", "gin-query") is None
+
+    def test_failed_category_kept(self, scraper, db):
+        db.save_checkpoint("whiskey", QUERY, "whiskey", 3, {})
+        db.save_checkpoint("gin", "gin-query", "gin", 3, {})
+
+        def scrape_category(category, **kw):
+            if category == "gin":
+                raise RuntimeError("boom")
+            return []
+
+        self.run_scrape(scraper, scrape_category)
+
+        assert db.load_checkpoint("whiskey", QUERY) is None
+        assert db.load_checkpoint("gin", "gin-query")["last_page"] == 3
@@ -0,0 +1,205 @@
+"""
+API 模式並行詳情抓取單元測試
+驗證 worker pool、全域速率限制與 storage 寫入
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distiller_scraper.concurrency import RateLimiter
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.storage import SQLiteStorage
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def make_api_client(fail_slugs=()):
+    """建立詳情端點可用的 api_client mock；fail_slugs 內的 slug 回傳 None。"""
+    client = MagicMock()
+    client.is_available.return_value = True
+    client.detail_endpoint_template = "https://distiller.com/spirits/{slug}.json"
+
+    def fetch(url):
+        slug = url.rsplit("/", 1)[-1]
+        if slug in fail_slugs:
+            return None
+        return {"name": slug, "url": url, "expert_score": "90", "flavor_data": {}}
+
+    client.fetch_spirit_detail.side_effect = fetch
+    return client
+
+
+def urls(*slugs):
+    return [f"https://distiller.com/spirits/{s}" for s in slugs]
+
+
+@pytest.fixture
+def db():
+    storage = SQLiteStorage(":memory:")
+    yield storage
+    storage.close()
+
+
+# ---------------------------------------------------------------------------
+# RateLimiter
+# ---------------------------------------------------------------------------
+
+
+class TestRateLimiter:
+    def test_unlimited_never_waits(self):
+        limiter = RateLimiter(None)
+        assert all(limiter.acquire() == 0.0 for _ in range(5))
+
+    def test_spaces_requests_across_threads(self):
+        limiter = RateLimiter(50)  # 間隔 20ms
+        stamps = []
+        lock = threading.Lock()
+
+        def worker():
+            limiter.acquire()
+            with lock:
+                stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stamps.sort()
+        # 5 次請求至少跨越 4 個間隔
+        assert stamps[-1] - stamps[0] >= 4 * 0.02 * 0.9
+
+
+# ---------------------------------------------------------------------------
+# _scrape_urls 並行路徑
+# ---------------------------------------------------------------------------
+
+
+class TestConcurrentDetails:
+    def test_routes_to_pool_when_api_detail_available(self):
+        s = DistillerScraperV2(api_client=make_api_client(), api_concurrency=3)
+        assert s._use_concurrent_details() is True
+
+    def test_sequential_when_concurrency_is_one(self):
+        s = DistillerScraperV2(api_client=make_api_client(), api_concurrency=1)
+        assert s._use_concurrent_details() is False
+
+    def test_sequential_without_detail_endpoint(self):
+        client = make_api_client()
+        client.detail_endpoint_template = None
+        s = DistillerScraperV2(api_client=client, api_concurrency=3)
+        assert s._use_concurrent_details() is False
+
+    def test_saves_all_results_through_storage(self, db):
+        s = DistillerScraperV2(
+            storage=db, api_client=make_api_client(), api_concurrency=4, api_max_rps=0
+        )
+        results = []
+        s._scrape_urls(urls("a", "b", "c", "d", "e"), "whiskey", results, 10)
+
+        assert len(results) == 5
+        assert all(r["category"] == "whiskey" for r in results)
+        assert db.count() == 5
+        assert set(urls("a", "b", "c", "d", "e")) <= s.seen_urls
+
+    def test_respects_max_spirits(self):
+        client = make_api_client()
+        s = DistillerScraperV2(api_client=client, api_concurrency=4, api_max_rps=0)
+        results = []
+        s._scrape_urls(urls("a", "b", "c", "d", "e"), "gin", results, 2)
+
+        assert len(results) == 2
+        assert client.fetch_spirit_detail.call_count == 2
+
+    def test_skips_seen_and_duplicate_urls(self):
+        client = make_api_client()
+        s = DistillerScraperV2(api_client=client, api_concurrency=4, api_max_rps=0)
+        s.seen_urls.add(urls("a")[0])
+        results = []
+        s._scrape_urls(urls("a", "b", "b", "c"), "rum", results, 10)
+
+        assert sorted(r["name"] for r in results) == ["b", "c"]
+        assert client.fetch_spirit_detail.call_count == 2
+
+    def test_failed_api_urls_fall_back_to_sequential(self):
+        s = DistillerScraperV2(
+            delay_min=0,
+            delay_max=0,
+            api_client=make_api_client(fail_slugs={"b"}),
+            api_concurrency=4,
+            api_max_rps=0,
+        )
+        results = []
+        with patch.object(s, "scrape_spirit_detail", return_value=None) as mock_detail:
+            s._scrape_urls(urls("a", "b", "c"), "vodka", results, 10)
+
+        assert len(results) == 2
+        mock_detail.assert_called_once_with(urls("b")[0])
+
+    def test_selenium_fallback_does_not_retry_http(self):
+        client = make_api_client(fail_slugs={"b"})
+        s = DistillerScraperV2(
+            delay_min=0, delay_max=0, api_client=client, api_concurrency=4, api_max_rps=0
+        )
+        results = []
+        with patch.object(s, "_ensure_driver", return_value=False):
+            s._scrape_urls(urls("a", "b"), "vodka", results, 10)
+
+        # b 的 API 詳情只請求一次；Selenium 階段直接載入頁面（此處 driver 不可用 → 失敗）
+        assert [c.args[0] for c in client.fetch_spirit_detail.call_args_list].count(urls("b")[0]) == 1
+        assert s.failed_urls == urls("b")
+
+    def test_sequential_http_goes_through_rate_limiter(self):
+        s = DistillerScraperV2(api_client=make_api_client(), api_concurrency=1)
+        with patch.object(s._rate_limiter, "acquire", return_value=0.0) as acquire:
+            assert s.scrape_spirit_detail(urls("a")[0])["name"] == "a"
+        acquire.assert_called_once_with()
+
+
+class TestSearchRecords:
+    def make_client(self, harvested):
+        client = make_api_client()
+        client.take_search_record.side_effect = lambda url: harvested.pop(url, None)
+        client.harvest_stats = {"搜尋結果": 3, "欄位完整": len(harvested)}
+        return client
+
+    def test_harvested_records_skip_detail_requests(self, db):
+        harvested = {urls("a")[0]: {"name": "A", "url": urls("a")[0], "flavor_data": {}}}
+        client = self.make_client(harvested)
+        s = DistillerScraperV2(storage=db, api_client=client, api_concurrency=4, api_max_rps=0)
+        results = []
+        s._scrape_urls(urls("a", "b"), "whiskey", results, 10)
+
+        assert len(results) == 2
+        client.fetch_spirit_detail.assert_called_once_with(urls("b")[0])
+        assert db.count() == 2
+        assert results[0]["category"] == "whiskey"
+        assert s.get_statistics()["搜尋結果欄位"]["直接儲存"] == 1
+
+    def test_harvested_records_respect_max_spirits(self):
+        harvested = {u: {"name": u, "url": u, "flavor_data": {}} for u in urls("a", "b")}
+        client = self.make_client(harvested)
+        s = DistillerScraperV2(api_client=client, api_concurrency=4, api_max_rps=0)
+        results = []
+        s._scrape_urls(urls("a", "b", "c"), "gin", results, 1)
+
+        assert len(results) == 1
+        client.fetch_spirit_detail.assert_not_called()
+
+    def test_records_of_seen_urls_discarded(self):
+        harvested = {u: {"name": u, "url": u, "flavor_data": {}} for u in urls("a", "b")}
+        client = self.make_client(harvested)
+        s = DistillerScraperV2(api_client=client, api_concurrency=4, api_max_rps=0)
+        s.seen_urls.add(urls("a")[0])
+        results = []
+        s._scrape_urls(urls("a", "b"), "gin", results, 10)
+
+        assert [r["url"] for r in results] == urls("b")
+        assert harvested == {}
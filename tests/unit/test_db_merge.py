@@ -0,0 +1,154 @@
+"""
+資料庫合併單元測試
+驗證 spirits / cocktails 依時間戳決勝、子表依 url 重新對應、執行紀錄去重、舊版 schema 與種類判斷
+"""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from distiller_scraper.db_merge import detect_kind, merge_databases
+from distiller_scraper.diffords_storage import DiffordsStorage
+from distiller_scraper.storage import _DDL, SQLiteStorage
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+def recipe(cocktail_id, slug):
+    return f"https://www.diffordsguide.com/cocktails/recipe/{cocktail_id}/{slug}"
+
+
+def touch(conn, table, column, url, timestamp):
+    conn.execute(f"UPDATE {table} SET {column} = ? WHERE url = ?", (timestamp, url))
+    conn.commit()
+
+
+@pytest.fixture
+def distiller_dbs(tmp_path):
+    target = SQLiteStorage(str(tmp_path / "target.db"))
+    target.save_spirit({"name": "old", "url": spirit("a"), "flavor_data": {"smoky": 10}})
+    target.save_spirit({"name": "keep", "url": spirit("b"), "category": "gin"})
+    touch(target.conn, "spirits", "updated_at", spirit("a"), "2026-01-01 00:00:00")
+    touch(target.conn, "spirits", "updated_at", spirit("b"), "2026-03-01 00:00:00")
+    target.record_scrape_run(["whiskey"], "full")
+    target.close()
+
+    source = SQLiteStorage(str(tmp_path / "source.db"))
+    source.save_spirit({"name": "filler", "url": spirit("z")})  # 讓兩邊 id 不一致
+    source.save_spirit({"name": "new", "url": spirit("a"), "flavor_data": {"sweet": 70}})
+    source.save_spirit({"name": "stale", "url": spirit("b")})
+    touch(source.conn, "spirits", "updated_at", spirit("b"), "2026-02-01 00:00:00")
+    source.record_scrape_run(["gin"], "medium")
+    source.close()
+    return str(tmp_path / "target.db"), str(tmp_path / "source.db")
+
+
+class TestMergeDistiller:
+    def test_newer_wins_and_flavors_remapped(self, distiller_dbs):
+        target, source = distiller_dbs
+
+        stats = merge_databases(target, [source])
+
+        assert (stats["種類"], stats["來源列數"], stats["新增"], stats["更新"]) == (
+            "distiller", 3, 1, 1,
+        )
+        assert stats["每秒列數"] > 0
+        db = SQLiteStorage(target)
+        rows = {r["url"]: r for r in db.get_all_spirits()}
+        assert rows[spirit("a")]["name"] == "new"
+        assert rows[spirit("a")]["id"] == 1  # 目標 id 不變
+        assert (rows[spirit("b")]["name"], rows[spirit("b")]["category"]) == ("keep", "gin")
+        flavors = db.conn.execute(
+            "SELECT spirit_id, flavor_name FROM flavor_profiles ORDER BY spirit_id"
+        ).fetchall()
+        assert [tuple(r) for r in flavors] == [(1, "sweet")]
+        db.close()
+
+    def test_runs_appended_once(self, distiller_dbs):
+        target, source = distiller_dbs
+        assert merge_databases(target, [source])["執行紀錄"] == 1
+        assert merge_databases(target, [source])["執行紀錄"] == 0  # 重複合併不重複追加
+        conn = sqlite3.connect(target)
+        modes = [r[0] for r in conn.execute("SELECT mode FROM scrape_runs ORDER BY id")]
+        conn.close()
+        assert modes == ["full", "medium"]
+
+    def test_old_schema_source(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            _DDL.replace("    review_delta   INTEGER,\n", "").replace("    lastmod        TEXT,\n", "")
+        )
+        conn.execute("INSERT INTO spirits (name, url) VALUES ('x', ?)", (spirit("x"),))
+        conn.commit()
+        conn.close()
+
+        stats = merge_databases(str(tmp_path / "new.db"), [path])
+
+        assert stats["新增"] == 1
+
+
+class TestMergeDiffords:
+    def test_scraped_at_wins_and_ingredients(self, tmp_path):
+        base = {"name": "Negroni", "url": recipe(7, "negroni")}
+        target = DiffordsStorage(str(tmp_path / "target.db"))
+        target.save_cocktail({**base, "ingredients_generic": [{"sort_order": 1, "item": "Gin"}]})
+        touch(target.conn, "cocktails", "scraped_at", base["url"], "2026-01-01 00:00:00")
+        target.close()
+        source = DiffordsStorage(str(tmp_path / "source.db"))
+        source.save_cocktail(
+            {
+                **base,
+                "rating_value": 4.5,
+                "ingredients_generic": [
+                    {"sort_order": 1, "item": "Gin"},
+                    {"sort_order": 2, "item": "Campari"},
+                ],
+            }
+        )
+        source.save_cocktail({"name": "Martini", "url": recipe(9, "martini")})
+        source.close()
+
+        stats = merge_databases(str(tmp_path / "target.db"), [str(tmp_path / "source.db")])
+
+        assert (stats["種類"], stats["新增"], stats["更新"]) == ("diffords", 1, 1)
+        db = DiffordsStorage(str(tmp_path / "target.db"))
+        negroni = db.get_cocktail_by_id(7)
+        assert negroni["rating_value"] == 4.5
+        assert [i["item"] for i in negroni["ingredients"]] == ["Gin", "Campari"]
+        assert db.get_cocktail_by_id(9)["name"] == "Martini"  # Difford's ID 一併保留
+        db.close()
+
+
+class TestKinds:
+    def test_detect_and_skip_mismatched(self, tmp_path, distiller_dbs):
+        _, source = distiller_dbs
+        cocktails = str(tmp_path / "cocktails.db")
+        DiffordsStorage(cocktails).close()
+        assert (detect_kind(source), detect_kind(cocktails)) == ("distiller", "diffords")
+
+        stats = merge_databases(str(tmp_path / "out.db"), [source, cocktails])
+        assert stats["略過"] == [cocktails]
+
+    def test_unknown_kind(self, tmp_path):
+        empty = str(tmp_path / "empty.db")
+        sqlite3.connect(empty).close()
+        with pytest.raises(ValueError):
+            merge_databases(str(tmp_path / "out.db"), [empty])
+
+
+def test_cli(distiller_dbs):
+    target, source = distiller_dbs
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "merge_db.py"), target, source],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "列/秒" in result.stdout
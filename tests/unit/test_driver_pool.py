@@ -0,0 +1,173 @@
+"""
+WebDriver 池單元測試
+以假 worker 取代真實 Chrome，驗證分派、逐 driver 淘汰與耗盡後 fallback
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from distiller_scraper.driver_pool import DriverPool, DriverPoolExhausted
+from distiller_scraper.scraper import DistillerScraperV2
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class FakeWorker:
+    """模擬 DistillerScraperV2 worker：scrape_spirit_detail 回傳以 slug 命名的資料。"""
+
+    def __init__(self, healthy=True, die_on=(), die_first=False):
+        self.healthy = healthy
+        self.die_on = set(die_on)
+        self.die_first = die_first
+        self.driver_failed = False
+        self.closed = False
+        self.scraped = []
+
+    def start_driver(self):
+        return True
+
+    def _health_check(self):
+        return self.healthy
+
+    def scrape_spirit_detail(self, url):
+        if url in self.die_on or (self.die_first and not self.scraped):
+            self.driver_failed = True
+            return None
+        self.scraped.append(url)
+        return {"name": url.rsplit("/", 1)[-1], "url": url}
+
+    def random_delay(self):
+        pass
+
+    def close_driver(self):
+        self.closed = True
+
+
+def urls(*slugs):
+    return [f"https://distiller.com/spirits/{s}" for s in slugs]
+
+
+# ---------------------------------------------------------------------------
+# DriverPool
+# ---------------------------------------------------------------------------
+
+
+class TestDriverPool:
+    def test_start_skips_unhealthy_workers(self):
+        workers = iter([FakeWorker(), FakeWorker(healthy=False), FakeWorker()])
+        pool = DriverPool(3, lambda: next(workers))
+
+        assert pool.start() == 2
+        assert pool.alive == 2
+
+    def test_worker_is_returned_after_use(self):
+        pool = DriverPool(1, FakeWorker)
+        pool.start()
+        with pool.worker() as w1:
+            pass
+        with pool.worker() as w2:
+            pass
+        assert w1 is w2
+
+    def test_failed_worker_is_retired_and_closed(self):
+        pool = DriverPool(2, FakeWorker)
+        pool.start()
+        with pool.worker() as w:
+            w.driver_failed = True
+
+        assert pool.alive == 1
+        assert pool.retired == 1
+        assert w.closed is True
+
+    def test_exhausted_pool_raises(self):
+        pool = DriverPool(1, FakeWorker)
+        pool.start()
+        with pool.worker() as w:
+            w.driver_failed = True
+        with pytest.raises(DriverPoolExhausted):
+            with pool.worker():
+                pass
+
+    def test_close_quits_all_drivers(self):
+        created = []
+
+        def factory():
+            created.append(FakeWorker())
+            return created[-1]
+
+        pool = DriverPool(2, factory)
+        pool.start()
+        pool.close()
+        assert all(w.closed for w in created)
+        assert pool.alive == 0
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2 + DriverPool
+# ---------------------------------------------------------------------------
+
+
+class TestScraperDriverPool:
+    def test_pool_disabled_by_default(self):
+        s = DistillerScraperV2()
+        assert s._ensure_driver_pool() is None
+
+    def test_details_dispatched_across_pool(self):
+        workers = [FakeWorker(), FakeWorker()]
+        s = DistillerScraperV2(driver_pool_size=2)
+        results = []
+        with patch.object(s, "_new_pool_worker", side_effect=workers):
+            s._scrape_urls(urls("a", "b", "c", "d"), "whiskey", results, 10)
+
+        assert sorted(r["name"] for r in results) == ["a", "b", "c", "d"]
+        assert all(r["category"] == "whiskey" for r in results)
+        assert sum(len(w.scraped) for w in workers) == 4
+        assert set(urls("a", "b", "c", "d")) <= s.seen_urls
+
+    def test_one_dead_driver_does_not_stop_the_run(self):
+        dying = FakeWorker(die_first=True)
+        healthy = FakeWorker()
+        s = DistillerScraperV2(driver_pool_size=2)
+        results = []
+        with patch.object(s, "_new_pool_worker", side_effect=[dying, healthy]):
+            s._scrape_urls(urls("a", "b", "c", "d", "e"), "gin", results, 10)
+
+        assert s.driver_pool.alive == 1
+        assert len(s.failed_urls) == 1
+        assert len(results) == 4
+        assert len(healthy.scraped) == 4
+
+    def test_falls_back_to_main_driver_when_pool_exhausted(self):
+        s = DistillerScraperV2(driver_pool_size=1, delay_min=0, delay_max=0)
+        dying = FakeWorker(die_on=set(urls("a")))
+        results = []
+        with (
+            patch.object(s, "_new_pool_worker", return_value=dying),
+            patch.object(s, "scrape_spirit_detail", return_value=None) as main_detail,
+        ):
+            s._scrape_urls(urls("a", "b", "c"), "rum", results, 1)
+
+        # a 讓唯一的 driver 失效 → 池耗盡，剩餘 URL 改由主 driver 處理
+        assert s.driver_pool.alive == 0
+        assert [c.args[0] for c in main_detail.call_args_list] == urls("b", "c")
+
+    def test_urls_unserved_by_exhausted_pool_retried_on_main_driver(self):
+        s = DistillerScraperV2(driver_pool_size=2, delay_min=0, delay_max=0)
+        workers = [FakeWorker(die_first=True), FakeWorker(die_first=True)]
+        results = []
+        with (
+            patch.object(s, "_new_pool_worker", side_effect=workers),
+            patch.object(s, "scrape_spirit_detail", side_effect=lambda u: {"name": "main", "url": u}) as main_detail,
+        ):
+            s._scrape_urls(urls("a", "b", "c", "d"), "rum", results, 10)
+
+        # 兩個 driver 各在第一筆失效；同批其餘 URL 未被嘗試，不得記為失敗，須交回主 driver
+        assert s.driver_pool.alive == 0
+        retried = [c.args[0] for c in main_detail.call_args_list]
+        assert len(s.failed_urls) == 2 and len(retried) == 2
+        assert set(s.failed_urls) | set(retried) == set(urls("a", "b", "c", "d"))
+        assert len(results) == 2
@@ -0,0 +1,152 @@
+"""
+Chrome 看門狗單元測試
+驗證程序樹 RSS 取樣、頁數 / 記憶體水位與 scraper 於頁面之間的主動回收
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distiller_scraper import driver_watchdog
+from distiller_scraper.driver_watchdog import DriverWatchdog, process_tree_rss
+from distiller_scraper.scraper import DistillerScraperV2
+
+
+# ---------------------------------------------------------------------------
+# process_tree_rss
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="需要 /proc")
+class TestProcessTreeRss:
+    def test_own_process_has_rss(self):
+        assert process_tree_rss(os.getpid()) > 0
+
+    def test_parent_tree_includes_children(self):
+        parent = os.getppid()
+        assert process_tree_rss(parent) >= process_tree_rss(os.getpid())
+
+    def test_missing_pid_returns_none(self):
+        assert process_tree_rss(2**22 + 12345) is None
+
+
+# ---------------------------------------------------------------------------
+# DriverWatchdog
+# ---------------------------------------------------------------------------
+
+
+class TestDriverWatchdog:
+    def test_page_watermark(self):
+        dog = DriverWatchdog(max_pages=3, max_rss_mb=0)
+        for _ in range(2):
+            dog.record_page()
+        assert dog.check(None) is None
+        dog.record_page()
+        assert dog.check(None) == "pages"
+
+    def test_reset_clears_pages(self):
+        dog = DriverWatchdog(max_pages=1, max_rss_mb=0)
+        dog.record_page()
+        dog.reset()
+        assert dog.check(None) is None
+
+    def test_memory_sampled_every_n_pages(self):
+        dog = DriverWatchdog(max_pages=0, max_rss_mb=100, check_every=2)
+        with patch.object(
+            driver_watchdog, "process_tree_rss", return_value=200 * 1024 * 1024
+        ) as mock_rss:
+            dog.record_page()
+            assert dog.check(1234) is None  # 第 1 頁不取樣
+            dog.record_page()
+            assert dog.check(1234) == "memory"
+
+        mock_rss.assert_called_once_with(1234)
+        assert dog.summary()["最高 RSS MB"] == 200.0
+
+    def test_memory_sampled_when_batches_skip_multiples(self):
+        # 多分頁路徑一次記錄整批頁數：3、6、9、12 都不是 check_every=5 的倍數，取餘數判斷永遠不會取樣
+        dog = DriverWatchdog(max_pages=0, max_rss_mb=100, check_every=5)
+        with patch.object(
+            driver_watchdog, "process_tree_rss", return_value=10 * 1024 * 1024
+        ) as mock_rss:
+            for _ in range(4):
+                for _ in range(3):
+                    dog.record_page()
+                dog.check(1234)
+
+        # 第 6 頁（距上次 6 頁）與第 12 頁（距上次 6 頁）各取樣一次
+        assert mock_rss.call_count == 2
+        assert dog.pages_at_last_sample == 12
+
+    def test_memory_below_watermark(self):
+        dog = DriverWatchdog(max_pages=0, max_rss_mb=100, check_every=1)
+        dog.record_page()
+        with patch.object(driver_watchdog, "process_tree_rss", return_value=10 * 1024 * 1024):
+            assert dog.check(1234) is None
+
+    def test_disabled_watermarks(self):
+        dog = DriverWatchdog(max_pages=None, max_rss_mb=None)
+        for _ in range(1000):
+            dog.record_page()
+        assert dog.check(1234) is None
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2 整合
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def scraper():
+    s = DistillerScraperV2(delay_min=0, delay_max=0)
+    s.driver = MagicMock()
+    s.watchdog = DriverWatchdog(max_pages=2, max_rss_mb=0)
+    return s
+
+
+class TestScraperRecycling:
+    def test_load_page_counts_pages(self, scraper):
+        scraper._load_page("https://distiller.com/spirits/a")
+        assert scraper.watchdog.pages == 1
+        scraper.driver.get.assert_called_once_with("https://distiller.com/spirits/a")
+
+    def test_recycles_between_pages_without_using_restart_budget(self, scraper):
+        def restart():
+            scraper.watchdog.reset()
+            return True
+
+        with patch.object(scraper, "restart_driver", side_effect=restart) as mock_restart:
+            for slug in ("a", "b", "c"):
+                scraper._load_page(f"https://distiller.com/spirits/{slug}")
+
+        mock_restart.assert_called_once()
+        assert scraper.restart_count == 0
+        assert scraper.watchdog.summary()["回收原因"] == {"pages": 1}
+
+    def test_failed_recycle_retries_cold_start(self, scraper):
+        scraper.watchdog.pages = 2
+        with (
+            patch.object(scraper, "restart_driver", return_value=False),
+            patch.object(scraper, "start_driver", return_value=False),
+        ):
+            with pytest.raises(RuntimeError):
+                scraper._load_page("https://distiller.com/spirits/a")
+
+        assert scraper.driver is None
+        assert scraper.driver_failed is True
+
+    def test_detail_page_not_lost_on_recycle(self, scraper):
+        scraper.watchdog.pages = 2
+        scraper.driver.page_source = (
+            "<html><body><h1 class='secondary-headline name'>Ardbeg 10</h1></body></html>"
+        )
+        with patch.object(scraper, "restart_driver", return_value=True):
+            data = scraper.scrape_spirit_detail("https://distiller.com/spirits/ardbeg-10")
+
+        assert data["name"] == "Ardbeg 10"
+        assert scraper.failed_urls == []
+
+    def test_statistics_include_recycle_summary(self, scraper):
+        assert scraper.get_statistics()["Chrome 回收"]["回收次數"] == 0
@@ -0,0 +1,188 @@
+"""
+CrawlFrontier 單元測試
+驗證跨查詢去重、重疊 / 已知分類、取出順序，以及 scrape_category_paginated 的多風格串接
+"""
+
+from unittest.mock import patch
+
+from distiller_scraper.config import ScraperConfig
+from distiller_scraper.frontier import CrawlFrontier
+from distiller_scraper.scraper import DistillerScraperV2
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+class RecordingPages(dict):
+    """記錄被讀取頁碼的列表頁對照表。"""
+
+    def __init__(self, pages):
+        super().__init__(pages)
+        self.fetched = []
+
+    def get(self, page, default=None):
+        self.fetched.append(page)
+        return super().get(page, default)
+
+
+# ---------------------------------------------------------------------------
+# CrawlFrontier
+# ---------------------------------------------------------------------------
+
+
+class TestOffer:
+    def test_fresh_urls_enqueued_once(self):
+        frontier = CrawlFrontier()
+        offer = frontier.offer([spirit("a"), spirit("b"), spirit("a")], "Bourbon", 1, set())
+        assert offer.fresh == [spirit("a"), spirit("b")]
+        assert len(frontier) == 2
+
+    def test_db_urls_are_known(self):
+        frontier = CrawlFrontier()
+        offer = frontier.offer([spirit("a"), spirit("b")], "Bourbon", 1, {spirit("a")})
+        assert offer.known == [spirit("a")]
+        assert offer.duplicate_ratio == 0.5
+
+    def test_other_query_urls_are_overlap(self):
+        frontier = CrawlFrontier()
+        seen = set()
+        frontier.offer([spirit("a"), spirit("b")], "Bourbon", 1, seen)
+        seen.add(spirit("a"))  # 已爬
+        # b 仍在佇列，a 已爬：兩者都由 Bourbon 先發現
+        offer = frontier.offer([spirit("a"), spirit("b"), spirit("c")], "Rye", 1, seen)
+
+        assert offer.overlap == [spirit("a"), spirit("b")]
+        assert offer.fresh == [spirit("c")]
+        assert offer.duplicate_ratio == 0.0
+        assert len(frontier) == 3  # b 不重複入列
+
+    def test_same_query_repeat_is_known(self):
+        frontier = CrawlFrontier()
+        seen = set()
+        frontier.offer([spirit("a")], "Bourbon", 1, seen)
+        seen.add(spirit("a"))
+        offer = frontier.offer([spirit("a")], "Bourbon", 2, seen)
+        assert offer.known == [spirit("a")]
+
+    def test_discarded_url_can_be_offered_again(self):
+        frontier = CrawlFrontier()
+        frontier.offer([spirit("a")], "Bourbon", 1, set())
+        assert frontier.discard_pending() == 1
+        offer = frontier.offer([spirit("a")], "Rye", 1, set())
+        assert offer.fresh == [spirit("a")]
+
+
+class TestPop:
+    def test_priority_by_page_then_arrival(self):
+        frontier = CrawlFrontier()
+        frontier.offer([spirit("p3")], "Bourbon", 3, set())
+        frontier.offer([spirit("p1-a"), spirit("p1-b")], "Rye", 1, set())
+        frontier.offer([spirit("p2")], "Scotch", 2, set())
+
+        assert frontier.pop(set()) == [spirit("p1-a"), spirit("p1-b"), spirit("p2"), spirit("p3")]
+        assert len(frontier) == 0
+
+    def test_pop_skips_urls_scraped_meanwhile(self):
+        frontier = CrawlFrontier()
+        frontier.offer([spirit("a"), spirit("b")], "Bourbon", 1, set())
+        assert frontier.pop({spirit("a")}) == [spirit("b")]
+
+    def test_pop_limit(self):
+        frontier = CrawlFrontier()
+        frontier.offer([spirit(s) for s in "abc"], "Bourbon", 1, set())
+        assert frontier.pop(set(), limit=2) == [spirit("a"), spirit("b")]
+        assert len(frontier) == 1
+
+
+class TestSummary:
+    def test_overlap_report(self):
+        frontier = CrawlFrontier()
+        seen = set()
+        frontier.offer([spirit("a"), spirit("b")], "Bourbon", 1, seen)
+        seen.update(frontier.pop(seen))
+        frontier.offer([spirit("a"), spirit("c")], "Rye", 1, seen)
+
+        summary = frontier.summary()
+        assert summary["列出 URL"] == 4
+        assert summary["不重複 URL"] == 3
+        assert summary["查詢重疊"] == 1
+        assert summary["重疊率"] == 0.25
+        assert summary["各查詢"]["Rye"] == {"列出": 2, "新增": 1, "重疊": 1, "已知": 0}
+
+
+# ---------------------------------------------------------------------------
+# scrape_category_paginated 多風格串接
+# ---------------------------------------------------------------------------
+
+
+class TestPaginatedFrontier:
+    def run(self, scraper, listings, max_spirits=1000):
+        scraped = []
+
+        def scrape_urls(urls, category, results, max_spirits):
+            for url in urls:
+                if url not in scraper.seen_urls and len(results) < max_spirits:
+                    scraper.seen_urls.add(url)
+                    scraped.append(url)
+                    results.append({"url": url})
+
+        queries = [(f"https://distiller.com/search?q={label}", label) for label in listings]
+        with (
+            patch.object(scraper, "_get_search_queries", return_value=queries),
+            patch.object(
+                scraper,
+                "_fetch_spirit_urls",
+                side_effect=lambda url, page: listings[url.split("=")[-1]].get(page, []),
+            ),
+            patch.object(scraper, "_scrape_urls", side_effect=scrape_urls),
+            patch("time.sleep"),
+        ):
+            scraper.scrape_category_paginated("whiskey", max_spirits=max_spirits, use_styles=True)
+        return scraped
+
+    def test_overlap_does_not_trigger_first_page_skip(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        listings = {
+            "Bourbon": {1: [spirit("a"), spirit("b")]},
+            # Rye 首頁全是 Bourbon 剛爬過的 → 以前會被首頁早停；第 2 頁才有新烈酒
+            "Rye": {1: [spirit("a"), spirit("b")], 2: [spirit("c"), spirit("d")]},
+        }
+
+        scraped = self.run(s, listings)
+
+        assert scraped == [spirit("a"), spirit("b"), spirit("c"), spirit("d")]
+        assert s.frontier.summary()["各查詢"]["Rye"]["重疊"] == 2
+
+    def test_overlap_only_query_stops_paginating(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        bourbon = [spirit(f"b{i}") for i in range(6)]
+        # Rye 每頁都只是重新列出 Bourbon 已找到的烈酒（每頁組合不同，分頁判定為有效）
+        rye = RecordingPages(
+            {p: [bourbon[(p + i) % 6] for i in range(3)] for p in range(1, ScraperConfig.MAX_PAGES_PER_QUERY + 1)}
+        )
+        listings = {"Bourbon": {1: bourbon[:3], 2: bourbon[3:]}, "Rye": rye}
+
+        scraped = self.run(s, listings)
+
+        assert scraped == bourbon
+        # 第 1 頁判定分頁前不累計；第 2 頁起每頁一次連續重複頁 → 達上限即停止
+        assert rye.fetched == list(range(1, 2 + ScraperConfig.MAX_CONSECUTIVE_DUP_PAGES))
+        assert s.frontier.summary()["各查詢"]["Rye"]["新增"] == 0
+
+    def test_database_duplicates_still_skip(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        s.seen_urls = {spirit("a"), spirit("b")}
+        listings = {"Rye": {1: [spirit("a"), spirit("b")], 2: [spirit("c")]}}
+
+        assert self.run(s, listings) == []
+
+    def test_pending_discarded_at_max_spirits(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        listings = {"Bourbon": {1: [spirit("a"), spirit("b"), spirit("c")]}}
+
+        assert self.run(s, listings, max_spirits=1) == [spirit("a")]
+        assert len(s.frontier) == 0
+
+    def test_statistics_include_overlap(self):
+        assert "查詢重疊" in DistillerScraperV2().get_statistics()
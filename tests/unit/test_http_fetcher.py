@@ -0,0 +1,163 @@
+"""
+HTMLDetailFetcher 單元測試
+所有 HTTP 請求均使用 Mock，不需要真實網路連線
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from distiller_scraper.http_fetcher import HTMLDetailFetcher
+from distiller_scraper.scraper import DistillerScraperV2
+
+
+URL = "https://distiller.com/spirits/highland-park-12-year"
+
+FULL_HTML = """
+<html><body>
+  <h1 class="secondary-headline name">Highland Park 12 Year</h1>
+  <div class="distiller-score"><span>91</span></div>
+  <canvas class="js-flavor-profile-chart" data-flavors='{"smoky": 40, "rich": 60}'></canvas>
+</body></html>
+"""
+
+NO_FLAVOR_HTML = """
+<html><body>
+  <h1 class="secondary-headline name">Highland Park 12 Year</h1>
+  <div class="distiller-score"><span>91</span></div>
+</body></html>
+"""
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def make_response(text, status_code=200):
+    resp = MagicMock(spec=requests.Response)
+    resp.status_code = status_code
+    resp.text = text
+    return resp
+
+
+@pytest.fixture
+def fetcher():
+    return HTMLDetailFetcher()
+
+
+# ---------------------------------------------------------------------------
+# HTMLDetailFetcher
+# ---------------------------------------------------------------------------
+
+
+class TestHTMLDetailFetcher:
+    def test_session_accepts_html(self, fetcher):
+        assert "text/html" in fetcher.session.headers["Accept"]
+
+    def test_complete_page_returns_data(self, fetcher):
+        with patch.object(fetcher.session, "get", return_value=make_response(FULL_HTML)):
+            data = fetcher.fetch(URL)
+
+        assert data["name"] == "Highland Park 12 Year"
+        assert data["expert_score"] == "91"
+        assert data["flavor_data"] == {"smoky": 40, "rich": 60}
+        assert data["url"] == URL
+        assert fetcher.hits == 1
+
+    def test_missing_flavor_chart_needs_selenium(self, fetcher):
+        with patch.object(fetcher.session, "get", return_value=make_response(NO_FLAVOR_HTML)):
+            assert fetcher.fetch(URL) is None
+        assert fetcher.fallbacks == 1
+
+    def test_required_fields_are_configurable(self):
+        fetcher = HTMLDetailFetcher(required_fields=("name",))
+        with patch.object(fetcher.session, "get", return_value=make_response(NO_FLAVOR_HTML)):
+            assert fetcher.fetch(URL)["name"] == "Highland Park 12 Year"
+
+    def test_non_200_returns_none(self, fetcher):
+        with patch.object(fetcher.session, "get", return_value=make_response("", 403)):
+            assert fetcher.fetch(URL) is None
+
+    def test_network_error_returns_none(self, fetcher):
+        with patch.object(
+            fetcher.session, "get", side_effect=requests.ConnectionError("boom")
+        ):
+            assert fetcher.fetch(URL) is None
+        assert fetcher.summary() == {"命中": 0, "需 Selenium": 1}
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2 整合
+# ---------------------------------------------------------------------------
+
+
+def make_fetcher(html_by_slug):
+    fetcher = MagicMock(spec=HTMLDetailFetcher)
+
+    def fetch(url):
+        slug = url.rsplit("/", 1)[-1]
+        if slug not in html_by_slug:
+            return None
+        return {"name": slug, "url": url, "expert_score": "90", "flavor_data": {"a": 1}}
+
+    fetcher.fetch.side_effect = fetch
+    return fetcher
+
+
+def urls(*slugs):
+    return [f"https://distiller.com/spirits/{s}" for s in slugs]
+
+
+class TestScraperHTTPDetail:
+    def test_sequential_detail_skips_chrome(self):
+        s = DistillerScraperV2(html_fetcher=make_fetcher({"a"}))
+        s.driver = MagicMock()
+
+        data = s.scrape_spirit_detail(urls("a")[0])
+
+        assert data["name"] == "a"
+        s.driver.get.assert_not_called()
+        assert urls("a")[0] in s.seen_urls
+
+    def test_concurrent_path_used_without_api(self):
+        s = DistillerScraperV2(
+            html_fetcher=make_fetcher({"a", "b"}), api_concurrency=3, api_max_rps=0
+        )
+        assert s._use_concurrent_details() is True
+
+        results = []
+        s._scrape_urls(urls("a", "b"), "whiskey", results, 10)
+        assert sorted(r["name"] for r in results) == ["a", "b"]
+
+    def test_incomplete_pages_fall_back_to_selenium(self):
+        s = DistillerScraperV2(
+            delay_min=0,
+            delay_max=0,
+            html_fetcher=make_fetcher({"a"}),
+            api_concurrency=3,
+            api_max_rps=0,
+        )
+        results = []
+        with patch.object(s, "_scrape_urls_selenium") as mock_selenium:
+            s._scrape_urls(urls("a", "js-only"), "gin", results, 10)
+
+        assert [r["name"] for r in results] == ["a"]
+        assert mock_selenium.call_args[0][0] == urls("js-only")
+
+    def test_api_tried_before_html(self):
+        api = MagicMock()
+        api.is_available.return_value = True
+        api.detail_endpoint_template = "https://distiller.com/spirits/{slug}.json"
+        api.fetch_spirit_detail.return_value = {"name": "from-api", "flavor_data": {}}
+        fetcher = make_fetcher({"a"})
+        s = DistillerScraperV2(
+            api_client=api, html_fetcher=fetcher, api_concurrency=2, api_max_rps=0
+        )
+
+        results = []
+        s._scrape_urls(urls("a"), "rum", results, 10)
+
+        assert results[0]["name"] == "from-api"
+        fetcher.fetch.assert_not_called()
@@ -0,0 +1,151 @@
+"""
+Chrome 延遲啟動單元測試
+驗證 API 模式下不預先啟動 Chrome、HTTP 健康檢查，以及第一次 Selenium fallback 才啟動
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distiller_scraper.scraper import DistillerScraperV2
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def make_api_client(available=True, status_code=200):
+    client = MagicMock()
+    client.session.get.return_value = MagicMock(status_code=status_code)
+    client.load_cached_endpoints.return_value = False
+    client.discover.return_value = {
+        "available": available,
+        "search_endpoint": "https://distiller.com/search.json" if available else None,
+        "detail_endpoint_template": None,
+    }
+    client.is_available.return_value = available
+    return client
+
+
+def fake_start(scraper):
+    """start_driver 替身：設定 mock driver 並回傳 True。"""
+
+    def start():
+        scraper.driver = MagicMock()
+        return True
+
+    return start
+
+
+@pytest.fixture
+def api_scraper():
+    return DistillerScraperV2(delay_min=0, delay_max=0, api_client=make_api_client())
+
+
+# ---------------------------------------------------------------------------
+# scrape()
+# ---------------------------------------------------------------------------
+
+
+class TestScrapeWithoutChrome:
+    def test_api_run_never_starts_chrome(self, api_scraper):
+        with (
+            patch.object(api_scraper, "start_driver") as mock_start,
+            patch.object(api_scraper, "scrape_category", return_value=[{"name": "x"}]),
+        ):
+            assert api_scraper.scrape(categories=["whiskey"], max_per_category=1) is True
+
+        mock_start.assert_not_called()
+        api_scraper.api_client.session.get.assert_called_once()
+
+    def test_http_health_failure_aborts(self, api_scraper):
+        api_scraper.api_client.session.get.side_effect = ConnectionError("down")
+        with (
+            patch.object(api_scraper, "start_driver") as mock_start,
+            patch.object(api_scraper, "scrape_category") as mock_category,
+        ):
+            assert api_scraper.scrape(categories=["whiskey"]) is False
+
+        mock_start.assert_not_called()
+        mock_category.assert_not_called()
+
+    def test_http_health_server_error_aborts(self):
+        s = DistillerScraperV2(api_client=make_api_client(status_code=503))
+        assert s._http_health_check() is False
+
+    def test_selenium_only_run_starts_chrome_eagerly(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        with (
+            patch.object(s, "start_driver", return_value=True) as mock_start,
+            patch.object(s, "_health_check", return_value=True),
+            patch.object(s, "scrape_category", return_value=[]),
+        ):
+            s.scrape(categories=["whiskey"], max_per_category=1)
+
+        mock_start.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# discover_api()
+# ---------------------------------------------------------------------------
+
+
+class TestDiscoverWithoutChrome:
+    def test_static_candidates_found_without_chrome(self, api_scraper):
+        with (
+            patch.object(api_scraper, "start_driver") as mock_start,
+            patch.object(api_scraper, "capture_xhr_requests") as mock_capture,
+        ):
+            assert api_scraper.discover_api() is True
+
+        mock_start.assert_not_called()
+        mock_capture.assert_not_called()
+
+    def test_falls_back_to_xhr_capture_in_chrome(self):
+        client = make_api_client(available=False)
+        s = DistillerScraperV2(api_client=client)
+        with (
+            patch.object(s, "start_driver", side_effect=fake_start(s)),
+            patch.object(s, "_health_check", return_value=True),
+            patch.object(s, "capture_xhr_requests", return_value=["https://distiller.com/x.json"]),
+        ):
+            s.discover_api()
+
+        assert client.discover.call_count == 2
+        client.discover.assert_called_with(["https://distiller.com/x.json"])
+
+
+# ---------------------------------------------------------------------------
+# _ensure_driver()
+# ---------------------------------------------------------------------------
+
+
+class TestEnsureDriver:
+    def test_starts_once_on_first_selenium_use(self):
+        s = DistillerScraperV2()
+        with (
+            patch.object(s, "start_driver", side_effect=fake_start(s)) as mock_start,
+            patch.object(s, "_health_check", return_value=True),
+        ):
+            assert s._ensure_driver() is True
+            assert s._ensure_driver() is True
+
+        mock_start.assert_called_once()
+
+    def test_failed_start_is_not_retried(self):
+        s = DistillerScraperV2()
+        with patch.object(s, "start_driver", return_value=False) as mock_start:
+            assert s._ensure_driver() is False
+            assert s._ensure_driver() is False
+
+        mock_start.assert_called_once()
+        assert s.driver_failed is True
+
+    def test_detail_fallback_without_chrome_marks_failed(self):
+        s = DistillerScraperV2()
+        s.driver_failed = True
+        url = "https://distiller.com/spirits/x"
+
+        assert s.scrape_spirit_detail(url) is None
+        assert s.failed_urls == [url]
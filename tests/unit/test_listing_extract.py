@@ -0,0 +1,111 @@
+"""
+瀏覽器端列表擷取單元測試
+驗證 LIST_ITEMS_SCRIPT 回傳值的解析、與 BeautifulSoup 路徑輸出一致，以及失敗時退回 page_source
+"""
+
+import json
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.selectors import LIST_ITEMS_SCRIPT, DataExtractor, Selectors
+
+QUERY = "https://distiller.com/search?category=whiskey&sort=distiller_score"
+
+
+def browser_rows(soup):
+    """模擬 LIST_ITEMS_SCRIPT 在同一份 DOM 上的回傳（原始 href、缺值為 null）。"""
+    rows = []
+    for li in soup.select(Selectors.SPIRIT_LIST_ITEM):
+        href = li.select_one("a")["href"]
+        fields = [
+            DataExtractor.extract_text(li, sel, None)
+            for sel in DataExtractor.list_items_script_args()[1:]
+        ]
+        rows.append([href, *fields])
+    return json.dumps(rows)
+
+
+@pytest.fixture
+def scraper():
+    s = DistillerScraperV2()
+    s.driver = MagicMock()
+    with (
+        patch.object(s, "_ensure_driver", return_value=True),
+        patch.object(s, "_load_page"),
+        patch.object(s, "_wait_until_ready"),
+        patch.object(s, "_wait_for_body", return_value=True),
+        patch.object(s, "scroll_page"),
+    ):
+        yield s
+
+
+class TestParseListItemsJson:
+    def test_matches_extract_list_item(self, sample_search_results_soup):
+        expected = [
+            DataExtractor.extract_list_item(li)
+            for li in sample_search_results_soup.select(Selectors.SPIRIT_LIST_ITEM)
+        ]
+        assert DataExtractor.parse_list_items_json(browser_rows(sample_search_results_soup)) == expected
+
+    def test_missing_fields_become_na(self):
+        items = DataExtractor.parse_list_items_json('[["/spirits/a", null, "", null, "Japan"]]')
+        assert items == [
+            {
+                "name": "N/A",
+                "url": "https://distiller.com/spirits/a",
+                "distiller_score": "N/A",
+                "community_rating": "N/A",
+                "origin": "Japan",
+            }
+        ]
+
+    @pytest.mark.parametrize("raw", [None, 3, "not json", "{}", '[["/spirits/a"]]', "[[1, 2, 3, 4, 5]]"])
+    def test_unexpected_shape_returns_none(self, raw):
+        assert DataExtractor.parse_list_items_json(raw) is None
+
+
+class TestBrowserListing:
+    def test_uses_script_without_page_source(self, scraper, sample_search_results_soup):
+        scraper.driver.execute_script.return_value = browser_rows(sample_search_results_soup)
+        page_source = PropertyMock()
+        type(scraper.driver).page_source = page_source
+
+        urls = scraper._fetch_spirit_urls_from_page(QUERY)
+
+        assert urls[0] == "https://distiller.com/spirits/highland-park-18"
+        assert urls[-1] == "https://distiller.com/spirits/lagavulin-16"
+        page_source.assert_not_called()
+        args = scraper.driver.execute_script.call_args.args
+        assert args[0] == LIST_ITEMS_SCRIPT
+        assert args[1] == Selectors.SPIRIT_LIST_ITEM
+        assert scraper.get_statistics()["列表擷取"] == {"瀏覽器": 1, "page_source": 0}
+
+    def test_script_error_falls_back_to_page_source(self, scraper, sample_search_results_html):
+        scraper.driver.execute_script.side_effect = Exception("javascript error")
+        scraper.driver.page_source = sample_search_results_html
+
+        items = scraper._fetch_listing_items(QUERY, 1)
+
+        assert [i["distiller_score"] for i in items] == ["99", "97", "95", "94"]
+        assert scraper.listing_extract_stats == {"瀏覽器": 0, "page_source": 1}
+
+    def test_fallback_dedupes_urls(self, scraper):
+        card = "<li class='spirit'><a href='/spirits/{0}'><h5 class='name-content'><div class='name'>{0}</div></h5></a></li>"
+        scraper.driver.execute_script.return_value = None
+        scraper.driver.page_source = (
+            "<ol class='spirits'>" + "".join(card.format(s) for s in ("a", "b", "a", "c")) + "</ol>"
+        )
+
+        urls = scraper._fetch_spirit_urls_from_page(QUERY)
+
+        assert urls == [f"https://distiller.com/spirits/{s}" for s in ("a", "b", "c")]
+
+    def test_disabled_by_config(self, scraper, sample_search_results_html):
+        scraper.driver.page_source = sample_search_results_html
+        with patch("distiller_scraper.scraper.ScraperConfig.LISTING_EXTRACT_IN_BROWSER", False):
+            urls = scraper._fetch_spirit_urls_from_page(QUERY)
+
+        scraper.driver.execute_script.assert_not_called()
+        assert len(urls) == 4
@@ -0,0 +1,100 @@
+"""
+單元測試 - lxml 詳情頁提取器
+驗證 LxmlExtractor 與 DataExtractor（html.parser）輸出一致，以及解析器切換
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from distiller_scraper.lxml_extractor import LxmlExtractor, css_to_xpath, extract_detail_html
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.selectors import DataExtractor
+
+EDGE_CASES = {
+    "partial": """
+        <html><body>
+            <h1 class="secondary-headline name">Test Spirit</h1>
+            <p class="ultra-mini-headline type">Bourbon</p>
+            <!-- 缺少 location, age, abv 等欄位 -->
+            <div class="distiller-score">Score<span>85</span></div>
+        </body></html>
+    """,
+    "fallbacks": """
+        <h1 itemprop="name">  Fallback <em>Name</em> </h1>
+        <h1 class="secondary-headline name">   </h1>
+        <p class="ultra-mini-headline location">Scotland</p>
+        <p class="description" itemprop="description_first_half">First <!-- note --> half</p>
+        <div class="spirit-cost cost-3 large"></div>
+        <canvas class="js-flavor-profile-chart" data-flavors="not json"></canvas>
+    """,
+    "nested": """
+        <li class="detail  age extra"><div class="label">Age</div><div class="value"><b>12</b> Year</div></li>
+        <div class="distiller-score"><span></span><span>90</span></div>
+        <span itemprop="ratingValue">4.1</span>
+        <div class="meet-experts"><a itemprop="author">A &amp; B</a></div>
+        <a itemprop="author">Outside</a>
+    """,
+    "empty": "",
+}
+
+
+def bs4_extract(html):
+    return DataExtractor.extract_spirit_details(BeautifulSoup(html, "html.parser"))
+
+
+class TestParity:
+    def test_fixture_page(self, sample_spirit_detail_html):
+        data = LxmlExtractor.extract_spirit_details(sample_spirit_detail_html)
+
+        assert data == bs4_extract(sample_spirit_detail_html)
+        assert list(data) == list(bs4_extract(sample_spirit_detail_html))
+        assert data["name"] == "Highland Park 18 Year"
+        assert data["cost_level"] == "4"
+        assert data["flavor_data"]["rich"] == 80
+
+    @pytest.mark.parametrize("case", sorted(EDGE_CASES))
+    def test_edge_cases(self, case):
+        html = EDGE_CASES[case]
+        assert LxmlExtractor.extract_spirit_details(html) == bs4_extract(html)
+
+    def test_xml_declaration(self, sample_spirit_detail_html):
+        html = '<?xml version="1.0" encoding="utf-8"?>\n' + sample_spirit_detail_html
+        assert LxmlExtractor.extract_spirit_details(html)["name"] == "Highland Park 18 Year"
+
+
+class TestCssToXpath:
+    def test_compound_and_descendant(self):
+        assert css_to_xpath("div.meet-experts a[itemprop='author']") == (
+            "//div[contains(concat(' ', normalize-space(@class), ' '), ' meet-experts ')]"
+            "//a[@itemprop='author']"
+        )
+
+    @pytest.mark.parametrize("selector", ["ul > li", "a:first-child", "#id", "div[data-x]"])
+    def test_unsupported_syntax_raises(self, selector):
+        with pytest.raises(ValueError):
+            css_to_xpath(selector)
+
+
+class TestParserSwitch:
+    def test_dispatch(self, sample_spirit_detail_html):
+        assert extract_detail_html(sample_spirit_detail_html, "lxml") == extract_detail_html(
+            sample_spirit_detail_html, "bs4"
+        )
+        with pytest.raises(ValueError):
+            extract_detail_html(sample_spirit_detail_html, "html5lib")
+
+    def test_scraper_uses_configured_parser(self, monkeypatch, sample_spirit_detail_html):
+        monkeypatch.setattr("distiller_scraper.config.ScraperConfig.DETAIL_PARSER", "lxml")
+        calls = []
+        original = LxmlExtractor.extract_spirit_details
+        monkeypatch.setattr(
+            LxmlExtractor,
+            "extract_spirit_details",
+            staticmethod(lambda html: calls.append(html) or original(html)),
+        )
+        s = DistillerScraperV2()
+
+        data = s._parse_detail_html("https://distiller.com/spirits/hp-18", sample_spirit_detail_html)
+
+        assert calls and data["url"] == "https://distiller.com/spirits/hp-18"
+        assert data["name"] == "Highland Park 18 Year"
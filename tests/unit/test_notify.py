@@ -247,6 +247,14 @@ class TestNotifySuccess:
         msg = mock_send.call_args[0][0]
         assert "⏱" not in msg
 
+    def test_partial_run_shows_budget_progress(self, notifier):
+        stats = {"爬取預算": {"提前結束": "時間", "計畫": 9, "完成": 4}}
+        with patch.object(notifier, "send", return_value=True) as mock_send:
+            notifier.notify_success("full", stats)
+        msg = mock_send.call_args[0][0]
+        assert "時間預算用完" in msg
+        assert "完成 4/9 項" in msg
+
     def test_page_errors_shown_when_nonzero(self, notifier):
         with patch.object(notifier, "send", return_value=True) as mock_send:
             notifier.notify_success("test", {}, page_errors=3)
@@ -0,0 +1,193 @@
+"""
+原始頁面封存單元測試
+驗證內容定址去重、版本時間軸查詢、多執行緒寫入，以及各抓取路徑的封存掛鉤
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from distiller_scraper.api_client import DistillerAPIClient
+from distiller_scraper.diffords_scraper import DiffordsGuideScraper
+from distiller_scraper.http_fetcher import HTMLDetailFetcher
+from distiller_scraper.page_archive import (
+    KIND_DIFFORDS_HTML,
+    KIND_DISTILLER_API,
+    KIND_DISTILLER_HTML,
+    PageArchive,
+    content_hash,
+)
+from distiller_scraper.scraper import DistillerScraperV2
+
+URL = "https://distiller.com/spirits/highland-park-18"
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    a = PageArchive(str(tmp_path / "archive.db"))
+    yield a
+    a.close()
+
+
+def make_response(text, status_code=200):
+    resp = MagicMock(spec=requests.Response)
+    resp.status_code = status_code
+    resp.text = text
+    resp.headers = {"Content-Type": "application/json"}
+    resp.json.side_effect = lambda: json.loads(text)
+    resp.raise_for_status.return_value = None
+    return resp
+
+
+class TestContentAddressing:
+    def test_roundtrip_is_compressed(self, archive):
+        html = "<html>" + "<p>Highland Park</p>" * 500 + "</html>"
+
+        digest = archive.put(URL, html, KIND_DISTILLER_HTML)
+
+        page = archive.get(URL)
+        assert page.text == html
+        assert page.hash == digest == content_hash(html.encode("utf-8"))
+        assert page.size == len(html) and len(page.data) < len(html) // 10
+        assert zlib.decompress(page.data).decode("utf-8") == html
+
+    def test_identical_bodies_stored_once(self, archive):
+        archive.put(URL, "<html>same</html>", KIND_DISTILLER_HTML)
+        archive.put(URL + "-2", "<html>same</html>", KIND_DISTILLER_HTML)
+
+        bodies = archive.conn.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+        assert bodies == 1
+        assert archive.count() == 2
+        assert archive.summary()["新內容"] == 1
+        assert archive.summary()["重複內容"] == 1
+
+    def test_unchanged_refetch_extends_version(self, archive):
+        archive.put(URL, "v1", KIND_DISTILLER_HTML, fetched_at=T0)
+        archive.put(URL, "v1", KIND_DISTILLER_HTML, fetched_at=T0 + timedelta(days=7))
+
+        [version] = archive.history(URL)
+        assert version.fetched_at == T0.isoformat()
+        assert version.last_fetched_at == (T0 + timedelta(days=7)).isoformat()
+
+
+class TestTimeline:
+    @pytest.fixture
+    def versions(self, archive):
+        for day, body in enumerate(["v1", "v2", "v1"]):
+            archive.put(URL, body, KIND_DISTILLER_HTML, fetched_at=T0 + timedelta(days=day))
+        return archive
+
+    def test_history_keeps_flip_back(self, versions):
+        assert [p.text for p in versions.history(URL)] == ["v1", "v2", "v1"]
+
+    def test_get_at_time(self, versions):
+        assert versions.get(URL).text == "v1"
+        assert versions.get(URL, at=(T0 + timedelta(days=1, hours=1)).isoformat()).text == "v2"
+        assert versions.get(URL, at=(T0 - timedelta(days=1)).isoformat()) is None
+
+    def test_latest_per_url_and_kind(self, versions):
+        versions.put(URL, '{"name": "HP 18"}', KIND_DISTILLER_API)
+        versions.put(URL + "-2", "other", KIND_DISTILLER_HTML, fetched_at=T0)
+
+        latest = list(versions.latest(KIND_DISTILLER_HTML))
+        assert [(p.url, p.text) for p in latest] == [(URL, "v1"), (URL + "-2", "other")]
+        assert [p.kind for p in versions.latest(KIND_DISTILLER_API)] == [KIND_DISTILLER_API]
+        assert [p.url for p in versions.latest(KIND_DISTILLER_HTML, since=(T0 + timedelta(days=1)).isoformat())] == [URL]
+
+    def test_reopen_keeps_pages(self, versions, tmp_path):
+        versions.close()
+        reopened = PageArchive(versions.db_path)
+        assert len(reopened.history(URL)) == 3
+        reopened.close()
+
+
+def test_concurrent_puts(archive):
+    def worker(n):
+        for i in range(20):
+            archive.put(f"{URL}-{i}", f"page {i}", KIND_DISTILLER_HTML)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert archive.count(KIND_DISTILLER_HTML) == 20
+    assert archive.summary()["頁面"] == 80
+    assert archive.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 20
+
+
+class TestFetchHooks:
+    def test_selenium_detail_archived_before_parse(self, archive):
+        scraper = DistillerScraperV2(archive=archive)
+
+        assert scraper._parse_detail_html(URL, "<html><body>no name</body></html>") is None
+
+        assert archive.get(URL, kind=KIND_DISTILLER_HTML).text == "<html><body>no name</body></html>"
+        assert scraper.get_statistics()["頁面封存"]["頁面"] == 1
+
+    def test_http_fetcher(self, archive, sample_spirit_detail_html):
+        fetcher = HTMLDetailFetcher(archive=archive)
+        with patch.object(fetcher.session, "get", return_value=make_response(sample_spirit_detail_html)):
+            fetcher.fetch(URL)
+        with patch.object(fetcher.session, "get", return_value=make_response("gone", 404)):
+            fetcher.fetch(URL + "-404")
+
+        assert archive.get(URL).text == sample_spirit_detail_html
+        assert archive.get(URL + "-404") is None
+
+    def test_api_detail(self, archive):
+        client = DistillerAPIClient(archive=archive)
+        client.detail_endpoint_template = "https://distiller.com/spirits/{slug}.json"
+        body = json.dumps({"spirit": {"name": "Highland Park 18"}})
+        with patch.object(client.session, "get", return_value=make_response(body)):
+            client.fetch_spirit_detail(URL)
+
+        assert archive.get(URL, kind=KIND_DISTILLER_API).text == body
+
+    def test_diffords_recipe(self, archive):
+        scraper = DiffordsGuideScraper(archive=archive)
+        recipe_url = "https://www.diffordsguide.com/cocktails/recipe/1/negroni"
+        with patch.object(scraper.session, "get", return_value=make_response("<html></html>")):
+            scraper._fetch_recipe(recipe_url)
+
+        assert archive.get(recipe_url, kind=KIND_DIFFORDS_HTML).text == "<html></html>"
+        assert scraper.get_statistics()["頁面封存"]["頁面"] == 1
+
+    def test_pool_workers_share_archive(self, archive):
+        scraper = DistillerScraperV2(archive=archive, driver_pool_size=2)
+        assert scraper._new_pool_worker().archive is archive
+
+    def test_archive_failure_does_not_stop_fetch(self, archive, sample_spirit_detail_html):
+        broken = MagicMock(spec=PageArchive)
+        broken.put.side_effect = sqlite3.OperationalError("database or disk is full")
+
+        scraper = DistillerScraperV2(archive=broken)
+        assert scraper._parse_detail_html(URL, sample_spirit_detail_html)["name"] == "Highland Park 18 Year"
+
+        fetcher = HTMLDetailFetcher(archive=broken)
+        with patch.object(fetcher.session, "get", return_value=make_response(sample_spirit_detail_html)):
+            assert fetcher.fetch(URL) is not None
+
+        client = DistillerAPIClient(archive=broken)
+        client.detail_endpoint_template = "https://distiller.com/spirits/{slug}.json"
+        body = json.dumps({"spirit": {"name": "Highland Park 18"}})
+        with patch.object(client.session, "get", return_value=make_response(body)):
+            assert client.fetch_spirit_detail(URL)["name"] == "Highland Park 18"
+
+        diffords = DiffordsGuideScraper(archive=broken)
+        with patch.object(diffords.session, "get", return_value=make_response("<html></html>")):
+            diffords._fetch_recipe("https://www.diffordsguide.com/cocktails/recipe/1/negroni")
+
+        assert broken.put.call_count == 4
+
+    def test_disabled_by_default(self):
+        assert DistillerScraperV2().get_statistics()["頁面封存"] == {}
+        assert "頁面封存" not in DiffordsGuideScraper().get_statistics()
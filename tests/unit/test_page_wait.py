@@ -0,0 +1,259 @@
+"""
+條件式頁面等待單元測試
+驗證 PageWaiter 的元素條件、DOM 穩定條件、各條件逾時、導覽 commit 檢查與等待統計
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from distiller_scraper.page_wait import (
+    PageWaiter,
+    WaitCondition,
+    WaitStats,
+    navigation_committed,
+)
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.selectors import Selectors
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class FakeDriver:
+    """find_elements 在第 appear_after 次輪詢後命中 present 中的 selector。"""
+
+    def __init__(self, present=(), appear_after=0, dom_sizes=None):
+        self.present = set(present)
+        self.appear_after = appear_after
+        self.dom_sizes = list(dom_sizes or [])
+        self.find_calls = 0
+
+    def find_elements(self, by, selector):
+        self.find_calls += 1
+        if selector in self.present and self.find_calls > self.appear_after:
+            return [object()]
+        return []
+
+    def execute_script(self, script):
+        if not self.dom_sizes:
+            return None
+        return self.dom_sizes.pop(0) if len(self.dom_sizes) > 1 else self.dom_sizes[0]
+
+
+class StaleRoot:
+    """上一頁的 <html> 節點：document 被取代後存取即拋出 StaleElementReferenceException。"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @property
+    def tag_name(self):
+        if self.driver.committed:
+            raise StaleElementReferenceException("stale element reference")
+        return "html"
+
+
+class SlowNavigationDriver:
+    """driver.get() 立即返回，但上一頁的 DOM（含品名 / 列表節點）在 commit_after 次輪詢內仍在。"""
+
+    def __init__(self, current_url, page_source, commit_after=2, redirect_to=None):
+        self.href = current_url
+        self.page_source = page_source
+        self.commit_after = commit_after
+        self.redirect_to = redirect_to
+        self.pending = None
+        self.polls = 0
+        self.committed = False
+
+    def find_element(self, by, selector):
+        return StaleRoot(self)
+
+    def find_elements(self, by, selector):
+        return [object()]  # 舊頁面已有所有就緒節點
+
+    def get(self, url):
+        self.pending, self.polls, self.committed = url, 0, False
+
+    def execute_script(self, script, *args):
+        if "location.href" in script and self.pending is not None:
+            self.polls += 1
+            if self.commit_after is not None and self.polls > self.commit_after:
+                self.href, self.committed = self.redirect_to or self.pending, True
+                self.page_source = "<html><body><h1 class='secondary-headline name'>New Spirit</h1></body></html>"
+            return self.href
+        return 10
+
+
+OLD_DETAIL = "<html><body><h1 class='secondary-headline name'>Old Spirit</h1></body></html>"
+
+
+@pytest.fixture
+def waiter():
+    return PageWaiter(poll_interval=0)
+
+
+# ---------------------------------------------------------------------------
+# PageWaiter
+# ---------------------------------------------------------------------------
+
+
+class TestPageWaiter:
+    def test_returns_first_satisfied_selector(self, waiter):
+        driver = FakeDriver(present={"h1.name"})
+        conds = [WaitCondition.element("h1.other", 1), WaitCondition.element("h1.name", 1)]
+
+        assert waiter.wait(driver, conds, label="detail") == "h1.name"
+
+    def test_polls_until_element_appears(self, waiter):
+        driver = FakeDriver(present={"h1.name"}, appear_after=3)
+
+        assert waiter.wait(driver, [WaitCondition.element("h1.name", 5)]) == "h1.name"
+        assert driver.find_calls == 4
+
+    def test_all_conditions_timing_out_returns_none(self, waiter):
+        driver = FakeDriver()
+        conds = [WaitCondition.element("h1.name", 0.05), WaitCondition.element("canvas", 0.02)]
+
+        assert waiter.wait(driver, conds, label="detail") is None
+        assert waiter.stats["detail"].timeouts == 1
+
+    def test_dom_stable_condition(self, waiter):
+        driver = FakeDriver(dom_sizes=[None, 10, 20, 30, 30])
+        cond = WaitCondition.dom_stable(stable_for=0.0, timeout=5)
+
+        assert waiter.wait(driver, [cond]) == "dom-stable"
+
+    def test_dom_never_stable_times_out(self, waiter):
+        driver = FakeDriver(dom_sizes=[None])  # document 一直在 loading
+        cond = WaitCondition.dom_stable(stable_for=0.0, timeout=0.05)
+
+        assert waiter.wait(driver, [cond]) is None
+
+    def test_lookup_errors_treated_as_not_ready(self, waiter):
+        driver = MagicMock()
+        driver.find_elements.side_effect = [Exception("no document"), [object()]]
+
+        assert waiter.wait(driver, [WaitCondition.element("body", 5)]) == "body"
+
+    def test_records_elapsed_per_label(self, waiter):
+        driver = FakeDriver(present={"body"})
+        waiter.wait(driver, [WaitCondition.element("body", 1)], label="health")
+        waiter.wait(driver, [WaitCondition.element("body", 1)], label="health")
+
+        summary = waiter.summary()["health"]
+        assert summary["次數"] == 2
+        assert summary["逾時次數"] == 0
+        assert summary["滿足條件"] == {"body": 2}
+
+
+class TestNavigationCommit:
+    def test_waits_while_old_dom_is_present(self, waiter):
+        driver = SlowNavigationDriver("https://distiller.com/spirits/old", OLD_DETAIL)
+        root = driver.find_element(None, "html")
+        driver.get("https://distiller.com/spirits/new")
+
+        assert navigation_committed(driver, "https://distiller.com/spirits/new", root) is None
+        assert waiter.wait_for_navigation(driver, "https://distiller.com/spirits/new", root, 5)
+        assert driver.committed
+
+    def test_redirect_detected_by_stale_root(self, waiter):
+        driver = SlowNavigationDriver(
+            "https://distiller.com/spirits/old", OLD_DETAIL,
+            redirect_to="https://distiller.com/spirits/canonical",
+        )
+        root = driver.find_element(None, "html")
+        driver.get("https://distiller.com/spirits/new")
+
+        assert waiter.wait_for_navigation(driver, "https://distiller.com/spirits/new", root, 5)
+        assert waiter.stats["navigation"].satisfied_by == {"stale": 1}
+
+    def test_never_committed_times_out(self, waiter):
+        driver = SlowNavigationDriver("https://distiller.com/spirits/old", OLD_DETAIL, commit_after=None)
+        driver.get("https://distiller.com/spirits/new")
+
+        assert not waiter.wait_for_navigation(driver, "https://distiller.com/spirits/new", None, 0.05)
+        assert waiter.stats["navigation"].timeouts == 1
+
+
+class TestWaitStats:
+    def test_summary_averages(self):
+        stats = WaitStats()
+        stats.record(1.0, "a")
+        stats.record(3.0, None)
+
+        summary = stats.summary()
+        assert summary["平均秒數"] == 2.0
+        assert summary["最長秒數"] == 3.0
+        assert summary["逾時次數"] == 1
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2 整合
+# ---------------------------------------------------------------------------
+
+
+class TestScraperReadinessWaits:
+    def make_scraper(self, driver):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        s.driver = driver
+        s.page_waiter.poll_interval = 0
+        return s
+
+    def test_detail_page_does_not_sleep_fixed_delay(self):
+        driver = FakeDriver(present={Selectors.NAME})
+        driver.page_source = (
+            "<html><body><h1 class='secondary-headline name'>Talisker 10</h1></body></html>"
+        )
+        s = self.make_scraper(driver)
+        driver.get = MagicMock()
+
+        with patch("distiller_scraper.scraper.time.sleep") as mock_sleep:
+            data = s.scrape_spirit_detail("https://distiller.com/spirits/talisker-10")
+
+        assert data["name"] == "Talisker 10"
+        mock_sleep.assert_not_called()
+        assert s.page_waiter.stats["detail"].satisfied_by == {Selectors.NAME: 1}
+
+    def test_detail_waits_for_new_document(self):
+        driver = SlowNavigationDriver("https://distiller.com/spirits/old", OLD_DETAIL)
+        s = self.make_scraper(driver)
+
+        data = s.scrape_spirit_detail("https://distiller.com/spirits/new")
+
+        assert data["name"] == "New Spirit"
+
+    def test_detail_not_parsed_when_navigation_never_commits(self):
+        driver = SlowNavigationDriver("https://distiller.com/spirits/old", OLD_DETAIL, commit_after=None)
+        s = self.make_scraper(driver)
+
+        with patch("distiller_scraper.scraper.ScraperConfig.NAVIGATION_COMMIT_TIMEOUT", 0.05):
+            data = s.scrape_spirit_detail("https://distiller.com/spirits/new")
+
+        assert data is None
+        assert s.failed_urls == ["https://distiller.com/spirits/new"]
+        assert s.spirits_data == []
+
+    def test_listing_not_read_from_previous_page(self):
+        driver = SlowNavigationDriver("https://distiller.com/search?page=1", "", commit_after=None)
+        s = self.make_scraper(driver)
+
+        with patch("distiller_scraper.scraper.ScraperConfig.NAVIGATION_COMMIT_TIMEOUT", 0.05):
+            assert s._load_listing_items("https://distiller.com/search?page=2") is None
+        assert s.page_errors == 1
+
+    def test_listing_wait_uses_list_item_selector(self):
+        driver = MagicMock()
+        s = self.make_scraper(driver)
+
+        assert s._wait_until_ready("listing") == Selectors.SPIRIT_LIST_ITEM
+
+    def test_statistics_include_wait_summary(self):
+        s = self.make_scraper(FakeDriver(present={"body"}))
+        s._wait_until_ready("health")
+
+        assert s.get_statistics()["頁面等待"]["health"]["次數"] == 1
@@ -0,0 +1,175 @@
+"""
+搜尋頁預取單元測試
+驗證 ListingPrefetcher 的有界領先、取消與 scrape_category_paginated 的 producer / consumer 串接
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from distiller_scraper.config import ScraperConfig
+from distiller_scraper.prefetch import ListingPrefetcher
+from distiller_scraper.scraper import DistillerScraperV2
+
+QUERY = "https://distiller.com/search?category=whiskey"
+
+
+def page_urls(page, per_page=3):
+    return [f"https://distiller.com/spirits/p{page}-{i}" for i in range(per_page)]
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+# ---------------------------------------------------------------------------
+# ListingPrefetcher
+# ---------------------------------------------------------------------------
+
+
+class TestListingPrefetcher:
+    def test_pages_returned_in_order(self):
+        prefetcher = ListingPrefetcher(page_urls, 1, 3, depth=2).start()
+        assert [prefetcher.take(p) for p in (1, 2, 3)] == [page_urls(1), page_urls(2), page_urls(3)]
+        assert prefetcher.take(4) is None
+        assert prefetcher.summary() == {"預取頁數": 3, "命中": 3, "未命中": 1}
+
+    def test_bounded_lead(self):
+        fetched = []
+
+        def fetch(page):
+            fetched.append(page)
+            return page_urls(page)
+
+        prefetcher = ListingPrefetcher(fetch, 1, 50, depth=2).start()
+        # 佇列容量 2：背景執行緒抓完第 3 頁後阻塞在 put
+        assert wait_until(lambda: len(fetched) == 3)
+        time.sleep(0.2)
+        assert fetched == [1, 2, 3]
+        prefetcher.cancel()
+
+    def test_stops_after_empty_page(self):
+        fetch = MagicMock(side_effect=lambda p: page_urls(p) if p < 2 else [])
+        prefetcher = ListingPrefetcher(fetch, 1, 50, depth=4).start()
+
+        assert prefetcher.take(1) == page_urls(1)
+        assert prefetcher.take(2) == []
+        assert prefetcher.take(3) is None
+        assert fetch.call_count == 2
+
+    def test_failed_request_is_a_miss(self):
+        prefetcher = ListingPrefetcher(lambda p: None, 1, 50).start()
+        assert prefetcher.take(1) is None
+        assert prefetcher.take(2) is None
+        assert prefetcher.misses == 2
+
+    def test_fetch_exception_is_a_miss(self):
+        def fetch(page):
+            raise ConnectionError("reset")
+
+        prefetcher = ListingPrefetcher(fetch, 1, 50).start()
+        assert prefetcher.take(1) is None
+
+    def test_cancel_stops_further_requests(self):
+        fetched = []
+
+        def fetch(page):
+            fetched.append(page)
+            return page_urls(page)
+
+        prefetcher = ListingPrefetcher(fetch, 1, 50, depth=1, delay=0.05).start()
+        assert prefetcher.take(1) == page_urls(1)
+        prefetcher.cancel()
+        count = len(fetched)
+        time.sleep(0.3)
+
+        assert len(fetched) == count
+        assert not prefetcher._thread.is_alive()
+
+
+# ---------------------------------------------------------------------------
+# scrape_category_paginated 串接
+# ---------------------------------------------------------------------------
+
+
+def make_api_client(pages):
+    client = MagicMock()
+    client.is_available.return_value = True
+    client.fetch_search_results.side_effect = (
+        lambda category, page, spirit_style_id=None: pages(page)
+    )
+    return client
+
+
+def run_paginated(scraper, max_spirits=1000):
+    def scrape_urls(urls, category, results, max_spirits):
+        for url in urls:
+            if url not in scraper.seen_urls and len(results) < max_spirits:
+                scraper.seen_urls.add(url)
+                results.append({"url": url})
+
+    with (
+        patch.object(scraper, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+        patch.object(scraper, "_scrape_urls", side_effect=scrape_urls),
+        patch.object(ScraperConfig, "SCROLL_DELAY", 0),
+        patch("time.sleep"),
+    ):
+        return scraper.scrape_category_paginated("whiskey", max_spirits=max_spirits)
+
+
+class TestPaginatedPrefetch:
+    def test_pages_come_from_prefetcher(self):
+        client = make_api_client(lambda p: page_urls(p) if p <= 3 else [])
+        s = DistillerScraperV2(api_client=client, delay_min=0, delay_max=0, prefetch_depth=2)
+
+        results = run_paginated(s)
+
+        assert len(results) == 9
+        assert s.prefetch_stats["命中"] == 4  # 第 1-3 頁 + 第 4 頁（空頁）
+        assert s.prefetch_stats["未命中"] == 0
+
+    def test_stop_condition_cancels_prefetch(self):
+        # 第 2 頁之後全是舊 URL → 連續重複頁停止；預取不應抓到查詢結尾
+        client = make_api_client(lambda p: page_urls(p) if p <= 2 else page_urls(2))
+        s = DistillerScraperV2(api_client=client, delay_min=0, delay_max=0, prefetch_depth=2)
+
+        run_paginated(s)
+
+        last_page = 2 + ScraperConfig.MAX_CONSECUTIVE_DUP_PAGES
+        assert client.fetch_search_results.call_count <= last_page + 3
+        assert client.fetch_search_results.call_count < ScraperConfig.MAX_PAGES_PER_QUERY
+
+    def test_search_records_cleared_after_query(self):
+        # 預取但未處理的頁、已收錄 URL 的搜尋結果紀錄不跨查詢累積
+        client = make_api_client(lambda p: page_urls(p) if p <= 3 else [])
+        s = DistillerScraperV2(api_client=client, delay_min=0, delay_max=0, prefetch_depth=2)
+
+        run_paginated(s, max_spirits=3)
+
+        client.clear_search_records.assert_called_once_with()
+
+    def test_failed_prefetch_falls_back_to_sync_fetch(self):
+        client = make_api_client(lambda p: None)
+        s = DistillerScraperV2(api_client=client, delay_min=0, delay_max=0, prefetch_depth=2)
+
+        with patch.object(s, "_fetch_spirit_urls", return_value=[]) as mock_fetch:
+            run_paginated(s)
+
+        mock_fetch.assert_called_once_with(QUERY, 1)
+        assert s.prefetch_stats["未命中"] == 1
+
+    def test_selenium_listing_not_prefetched(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0, prefetch_depth=2)
+        assert s._start_listing_prefetch(QUERY, 1) is None
+
+    def test_disabled_by_depth_zero(self):
+        client = make_api_client(lambda p: [])
+        s = DistillerScraperV2(api_client=client, prefetch_depth=0)
+        assert s._start_listing_prefetch(QUERY, 1) is None
+
+    def test_statistics_include_prefetch(self):
+        assert "搜尋頁預取" in DistillerScraperV2().get_statistics()
@@ -0,0 +1,118 @@
+"""
+串流記錄單元測試
+驗證 RecordTally 與 DataFrame 版統計一致、類別容器轉交不重複計數、記憶體不隨筆數成長，
+以及 DistillerScraperV2 串流模式下記錄只寫入 storage
+"""
+
+import tracemalloc
+from unittest.mock import patch
+
+from distiller_scraper.record_stream import RecordTally, StreamingRecords
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.storage import SQLiteStorage
+
+
+def record(i, category="whiskey", **overrides):
+    data = {
+        "name": f"Spirit {i}",
+        "url": f"https://distiller.com/spirits/s{i}",
+        "category": category,
+        "expert_score": 90 if i % 2 else None,
+        "description": "N/A" if i % 3 == 0 else f"desc {i}",
+        "badge": "" if i % 4 == 0 else "TOP",
+        "flavor_data": {"smoky": 10},
+    }
+    data.update(overrides)
+    return data
+
+
+class TestRecordTally:
+    def test_matches_dataframe_statistics(self):
+        records = [record(i) for i in range(7)] + [record(i, "gin") for i in range(7, 10)]
+        plain = DistillerScraperV2()
+        plain.spirits_data = list(records)
+        streaming = DistillerScraperV2(streaming=True)
+        streaming.spirits_data.extend(records)
+
+        expected, actual = plain.get_statistics(), streaming.get_statistics()
+
+        assert actual["總記錄數"] == expected["總記錄數"] == 10
+        assert actual["類別分布"] == expected["類別分布"]
+        assert actual["欄位有效率"] == expected["欄位有效率"]
+
+    def test_missing_keys_count_as_invalid(self):
+        tally = RecordTally()
+        tally.add({"name": "a", "category": "rum", "age": "12"})
+        tally.add({"name": "b", "category": "rum"})
+
+        assert tally.field_coverage()["age"] == "1/2 (50.0%)"
+        assert tally.categories() == {"rum": 2}
+
+    def test_empty(self):
+        assert RecordTally().field_coverage() == {}
+
+
+class TestStreamingRecords:
+    def test_child_forwards_without_double_count(self):
+        root = StreamingRecords()
+        category = root.child()
+        category.append(record(1))
+        category.append(record(2))
+        root.extend(category)  # scrape() 的 spirits_data.extend(category_results)
+
+        assert len(category) == 2
+        assert len(root) == 2
+        assert root.tally.count == 2
+        assert list(root) == []
+
+    def test_memory_stays_flat(self):
+        records = StreamingRecords()
+        records.extend(record(i) for i in range(200))
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            records.extend(record(i, description="x" * 2000) for i in range(5000))
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(records) == 5200
+        # 5000 筆各約 2 KB 的描述若被保留會超過 10 MB
+        assert current - baseline < 200_000
+
+
+class TestScraperStreaming:
+    def test_records_persisted_not_retained(self):
+        db = SQLiteStorage(":memory:")
+        s = DistillerScraperV2(storage=db, streaming=True, delay_min=0, delay_max=0)
+        urls = [f"https://distiller.com/spirits/s{i}" for i in range(5)]
+
+        def scrape_urls(batch, category, results, max_spirits):
+            for url in batch:
+                if len(results) >= max_spirits:
+                    break
+                data = {"name": url, "url": url, "category": category}
+                s.seen_urls.add(url)
+                s._persist(data)
+                results.append(data)
+
+        with (
+            patch.object(s, "_fetch_spirit_urls", side_effect=[urls, []]),
+            patch.object(s, "_scrape_urls", side_effect=scrape_urls),
+            patch.object(s, "_http_health_check", return_value=True),
+            patch.object(s, "start_driver", return_value=True),
+            patch.object(s, "_health_check", return_value=True),
+        ):
+            s.scrape(categories=["whiskey"], max_per_category=3, use_styles=False)
+
+        assert len(s.spirits_data) == 3
+        assert list(s.spirits_data) == []
+        assert s.to_dataframe().empty
+        stats = s.get_statistics()
+        assert stats["總記錄數"] == 3
+        assert stats["類別分布"] == {"whiskey": 3}
+        assert db.conn.execute("SELECT COUNT(*) FROM spirits").fetchone()[0] == 3
+        db.close()
+
+    def test_default_keeps_list(self):
+        assert DistillerScraperV2().spirits_data == []
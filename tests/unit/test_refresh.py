@@ -0,0 +1,285 @@
+"""
+分數刷新模式單元測試
+驗證列表分數批次更新、只重爬分數變動的烈酒，以及 run.py --mode refresh
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.storage import SQLiteStorage
+
+QUERY = "https://distiller.com/search?category=whiskey&sort=distiller_score"
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+def card(slug, score="90", rating="4.10"):
+    return {
+        "name": slug,
+        "url": spirit(slug),
+        "distiller_score": score,
+        "community_rating": rating,
+        "origin": "N/A",
+    }
+
+
+@pytest.fixture
+def db():
+    storage = SQLiteStorage(":memory:")
+    for slug, expert, community in (("a", "90", "4.10"), ("b", "85", "3.90")):
+        storage.save_spirit({
+            "name": slug.upper(),
+            "url": spirit(slug),
+            "expert_score": expert,
+            "community_score": community,
+        })
+    yield storage
+    storage.close()
+
+
+# ---------------------------------------------------------------------------
+# SQLiteStorage.update_listing_scores
+# ---------------------------------------------------------------------------
+
+
+class TestUpdateListingScores:
+    def scores(self, db, slug):
+        row = db.conn.execute(
+            "SELECT expert_score, community_score FROM spirits WHERE url = ?", (spirit(slug),)
+        ).fetchone()
+        return row["expert_score"], row["community_score"]
+
+    def test_only_changed_rows_updated(self, db):
+        changed = db.update_listing_scores([
+            {"url": spirit("a"), "expert_score": 90, "community_score": 4.1},
+            {"url": spirit("b"), "expert_score": 87, "community_score": 3.9},
+        ])
+
+        assert changed == [spirit("b")]
+        assert self.scores(db, "b") == (87, 3.9)
+
+    def test_community_change_detected(self, db):
+        changed = db.update_listing_scores(
+            [{"url": spirit("a"), "expert_score": None, "community_score": 4.25}]
+        )
+        assert changed == [spirit("a")]
+        assert self.scores(db, "a") == (90, 4.25)  # 未提供的分數不覆寫
+
+    def test_unknown_urls_ignored(self, db):
+        changed = db.update_listing_scores(
+            [{"url": spirit("new"), "expert_score": 99, "community_score": 4.9}]
+        )
+        assert changed == []
+        assert db.count() == 2
+
+    def test_csv_storage_does_not_support_refresh(self, tmp_path):
+        from distiller_scraper.storage import CSVStorage
+
+        csv = CSVStorage(str(tmp_path / "out.csv"))
+        assert csv.update_listing_scores([{"url": spirit("a"), "expert_score": 1}]) == []
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2.refresh_scores
+# ---------------------------------------------------------------------------
+
+
+class TestRefreshScores:
+    def run(self, scraper, listings, **kwargs):
+        scraped = []
+
+        def scrape_urls(urls, category, results, max_spirits):
+            for url in urls:
+                if url not in scraper.seen_urls:
+                    scraper.seen_urls.add(url)
+                    scraped.append(url)
+                    results.append({"url": url, "category": category})
+
+        with (
+            patch.object(scraper, "start_driver", return_value=True),
+            patch.object(scraper, "_health_check", return_value=True),
+            patch.object(scraper, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+            patch.object(
+                scraper, "_fetch_listing_items", side_effect=lambda url, page: listings.get(page, [])
+            ) as mock_fetch,
+            patch.object(scraper, "_scrape_urls", side_effect=scrape_urls),
+            patch("time.sleep"),
+        ):
+            ok = scraper.refresh_scores(categories=["whiskey"], **kwargs)
+        return ok, scraped, mock_fetch.call_count
+
+    def test_rescrapes_only_changed_spirits(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        listings = {1: [card("a", "90", "4.10"), card("b", "88", "3.90"), card("new")]}
+
+        ok, scraped, _ = self.run(s, listings)
+
+        assert ok is True
+        assert scraped == [spirit("b")]
+        assert s.refresh_stats["分數變動"] == 1
+        assert s.refresh_stats["重新爬取"] == 1
+        assert s.refresh_stats["已收錄"] == 2
+
+    def test_update_only_without_rescrape(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        ok, scraped, _ = self.run(s, {1: [card("b", "88")]}, rescrape=False)
+
+        assert scraped == []
+        assert s.refresh_stats["分數變動"] == 1
+
+    def test_page_budget(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        listings = {p: [card("a"), card(f"x{p}")] for p in range(1, 10)}
+
+        _, _, loads = self.run(s, listings, pages_per_query=2)
+
+        assert loads == 2
+
+    def test_stops_past_database_coverage(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        listings = {1: [card("a")], 2: [card("x")], 3: [card("b")]}
+
+        _, _, loads = self.run(s, listings, pages_per_query=5)
+
+        assert loads == 2
+
+    def test_health_check_failure_aborts(self, db):
+        s = DistillerScraperV2(storage=db)
+        with (
+            patch.object(s, "start_driver", return_value=True),
+            patch.object(s, "_health_check", return_value=False),
+            patch.object(s, "_fetch_listing_items") as mock_fetch,
+        ):
+            assert s.refresh_scores(categories=["whiskey"]) is False
+        mock_fetch.assert_not_called()
+
+    def test_failed_rescrape_returns_to_seen_urls(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        s.seen_urls = {spirit("a"), spirit("b")}
+        with (
+            patch.object(s, "start_driver", return_value=True),
+            patch.object(s, "_health_check", return_value=True),
+            patch.object(s, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+            patch.object(s, "_fetch_listing_items", return_value=[card("b", "88")]),
+            patch.object(s, "_scrape_urls"),  # 詳情爬取全部失敗：不寫入 results
+            patch("time.sleep"),
+        ):
+            assert s.refresh_scores(categories=["whiskey"]) is True
+
+        assert spirit("b") in s.seen_urls
+        assert s.refresh_stats["重新爬取"] == 0
+
+    def test_api_refresh_never_starts_chrome(self, db):
+        api = MagicMock()
+        api.is_available.return_value = True
+        api.fetch_search_items.return_value = [
+            {"name": "B", "url": spirit("b"), "expert_score": "88", "community_score": "3.90"}
+        ]
+        s = DistillerScraperV2(storage=db, api_client=api, delay_min=0, delay_max=0)
+        s.seen_urls = {spirit("a"), spirit("b")}
+        with (
+            patch.object(s, "start_driver") as mock_start,
+            patch.object(s, "_http_health_check", return_value=True),
+            patch.object(s, "discover_api", return_value=True),
+            patch.object(s, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+            patch.object(s, "_scrape_urls") as mock_scrape,
+            patch("time.sleep"),
+        ):
+            assert s.refresh_scores(categories=["whiskey"], pages_per_query=1) is True
+
+        mock_start.assert_not_called()
+        assert s.refresh_stats["分數變動"] == 1
+        assert mock_scrape.call_args[0][0] == [spirit("b")]
+
+    @pytest.mark.parametrize(
+        "text,expected", [("99", 99.0), ("Score92", 92.0), ("4.47", 4.47), ("N/A", None)]
+    )
+    def test_parse_listing_score(self, text, expected):
+        assert DistillerScraperV2._parse_listing_score(text) == expected
+
+
+class TestFetchListingItems:
+    def test_extracts_cards(self, sample_search_results_html):
+        s = DistillerScraperV2()
+        s.driver = MagicMock(page_source=sample_search_results_html)
+        s.driver.execute_script.return_value = None  # 瀏覽器端擷取不可用 → page_source
+        with (
+            patch.object(s, "_ensure_driver", return_value=True),
+            patch.object(s, "_load_page") as mock_load,
+            patch.object(s, "_wait_until_ready"),
+            patch.object(s, "_wait_for_body", return_value=True),
+            patch.object(s, "scroll_page"),
+        ):
+            items = s._fetch_listing_items(QUERY, 2)
+
+        mock_load.assert_called_once_with(f"{QUERY}&page=2")
+        assert items[0]["url"] == spirit("highland-park-18")
+        assert items[0]["distiller_score"] == "99"
+        assert items[0]["community_rating"] == "4.47"
+
+    def test_api_records_mapped_to_cards(self):
+        api = MagicMock()
+        api.is_available.return_value = True
+        api.fetch_search_items.return_value = [
+            {"name": "A", "url": spirit("a"), "expert_score": "92", "community_score": "N/A"}
+        ]
+        s = DistillerScraperV2(api_client=api)
+        with patch.object(s, "_load_listing_items") as mock_selenium:
+            items = s._fetch_listing_items(QUERY, 2)
+
+        mock_selenium.assert_not_called()
+        api.fetch_search_items.assert_called_once_with(
+            category="whiskey", page=2, spirit_style_id=None
+        )
+        assert items == [
+            {"name": "A", "url": spirit("a"), "distiller_score": "92", "community_rating": "N/A"}
+        ]
+
+    @pytest.mark.parametrize(
+        "records",
+        [None, [{"name": "A", "url": spirit("a"), "expert_score": "N/A", "community_score": "N/A"}]],
+    )
+    def test_falls_back_to_selenium_without_api_scores(self, records):
+        api = MagicMock()
+        api.is_available.return_value = True
+        api.fetch_search_items.return_value = records
+        s = DistillerScraperV2(api_client=api)
+        with patch.object(s, "_load_listing_items", return_value=[card("a")]) as mock_selenium:
+            items = s._fetch_listing_items(QUERY, 1)
+
+        mock_selenium.assert_called_once_with(QUERY)
+        assert items == [card("a")]
+
+
+# ---------------------------------------------------------------------------
+# run.py --mode refresh
+# ---------------------------------------------------------------------------
+
+
+class TestRunRefresh:
+    def test_records_refresh_run(self):
+        import run as run_module
+
+        storage_mock = MagicMock(spec=SQLiteStorage)
+        storage_mock.record_scrape_run.return_value = 7
+        scraper_mock = MagicMock()
+        scraper_mock.refresh_scores.return_value = True
+        scraper_mock.spirits_data = [object()] * 2
+        scraper_mock.failed_urls = []
+        scraper_mock.page_errors = 0
+        scraper_mock.get_statistics.return_value = {}
+
+        with (
+            patch("run.SQLiteStorage", return_value=storage_mock),
+            patch.object(run_module, "_build_api_client", return_value=None),
+            patch("run.DistillerScraperV2", return_value=scraper_mock),
+        ):
+            success, _ = run_module.run_refresh(output="csv", db_path=":memory:")
+
+        assert success is True
+        assert storage_mock.record_scrape_run.call_args.kwargs["mode"] == "refresh"
+        storage_mock.finish_scrape_run.assert_called_once_with(7, 2, 0, "completed")
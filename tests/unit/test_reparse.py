@@ -0,0 +1,179 @@
+"""
+離線重新擷取單元測試
+驗證封存頁面經程序池擷取後分批寫入、保留原本的時間戳，以及失敗頁面的計數
+"""
+
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from distiller_scraper.diffords_storage import DiffordsStorage
+from distiller_scraper.page_archive import (
+    KIND_DIFFORDS_HTML,
+    KIND_DISTILLER_API,
+    KIND_DISTILLER_HTML,
+    PageArchive,
+)
+from distiller_scraper.reparse import db_timestamp, reparse_archive
+from distiller_scraper.storage import SQLiteStorage
+from tests.unit.test_diffords import SAMPLE_HTML
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+def recipe(cocktail_id, slug):
+    return f"https://www.diffordsguide.com/cocktails/recipe/{cocktail_id}/{slug}"
+
+
+@pytest.fixture
+def archive(tmp_path):
+    a = PageArchive(str(tmp_path / "archive.db"))
+    yield a
+    a.close()
+
+
+@pytest.fixture
+def distiller_db(tmp_path):
+    db = SQLiteStorage(str(tmp_path / "distiller.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def diffords_db(tmp_path):
+    db = DiffordsStorage(str(tmp_path / "diffords.db"))
+    yield db
+    db.close()
+
+
+class TestDistiller:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_html_pages_written_in_batches(self, archive, distiller_db, sample_spirit_detail_html, workers):
+        for i in range(5):
+            archive.put(spirit(f"hp-{i}"), sample_spirit_detail_html, KIND_DISTILLER_HTML)
+        archive.put(spirit("broken"), "<html>no name</html>", KIND_DISTILLER_HTML)
+
+        stats = reparse_archive(archive, KIND_DISTILLER_HTML, distiller_db, workers=workers, batch_size=2)
+
+        assert stats["頁面"] == 6
+        assert stats["寫入"] == 5
+        assert stats["失敗"] == 1
+        rows = distiller_db.conn.execute("SELECT name, url FROM spirits ORDER BY url").fetchall()
+        assert [tuple(r) for r in rows] == [("Highland Park 18 Year", spirit(f"hp-{i}")) for i in range(5)]
+        flavors = distiller_db.conn.execute("SELECT COUNT(*) FROM flavor_profiles").fetchone()[0]
+        assert flavors > 0
+
+    def test_existing_rows_keep_timestamps(self, archive, distiller_db, sample_spirit_detail_html):
+        url = spirit("hp-18")
+        distiller_db.save_spirit({"name": "Old Name", "url": url, "category": "whiskey", "review_count": "10"})
+        distiller_db.conn.execute(
+            "UPDATE spirits SET updated_at = '2026-01-01 00:00:00', review_delta = 7 WHERE url = ?", (url,)
+        )
+        distiller_db.conn.commit()
+        archive.put(url, sample_spirit_detail_html, KIND_DISTILLER_HTML)
+
+        reparse_archive(archive, KIND_DISTILLER_HTML, distiller_db, workers=1)
+
+        row = distiller_db.conn.execute(
+            "SELECT name, category, updated_at, review_delta FROM spirits WHERE url = ?", (url,)
+        ).fetchone()
+        assert tuple(row) == ("Highland Park 18 Year", "whiskey", "2026-01-01 00:00:00", 7)
+
+    def test_rows_updated_after_archive_not_overwritten(self, archive, distiller_db, sample_spirit_detail_html):
+        fetched = datetime(2026, 3, 1, 12, 0, 0)
+        later, same_run = spirit("later"), spirit("same-run")
+        for url in (later, same_run):
+            distiller_db.save_spirit({"name": "Old Name", "url": url})
+            archive.put(url, sample_spirit_detail_html, KIND_DISTILLER_HTML, fetched_at=fetched)
+        # later：封存一天後另有未封存的更新；same-run：同一次抓取稍晚寫入（在寬限內）
+        for url, delta in ((later, timedelta(days=1)), (same_run, timedelta(seconds=30))):
+            distiller_db.conn.execute(
+                "UPDATE spirits SET updated_at = ? WHERE url = ?", (db_timestamp((fetched + delta).isoformat()), url)
+            )
+        distiller_db.conn.commit()
+
+        stats = reparse_archive(archive, KIND_DISTILLER_HTML, distiller_db, workers=1)
+
+        assert (stats["寫入"], stats["未寫入"]) == (1, 1)
+        names = dict(distiller_db.conn.execute("SELECT url, name FROM spirits").fetchall())
+        assert names == {later: "Old Name", same_run: "Highland Park 18 Year"}
+
+    def test_api_responses(self, archive, distiller_db):
+        archive.put(spirit("hp-18"), json.dumps({"spirit": {"name": "Highland Park 18"}}), KIND_DISTILLER_API)
+        archive.put(spirit("bad"), "not json", KIND_DISTILLER_API)
+
+        stats = reparse_archive(archive, KIND_DISTILLER_API, distiller_db, workers=1)
+
+        assert (stats["寫入"], stats["失敗"]) == (1, 1)
+        assert distiller_db.get_existing_urls() == {spirit("hp-18")}
+
+    def test_unknown_kind(self, archive, distiller_db):
+        with pytest.raises(ValueError):
+            reparse_archive(archive, "html", distiller_db)
+
+
+class TestDiffords:
+    def test_recipes_keep_lastmod_and_scraped_at(self, archive, diffords_db):
+        url = recipe(1254, "negroni")
+        diffords_db.save_cocktail({"name": "Old", "url": url, "lastmod": "2026-02-01"})
+        diffords_db.conn.execute("UPDATE cocktails SET scraped_at = '2026-02-02 00:00:00'")
+        diffords_db.conn.commit()
+        archive.put(url, SAMPLE_HTML, KIND_DIFFORDS_HTML)
+        archive.put(recipe(2, "new"), SAMPLE_HTML, KIND_DIFFORDS_HTML)
+
+        stats = reparse_archive(archive, KIND_DIFFORDS_HTML, diffords_db, workers=2)
+
+        assert stats["寫入"] == 2
+        row = diffords_db.conn.execute(
+            "SELECT name, glassware, lastmod, scraped_at FROM cocktails WHERE url = ?", (url,)
+        ).fetchone()
+        assert tuple(row) == ("Negroni", "Old Fashioned Glass", "2026-02-01", "2026-02-02 00:00:00")
+        ingredients = diffords_db.conn.execute(
+            "SELECT COUNT(*) FROM cocktail_ingredients WHERE cocktail_id = 1254"
+        ).fetchone()[0]
+        assert ingredients == 3
+
+    def test_newer_row_not_overwritten(self, archive, diffords_db):
+        url = recipe(1254, "negroni")
+        diffords_db.save_cocktail({"name": "Newer", "url": url})
+        archive.put(url, SAMPLE_HTML, KIND_DIFFORDS_HTML, fetched_at=datetime(2026, 1, 1))
+
+        stats = reparse_archive(archive, KIND_DIFFORDS_HTML, diffords_db, workers=1)
+
+        assert (stats["寫入"], stats["未寫入"]) == (0, 1)
+        assert diffords_db.conn.execute("SELECT name FROM cocktails").fetchone()[0] == "Newer"
+
+
+def test_db_timestamp_converts_to_utc():
+    assert db_timestamp("2026-01-01T12:00:00+08:00") == "2026-01-01 04:00:00"
+    assert db_timestamp("2026-01-01T12:00:00+08:00", slack=300) == "2026-01-01 04:05:00"
+    local = datetime(2026, 1, 1, 12, 0, 0)
+    assert db_timestamp(local.isoformat()) == local.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def test_cli(tmp_path, sample_spirit_detail_html):
+    archive = PageArchive(str(tmp_path / "archive.db"))
+    archive.put(spirit("hp-18"), sample_spirit_detail_html, KIND_DISTILLER_HTML)
+    archive.close()
+    db_path = str(tmp_path / "distiller.db")
+
+    result = subprocess.run(
+        [
+            sys.executable, str(ROOT / "reparse.py"), "--kind", KIND_DISTILLER_HTML,
+            "--archive", str(tmp_path / "archive.db"), "--db-path", db_path, "--workers", "1",
+        ],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "頁/秒" in result.stdout
+    storage = SQLiteStorage(db_path)
+    assert storage.get_existing_urls() == {spirit("hp-18")}
+    storage.close()
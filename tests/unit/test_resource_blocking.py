@@ -0,0 +1,200 @@
+"""
+ResourcePolicy 單元測試
+驗證 CDP 封鎖規則、來源允許清單學習與 performance log 流量統計
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from distiller_scraper.config import ScraperConfig
+from distiller_scraper.page_wait import WaitStats
+from distiller_scraper.resource_blocking import ResourcePolicy
+from distiller_scraper.scraper import DistillerScraperV2
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def perf_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def request(url, rtype="Script"):
+    return perf_entry("Network.requestWillBeSent", request={"url": url}, type=rtype)
+
+
+@pytest.fixture
+def policy():
+    return ResourcePolicy(["*.png", "*.css"], ["distiller.com", "*.distiller.com"])
+
+
+def blocked_urls(driver):
+    """取出最後一次 Network.setBlockedURLs 的規則。"""
+    calls = [c for c in driver.execute_cdp_cmd.call_args_list if c[0][0] == "Network.setBlockedURLs"]
+    return calls[-1][0][1]["urls"]
+
+
+# ---------------------------------------------------------------------------
+# 規則
+# ---------------------------------------------------------------------------
+
+
+class TestRules:
+    def test_apply_sends_static_patterns(self, policy):
+        driver = MagicMock()
+        assert policy.apply(driver) is True
+        assert blocked_urls(driver) == ["*.png", "*.css"]
+
+    def test_disabled_policy_does_not_touch_driver(self):
+        policy = ResourcePolicy(["*.png"], [], enabled=False)
+        driver = MagicMock()
+        assert policy.apply(driver) is False
+        driver.execute_cdp_cmd.assert_not_called()
+
+    def test_cdp_failure_is_not_fatal(self, policy):
+        driver = MagicMock()
+        driver.execute_cdp_cmd.side_effect = Exception("CDP unavailable")
+        assert policy.apply(driver) is False
+
+    @pytest.mark.parametrize(
+        "host,allowed",
+        [
+            ("distiller.com", True),
+            ("assets.distiller.com", True),
+            ("www.google-analytics.com", False),
+            ("distiller.com.evil.net", False),
+        ],
+    )
+    def test_allow_list_matching(self, policy, host, allowed):
+        assert policy.is_allowed_host(host) is allowed
+
+    def test_config_defaults_allow_distiller(self):
+        policy = ResourcePolicy(ScraperConfig.BLOCKED_URL_PATTERNS, ScraperConfig.ALLOWED_ORIGINS)
+        assert policy.is_allowed_host("distiller.com")
+        assert "*.woff2" in policy.url_patterns()
+
+
+# ---------------------------------------------------------------------------
+# observe
+# ---------------------------------------------------------------------------
+
+
+class TestObserve:
+    def test_learns_third_party_hosts_and_reapplies(self, policy):
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            request("https://distiller.com/spirits/x", "Document"),
+            request("https://cdn.tracker.io/t.js"),
+            request("data:image/png;base64,AAAA", "Image"),
+        ]
+
+        policy.observe(driver)
+
+        assert policy.blocked_hosts == {"cdn.tracker.io"}
+        assert "*://cdn.tracker.io/*" in blocked_urls(driver)
+
+    def test_no_reapply_without_new_hosts(self, policy):
+        driver = MagicMock()
+        driver.get_log.return_value = [request("https://distiller.com/app.js")]
+
+        policy.observe(driver)
+
+        driver.execute_cdp_cmd.assert_not_called()
+
+    def test_disabled_policy_only_records_stats(self):
+        policy = ResourcePolicy([], ["distiller.com"], enabled=False)
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            request("https://cdn.tracker.io/t.js"),
+            perf_entry("Network.loadingFinished", encodedDataLength=2048),
+        ]
+
+        policy.observe(driver)
+
+        assert policy.blocked_hosts == set()
+        assert policy.transferred_bytes == 2048
+        driver.execute_cdp_cmd.assert_not_called()
+
+    def test_counts_bytes_and_blocked_requests(self, policy):
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            perf_entry("Network.loadingFinished", encodedDataLength=1000),
+            perf_entry("Network.loadingFinished", encodedDataLength=500),
+            perf_entry("Network.loadingFailed", blockedReason="inspector", type="Image"),
+            perf_entry("Network.loadingFailed", blockedReason="inspector", type="Image"),
+            perf_entry("Network.loadingFailed", errorText="net::ERR_ABORTED", type="XHR"),
+            {"message": "not json"},
+        ]
+
+        policy.observe(driver)
+        summary = policy.summary()
+
+        assert summary["傳輸位元組"] == 1500
+        assert summary["每頁平均位元組"] == 1500
+        assert summary["封鎖請求數"] == 2
+        assert summary["封鎖類型"] == {"Image": 2}
+
+    def test_saved_bytes_use_observed_size_then_typical(self, policy):
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            perf_entry("Network.requestWillBeSent", requestId="1", type="Script",
+                       request={"url": "https://distiller.com/a.js"}),
+            perf_entry("Network.loadingFinished", requestId="1", encodedDataLength=8000),
+            perf_entry("Network.loadingFailed", requestId="2", blockedReason="inspector", type="Script"),
+            perf_entry("Network.loadingFailed", requestId="3", blockedReason="inspector", type="Image"),
+        ]
+
+        policy.observe(driver)
+        summary = policy.summary()
+
+        # Script 有同類型樣本（8000），Image 沒有 → 用 TYPICAL_BYTES
+        expected = 8000 + ResourcePolicy.TYPICAL_BYTES["Image"]
+        assert summary["估計節省位元組"] == expected
+        assert summary["每頁估計節省位元組"] == expected
+        assert policy._request_types == {}
+
+    def test_ready_delta_needs_baseline(self):
+        assert ResourcePolicy([], [], baseline_ready_seconds=None).summary(1.5)["就緒秒數差異"] is None
+        summary = ResourcePolicy([], [], baseline_ready_seconds=2.0).summary(1.25)
+        assert summary["詳情頁平均就緒秒數"] == 1.25
+        assert summary["就緒秒數差異"] == -0.75
+
+    def test_log_read_failure_ignored(self, policy):
+        driver = MagicMock()
+        driver.get_log.side_effect = Exception("log unavailable")
+        policy.observe(driver)
+        assert policy.pages == 0
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2 整合
+# ---------------------------------------------------------------------------
+
+
+class TestScraperResourcePolicy:
+    def test_default_follows_config(self):
+        s = DistillerScraperV2()
+        assert s.resource_policy.enabled is ScraperConfig.BLOCK_RESOURCES
+
+    def test_can_be_disabled(self):
+        s = DistillerScraperV2(block_resources=False)
+        assert s.resource_policy.enabled is False
+        assert s._new_pool_worker().resource_policy.enabled is False
+
+    def test_statistics_include_resource_summary(self):
+        s = DistillerScraperV2()
+        assert "資源封鎖" in s.get_statistics()
+
+    def test_statistics_report_detail_ready_seconds(self, monkeypatch):
+        monkeypatch.setattr(ScraperConfig, "UNBLOCKED_READY_SECONDS", 3.0)
+        s = DistillerScraperV2()
+        s.page_waiter.stats["detail"] = WaitStats(count=2, total_seconds=4.0)
+
+        summary = s.get_statistics()["資源封鎖"]
+
+        assert summary["詳情頁平均就緒秒數"] == 2.0
+        assert summary["就緒秒數差異"] == -1.0
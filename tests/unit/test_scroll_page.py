@@ -1,6 +1,6 @@
-from unittest.mock import MagicMock, patch
-
 import logging
+import time
+from unittest.mock import MagicMock, patch
 
 import pytest
 from selenium.common.exceptions import JavascriptException
@@ -8,6 +8,7 @@ from selenium.webdriver.remote.webdriver import WebDriver
 
 from distiller_scraper.config import ScraperConfig
 from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.scroll import ScrollProbe, ScrollWaiter
 
 
 @pytest.fixture
@@ -95,3 +96,134 @@ class TestScrollPage:
             scraper.scroll_page()
 
         assert scraper.page_errors == 0
+
+
+class LazyListDriver:
+    """每次滾動後載入 batch 筆列表項目，直到 total 筆；scrollHeight 隨項目數增加。"""
+
+    def __init__(self, batch=10, total=30, initial=10, requests_per_scroll=1):
+        self.items = initial
+        self.batch, self.total = batch, total
+        self.requests_per_scroll = requests_per_scroll
+        self.resources = 5
+        self.inflight = 0
+        self.probe_args = []
+        self.scrolls = 0
+
+    def execute_script(self, script, *args):
+        if script == "return document.body.scrollHeight":
+            return self.items * 100
+        if script.startswith("window.scrollTo"):
+            self.scrolls += 1
+            if self.items < self.total:
+                self.items = min(self.items + self.batch, self.total)
+                self.resources += self.requests_per_scroll
+            return None
+        if "__distillerNet" in script:
+            self.probe_args.append(args)
+            hrefs = [f"https://distiller.com/spirits/s{i}" for i in range(self.items)] if args[1] else None
+            return [self.items, self.resources, self.inflight, hrefs]
+        return None
+
+
+class TestItemCountScroll:
+    @pytest.fixture
+    def lazy_scraper(self):
+        s = DistillerScraperV2(headless=True, delay_min=0, delay_max=0)
+        s.scroll_waiter.poll_interval = 0
+        s.scroll_waiter.idle_seconds = 0.05
+        s.scroll_waiter.min_wait = 0.05
+        return s
+
+    def test_stops_when_items_stop_growing_without_fixed_delay(self, lazy_scraper):
+        lazy_scraper.driver = LazyListDriver(batch=10, total=30)
+        with (
+            patch.object(lazy_scraper, "_wait_for_body", return_value=True),
+            patch("distiller_scraper.scraper.time.sleep") as mock_sleep,
+        ):
+            lazy_scraper.scroll_page()
+
+        assert lazy_scraper.driver.scrolls == 3  # 兩次載入 + 一次確認已到底
+        assert not any(c.args[0] >= ScraperConfig.SCROLL_DELAY for c in mock_sleep.call_args_list)
+        summary = lazy_scraper.get_statistics()["滾動效率"]
+        assert summary["頁數"] == 1
+        assert summary["載入項目"] == 20
+        assert summary["每秒項目數"] > 0
+
+    def test_stops_once_target_of_new_items_loaded(self, lazy_scraper):
+        lazy_scraper.driver = LazyListDriver(batch=10, total=100)
+        known = {f"https://distiller.com/spirits/s{i}" for i in range(5)}
+        with patch.object(lazy_scraper, "_wait_for_body", return_value=True):
+            lazy_scraper.scroll_page(target_items=15, known_urls=known)
+
+        assert lazy_scraper.driver.scrolls == 1  # 20 筆中 15 筆為新項目
+        # 已收錄 URL 只在 Python 端比對，不傳入瀏覽器
+        assert all(len(args) == 2 and isinstance(args[1], bool) for args in lazy_scraper.driver.probe_args)
+        assert lazy_scraper.scroll_waiter.summary()["達到目標提前停止"] == 1
+
+    def test_network_idle_ends_wait_before_timeout(self, lazy_scraper):
+        lazy_scraper.driver = LazyListDriver(total=10)  # 已到底：滾動不會觸發請求
+        lazy_scraper.scroll_waiter.max_wait = 5
+        with patch.object(lazy_scraper, "_wait_for_body", return_value=True):
+            started = time.monotonic()
+            lazy_scraper.scroll_page()
+
+        assert time.monotonic() - started < 1
+        assert lazy_scraper.driver.scrolls == 1
+
+    def test_idle_not_trusted_before_min_wait(self, lazy_scraper):
+        lazy_scraper.driver = LazyListDriver(total=10)
+        lazy_scraper.scroll_waiter.idle_seconds = 0
+        lazy_scraper.scroll_waiter.min_wait = 0.3
+        lazy_scraper.scroll_waiter.max_wait = 5
+        with patch.object(lazy_scraper, "_wait_for_body", return_value=True):
+            started = time.monotonic()
+            lazy_scraper.scroll_page()
+
+        assert 0.3 <= time.monotonic() - started < 1
+
+    def test_inflight_request_keeps_waiting(self, lazy_scraper):
+        # 請求仍在進行、資源數不變（例如資源緩衝區已滿）：不視為閒置，等到逾時
+        lazy_scraper.driver = LazyListDriver(total=10)
+        lazy_scraper.driver.inflight = 1
+        lazy_scraper.scroll_waiter.max_wait = 0.3
+        with patch.object(lazy_scraper, "_wait_for_body", return_value=True):
+            started = time.monotonic()
+            lazy_scraper.scroll_page()
+
+        assert time.monotonic() - started >= 0.3
+
+    def test_target_ignored_when_probe_unavailable(self, scraper, mock_driver):
+        mock_driver.execute_script.side_effect = TestScrollPage()._make_execute_script(
+            [1000, 2000, 2000]
+        )
+        with patch("time.sleep") as mock_sleep:
+            scraper.scroll_page(target_items=1, known_urls=set())
+
+        mock_sleep.assert_called_with(ScraperConfig.SCROLL_DELAY)
+        assert scraper.scroll_waiter.summary()["頁數"] == 0
+
+
+class TestScrollWaiterTimeout:
+    def test_adapts_to_observed_latency(self):
+        waiter = ScrollWaiter("li", max_wait=2.0, min_wait=0.5, idle_seconds=1.0)
+        assert waiter.timeout == 2.0
+        waiter._latency = 0.1
+        assert waiter.timeout == 0.5
+        waiter._latency = 0.6
+        assert waiter.timeout == pytest.approx(1.2)
+        waiter._latency = 5
+        assert waiter.timeout == 2.0
+
+    def test_probe_rejects_unexpected_values(self):
+        waiter = ScrollWaiter("li", max_wait=2.0, min_wait=0.5, idle_seconds=1.0)
+        for value in (None, 1000, [1, 2, 0], [1, "2", 3, None], [True, 1, 1, None], [1, 1, 0, "a"]):
+            driver = MagicMock()
+            driver.execute_script.return_value = value
+            assert waiter.probe(driver) is None
+
+    def test_fresh_counted_from_links(self):
+        probe = ScrollProbe(3, 0, 0, ("https://a", None, "https://b"))
+        assert probe.fresh({"https://a"}) == 1
+        assert probe.fresh(None) == 3
+        assert ScrollProbe(3, 0, 0).fresh(set()) == 0
@@ -0,0 +1,126 @@
+"""
+工作分片單元測試
+驗證 ShardSpec 的環境變數 / 互斥分配、查詢與過期候選的分片，以及分片資料庫合併
+"""
+
+import sqlite3
+
+import pytest
+
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.sharding import (
+    ShardSpec,
+    merge_shards,
+    prepare_shard_db,
+    shard_db_path,
+)
+from distiller_scraper.storage import SQLiteStorage
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+def set_updated_at(db, slug, timestamp):
+    db.conn.execute("UPDATE spirits SET updated_at = ? WHERE url = ?", (timestamp, spirit(slug)))
+    db.conn.commit()
+
+
+class TestShardSpec:
+    def test_from_env_and_cli_override(self):
+        env = {"CLOUD_RUN_TASK_INDEX": "2", "CLOUD_RUN_TASK_COUNT": "4"}
+        assert ShardSpec.from_env(environ=env) == ShardSpec(2, 4)
+        assert ShardSpec.from_env(index=0, environ=env) == ShardSpec(0, 4)
+        assert not ShardSpec.from_env(environ={}).enabled
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            ShardSpec(3, 3)
+
+    def test_shards_are_disjoint_and_complete(self):
+        urls = [spirit(f"s{i}") for i in range(200)]
+        shards = [ShardSpec(i, 3).select(urls) for i in range(3)]
+        assert sorted(sum(shards, [])) == sorted(urls)
+        assert all(len(s) > 30 for s in shards)  # 雜湊分配大致平均
+
+    def test_db_path(self):
+        assert ShardSpec(1, 4).db_path("data/distiller.db") == "data/distiller.shard-1-of-4.db"
+        assert ShardSpec().db_path("distiller.db") == "distiller.db"
+
+
+class TestScraperSharding:
+    def test_style_queries_split_across_shards(self):
+        full = DistillerScraperV2()._get_search_queries("whiskey", use_styles=True)
+        parts = [
+            DistillerScraperV2(shard=ShardSpec(i, 2))._get_search_queries("whiskey", True)
+            for i in range(2)
+        ]
+        assert sorted(parts[0] + parts[1]) == sorted(full)
+        assert not set(parts[0]) & set(parts[1])
+
+    def test_stale_candidates_filtered(self):
+        db = SQLiteStorage(":memory:")
+        for i in range(20):
+            db.save_spirit({"name": f"s{i}", "url": spirit(f"s{i}"), "category": "gin"})
+        db.conn.execute("UPDATE spirits SET updated_at = datetime('now', '-90 days')")
+        shard = ShardSpec(1, 3)
+        s = DistillerScraperV2(storage=db, shard=shard)
+        s._plan_stale_refresh(["gin"], 20)
+        urls = s.stale_scheduler.take("gin")
+        assert urls and all(shard.owns(u) for u in urls)
+        db.close()
+
+
+class TestMergeShards:
+    def test_newer_rows_flavors_and_checkpoints(self, tmp_path):
+        main_path = str(tmp_path / "distiller.db")
+        main = SQLiteStorage(main_path)
+        main.save_spirit({"name": "old", "url": spirit("a"), "flavor_data": {"smoky": 10}})
+        main.save_spirit({"name": "keep", "url": spirit("b")})
+        set_updated_at(main, "a", "2026-01-01 00:00:00")
+        set_updated_at(main, "b", "2026-03-01 00:00:00")
+        query = "https://distiller.com/search?category=gin&sort=distiller_score"
+        main.save_checkpoint("gin", query, "gin", 4, {})
+        main.close()
+
+        index = next(i for i in range(2) if ShardSpec(i, 2).owns(query))
+        for i in range(2):
+            assert prepare_shard_db(main_path, shard_db_path(main_path, i, 2))
+        shard = SQLiteStorage(shard_db_path(main_path, index, 2))
+        shard.save_spirit({"name": "new", "url": spirit("a"), "flavor_data": {"sweet": 70}})
+        shard.save_spirit({"name": "added", "url": spirit("c")})
+        shard.clear_checkpoints(["gin"])  # 分片已爬完 gin
+        shard.close()
+        other = SQLiteStorage(shard_db_path(main_path, 1 - index, 2))
+        other.save_spirit({"name": "stale", "url": spirit("b")})
+        set_updated_at(other, "b", "2026-02-01 00:00:00")  # 比主資料庫舊
+        other.close()
+
+        stats = merge_shards(main_path, 2)
+
+        assert (stats["分片"], stats["新增"], stats["更新"]) == (2, 1, 1)
+        main = SQLiteStorage(main_path)
+        names = {r["url"]: r["name"] for r in main.get_all_spirits()}
+        assert names == {spirit("a"): "new", spirit("b"): "keep", spirit("c"): "added"}
+        flavors = main.conn.execute(
+            "SELECT f.flavor_name FROM flavor_profiles f JOIN spirits s ON s.id = f.spirit_id"
+            " WHERE s.url = ?",
+            (spirit("a"),),
+        ).fetchall()
+        assert [r[0] for r in flavors] == ["sweet"]
+        assert main.load_checkpoint("gin", query) is None
+        main.close()
+
+    def test_missing_shard_keeps_checkpoints(self, tmp_path):
+        main_path = str(tmp_path / "distiller.db")
+        main = SQLiteStorage(main_path)
+        main.save_checkpoint("gin", "q", "gin", 2, {})
+        main.close()
+        open(shard_db_path(main_path, 0, 2), "wb").close()  # GCS 下載失敗留下的空白檔
+
+        stats = merge_shards(main_path, 2)
+
+        assert stats["缺少"] == [0, 1]
+        conn = sqlite3.connect(main_path)
+        assert conn.execute("SELECT last_page FROM crawl_checkpoints").fetchone() == (2,)
+        conn.close()
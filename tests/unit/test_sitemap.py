@@ -0,0 +1,230 @@
+"""
+Sitemap 探索單元測試
+驗證 sitemap 索引 / gzip 子 sitemap 解析、lastmod 略過判斷、category 保留與 lastmod 遷移
+"""
+
+import gzip
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from distiller_scraper.config import ScraperConfig
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.sitemap import SitemapDiscovery, SitemapEntry
+from distiller_scraper.storage import _DDL, SQLiteStorage
+
+INDEX_URL = "https://distiller.com/sitemap.xml"
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+def urlset(*urls):
+    body = "".join(
+        f"<url><loc>{u}</loc>" + (f"<lastmod>{m}</lastmod>" if m else "") + "</url>"
+        for u, m in urls
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{body}</urlset>'
+    ).encode()
+
+
+def sitemap_index(*children):
+    body = "".join(f"<sitemap><loc>{c}</loc></sitemap>" for c in children)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{body}</sitemapindex>'
+    ).encode()
+
+
+def fake_session(pages):
+    """依 URL 回傳固定內容的 requests.Session；未列出的 URL 回傳 404。"""
+    session = MagicMock(spec=requests.Session)
+    session.headers = {}
+
+    def get(url, timeout=None):
+        resp = MagicMock()
+        if url not in pages:
+            resp.raise_for_status.side_effect = requests.HTTPError("404")
+        resp.content = pages.get(url, b"")
+        return resp
+
+    session.get.side_effect = get
+    return session
+
+
+# ---------------------------------------------------------------------------
+# SitemapDiscovery
+# ---------------------------------------------------------------------------
+
+
+class TestSitemapDiscovery:
+    def test_index_with_gzipped_child(self):
+        child_1 = "https://distiller.com/sitemap1.xml.gz"
+        child_2 = "https://distiller.com/sitemap2.xml"
+        pages = {
+            INDEX_URL: sitemap_index(child_1, child_2),
+            child_1: gzip.compress(
+                urlset((spirit("a"), "2026-05-01"), ("https://distiller.com/search", None))
+            ),
+            child_2: urlset(
+                (spirit("b"), None),
+                (spirit("a"), "2026-05-01"),  # 重複 URL
+                (spirit("a") + "/reviews", None),  # 非詳情頁
+            ),
+        }
+        discovery = SitemapDiscovery(INDEX_URL, session=fake_session(pages))
+
+        entries = discovery.entries()
+
+        assert entries == [SitemapEntry(spirit("a"), "2026-05-01"), SitemapEntry(spirit("b"))]
+        assert discovery.stats == {"子 sitemap": 2, "失敗": 0, "烈酒 URL": 2}
+
+    def test_plain_urlset_and_failed_child(self):
+        pages = {INDEX_URL: urlset((spirit("a"), None))}
+        assert [e.url for e in SitemapDiscovery(INDEX_URL, fake_session(pages)).entries()] == [
+            spirit("a")
+        ]
+
+        missing = "https://distiller.com/missing.xml"
+        pages = {INDEX_URL: sitemap_index(missing)}
+        discovery = SitemapDiscovery(INDEX_URL, fake_session(pages))
+        assert discovery.entries() == []
+        assert discovery.stats["失敗"] == 1
+
+
+# ---------------------------------------------------------------------------
+# SQLiteStorage
+# ---------------------------------------------------------------------------
+
+
+class TestLastmodStorage:
+    def test_lastmod_map_falls_back_to_updated_at(self):
+        db = SQLiteStorage(":memory:")
+        db.save_spirit({"name": "a", "url": spirit("a")})
+        db.save_spirit({"name": "b", "url": spirit("b")})
+        db.set_lastmods({spirit("a"): "2026-05-01T08:00:00+00:00"})
+        lastmods = db.get_url_lastmod_map()
+        assert lastmods[spirit("a")] == "2026-05-01T08:00:00+00:00"
+        assert len(lastmods[spirit("b")]) == 10  # updated_at 的日期
+        db.close()
+
+    def test_update_without_category_keeps_existing(self):
+        db = SQLiteStorage(":memory:")
+        db.save_spirit({"name": "a", "url": spirit("a"), "category": "gin"})
+        db.save_spirit({"name": "a2", "url": spirit("a"), "category": None})
+        assert db.get_all_spirits()[0]["category"] == "gin"
+        db.close()
+
+    def test_migrates_old_schema(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(_DDL.replace("    lastmod        TEXT,\n", ""))
+        conn.close()
+
+        db = SQLiteStorage(path)
+        columns = {r["name"] for r in db.conn.execute("PRAGMA table_info(spirits)")}
+        db.close()
+        assert "lastmod" in columns
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2.scrape_sitemap
+# ---------------------------------------------------------------------------
+
+
+class TestScrapeSitemap:
+    def run(self, scraper, entries, **kwargs):
+        discovery = MagicMock(spec=SitemapDiscovery)
+        discovery.index_url = INDEX_URL
+        discovery.stats = {"子 sitemap": 1}
+        discovery.entries.return_value = entries
+        scraped = []
+
+        def scrape_urls(urls, category, results, max_spirits):
+            for url in urls:
+                if url not in scraper.seen_urls and len(results) < max_spirits:
+                    scraper.seen_urls.add(url)
+                    scraped.append(url)
+                    data = {"name": url, "url": url, "category": category}
+                    scraper._persist(data)
+                    results.append(data)
+
+        with (
+            patch.object(scraper, "_scrape_urls", side_effect=scrape_urls),
+            patch("distiller_scraper.scraper.ScraperConfig.SITEMAP_BATCH_SIZE", 2),
+        ):
+            ok = scraper.scrape_sitemap(discovery=discovery, **kwargs)
+        return ok, scraped
+
+    def test_skips_unchanged_and_records_lastmod(self):
+        db = SQLiteStorage(":memory:")
+        for slug in ("same", "changed", "no-lastmod"):
+            db.save_spirit({"name": slug, "url": spirit(slug), "category": "whiskey"})
+        db.set_lastmods({spirit("same"): "2026-05-01", spirit("changed"): "2026-05-01"})
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        entries = [
+            SitemapEntry(spirit("same"), "2026-05-01"),
+            SitemapEntry(spirit("changed"), "2026-06-01"),
+            SitemapEntry(spirit("no-lastmod")),
+            SitemapEntry(spirit("new"), "2026-06-02"),
+        ]
+
+        ok, scraped = self.run(s, entries)
+
+        assert ok is True
+        assert scraped == [spirit("changed"), spirit("new")]
+        assert s.get_statistics()["Sitemap 探索"] == {
+            "烈酒 URL": 4, "略過": 2, "待爬": 2, "已爬取": 2,
+        }
+        lastmods = db.get_url_lastmod_map()
+        assert lastmods[spirit("changed")] == "2026-06-01"
+        assert lastmods[spirit("new")] == "2026-06-02"
+        db.close()
+
+    def test_full_mode_rescrapes_known(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        s.seen_urls = {spirit("a")}
+        entries = [SitemapEntry(spirit("a"), "2026-05-01"), SitemapEntry(spirit("b"))]
+
+        _, scraped = self.run(s, entries, incremental=False, max_spirits=1)
+
+        assert scraped == [spirit("a")]
+        assert s.seen_urls == {spirit("a")}
+
+    def test_request_budget_stops_between_batches(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        entries = [SitemapEntry(spirit(f"n{i}")) for i in range(6)]
+
+        _, scraped = self.run(s, entries, request_budget=4)
+
+        # sitemap 索引 + 子 sitemap = 2 次請求，剩 2 筆詳情
+        assert scraped == [spirit("n0"), spirit("n1")]
+        assert s.budget.stopped_by == "請求數"
+        assert (s.budget.planned, s.budget.completed) == (6, 2)
+
+    def test_empty_sitemap_fails(self):
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        ok, scraped = self.run(s, [])
+        assert ok is False
+        assert scraped == []
+
+
+class TestRunDiscovery:
+    def test_sitemap_discovery_dispatch(self):
+        import argparse
+
+        import run as run_module
+
+        scraper_mock = MagicMock()
+        scraper_mock.scrape_sitemap.return_value = True
+        args = argparse.Namespace(discovery="sitemap", time_budget=600)
+
+        assert run_module._run_scrape(scraper_mock, args, ["whiskey", "gin"], 50, True) is True
+        kwargs = scraper_mock.scrape_sitemap.call_args.kwargs
+        assert (kwargs["max_spirits"], kwargs["time_budget"]) == (100, 600)
+        assert kwargs["discovery"].index_url == ScraperConfig.SITEMAP_INDEX_URL
+        scraper_mock.scrape.assert_not_called()
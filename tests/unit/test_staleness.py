@@ -0,0 +1,222 @@
+"""
+過期資料刷新排程單元測試
+驗證 updated_at 索引查詢、review_delta 遷移、優先序、CrawlBudget，以及與分頁探索的交錯
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from distiller_scraper.budget import CrawlBudget
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.staleness import StaleRefreshScheduler
+from distiller_scraper.storage import _DDL, SQLiteStorage
+
+QUERY = "https://distiller.com/search?category=whiskey"
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+def age(db, slug, days):
+    db.conn.execute(
+        "UPDATE spirits SET updated_at = datetime('now', ?) WHERE url = ?",
+        (f"-{days} days", spirit(slug)),
+    )
+    db.conn.commit()
+
+
+@pytest.fixture
+def db():
+    storage = SQLiteStorage(":memory:")
+    for slug, category, days in (
+        ("old-gin", "gin", 90),
+        ("old-whiskey", "whiskey", 60),
+        ("mid-whiskey", "whiskey", 40),
+        ("fresh-whiskey", "whiskey", 1),
+    ):
+        storage.save_spirit({"name": slug, "url": spirit(slug), "category": category})
+        age(storage, slug, days)
+    yield storage
+    storage.close()
+
+
+# ---------------------------------------------------------------------------
+# SQLiteStorage
+# ---------------------------------------------------------------------------
+
+
+class TestSelectStaleSpirits:
+    def test_oldest_first_within_limit(self, db):
+        rows = db.select_stale_spirits(30, 2)
+        assert [r["url"] for r in rows] == [spirit("old-gin"), spirit("old-whiskey")]
+        assert rows[0]["age_days"] == pytest.approx(90, abs=0.01)
+
+    def test_min_age_and_category_filter(self, db):
+        rows = db.select_stale_spirits(30, 10, ["whiskey"])
+        assert [r["url"] for r in rows] == [spirit("old-whiskey"), spirit("mid-whiskey")]
+
+    def test_query_uses_updated_at_index(self, db):
+        with patch.object(db, "conn", wraps=db.conn) as conn:
+            db.select_stale_spirits(30, 5, ["whiskey"])
+        sql, params = conn.execute.call_args.args
+        plan = " ".join(r[3] for r in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        assert "idx_spirits_updated_at" in plan
+        assert "TEMP B-TREE" not in plan  # 依索引順序，不需額外排序
+
+    def test_review_delta_tracks_growth(self, db):
+        db.save_spirit({"name": "x", "url": spirit("x"), "review_count": 10})
+        db.save_spirit({"name": "x", "url": spirit("x"), "review_count": 25})
+        db.save_spirit({"name": "x", "url": spirit("x")})  # 未提供評論數：保留上次增量
+        row = db.conn.execute(
+            "SELECT review_count, review_delta FROM spirits WHERE url = ?", (spirit("x"),)
+        ).fetchone()
+        assert (row["review_count"], row["review_delta"]) == (None, 15)
+
+    def test_migrates_old_schema(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(_DDL.replace("    review_delta   INTEGER,\n", ""))  # 舊版 schema
+        conn.commit()
+        conn.close()
+
+        storage = SQLiteStorage(path)
+        columns = {r["name"] for r in storage.conn.execute("PRAGMA table_info(spirits)")}
+        storage.close()
+        assert "review_delta" in columns
+
+
+# ---------------------------------------------------------------------------
+# StaleRefreshScheduler
+# ---------------------------------------------------------------------------
+
+
+def row(slug, days, category="whiskey", delta=0):
+    return {"url": spirit(slug), "category": category, "age_days": days, "review_delta": delta}
+
+
+class TestScheduler:
+    def test_momentum_outranks_slightly_older(self):
+        scheduler = StaleRefreshScheduler(
+            [row("quiet", 50), row("busy", 40, delta=30)], limit=2, momentum_weight=0.5
+        )
+        assert scheduler.take("whiskey") == [spirit("busy"), spirit("quiet")]
+
+    def test_category_weight(self):
+        scheduler = StaleRefreshScheduler(
+            [row("gin", 40, "gin"), row("whisky", 40)], limit=1,
+            category_weights={"whiskey": 1.5},
+        )
+        assert scheduler.take("gin") == []
+        assert scheduler.take("whiskey") == [spirit("whisky")]
+
+    def test_limit_and_take_batches(self):
+        scheduler = StaleRefreshScheduler([row(f"s{i}", 100 - i) for i in range(6)], limit=4)
+        assert scheduler.candidates == 6
+        assert scheduler.take("whiskey", 3) == [spirit("s0"), spirit("s1"), spirit("s2")]
+        assert scheduler.take("whiskey", 3) == [spirit("s3")]
+        assert len(scheduler) == 0
+        assert scheduler.summary()["已取出"] == 4
+
+
+# ---------------------------------------------------------------------------
+# CrawlBudget
+# ---------------------------------------------------------------------------
+
+
+class TestCrawlBudget:
+    def test_unlimited(self):
+        budget = CrawlBudget()
+        budget.spend(1000)
+        assert budget.remaining() is None
+        assert budget.allow(7) == 7
+        assert not budget.exhausted()
+
+    def test_request_cap(self):
+        budget = CrawlBudget(max_requests=5)
+        budget.spend(3)
+        assert budget.allow(10) == 2
+        assert budget.allow(None) == 2
+        budget.spend(2)
+        assert budget.exhausted()
+        assert budget.stopped_by == "請求數"
+
+    def test_time_cap(self):
+        now = [0.0]
+        budget = CrawlBudget(max_seconds=60, clock=lambda: now[0])
+        assert budget.allow(None) is None
+        now[0] = 61
+        assert budget.allow(5) == 0
+        assert budget.stopped_by == "時間"
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2 交錯重爬
+# ---------------------------------------------------------------------------
+
+
+class TestInterleavedRefresh:
+    def run(self, scraper, listings, **scrape_kwargs):
+        order = []
+
+        def scrape_urls(urls, category, results, max_spirits):
+            for url in urls:
+                if url not in scraper.seen_urls and len(results) < max_spirits:
+                    scraper.seen_urls.add(url)
+                    order.append(url)
+                    results.append({"url": url, "category": category})
+
+        with (
+            patch.object(scraper, "_http_health_check", return_value=True),
+            patch.object(scraper, "start_driver", return_value=True),
+            patch.object(scraper, "_health_check", return_value=True),
+            patch.object(scraper, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+            patch.object(
+                scraper, "_fetch_spirit_urls", side_effect=lambda url, page: listings.get(page, [])
+            ),
+            patch.object(scraper, "_scrape_urls", side_effect=scrape_urls),
+            patch("distiller_scraper.scraper.ScraperConfig.STALE_REFRESH_PER_PAGE", 1),
+            patch("time.sleep"),
+        ):
+            ok = scraper.scrape(categories=["whiskey"], use_styles=False, **scrape_kwargs)
+        return ok, order
+
+    def test_refresh_interleaved_between_pages(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        listings = {1: [spirit("n1")], 2: [spirit("n2")]}
+
+        ok, order = self.run(s, listings, refresh_stale=5)
+
+        assert ok is True
+        assert order == [spirit("n1"), spirit("old-whiskey"), spirit("n2"), spirit("mid-whiskey")]
+        assert s.stale_refreshed == 2
+        assert spirit("old-whiskey") in s.seen_urls
+        assert s.get_statistics()["過期刷新"]["重新爬取"] == 2
+
+    def test_remaining_refresh_done_after_early_stop(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        # 首頁全是已收錄烈酒 → 首頁早停，排程仍在類別結束時做完
+        listings = {1: [spirit("fresh-whiskey")]}
+
+        _, order = self.run(s, listings, refresh_stale=5)
+
+        assert order == [spirit("old-whiskey"), spirit("mid-whiskey")]
+
+    def test_request_budget_stops_discovery_and_refresh(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        listings = {p: [spirit(f"n{p}")] for p in range(1, 10)}
+
+        _, order = self.run(s, listings, refresh_stale=5, request_budget=4)
+
+        # 第 1 頁 + 詳情 + 過期刷新 + 第 2 頁 = 4 次請求
+        assert order == [spirit("n1"), spirit("old-whiskey")]
+        assert s.budget.stopped_by == "請求數"
+        assert db.load_checkpoint("whiskey", QUERY)["last_page"] == 1  # 保留檢查點續爬
+
+    def test_disabled_by_default(self, db):
+        s = DistillerScraperV2(storage=db, delay_min=0, delay_max=0)
+        _, order = self.run(s, {1: [spirit("n1")]})
+        assert order == [spirit("n1")]
+        assert s.get_statistics()["過期刷新"] == {}
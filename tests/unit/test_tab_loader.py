@@ -0,0 +1,259 @@
+"""
+單一 Chrome 多分頁並行載入單元測試
+驗證 MultiTabLoader 的分頁分派、完成順序、逾時處理與 scraper 的多分頁路徑
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.storage import SQLiteStorage
+from distiller_scraper.tab_loader import MultiTabLoader
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        handle = f"tab-{len(self._driver.handles)}"
+        self._driver.handles.append(handle)
+        self._driver.current_window_handle = handle
+
+
+class FakeTabDriver:
+    """模擬多分頁 WebDriver：每個 URL 需輪詢 delays[slug] 次才就緒。"""
+
+    def __init__(self, delays=None, never_ready=(), fail_on=None):
+        self.handles = ["main"]
+        self.current_window_handle = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.loaded = {}  # handle -> url
+        self.polls = {}  # handle -> 剩餘輪詢次數
+        self.delays = delays or {}
+        self.never_ready = set(never_ready)
+        self.fail_on = fail_on
+        self.closed = []
+        self.gets = []
+
+    @staticmethod
+    def _slug(url):
+        return url.rsplit("/", 1)[-1]
+
+    def get(self, url):
+        if self.fail_on and self._slug(url) == self.fail_on:
+            raise Exception("invalid session id")
+        self.gets.append(url)
+        self.loaded[self.current_window_handle] = url
+        self.polls[self.current_window_handle] = self.delays.get(self._slug(url), 0)
+
+    def execute_script(self, script, *args):
+        handle = self.current_window_handle
+        if self._slug(self.loaded[handle]) in self.never_ready:
+            return False
+        if self.polls[handle] > 0:
+            self.polls[handle] -= 1
+            return False
+        return True
+
+    @property
+    def page_source(self):
+        slug = self._slug(self.loaded[self.current_window_handle])
+        name = "" if slug.startswith("noname") else slug
+        return f"<html><body><h1 class='secondary-headline name'>{name}</h1></body></html>"
+
+    def close(self):
+        self.closed.append(self.current_window_handle)
+
+
+class LaggingTabDriver(FakeTabDriver):
+    """重用分頁時，新 document 在 commit_polls 次 location.href 輪詢後才取代上一頁（上一頁的品名仍在）。"""
+
+    def __init__(self, commit_polls=2, **kwargs):
+        super().__init__(**kwargs)
+        self.commit_polls = commit_polls
+        self.pending = {}  # handle -> (url, 剩餘輪詢次數)
+
+    def get(self, url):
+        handle = self.current_window_handle
+        if handle not in self.loaded:
+            return super().get(url)
+        self.gets.append(url)
+        self.pending[handle] = [url, self.commit_polls]
+
+    def execute_script(self, script, *args):
+        handle = self.current_window_handle
+        if "location.href" in script:
+            pending = self.pending.get(handle)
+            if pending is not None:
+                if pending[1] is not None and pending[1] <= 0:
+                    del self.pending[handle]
+                    super().get(pending[0])
+                else:
+                    if pending[1] is not None:
+                        pending[1] -= 1
+            return self.loaded[handle]
+        return super().execute_script(script, *args)
+
+
+def urls(*slugs):
+    return [f"https://distiller.com/spirits/{s}" for s in slugs]
+
+
+@pytest.fixture
+def db():
+    storage = SQLiteStorage(":memory:")
+    yield storage
+    storage.close()
+
+
+# ---------------------------------------------------------------------------
+# MultiTabLoader
+# ---------------------------------------------------------------------------
+
+
+class TestMultiTabLoader:
+    def make_loader(self, driver, tabs=3, timeout=5.0):
+        return MultiTabLoader(
+            driver, tabs=tabs, ready_script="ready", timeout=timeout, poll_interval=0
+        )
+
+    def test_loads_every_url_once(self):
+        driver = FakeTabDriver()
+        loaded = list(self.make_loader(driver).load(urls("a", "b", "c", "d", "e")))
+
+        assert sorted(u for u, _ in loaded) == sorted(urls("a", "b", "c", "d", "e"))
+        assert len(driver.gets) == 5
+
+    def test_yields_in_completion_order(self):
+        driver = FakeTabDriver(delays={"a": 5, "b": 0, "c": 2})
+        loaded = [u for u, _ in self.make_loader(driver).load(urls("a", "b", "c"))]
+
+        assert loaded == urls("b", "c", "a")
+
+    def test_opens_at_most_tabs_minus_one_extra_windows(self):
+        driver = FakeTabDriver()
+        list(self.make_loader(driver, tabs=3).load(urls("a", "b", "c", "d", "e", "f")))
+
+        assert len(driver.handles) == 3
+        # 額外分頁於結束時關閉，並切回原分頁
+        assert sorted(driver.closed) == ["tab-1", "tab-2"]
+        assert driver.current_window_handle == "main"
+
+    def test_no_extra_tabs_for_single_url(self):
+        driver = FakeTabDriver()
+        list(self.make_loader(driver, tabs=4).load(urls("a")))
+
+        assert driver.handles == ["main"]
+
+    def test_timeout_still_yields_page_source(self):
+        driver = FakeTabDriver(never_ready={"slow"})
+        loader = self.make_loader(driver, tabs=2, timeout=0)
+        loaded = dict(loader.load(urls("slow")))
+
+        assert urls("slow")[0] in loaded
+        assert loader.timeouts == 1
+
+    def test_reused_tab_waits_for_new_document(self):
+        driver = LaggingTabDriver(commit_polls=3)
+        loaded = list(self.make_loader(driver, tabs=1).load(urls("a", "b", "c")))
+
+        # 每個 URL 都拿到自己的 page_source，而不是同一分頁上一頁的內容
+        assert [(u.rsplit("/", 1)[-1], ">" + u.rsplit("/", 1)[-1] + "<" in html) for u, html in loaded] == [
+            ("a", True), ("b", True), ("c", True),
+        ]
+
+    def test_reused_tab_never_committing_yields_none(self):
+        driver = LaggingTabDriver(commit_polls=None)
+        loader = self.make_loader(driver, tabs=1, timeout=0.05)
+        loaded = list(loader.load(urls("a", "b")))
+
+        assert loaded[0][0] == urls("a")[0] and loaded[0][1] is not None
+        assert loaded[1] == (urls("b")[0], None)
+
+    def test_empty_input_does_nothing(self):
+        driver = FakeTabDriver()
+        assert list(self.make_loader(driver).load([])) == []
+        assert driver.gets == []
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2 多分頁路徑
+# ---------------------------------------------------------------------------
+
+
+class TestScraperMultiTab:
+    def make_scraper(self, driver, storage=None, tabs=3):
+        s = DistillerScraperV2(storage=storage, delay_min=0, delay_max=0, tab_count=tabs)
+        s.driver = driver
+        return s
+
+    def test_routes_to_multitab_when_tabs_enabled(self, db):
+        s = self.make_scraper(FakeTabDriver(), storage=db)
+        results = []
+        with patch.object(s, "_scrape_urls_sequential") as mock_seq:
+            s._scrape_urls(urls("a", "b", "c"), "whiskey", results, 10)
+
+        mock_seq.assert_not_called()
+        assert sorted(r["name"] for r in results) == ["a", "b", "c"]
+        assert all(r["category"] == "whiskey" for r in results)
+        assert db.count() == 3
+        assert set(urls("a", "b", "c")) <= s.seen_urls
+
+    def test_sequential_when_tabs_disabled(self):
+        s = self.make_scraper(FakeTabDriver(), tabs=1)
+        with patch.object(s, "_scrape_urls_sequential") as mock_seq:
+            s._scrape_urls(urls("a"), "gin", [], 10)
+
+        mock_seq.assert_called_once()
+
+    def test_respects_max_spirits_and_seen_urls(self):
+        driver = FakeTabDriver()
+        s = self.make_scraper(driver)
+        s.seen_urls.add(urls("a")[0])
+        results = []
+        s._scrape_urls(urls("a", "b", "c", "d"), "rum", results, 2)
+
+        assert len(results) == 2
+        assert urls("a")[0] not in driver.gets
+
+    def test_missing_name_recorded_as_failed(self):
+        s = self.make_scraper(FakeTabDriver())
+        results = []
+        s._scrape_urls(urls("a", "noname1"), "vodka", results, 10)
+
+        assert [r["name"] for r in results] == ["a"]
+        assert s.failed_urls == urls("noname1")
+
+    def test_uncommitted_tab_recorded_as_failed(self):
+        s = self.make_scraper(LaggingTabDriver(commit_polls=None), tabs=2)
+        results = []
+        with patch("distiller_scraper.scraper.ScraperConfig.DETAIL_READY_TIMEOUT", 0.05):
+            s._scrape_urls(urls("a", "b", "c"), "gin", results, 10)
+
+        # c 在已交出 a 的分頁上載入，但始終未 commit：不可把 a 的內容存成 c
+        assert sorted(r["name"] for r in results) == ["a", "b"]
+        assert s.failed_urls == urls("c")
+
+    def test_session_loss_restarts_and_falls_back_to_sequential(self):
+        s = self.make_scraper(FakeTabDriver(fail_on="c"), tabs=2)
+        results = []
+        with patch.object(s, "restart_driver", return_value=True) as mock_restart, \
+                patch.object(s, "_scrape_urls_sequential") as mock_seq:
+            s._scrape_urls(urls("a", "b", "c", "d"), "brandy", results, 10)
+
+        mock_restart.assert_called_once()
+        assert s.restart_count == 1
+        # 已解析完成的 a 不重爬；尚未交出結果的分頁與佇列中的 URL 全數交回循序路徑
+        remaining = mock_seq.call_args[0][0]
+        assert [r["name"] for r in results] == ["a"]
+        assert remaining == urls("b", "c", "d")
@@ -0,0 +1,295 @@
+"""
+時間預算單元測試
+驗證每項成本 EWMA、截止前收尾（保留檢查點）、scrape_runs 的 planned / completed 與 partial 狀態
+"""
+
+import functools
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from distiller_scraper.budget import CrawlBudget
+from distiller_scraper.diffords_scraper import DiffordsGuideScraper, SitemapEntry
+from distiller_scraper.diffords_storage import DiffordsStorage
+from distiller_scraper.scraper import DistillerScraperV2
+from distiller_scraper.storage import _DDL, SQLiteStorage
+
+QUERY = "https://distiller.com/search?category=whiskey"
+
+
+def spirit(slug):
+    return f"https://distiller.com/spirits/{slug}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+# ---------------------------------------------------------------------------
+# CrawlBudget
+# ---------------------------------------------------------------------------
+
+
+class TestItemCost:
+    def test_ewma(self):
+        budget = CrawlBudget(alpha=0.5)
+        budget.record(2, 20)  # 10 秒 / 項
+        budget.record(1, 20)
+        assert budget.item_cost == pytest.approx(15)
+        assert budget.completed == 3
+
+    def test_remaining_items_from_time_left(self):
+        clock = FakeClock()
+        budget = CrawlBudget(max_seconds=100, reserve_seconds=20, clock=clock)
+        assert budget.remaining() is None  # 尚無成本估計
+        clock.advance(30)
+        budget.record(3, 30)
+        assert budget.remaining() == 5  # (100 - 20 - 30) // 10
+
+    def test_exhausted_when_next_item_would_miss_deadline(self):
+        clock = FakeClock()
+        budget = CrawlBudget(max_seconds=100, reserve_seconds=20, clock=clock)
+        budget.record(1, 10)
+        clock.advance(71)
+        assert budget.exhausted()
+        assert budget.stopped_by == "時間"
+
+    def test_request_and_time_limits_combined(self):
+        clock = FakeClock()
+        budget = CrawlBudget(max_requests=3, max_seconds=1000, clock=clock)
+        budget.record(1, 1)
+        assert budget.remaining() == 3
+
+
+# ---------------------------------------------------------------------------
+# DistillerScraperV2
+# ---------------------------------------------------------------------------
+
+
+class TestPaginatedTimeBudget:
+    def test_stops_mid_page_and_keeps_checkpoint(self):
+        storage = SQLiteStorage(":memory:")
+        clock = FakeClock()
+        s = DistillerScraperV2(storage=storage, delay_min=0, delay_max=0)
+        s.budget = CrawlBudget(max_seconds=100, clock=clock)
+        listings = {
+            1: [spirit(f"a{i}") for i in range(5)],
+            2: [spirit(f"b{i}") for i in range(8)],
+        }
+        scraped = []
+
+        def scrape_urls(urls, category, results, max_spirits):
+            for url in urls:
+                clock.advance(10)
+                s.seen_urls.add(url)
+                scraped.append(url)
+                results.append({"url": url})
+
+        with (
+            patch.object(s, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+            patch.object(s, "_fetch_spirit_urls", side_effect=lambda u, p: listings.get(p, [])),
+            patch.object(s, "_scrape_urls", side_effect=scrape_urls),
+            patch("time.sleep"),
+        ):
+            s.scrape_category_paginated("whiskey")
+
+        # 第 1 頁 5 筆用掉 50 秒 → 第 2 頁只夠再爬 5 筆
+        assert scraped == listings[1] + listings[2][:5]
+        assert s.budget.stopped_by == "時間"
+        assert (s.budget.planned, s.budget.completed) == (13, 10)
+        # 第 2 頁沒爬完：檢查點停在第 1 頁，下一次 run 從第 2 頁重來
+        assert storage.load_checkpoint("whiskey", QUERY)["last_page"] == 1
+        storage.close()
+
+    def test_partial_page_stop_logs_reason(self, caplog):
+        # 第 1 頁估得每項 10 秒 → 第 2 頁只放行 5 筆；實際很快，預算尚未用完但本頁仍有未爬 URL
+        clock = FakeClock()
+        s = DistillerScraperV2(delay_min=0, delay_max=0)
+        s.budget = CrawlBudget(max_seconds=100, clock=clock)
+        listings = {
+            1: [spirit(f"a{i}") for i in range(5)],
+            2: [spirit(f"b{i}") for i in range(8)],
+        }
+
+        def scrape_urls(urls, category, results, max_spirits):
+            for url in urls:
+                clock.advance(10 if url.rsplit("/", 1)[-1].startswith("a") else 1)
+                s.seen_urls.add(url)
+                results.append({"url": url})
+
+        with (
+            patch.object(s, "_get_search_queries", return_value=[(QUERY, "whiskey")]),
+            patch.object(s, "_fetch_spirit_urls", side_effect=lambda u, p: listings.get(p, [])),
+            patch.object(s, "_scrape_urls", side_effect=scrape_urls),
+            patch("time.sleep"),
+            caplog.at_level("INFO", logger="distiller_scraper.scraper"),
+        ):
+            results = s.scrape_category_paginated("whiskey")
+
+        assert len(results) == 10
+        assert s.budget.stopped_by is None
+        assert "剩餘預算只夠爬本頁部分 URL（3 個未爬）" in caplog.text
+        assert "爬取預算已用完（None）" not in caplog.text
+
+
+class TestDistillerValueOrder:
+    QUERIES = {
+        "whiskey": [("q-bourbon", "Bourbon"), ("q-rye", "Rye"), ("q-scotch", "Scotch")],
+        "gin": [("q-gin", "gin")],
+        "rum": [("q-rum", "rum")],
+    }
+
+    @pytest.fixture
+    def scraper(self):
+        storage = SQLiteStorage(":memory:")
+        storage.save_checkpoint("whiskey", "q-bourbon", "Bourbon", 4, {"consecutive_dup_pages": 1})
+        storage.save_checkpoint("whiskey", "q-rye", "Rye", 9, {"done": True})
+        storage.save_checkpoint("gin", "q-gin", "gin", 2, {"done": True})
+        s = DistillerScraperV2(storage=storage, delay_min=0, delay_max=0)
+        with patch.object(
+            s, "_get_search_queries", side_effect=lambda c, use_styles: self.QUERIES[c]
+        ):
+            yield s
+        storage.close()
+
+    def test_queries_ordered_by_checkpoint(self, scraper):
+        ordered = scraper._order_queries_by_value("whiskey", self.QUERIES["whiskey"])
+        # 未開始 → 最近全是重複 → 已完成
+        assert [label for _, label in ordered] == ["Scotch", "Bourbon", "Rye"]
+
+    def test_categories_ordered_by_best_query(self, scraper):
+        ordered = scraper._order_categories_by_value(["gin", "whiskey", "rum"], True)
+        assert ordered == ["whiskey", "rum", "gin"]
+
+    def test_scrape_orders_only_under_time_budget(self, scraper):
+        seen = []
+
+        def scrape_category(category, **kwargs):
+            seen.append(category)
+            return []
+
+        with (
+            patch.object(scraper, "_http_health_check", return_value=True),
+            patch.object(scraper, "start_driver", return_value=True),
+            patch.object(scraper, "_health_check", return_value=True),
+            patch.object(scraper, "scrape_category", side_effect=scrape_category),
+            patch.object(scraper.storage, "clear_checkpoints"),  # 兩次 run 都看得到檢查點
+            patch("time.sleep"),
+        ):
+            scraper.scrape(categories=["gin", "whiskey"], use_pagination=True, time_budget=0)
+            scraper.scrape(categories=["gin", "whiskey"], use_pagination=True, time_budget=600)
+
+        assert seen == ["gin", "whiskey", "whiskey", "gin"]
+
+
+# ---------------------------------------------------------------------------
+# scrape_runs
+# ---------------------------------------------------------------------------
+
+
+class TestScrapeRunProgress:
+    def test_planned_and_completed_recorded(self):
+        db = SQLiteStorage(":memory:")
+        run_id = db.record_scrape_run(categories=["whiskey"], mode="full")
+        db.finish_scrape_run(run_id, 8, 2, "partial", planned=40, completed=10)
+        row = db.conn.execute("SELECT * FROM scrape_runs WHERE id = ?", (run_id,)).fetchone()
+        assert (row["status"], row["planned"], row["completed"]) == ("partial", 40, 10)
+        db.close()
+
+    def test_migrates_old_scrape_runs(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            _DDL.replace(",\n    planned        INTEGER,\n    completed      INTEGER", "")
+        )
+        conn.close()
+
+        db = SQLiteStorage(path)
+        columns = {r["name"] for r in db.conn.execute("PRAGMA table_info(scrape_runs)")}
+        db.close()
+        assert {"planned", "completed"} <= columns
+
+    def test_run_marks_partial(self):
+        import run as run_module
+
+        storage_mock = MagicMock(spec=SQLiteStorage)
+        storage_mock.record_scrape_run.return_value = 3
+        scraper_mock = MagicMock()
+        scraper_mock.scrape.return_value = True
+        scraper_mock.spirits_data = [object()] * 4
+        scraper_mock.failed_urls = []
+        scraper_mock.page_errors = 0
+        scraper_mock.budget = CrawlBudget()
+        scraper_mock.budget.plan(9)
+        scraper_mock.budget.record(4, 1)
+        scraper_mock.budget.stopped_by = "時間"
+        scraper_mock.get_statistics.return_value = {}
+
+        with (
+            patch.object(run_module, "_build_storage", return_value=(storage_mock, None)),
+            patch.object(run_module, "_build_api_client", return_value=None),
+            patch("run.DistillerScraperV2", return_value=scraper_mock),
+        ):
+            run_module.run_full(output="sqlite", db_path=":memory:")
+
+        storage_mock.finish_scrape_run.assert_called_once_with(
+            3, 4, 0, "partial", planned=9, completed=4
+        )
+
+
+# ---------------------------------------------------------------------------
+# Difford's Guide
+# ---------------------------------------------------------------------------
+
+
+def entry(i, lastmod):
+    url = f"https://www.diffordsguide.com/cocktails/recipe/{i}/c{i}"
+    return SitemapEntry(i, f"c{i}", url, lastmod)
+
+
+class TestDiffordsTimeBudget:
+    def test_new_recipes_first_and_stop_before_deadline(self, tmp_path):
+        storage = DiffordsStorage(str(tmp_path / "d.db"))
+        clock = FakeClock()
+        scraper = DiffordsGuideScraper(storage=storage)
+        old = entry(1, "2026-05-01")
+        scraper.seen_urls.add(old.url)
+        scraper.lastmod_map[old.url] = "2026-01-01"
+        entries = [old, entry(2, "2026-02-01"), entry(3, "2026-03-01"), entry(4, None)]
+
+        with (
+            patch(
+                "distiller_scraper.diffords_scraper.CrawlBudget",
+                functools.partial(CrawlBudget, clock=clock),
+            ),
+            patch("distiller_scraper.diffords_scraper.TIME_BUDGET_RESERVE_SECONDS", 0),
+            patch.object(scraper, "_fetch_recipe", return_value={"name": "x"}) as mock_fetch,
+            patch("time.sleep", side_effect=lambda _: clock.advance(10)),
+        ):
+            scraper.scrape(entries=entries, time_budget=25)
+
+        fetched = [c.args[0] for c in mock_fetch.call_args_list]
+        assert fetched == [entries[2].url, entries[1].url]  # 新酒譜優先、lastmod 新者先
+        assert scraper.budget.stopped_by == "時間"
+        assert scraper.get_statistics()["爬取預算"]["計畫"] == 4
+        storage.close()
+
+    def test_finish_scrape_run_progress_and_partial_not_successful(self, tmp_path):
+        storage = DiffordsStorage(str(tmp_path / "d.db"))
+        run_id = storage.record_scrape_run("incremental")
+        storage.finish_scrape_run(run_id, 5, 0, 0, "partial", planned=20, completed=5)
+        row = storage.conn.execute(
+            "SELECT planned, completed FROM diffords_scrape_runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        assert (row["planned"], row["completed"]) == (20, 5)
+        assert storage.get_last_successful_run() is None
+        storage.close()
+